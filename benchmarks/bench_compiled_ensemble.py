@@ -0,0 +1,70 @@
+"""
+Benchmark the compiled voting ensemble against sklearn's predict_proba.
+
+Usage:
+    python -m benchmarks.bench_compiled_ensemble --batch-sizes 1 32 1000 --features 30
+"""
+
+import argparse
+import time
+import warnings
+
+import numpy as np
+
+from cross_dataset.models.training import create_model_ensemble
+from cross_dataset.models.compiled import CompiledEnsemble, max_proba_difference
+
+
+def make_data(n_samples, n_features, seed=0):
+    """Create a binary problem with a non-linear decision boundary."""
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n_samples, n_features))
+    y = (X[:, 0] + 0.5 * X[:, 1] ** 2 - X[:, 2] * X[:, 3] + rng.normal(size=n_samples) > 0.5).astype(int)
+    return X, y
+
+
+def time_call(func, repeats):
+    """Return the best wall time of repeated calls and the last result."""
+    best = np.inf
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def run(batch_sizes, n_train, n_features, repeats):
+    """Print agreement and per-batch timings of both implementations."""
+    X_train, y_train = make_data(n_train, n_features)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        model = create_model_ensemble().fit(X_train, y_train)
+
+    compile_time, compiled = time_call(lambda: CompiledEnsemble.from_voting(model), 1)
+    X_test, _ = make_data(max(batch_sizes), n_features, seed=1)
+    diff = max_proba_difference(model, compiled, X_test)
+    agreement = np.mean(model.predict(X_test) == compiled.predict(X_test))
+    print(f"compile time {compile_time:.4f} s, max abs diff {diff:.2e}, label agreement {agreement:.4f}")
+
+    print(f"{'batch':>7} {'sklearn (ms)':>13} {'compiled (ms)':>14} {'speedup':>8}")
+    for batch_size in batch_sizes:
+        X = X_test[:batch_size]
+        sklearn_time, _ = time_call(lambda: model.predict_proba(X), repeats)
+        compiled_time, _ = time_call(lambda: compiled.predict_proba(X), repeats)
+        print(f"{batch_size:>7} {sklearn_time * 1000:>13.2f} {compiled_time * 1000:>14.2f} "
+              f"{sklearn_time / compiled_time:>8.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compiled vs sklearn voting ensemble benchmark')
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 32, 1000])
+    parser.add_argument('--train-samples', type=int, default=1000)
+    parser.add_argument('--features', type=int, default=30)
+    parser.add_argument('--repeats', type=int, default=5)
+    args = parser.parse_args()
+
+    run(args.batch_sizes, args.train_samples, args.features, args.repeats)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,554 @@
+"""
+End-to-end benchmark suite with regression tracking.
+
+Runs the ingestion, feature extraction, domain adaptation and training
+steps of both frameworks on synthetic data (benchmarks.synthetic) at one or
+more dataset scales, and every API endpoint through an in-process test
+client. Each benchmark records its best and median wall time, throughput
+and peak traced memory. Results are written to JSON and compared with a
+stored baseline: a benchmark that is slower (or uses more memory) than the
+baseline by more than the threshold is a regression, and the exit code is 1.
+
+Each scale and the serving benchmarks run in their own process, since the
+dataset paths are read when the framework modules are imported and peak
+memory is then measured per workload.
+
+Usage:
+    python -m benchmarks.suite --scales 1 10 --baseline benchmarks/baseline.json
+    python -m benchmarks.suite --scales 1 --update-baseline
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import warnings
+from datetime import datetime
+from functools import cached_property
+
+import numpy as np
+
+from benchmarks.synthetic import generate_datasets
+
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+DEFAULT_THRESHOLD = 0.25
+# Differences below this are timer noise, whatever the ratio
+MIN_DELTA_SECONDS = 0.002
+MIN_DELTA_MB = 1.0
+
+SERVING_GROUP = 'serving'
+# Seconds to wait for the API warmup (/ready returning 200) before timing endpoints
+READY_TIMEOUT = 120
+
+# Registered benchmarks: name -> setup(workload) returning (callable, items, unit)
+BENCHMARKS = {}
+
+# Requests of the serving benchmarks: (method, path, JSON body)
+_SIGNAL = np.round(np.sin(np.arange(8400) / 50.0), 4).tolist()
+ENDPOINTS = [
+    ('GET', '/ready', None),
+    ('GET', '/metrics', None),
+    ('GET', '/wesad/dataserving/', None),
+    ('GET', '/wesad/dataserving/overview', None),
+    ('GET', '/wesad/dataserving/models/base', None),
+    ('GET', '/wesad/dataserving/subjects/2', None),
+    ('GET', '/wesad/dataserving/emotions', None),
+    ('GET', '/wesad/dataserving/confusion_matrices', None),
+    ('GET', '/wesad/dataserving/model_comparison', None),
+    ('GET', '/wesad/dataserving/model_selection_stats', None),
+    ('GET', '/wesad/dataserving/detailed/confusion_matrices/base/2', None),
+    ('GET', '/wesad/dataserving/detailed/emotion/Stress', None),
+    ('GET', '/wesad/dataserving/detailed/subject/2', None),
+    ('GET', '/wesad/dataserving/detailed/feature_importance', None),
+    ('GET', '/wesad/dataserving/detailed/misclassifications', None),
+    ('GET', '/wesad/dataserving/detailed/subject/2/misclassifications', None),
+    ('POST', '/wesad/dataserving/predict', {'ecg_data': _SIGNAL, 'emg_data': _SIGNAL, 'resp_data': _SIGNAL}),
+    ('GET', '/wesad/dataserving/visualize/subject/2/signals', None),
+    ('GET', '/wesad/dataserving/benchmarks', None),
+    ('GET', '/wesad/dataserving/dataset/statistics', None),
+    ('GET', '/wesad/dataserving/features/correlations', None),
+    ('POST', '/wesad/dataserving/simulate/adaptive', {'threshold': 0.65, 'subject_id': 2}),
+    ('GET', '/wesad/dataserving/reports/generate/performance_summary', None),
+    ('GET', '/wesad/dataserving/explain/base/2', None),
+    ('POST', '/wesad/dataserving/simulate/ensemble', {'base_weight': 0.5, 'subject_id': 2}),
+    ('GET', '/wesad/model/', None),
+    ('GET', '/wesad/model/subjects', None),
+    ('GET', '/wesad/model/predict/2', None),
+    ('GET', '/wesad/model/evaluate/2', None),
+    ('GET', '/wesad/model/sample/2/0', None),
+    ('GET', '/wesad/model/overall_performance', None),
+    ('GET', '/cross_dataset/dataserving/', None),
+    ('GET', '/cross_dataset/dataserving/overview', None),
+    ('GET', '/cross_dataset/dataserving/performance', None),
+    ('GET', '/cross_dataset/dataserving/adaptation', None),
+    ('GET', '/cross_dataset/dataserving/features/mapping', None),
+    ('GET', '/cross_dataset/dataserving/dataset/distribution', None),
+    ('GET', '/cross_dataset/dataserving/dataset/statistics', None),
+    ('POST', '/cross_dataset/dataserving/predict', {'signals': {'ECG': _SIGNAL[:480]}, 'dataset': 'WESAD'}),
+    ('GET', '/cross_dataset/dataserving/evaluation/arousal/wesad_to_kemocon', None),
+    ('POST', '/cross_dataset/dataserving/simulate/adaptation', {'adaptation_method': 'ensemble'}),
+    ('GET', '/cross_dataset/dataserving/visualize/domain_gap', None),
+    ('GET', '/cross_dataset/dataserving/visualize/confusion_matrices', None),
+    ('GET', '/cross_dataset/dataserving/visualize/class_distribution', None),
+    ('GET', '/cross_dataset/dataserving/visualize/feature_importance', None),
+    ('GET', '/cross_dataset/dataserving/report/performance', None),
+    ('GET', '/cross_dataset/model/', None),
+    ('GET', '/cross_dataset/model/available-samples', None),
+    ('GET', '/cross_dataset/model/samples/wesad_to_kemocon/0', None),
+    ('POST', '/cross_dataset/model/predict', {'direction': 'wesad_to_kemocon', 'sample_index': 0}),
+    ('POST', '/cross_dataset/model/predict/batch',
+     {'direction': 'wesad_to_kemocon', 'sample_indices': list(range(32))}),
+    ('GET', '/cross_dataset/model/models', None),
+    ('GET', '/cross_dataset/model/health', None)
+]
+
+
+def benchmark(name):
+    """Register a benchmark setup function under a name."""
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+def time_call(func, repeats):
+    """Return the best and median wall time of repeated calls."""
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times), float(np.median(times))
+
+
+def peak_memory_mb(func):
+    """Peak memory allocated (Python objects and NumPy arrays) during one call, in MB."""
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return round(peak / (1024 * 1024), 3)
+
+
+def measure(func, items, unit, repeats, memory=True):
+    """
+    Time a benchmark and measure its peak memory.
+
+    Args:
+        func (callable): Benchmarked call
+        items (int): Number of items processed per call, for the throughput
+        unit (str): Name of the items
+        repeats (int): Number of timed calls
+        memory (bool): Whether to measure peak memory (one extra, traced call)
+
+    Returns:
+        dict: Timing, throughput and memory of the benchmark
+    """
+    best, median = time_call(func, repeats)
+    result = {
+        'seconds': round(best, 6),
+        'median_seconds': round(median, 6),
+        'items': int(items),
+        'unit': unit,
+        'throughput': round(items / best, 3) if best > 0 else None
+    }
+    if memory:
+        result['peak_memory_mb'] = peak_memory_mb(func)
+    return result
+
+
+class Workload:
+    """
+    Inputs of the framework benchmarks, built once per scale from the synthetic datasets.
+
+    The framework modules read the dataset paths when they are imported, so
+    they are imported here rather than at the top of the module.
+    """
+
+    @cached_property
+    def wesad_subjects(self):
+        from wesad_framework.data.loaders import load_all_subjects
+        return load_all_subjects()
+
+    @cached_property
+    def wesad_features(self):
+        import pandas as pd
+        from wesad_framework.data.feature_extraction import extract_features
+        return pd.concat([extract_features(data) for data in self.wesad_subjects.values()])
+
+    @cached_property
+    def personalization(self):
+        """Base model and per-subject training data, as EnhancedPersonalizationFramework.run prepares them."""
+        from sklearn.preprocessing import StandardScaler
+        from wesad_framework.data.loaders import prepare_train_test_data
+        from wesad_framework.features.selection import select_best_features
+        from wesad_framework.models.base_model import train_base_model
+
+        features_df = self.wesad_features
+        feature_cols = [col for col in features_df.columns
+                        if col not in ['subject_id', 'segment_id', 'timestamp', 'label']]
+        global_scaler = StandardScaler().fit(features_df[feature_cols].values)
+        feature_names = select_best_features(features_df, global_scaler, n_features=20)
+        train_data_dict, _, combined_train, _ = prepare_train_test_data(features_df, test_ratio=0.3)
+        base_model, scaler = train_base_model(combined_train, feature_names, 'neural_network', global_scaler)
+        return base_model, scaler, feature_names, train_data_dict
+
+    @cached_property
+    def ecg_windows(self):
+        """WESAD ECG windows at 4 Hz, as the cross-dataset loader passes them to extract_all_features."""
+        from scipy import signal
+        from cross_dataset.config import SEGMENT_SIZE
+        windows = []
+        segment_length = SEGMENT_SIZE * 700
+        for data in self.wesad_subjects.values():
+            ecg = data['signal']['chest']['ECG'].ravel()
+            for i in range(0, len(ecg) - segment_length, segment_length // 2):
+                windows.append(signal.resample(ecg[i:i + segment_length], SEGMENT_SIZE * 4))
+        return windows
+
+    @cached_property
+    def cross_data(self):
+        """Processed WESAD and K-EmoCon feature tables."""
+        from cross_dataset.config import SEGMENT_SIZE
+        from cross_dataset.data.wesad_loader import process_wesad_data, get_available_subjects
+        from cross_dataset.data.kemocon_loader import process_kemocon_data, get_available_participants
+        from cross_dataset.features.extraction import extract_all_features
+        from cross_dataset.features.mapping import DEFAULT_EMOTION_MAP
+        wesad = process_wesad_data(get_available_subjects(), extract_all_features, DEFAULT_EMOTION_MAP,
+                                   segment_size=SEGMENT_SIZE)
+        kemocon = process_kemocon_data(get_available_participants(), extract_all_features,
+                                       window_size=SEGMENT_SIZE)
+        return wesad, kemocon
+
+    @cached_property
+    def mapped(self):
+        """Mapped arousal feature arrays and binary targets of both datasets."""
+        from cross_dataset.features.mapping import map_features, create_mapped_dataframes, convert_to_binary_targets
+        wesad, kemocon = self.cross_data
+        wesad_features, kemocon_features = map_features(wesad, kemocon, use_mutual_info=True, target='arousal')
+        wesad_mapped, kemocon_mapped = create_mapped_dataframes(wesad, kemocon, wesad_features, kemocon_features)
+        wesad_y, kemocon_y = convert_to_binary_targets(wesad_mapped, kemocon_mapped, 'arousal')
+        return (wesad_mapped[wesad_features].values, np.asarray(wesad_y),
+                kemocon_mapped[kemocon_features].values, np.asarray(kemocon_y))
+
+    @cached_property
+    def scaled_domains(self):
+        """Robust-scaled source (WESAD) and target (K-EmoCon) features, as adapters see them in training."""
+        from sklearn.preprocessing import RobustScaler
+        wesad_X, _, kemocon_X, _ = self.mapped
+        scaler = RobustScaler().fit(wesad_X)
+        return scaler.transform(wesad_X), scaler.transform(kemocon_X)
+
+
+@benchmark('wesad.extract_features')
+def bench_wesad_extract_features(workload):
+    from wesad_framework.data.feature_extraction import extract_features
+    subjects = list(workload.wesad_subjects.values())
+    return (lambda: [extract_features(data) for data in subjects]), len(workload.wesad_features), 'segments'
+
+
+@benchmark('cross.extract_all_features')
+def bench_extract_all_features(workload):
+    from cross_dataset.features.extraction import extract_all_features
+    windows = workload.ecg_windows
+    return (lambda: [extract_all_features(window, sampling_rate=4) for window in windows]), len(windows), 'windows'
+
+
+@benchmark('cross.process_kemocon_data')
+def bench_process_kemocon_data(workload):
+    from cross_dataset.config import SEGMENT_SIZE
+    from cross_dataset.data.kemocon_loader import process_kemocon_data, get_available_participants
+    from cross_dataset.features.extraction import extract_all_features
+    participants = get_available_participants()
+    _, kemocon = workload.cross_data
+    return (lambda: process_kemocon_data(participants, extract_all_features, window_size=SEGMENT_SIZE),
+            len(kemocon), 'samples')
+
+
+def _adaptation_benchmark(method):
+    """Setup of a domain adapter fit + transform benchmark."""
+    def setup(workload):
+        from cross_dataset.models.training import ADAPTERS
+        source, target = workload.scaled_domains
+        return (lambda: ADAPTERS[method]().fit(source, target).transform(source)), len(source), 'samples'
+    return setup
+
+
+for _method in ['coral', 'subspace', 'ensemble']:
+    benchmark(f"cross.adapt_{_method}")(_adaptation_benchmark(_method))
+
+
+@benchmark('cross.train_bidirectional_models')
+def bench_train_bidirectional_models(workload):
+    from cross_dataset.models.training import train_bidirectional_models
+    wesad_X, wesad_y, kemocon_X, kemocon_y = workload.mapped
+    return (lambda: train_bidirectional_models(wesad_X, wesad_y, kemocon_X, kemocon_y, 'ensemble'),
+            len(wesad_X) + len(kemocon_X), 'samples')
+
+
+@benchmark('cross.find_optimal_threshold')
+def bench_find_optimal_threshold(workload):
+    from cross_dataset.models.evaluation import find_optimal_threshold
+    _, wesad_y, _, kemocon_y = workload.mapped
+    # Probabilities for every sample of both domains, correlated with the labels
+    y_true = np.concatenate([wesad_y, kemocon_y])
+    rng = np.random.default_rng(0)
+    y_prob = np.clip(0.5 * y_true + rng.uniform(0, 0.5, len(y_true)) + rng.normal(0, 0.1, len(y_true)), 0, 1)
+    return (lambda: find_optimal_threshold(y_true, y_prob)), len(y_true), 'samples'
+
+
+@benchmark('wesad.create_personal_model')
+def bench_create_personal_model(workload):
+    from wesad_framework.models.personal_model import create_personal_model
+    base_model, scaler, feature_names, train_data_dict = workload.personalization
+    subjects = [data for data in train_data_dict.values() if len(data) > 0]
+    return (lambda: [create_personal_model(data, base_model, feature_names, scaler) for data in subjects],
+            len(subjects), 'subjects')
+
+
+def run_framework_benchmarks(data_dir, repeats, memory=True, only=None):
+    """
+    Run the framework benchmarks on the synthetic datasets in data_dir.
+
+    Args:
+        data_dir (str): Directory written by benchmarks.synthetic.generate_datasets
+        repeats (int): Number of timed calls per benchmark
+        memory (bool): Whether to measure peak memory
+        only (list): Substrings of the benchmarks to run (None runs all)
+
+    Returns:
+        dict: Benchmark name -> measurement
+    """
+    os.environ['WESAD_PATH'] = os.path.join(data_dir, 'WESAD')
+    os.environ['KEMOCON_PATH'] = os.path.join(data_dir, 'K_EmoCon')
+
+    workload = Workload()
+    results = {}
+    for name, setup in BENCHMARKS.items():
+        if only and not any(pattern in name for pattern in only):
+            continue
+        func, items, unit = setup(workload)
+        results[name] = measure(func, items, unit, repeats, memory)
+        print(f"  {name:<36} {results[name]['seconds'] * 1000:>10.1f} ms "
+              f"{results[name]['throughput'] or 0:>12.1f} {unit}/s", file=sys.stderr)
+    return results
+
+
+def run_serving_benchmarks(repeats, memory=True, only=None):
+    """
+    Time every API endpoint through an in-process test client.
+
+    Timing starts once /ready reports the warmup as finished, and each
+    request is sent once before timing, so artifact loading is not measured.
+    The response status is recorded with each result; endpoints answering
+    with an error are expected failures and are not timed. API routes
+    missing from ENDPOINTS are listed.
+
+    Args:
+        repeats (int): Number of timed requests per endpoint
+        memory (bool): Whether to measure peak memory
+        only (list): Substrings of the endpoints to run (None runs all)
+
+    Returns:
+        dict: "METHOD path" -> measurement
+    """
+    from fastapi.testclient import TestClient
+    from starlette.routing import compile_path
+    from server.main import app
+
+    results = {}
+    with TestClient(app, raise_server_exceptions=False) as client:
+        deadline = time.monotonic() + READY_TIMEOUT
+        while client.get('/ready').status_code != 200:
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"API warmup did not finish within {READY_TIMEOUT} s")
+            time.sleep(0.1)
+
+        for method, path, body in ENDPOINTS:
+            name = f"{method} {path}"
+            if only and not any(pattern in name for pattern in only):
+                continue
+            status = client.request(method, path, json=body).status_code
+            if not 200 <= status < 300:
+                results[name] = {'status': status, 'expected_failure': True}
+                print(f"  {name:<72} {status} (not timed)", file=sys.stderr)
+                continue
+            results[name] = measure(lambda: client.request(method, path, json=body), 1, 'requests',
+                                    repeats, memory)
+            results[name]['status'] = status
+            print(f"  {name:<72} {status} {results[name]['seconds'] * 1000:>8.2f} ms", file=sys.stderr)
+
+    for methods, path in api_routes(app.routes):
+        path_regex = compile_path(path)[0]
+        if not any(method in methods and path_regex.match(endpoint) for method, endpoint, _ in ENDPOINTS):
+            print(f"  Not benchmarked: {'/'.join(sorted(methods))} {path}", file=sys.stderr)
+    return results
+
+
+def api_routes(routes, prefix=''):
+    """Yield the methods and full path of every GET/POST route, including those of mounted apps."""
+    from starlette.routing import Mount
+    for route in routes:
+        if isinstance(route, Mount):
+            yield from api_routes(route.routes, prefix + route.path)
+            continue
+        methods = (getattr(route, 'methods', None) or set()) & {'GET', 'POST'}
+        if methods and getattr(route, 'include_in_schema', True):
+            yield methods, prefix + route.path
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Find benchmarks that got slower or use more memory than in the baseline.
+
+    An endpoint whose response status differs from the baseline is a
+    regression too, so a fast error response does not count as a speed-up.
+
+    Args:
+        results (dict): Group -> benchmark name -> measurement
+        baseline (dict): Results of a previous run in the same format
+        threshold (float): Allowed relative increase (0.25 allows 25% slower)
+
+    Returns:
+        list: One dict per regression (group, name, metric, baseline, current, ratio;
+            ratio is None for status changes)
+    """
+    regressions = []
+    for group, benchmarks in results.items():
+        for name, current in benchmarks.items():
+            previous = baseline.get(group, {}).get(name)
+            if previous is None:
+                continue
+            if current.get('status') != previous.get('status'):
+                regressions.append({
+                    'group': group,
+                    'name': name,
+                    'metric': 'status',
+                    'baseline': previous.get('status'),
+                    'current': current.get('status'),
+                    'ratio': None
+                })
+                continue
+            for metric, min_delta in [('seconds', MIN_DELTA_SECONDS), ('peak_memory_mb', MIN_DELTA_MB)]:
+                if metric not in current or metric not in previous or previous[metric] <= 0:
+                    continue
+                ratio = current[metric] / previous[metric]
+                if ratio > 1 + threshold and current[metric] - previous[metric] > min_delta:
+                    regressions.append({
+                        'group': group,
+                        'name': name,
+                        'metric': metric,
+                        'baseline': previous[metric],
+                        'current': current[metric],
+                        'ratio': round(ratio, 3)
+                    })
+    return regressions
+
+
+def run_group(group, args):
+    """Run one group of benchmarks in a subprocess and return its results."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        results_file = os.path.join(tmp_dir, 'results.json')
+        command = [sys.executable, '-m', 'benchmarks.suite', '--run-group', group,
+                   '--data-dir', args.data_dir, '--repeats', str(args.repeats), '--results-file', results_file]
+        if args.no_memory:
+            command.append('--no-memory')
+        if args.only:
+            command += ['--only'] + args.only
+        env = dict(os.environ, NEUROFEEL_LOG_LEVEL=os.environ.get('NEUROFEEL_LOG_LEVEL', 'ERROR'))
+        subprocess.run(command, check=True, env=env)
+        with open(results_file) as f:
+            return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='End-to-end benchmark suite with regression tracking')
+    parser.add_argument('--scales', type=float, nargs='+', default=[1.0],
+                        help='Synthetic dataset scales (multipliers of the recording durations)')
+    parser.add_argument('--subjects', type=int, default=3)
+    parser.add_argument('--participants', type=int, default=3)
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--data-dir', type=str, default=None,
+                        help='Directory for the synthetic datasets (reused if already generated)')
+    parser.add_argument('--output', type=str, default='benchmark_results.json')
+    parser.add_argument('--baseline', type=str, default=DEFAULT_BASELINE)
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='Allowed relative slowdown or memory increase before failing')
+    parser.add_argument('--update-baseline', action='store_true', help='Save the results as the new baseline')
+    parser.add_argument('--only', type=str, nargs='+', help='Only run benchmarks containing these substrings')
+    parser.add_argument('--no-memory', action='store_true', help='Skip the peak memory measurements')
+    parser.add_argument('--no-serving', action='store_true', help='Skip the API endpoint benchmarks')
+    parser.add_argument('--run-group', type=str, help=argparse.SUPPRESS)
+    parser.add_argument('--results-file', type=str, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_group:
+        # Worker process: run one group and write its results
+        warnings.simplefilter('ignore')
+        from wesad_framework.utils.log import configure_logging
+        configure_logging(os.environ.get('NEUROFEEL_LOG_LEVEL', 'ERROR'), 'text', stream=sys.stderr)
+        if args.run_group == SERVING_GROUP:
+            results = run_serving_benchmarks(args.repeats, not args.no_memory, args.only)
+        else:
+            results = run_framework_benchmarks(args.data_dir, args.repeats, not args.no_memory, args.only)
+        with open(args.results_file, 'w') as f:
+            json.dump(results, f)
+        return
+
+    data_root = args.data_dir or os.path.join(tempfile.gettempdir(), 'neurofeel_benchmark_data')
+    results = {}
+    for scale in args.scales:
+        group = f"scale_{scale:g}"
+        data_dir = os.path.join(data_root, f"{group}_{args.subjects}x{args.participants}")
+        if not os.path.isdir(data_dir):
+            print(f"Generating synthetic data at scale {scale:g} in {data_dir}", file=sys.stderr)
+            generate_datasets(data_dir, scale, args.subjects, args.participants)
+        print(f"Running framework benchmarks at scale {scale:g}", file=sys.stderr)
+        args.data_dir = data_dir
+        results[group] = run_group(group, args)
+
+    if not args.no_serving:
+        print("Running serving benchmarks", file=sys.stderr)
+        results[SERVING_GROUP] = run_group(SERVING_GROUP, args)
+
+    report = {
+        'created_at': datetime.now().isoformat(),
+        'python_version': platform.python_version(),
+        'platform': platform.platform(),
+        'repeats': args.repeats,
+        'results': results
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Results saved to {args.output}")
+
+    regressions = []
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f)['results'], args.threshold)
+        for regression in regressions:
+            ratio = f" ({regression['ratio']:.2f}x)" if regression['ratio'] is not None else ''
+            print(f"REGRESSION {regression['group']} {regression['name']} {regression['metric']}: "
+                  f"{regression['baseline']} -> {regression['current']}{ratio}")
+        print(f"{len(regressions)} regression(s) against {args.baseline} (threshold {args.threshold:.0%})")
+    else:
+        print(f"No baseline at {args.baseline}; run with --update-baseline to create one")
+
+    if args.update_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+    elif regressions:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,365 @@
+"""
+Generate synthetic WESAD- and K-EmoCon-shaped datasets.
+
+The files have the layout, names, columns and sampling rates the loaders of
+both frameworks read, so ingestion, feature extraction, training and serving
+can run without the licensed datasets. Signals depend on the emotional state
+(heart and respiration rate, EDA level, muscle activity, temperature), so the
+models have something to learn; the values are not physiologically faithful.
+
+Dataset size is set by the number of subjects/participants and the recording
+duration. The loaders only look for the original subject IDs (WESAD S2-S17,
+K-EmoCon 1-16), so --scale multiplies the recording durations; 1x is three
+subjects with two minutes per condition and three ten-minute debates.
+
+Usage:
+    python -m benchmarks.synthetic --output-dir /tmp/neurofeel_data --scale 10
+    export WESAD_PATH=/tmp/neurofeel_data/WESAD KEMOCON_PATH=/tmp/neurofeel_data/K_EmoCon
+"""
+
+import argparse
+import os
+import pickle
+
+import numpy as np
+import pandas as pd
+
+
+WESAD_SUBJECTS = [2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 13, 14, 15, 16, 17]
+KEMOCON_PARTICIPANTS = list(range(1, 17))
+
+CHEST_RATE = 700
+WRIST_RATES = {'ACC': 32, 'BVP': 64, 'EDA': 4, 'TEMP': 4}
+E4_RATES = {'HR': 1, 'EDA': 4, 'BVP': 64, 'TEMP': 4}
+
+# Signal levels of each WESAD condition (0 is the transient state between conditions)
+CONDITIONS = {
+    0: {'heart_rate': 74, 'resp_rate': 0.27, 'eda': 2.5, 'emg': 0.025, 'temp': 34.1},
+    1: {'heart_rate': 70, 'resp_rate': 0.25, 'eda': 2.0, 'emg': 0.020, 'temp': 34.0},  # baseline
+    2: {'heart_rate': 95, 'resp_rate': 0.35, 'eda': 6.0, 'emg': 0.060, 'temp': 34.6},  # stress
+    3: {'heart_rate': 80, 'resp_rate': 0.30, 'eda': 3.5, 'emg': 0.035, 'temp': 34.2},  # amusement
+    4: {'heart_rate': 62, 'resp_rate': 0.15, 'eda': 1.5, 'emg': 0.015, 'temp': 33.8}   # meditation
+}
+
+ANNOTATION_INTERVAL = 5  # K-EmoCon self-annotation interval in seconds
+KEMOCON_EPOCH_MS = 1543470000000
+
+
+def moving_average(x, window):
+    """Centered moving average computed with a cumulative sum."""
+    window = max(int(window), 1)
+    padded = np.concatenate([np.full(window // 2, x[0]), x, np.full(window - window // 2 - 1, x[-1])])
+    cumsum = np.concatenate([[0.0], np.cumsum(padded)])
+    return (cumsum[window:] - cumsum[:-window]) / window
+
+
+def heartbeat(phase):
+    """ECG-like waveform (P wave, QRS complex, T wave) of a cardiac phase in cycles."""
+    frac = phase % 1.0
+    return (0.15 * np.exp(-0.5 * ((frac - 0.30) / 0.040) ** 2)
+            + 1.20 * np.exp(-0.5 * ((frac - 0.50) / 0.012) ** 2)
+            - 0.20 * np.exp(-0.5 * ((frac - 0.53) / 0.010) ** 2)
+            + 0.30 * np.exp(-0.5 * ((frac - 0.75) / 0.050) ** 2))
+
+
+def wesad_labels(condition_seconds, rng, gap_seconds=None):
+    """
+    Label array of a WESAD protocol: four condition runs separated by transient (0) gaps.
+
+    Stress and amusement are presented in random order, as in the two protocol versions.
+
+    Args:
+        condition_seconds (float): Duration of each condition
+        rng (np.random.Generator): Random generator
+        gap_seconds (float): Duration of each gap (defaults to a tenth of a condition)
+
+    Returns:
+        np.ndarray: Label per chest sample (int32)
+    """
+    gap_seconds = condition_seconds / 10 if gap_seconds is None else gap_seconds
+    order = [1] + list(rng.permutation([2, 3])) + [4]
+    runs = []
+    for label in order:
+        runs.append(np.zeros(int(gap_seconds * CHEST_RATE), dtype=np.int32))
+        runs.append(np.full(int(condition_seconds * CHEST_RATE), label, dtype=np.int32))
+    runs.append(np.zeros(int(gap_seconds * CHEST_RATE), dtype=np.int32))
+    return np.concatenate(runs)
+
+
+def generate_wesad_subject(subject_id, condition_seconds=120, noise=1.0, seed=0):
+    """
+    Generate one subject in the layout of the WESAD S{id}.pkl files.
+
+    Args:
+        subject_id (int): Subject ID
+        condition_seconds (float): Duration of each condition
+        noise (float): Scale of the additive noise (0 for clean signals)
+        seed (int): Random seed
+
+    Returns:
+        dict: 'signal' ({'chest': ..., 'wrist': ...}), 'label' and 'subject'
+    """
+    rng = np.random.default_rng([seed, subject_id])
+    labels = wesad_labels(condition_seconds, rng)
+    n = len(labels)
+
+    def level(key, smoothing_seconds):
+        """Per-sample level of a condition parameter, with smooth transitions and a subject offset."""
+        values = np.array([CONDITIONS[label][key] for label in range(5)])[labels]
+        values = values * rng.uniform(0.9, 1.1)
+        return moving_average(values, smoothing_seconds * CHEST_RATE)
+
+    def gaussian(scale, size=n):
+        return rng.normal(scale=scale * noise, size=size) if noise else np.zeros(size)
+
+    # Heart rate with slow variability; ECG is a heartbeat template driven by the cardiac phase
+    heart_rate = level('heart_rate', 5) + moving_average(gaussian(20.0), 2 * CHEST_RATE)
+    cardiac_phase = np.cumsum(heart_rate / 60.0) / CHEST_RATE
+    wander = 0.1 * np.sin(2 * np.pi * 0.05 * np.arange(n) / CHEST_RATE + rng.uniform(0, 2 * np.pi))
+    ecg = heartbeat(cardiac_phase) + wander + gaussian(0.03)
+
+    resp_phase = np.cumsum(level('resp_rate', 5)) / CHEST_RATE
+    resp = 3.0 * np.sin(2 * np.pi * resp_phase) + gaussian(0.2)
+
+    emg = level('emg', 1) * rng.standard_normal(n) + gaussian(0.005)
+    eda = level('eda', 20) + np.cumsum(gaussian(0.0005)) + gaussian(0.01)
+    temp = level('temp', 60) + gaussian(0.01)
+    chest_acc = np.array([0.9, -0.05, -0.3]) + np.column_stack([gaussian(0.01) for _ in range(3)])
+
+    def wrist(rate):
+        """Chest sample index of each wrist sample at a sampling rate."""
+        return (np.arange(int(n * rate / CHEST_RATE)) * CHEST_RATE // rate).astype(np.int64)
+
+    acc_idx, bvp_idx, eda_idx = wrist(WRIST_RATES['ACC']), wrist(WRIST_RATES['BVP']), wrist(WRIST_RATES['EDA'])
+    wrist_acc = 64 * chest_acc[acc_idx] + np.column_stack([gaussian(2.0, len(acc_idx)) for _ in range(3)])
+    bvp = 50 * np.sin(2 * np.pi * cardiac_phase[bvp_idx]) + gaussian(5.0, len(bvp_idx))
+    wrist_eda = 0.3 * eda[eda_idx] + gaussian(0.005, len(eda_idx))
+    wrist_temp = temp[eda_idx] - 2.0 + gaussian(0.02, len(eda_idx))
+
+    def column(x):
+        return np.asarray(x, dtype=np.float64).reshape(len(x), -1)
+
+    return {
+        'signal': {
+            'chest': {
+                'ACC': column(chest_acc),
+                'ECG': column(ecg),
+                'EMG': column(emg),
+                'EDA': column(eda),
+                'Temp': column(temp),
+                'Resp': column(resp)
+            },
+            'wrist': {
+                'ACC': column(wrist_acc),
+                'BVP': column(bvp),
+                'EDA': column(wrist_eda),
+                'TEMP': column(wrist_temp)
+            }
+        },
+        'label': labels,
+        'subject': f"S{subject_id}"
+    }
+
+
+def write_wesad(output_dir, n_subjects=3, condition_seconds=120, noise=1.0, seed=0):
+    """
+    Write a synthetic WESAD dataset (output_dir/S{id}/S{id}.pkl).
+
+    Args:
+        output_dir (str): Dataset root, used as WESAD_PATH
+        n_subjects (int): Number of subjects (at most 15)
+        condition_seconds (float): Duration of each condition per subject
+        noise (float): Scale of the additive noise
+        seed (int): Random seed
+
+    Returns:
+        list: Written subject IDs
+    """
+    if not 1 <= n_subjects <= len(WESAD_SUBJECTS):
+        raise ValueError(f"n_subjects must be between 1 and {len(WESAD_SUBJECTS)}")
+
+    subject_ids = WESAD_SUBJECTS[:n_subjects]
+    for subject_id in subject_ids:
+        subject_dir = os.path.join(output_dir, f"S{subject_id}")
+        os.makedirs(subject_dir, exist_ok=True)
+        data = generate_wesad_subject(subject_id, condition_seconds, noise, seed)
+        with open(os.path.join(subject_dir, f"S{subject_id}.pkl"), 'wb') as f:
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+    return subject_ids
+
+
+def kemocon_annotations(debate_seconds, rng):
+    """
+    Self-annotations every five seconds, with slowly changing arousal and valence (1-5).
+
+    Args:
+        debate_seconds (float): Duration of the debate
+        rng (np.random.Generator): Random generator
+
+    Returns:
+        pd.DataFrame: Annotations in the column layout of P{pid}.self.csv
+    """
+    seconds = np.arange(ANNOTATION_INTERVAL, int(debate_seconds) + 1, ANNOTATION_INTERVAL)
+
+    def rating(low, high):
+        latent = moving_average(rng.normal(size=len(seconds)), 6)
+        latent = (latent - latent.mean()) / (latent.std() or 1.0)
+        return np.clip(np.round((low + high) / 2 + latent * (high - low) / 3), low, high).astype(int)
+
+    return pd.DataFrame({
+        'seconds': seconds,
+        'arousal': rating(1, 5),
+        'valence': rating(1, 5),
+        'cheerful': rating(1, 4),
+        'happy': rating(1, 4),
+        'angry': rating(1, 4),
+        'nervous': rating(1, 4),
+        'sad': rating(1, 4)
+    })
+
+
+def generate_kemocon_participant(pid, debate_seconds=600, noise=1.0, seed=0):
+    """
+    Generate one K-EmoCon participant.
+
+    Args:
+        pid (int): Participant ID
+        debate_seconds (float): Duration of the debate
+        noise (float): Scale of the additive noise
+        seed (int): Random seed
+
+    Returns:
+        tuple: (metadata dict, annotations DataFrame, dict of E4 signal DataFrames)
+    """
+    rng = np.random.default_rng([seed, 1000 + pid])
+    annotations = kemocon_annotations(debate_seconds, rng)
+
+    start_ms = KEMOCON_EPOCH_MS + pid * 3600 * 1000
+    end_ms = start_ms + int(debate_seconds * 1000)
+    # The wristband records from a minute before to a minute after the debate
+    init_ms = start_ms - 60 * 1000
+    stop_ms = end_ms + 60 * 1000
+    metadata = {'pid': pid, 'initTime': init_ms, 'startTime': start_ms, 'endTime': end_ms}
+
+    # Arousal and valence of the nearest annotation, as a function of time in ms
+    anno_ms = start_ms + (annotations['seconds'].values - annotations['seconds'].min()) / max(
+        np.ptp(annotations['seconds'].values), 1) * (end_ms - start_ms)
+
+    def state(key, timestamps):
+        return np.interp(timestamps, anno_ms, annotations[key].values.astype(float)) - 3.0
+
+    def gaussian(scale, size):
+        return rng.normal(scale=scale * noise, size=size) if noise else np.zeros(size)
+
+    signals = {}
+    for signal_type, rate in E4_RATES.items():
+        timestamps = init_ms + (np.arange((stop_ms - init_ms) * rate // 1000) * 1000 / rate).astype(np.int64)
+        arousal, valence = state('arousal', timestamps), state('valence', timestamps)
+        if signal_type == 'HR':
+            values = 72 + 6 * arousal + gaussian(2.0, len(timestamps))
+        elif signal_type == 'EDA':
+            values = moving_average(1.0 + 0.4 * arousal, 8 * rate) + gaussian(0.02, len(timestamps))
+        elif signal_type == 'TEMP':
+            values = 33.0 + 0.1 * valence - 0.05 * arousal + gaussian(0.02, len(timestamps))
+        else:
+            heart_rate = 72 + 6 * arousal
+            phase = np.cumsum(heart_rate / 60.0) / rate
+            values = (40 + 5 * valence) * np.sin(2 * np.pi * phase) + gaussian(5.0, len(timestamps))
+        signals[signal_type] = pd.DataFrame({
+            'timestamp': timestamps,
+            'value': np.round(values, 4),
+            'device_serial': f"A0{pid:04d}"
+        })
+
+    return metadata, annotations, signals
+
+
+def write_kemocon(output_dir, n_participants=3, debate_seconds=600, noise=1.0, seed=0):
+    """
+    Write a synthetic K-EmoCon dataset.
+
+    Creates metadata/subjects.csv, emotion_annotations/self_annotations/P{pid}.self.csv
+    and e4_data/{pid}/E4_{HR,EDA,BVP,TEMP}.csv under output_dir.
+
+    Args:
+        output_dir (str): Dataset root, used as KEMOCON_PATH
+        n_participants (int): Number of participants (at most 16)
+        debate_seconds (float): Duration of each debate
+        noise (float): Scale of the additive noise
+        seed (int): Random seed
+
+    Returns:
+        list: Written participant IDs
+    """
+    if not 1 <= n_participants <= len(KEMOCON_PARTICIPANTS):
+        raise ValueError(f"n_participants must be between 1 and {len(KEMOCON_PARTICIPANTS)}")
+
+    anno_dir = os.path.join(output_dir, 'emotion_annotations', 'self_annotations')
+    os.makedirs(anno_dir, exist_ok=True)
+    os.makedirs(os.path.join(output_dir, 'metadata'), exist_ok=True)
+
+    pids = KEMOCON_PARTICIPANTS[:n_participants]
+    subjects = []
+    for pid in pids:
+        metadata, annotations, signals = generate_kemocon_participant(pid, debate_seconds, noise, seed)
+        subjects.append(metadata)
+        annotations.to_csv(os.path.join(anno_dir, f"P{pid}.self.csv"), index=False)
+
+        e4_dir = os.path.join(output_dir, 'e4_data', str(pid))
+        os.makedirs(e4_dir, exist_ok=True)
+        for signal_type, frame in signals.items():
+            frame.to_csv(os.path.join(e4_dir, f"E4_{signal_type}.csv"), index=False)
+
+    pd.DataFrame(subjects).to_csv(os.path.join(output_dir, 'metadata', 'subjects.csv'), index=False)
+    return pids
+
+
+def generate_datasets(output_dir, scale=1.0, n_subjects=3, n_participants=3,
+                      condition_seconds=120, debate_seconds=600, noise=1.0, seed=0):
+    """
+    Write both synthetic datasets under output_dir.
+
+    Args:
+        output_dir (str): Root directory (datasets go to WESAD/ and K_EmoCon/)
+        scale (float): Multiplier of the recording durations
+        n_subjects (int): Number of WESAD subjects
+        n_participants (int): Number of K-EmoCon participants
+        condition_seconds (float): Duration of each WESAD condition at scale 1
+        debate_seconds (float): Duration of each K-EmoCon debate at scale 1
+        noise (float): Scale of the additive noise
+        seed (int): Random seed
+
+    Returns:
+        dict: Paths to use as WESAD_PATH and KEMOCON_PATH
+    """
+    paths = {
+        'WESAD_PATH': os.path.join(output_dir, 'WESAD'),
+        'KEMOCON_PATH': os.path.join(output_dir, 'K_EmoCon')
+    }
+    write_wesad(paths['WESAD_PATH'], n_subjects, condition_seconds * scale, noise, seed)
+    write_kemocon(paths['KEMOCON_PATH'], n_participants, debate_seconds * scale, noise, seed)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Synthetic WESAD and K-EmoCon dataset generator')
+    parser.add_argument('--output-dir', type=str, required=True)
+    parser.add_argument('--scale', type=float, default=1.0, help='Multiplier of the recording durations')
+    parser.add_argument('--subjects', type=int, default=3, help='Number of WESAD subjects (1-15)')
+    parser.add_argument('--participants', type=int, default=3, help='Number of K-EmoCon participants (1-16)')
+    parser.add_argument('--condition-seconds', type=float, default=120,
+                        help='Duration of each WESAD condition at scale 1')
+    parser.add_argument('--debate-seconds', type=float, default=600,
+                        help='Duration of each K-EmoCon debate at scale 1')
+    parser.add_argument('--noise', type=float, default=1.0, help='Scale of the additive noise')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    paths = generate_datasets(args.output_dir, args.scale, args.subjects, args.participants,
+                              args.condition_seconds, args.debate_seconds, args.noise, args.seed)
+    for name, path in paths.items():
+        print(f"export {name}={os.path.abspath(path)}")
+
+
+if __name__ == '__main__':
+    main()
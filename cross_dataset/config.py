@@ -23,6 +23,12 @@ SUBSPACE_MIN_COMPONENTS = 2  # Minimum number of components for subspace alignme
 CORAL_REG_PARAM = 0.1  # Regularization parameter for CORAL transformation
 ENSEMBLE_WEIGHTS = [0.4, 0.4, 0.2]  # Weights for subspace, CORAL, and simple scaling
 
+# Domain gap metric parameters
+DOMAIN_GAP_MAX_SAMPLES = 2000  # Samples per domain used for gap metrics (None uses all)
+MMD_RFF_FEATURES = 256  # Random Fourier features for the linear-time MMD
+SW_PROJECTIONS = 64  # Random projections for the sliced Wasserstein distance
+SIMULATION_SAMPLES = 500  # Samples per domain stored for interactive adaptation simulation
+
 # Model parameters
 CLASS_BALANCE_THRESHOLD = 0.7  # Apply balancing if minority/majority ratio is below this
 CLASS_BALANCE_METHOD = 'SMOTE'  # Default resampling method ('SMOTE', 'ADASYN', 'SMOTEENN')
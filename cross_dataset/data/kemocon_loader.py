@@ -2,11 +2,15 @@
 K-EmoCon dataset loading and preprocessing functions.
 """
 
+import logging
 import os
 import pandas as pd
 import numpy as np
 
 from ..config import KEMOCON_PATH, SEGMENT_SIZE
+from wesad_framework.utils.profiling import profile_stage
+
+logger = logging.getLogger(__name__)
 
 
 def load_metadata(participant_id):
@@ -21,7 +25,7 @@ def load_metadata(participant_id):
     """
     file_path = os.path.join(KEMOCON_PATH, "metadata", "subjects.csv")
     if not os.path.exists(file_path):
-        print(f"Metadata file not found: {file_path}")
+        logger.warning("Metadata file not found: %s", file_path)
         return None
     
     try:
@@ -29,12 +33,12 @@ def load_metadata(participant_id):
         participant_data = subjects[subjects['pid'] == int(participant_id)]
         
         if len(participant_data) == 0:
-            print(f"No metadata for participant {participant_id}")
+            logger.warning("No metadata for participant %s", participant_id)
             return None
         
         return participant_data.iloc[0]
     except Exception as e:
-        print(f"Error loading metadata: {e}")
+        logger.warning("Error loading metadata: %s", e)
         return None
 
 
@@ -52,13 +56,13 @@ def load_annotations(participant_id):
                            "self_annotations", f"P{participant_id}.self.csv")
     
     if not os.path.exists(anno_path):
-        print(f"No annotations found for participant {participant_id}")
+        logger.warning("No annotations found for participant %s", participant_id)
         return None
     
     try:
         return pd.read_csv(anno_path)
     except Exception as e:
-        print(f"Error loading annotations: {e}")
+        logger.warning("Error loading annotations: %s", e)
         return None
 
 
@@ -81,9 +85,9 @@ def load_physiological_data(participant_id):
         if os.path.exists(file_path):
             try:
                 signals[signal_type] = pd.read_csv(file_path)
-                print(f"  Loaded {len(signals[signal_type])} {signal_type} readings")
+                logger.debug("Loaded %s %s readings", len(signals[signal_type]), signal_type)
             except Exception as e:
-                print(f"  Error loading {signal_type} data: {e}")
+                logger.warning("Error loading %s data: %s", signal_type, e)
     
     return signals
 
@@ -127,7 +131,7 @@ def process_kemocon_data(participant_ids, extract_features_func, window_size=SEG
     all_samples = []
     
     for pid in participant_ids:
-        print(f"Processing K-EmoCon participant {pid}...")
+        logger.info("Processing K-EmoCon participant %s...", pid)
         
         # Load metadata for timestamp mapping
         metadata = load_metadata(pid)
@@ -140,9 +144,10 @@ def process_kemocon_data(participant_ids, extract_features_func, window_size=SEG
             continue
         
         # Load physiological data
-        signals = load_physiological_data(pid)
+        with profile_stage('load', participant=pid):
+            signals = load_physiological_data(pid)
         if not signals:
-            print(f"No physiological data for participant {pid}")
+            logger.warning("No physiological data for participant %s", pid)
             continue
         
         # Create timestamp mapping function
@@ -194,7 +199,7 @@ def process_kemocon_data(participant_ids, extract_features_func, window_size=SEG
     
     # Convert to DataFrame
     if not all_samples:
-        print("No K-EmoCon samples extracted")
+        logger.warning("No K-EmoCon samples extracted")
         return None
     
     df = pd.DataFrame(all_samples)
@@ -204,8 +209,8 @@ def process_kemocon_data(participant_ids, extract_features_func, window_size=SEG
     df_clean = df.dropna()
     
     feature_count = len(df_clean.columns) - 4  # Subtract id, dataset, arousal, valence
-    print(f"Extracted {len(df)} K-EmoCon samples, {len(df_clean)} after removing NaN values")
-    print(f"Features extracted: {feature_count}")
+    logger.info("Extracted %s K-EmoCon samples, %s after removing NaN values", len(df), len(df_clean))
+    logger.info("Features extracted: %s", feature_count)
     
     return df_clean
 
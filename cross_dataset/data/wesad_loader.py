@@ -2,6 +2,7 @@
 WESAD dataset loading and preprocessing functions.
 """
 
+import logging
 import os
 import pickle
 import numpy as np
@@ -9,6 +10,9 @@ import pandas as pd
 from scipy import signal
 
 from ..config import WESAD_PATH, SEGMENT_SIZE
+from wesad_framework.utils.profiling import profile_stage
+
+logger = logging.getLogger(__name__)
 
 
 def load_subject_data(subject_id):
@@ -23,16 +27,16 @@ def load_subject_data(subject_id):
     """
     file_path = os.path.join(WESAD_PATH, f'S{subject_id}', f'S{subject_id}.pkl')
     if not os.path.exists(file_path):
-        print(f"Data for subject S{subject_id} not found")
+        logger.warning("Data for subject S%s not found", subject_id)
         return None
     
     try:
         with open(file_path, 'rb') as f:
             data = pickle.load(f, encoding='latin1')
-        print(f"Loaded WESAD subject S{subject_id}")
+        logger.debug("Loaded WESAD subject S%s", subject_id)
         return data
     except Exception as e:
-        print(f"Error loading subject S{subject_id}: {e}")
+        logger.warning("Error loading subject S%s: %s", subject_id, e)
         return None
 
 
@@ -52,11 +56,12 @@ def process_wesad_data(subject_ids, extract_features_func, emotion_map, segment_
     all_samples = []
     
     for subject_id in subject_ids:
-        subject_data = load_subject_data(subject_id)
+        with profile_stage('load', subject=subject_id):
+            subject_data = load_subject_data(subject_id)
         if subject_data is None:
             continue
         
-        print(f"Processing WESAD subject S{subject_id}...")
+        logger.info("Processing WESAD subject S%s...", subject_id)
         
         # Extract data
         labels = subject_data['label']
@@ -87,7 +92,7 @@ def process_wesad_data(subject_ids, extract_features_func, emotion_map, segment_
                 # Process signals with error handling
                 try:
                     # Extract and downsample ECG
-                    ecg = chest_signals['ECG'][i:i+segment_length]
+                    ecg = chest_signals['ECG'][i:i+segment_length].ravel()
                     ecg_downsampled = signal.resample(ecg, int(len(ecg) * 4 / sampling_rate))
                     
                     # Extract features
@@ -107,18 +112,18 @@ def process_wesad_data(subject_ids, extract_features_func, emotion_map, segment_
                     # Additional signals can be processed here (EMG, EDA, etc.)
                     
                 except Exception as e:
-                    print(f"Error processing signals: {e}")
+                    logger.warning("Error processing signals: %s", e, extra={'sample_every': 100})
                 
                 # Only add samples with sufficient features
                 if len(features) > 5:  # More than just metadata fields
                     all_samples.append(features)
         
         # Progress report
-        print(f"  Added {len(all_samples)} segments from subject {subject_id}")
+        logger.info("Added %s segments from subject %s", len(all_samples), subject_id)
     
     # Convert to DataFrame
     if not all_samples:
-        print("No WESAD samples extracted")
+        logger.warning("No WESAD samples extracted")
         return None
     
     df = pd.DataFrame(all_samples)
@@ -134,11 +139,11 @@ def process_wesad_data(subject_ids, extract_features_func, emotion_map, segment_
                 median_val = df[col].median()
                 df[col] = df[col].fillna(median_val)
             except TypeError:
-                print(f"Warning: Column {col} contains non-numeric values, using mode instead")
+                logger.warning("Column %s contains non-numeric values, using mode instead", col)
                 mode_val = df[col].mode().iloc[0] if not df[col].mode().empty else 0
                 df[col] = df[col].fillna(mode_val)
     
-    print(f"Extracted {len(df)} WESAD samples with {len(df.columns)-5} features")
+    logger.info("Extracted %s WESAD samples with %s features", len(df), len(df.columns)-5)
     return df
 
 
@@ -2,12 +2,17 @@
 Domain adaptation modules.
 """
 
-from .coral import coral_transform, calculate_domain_discrepancy
-from .subspace import subspace_alignment, calculate_subspace_error
-from .ensemble import ensemble_domain_adaptation, measure_domain_gap
+from .base import AffineAdapter
+from .streaming import FeatureMoments
+from .coral import CoralAdapter, coral_transform, fit_coral_batch, calculate_domain_discrepancy
+from .subspace import SubspaceAdapter, subspace_alignment, calculate_subspace_error
+from .metrics import mmd_rff, coral_distance, sliced_wasserstein, domain_gap_metrics
+from .ensemble import EnsembleAdapter, ensemble_domain_adaptation, measure_domain_gap
 
 __all__ = [
-    'coral_transform', 'calculate_domain_discrepancy',
+    'AffineAdapter', 'FeatureMoments', 'CoralAdapter', 'SubspaceAdapter', 'EnsembleAdapter',
+    'coral_transform', 'fit_coral_batch', 'calculate_domain_discrepancy',
     'subspace_alignment', 'calculate_subspace_error',
+    'mmd_rff', 'coral_distance', 'sliced_wasserstein', 'domain_gap_metrics',
     'ensemble_domain_adaptation', 'measure_domain_gap'
 ]
\ No newline at end of file
@@ -0,0 +1,71 @@
+"""
+Base class for fitted domain adapters.
+"""
+
+import numpy as np
+from sklearn.base import BaseEstimator, TransformerMixin
+
+from .streaming import FeatureMoments
+
+
+class AffineAdapter(BaseEstimator, TransformerMixin):
+    """
+    Domain adapter whose fitted transformation is an affine map.
+
+    Subclasses implement fit(source, target) and set ``matrix_`` and
+    ``offset_`` so that transform(X) = X @ matrix_ + offset_. Once fitted,
+    adapting new samples is a single matrix multiply. Subclasses that can be
+    fitted from summary statistics also implement fit_moments, which makes
+    fit_batches available for data that does not fit in memory.
+    """
+
+    def fit_moments(self, source_moments, target_moments):
+        """
+        Fit the adaptation from accumulated feature statistics.
+
+        Args:
+            source_moments (FeatureMoments): Source domain statistics
+            target_moments (FeatureMoments): Target domain statistics
+
+        Returns:
+            AffineAdapter: Fitted adapter
+        """
+        raise NotImplementedError(f"{type(self).__name__} cannot be fitted from feature statistics")
+
+    def fit_batches(self, source_batches, target_batches):
+        """
+        Fit the adaptation in a single pass over batches of features.
+
+        Args:
+            source_batches (iterable): Source feature matrices, e.g. a generator over recordings
+            target_batches (iterable): Target feature matrices
+
+        Returns:
+            AffineAdapter: Fitted adapter
+        """
+        return self.fit_moments(
+            FeatureMoments.from_batches(source_batches),
+            FeatureMoments.from_batches(target_batches)
+        )
+
+    def _set_affine(self, matrix, offset):
+        """Store the fitted affine map."""
+        self.matrix_ = np.asarray(matrix)
+        self.offset_ = np.asarray(offset)
+        return self
+
+    def _set_identity(self, n_features):
+        """Store the identity map (used when adaptation fails)."""
+        return self._set_affine(np.eye(n_features), np.zeros(n_features))
+
+    def transform(self, X):
+        """
+        Apply the fitted adaptation.
+
+        Args:
+            X (np.ndarray): Source domain features
+
+        Returns:
+            np.ndarray: Adapted features
+        """
+        return np.asarray(X) @ self.matrix_ + self.offset_
@@ -2,9 +2,178 @@
 CORAL (CORrelation ALignment) domain adaptation method.
 """
 
+import logging
 import numpy as np
-import scipy
 from cross_dataset.config import CORAL_REG_PARAM
+from .base import AffineAdapter
+
+logger = logging.getLogger(__name__)
+
+
+def _regularized_covariance(features, reg_param, dtype):
+    """
+    Compute the mean and regularized covariance of a feature matrix.
+    
+    Args:
+        features (np.ndarray): Feature matrix (n_samples, n_features)
+        reg_param (float): Regularization added to the diagonal
+        dtype: Floating point type for the computation
+    
+    Returns:
+        tuple: (mean, covariance)
+    """
+    features = np.asarray(features, dtype=dtype)
+    mean = features.mean(axis=0)
+    centered = features - mean
+    cov = centered.T @ centered / (len(features) - 1)
+    cov[np.diag_indices_from(cov)] += reg_param
+    return mean, cov
+
+
+def _symmetric_power(cov, power):
+    """
+    Raise symmetric positive definite matrices to a power via eigendecomposition.
+    
+    Works on a single (d, d) matrix or a stack of shape (..., d, d).
+    Eigenvalues are clipped at a small positive floor for numerical stability.
+    
+    Args:
+        cov (np.ndarray): Symmetric positive definite matrix or stack of matrices
+        power (float): Exponent (e.g. 0.5 for the square root, -0.5 for the inverse square root)
+    
+    Returns:
+        np.ndarray: Matrix power with the same shape as cov
+    """
+    eigvals, eigvecs = np.linalg.eigh(cov)
+    floor = np.finfo(cov.dtype).eps * eigvals.max(axis=-1, keepdims=True)
+    eigvals = np.maximum(eigvals, floor)
+    return (eigvecs * eigvals[..., np.newaxis, :] ** power) @ np.swapaxes(eigvecs, -1, -2)
+
+
+def _coral_matrix(source_cov, target_cov):
+    """
+    Compute the CORAL transformation from (stacks of) regularized covariances.
+    
+    The source whitening and target re-coloring matrices each come from one
+    symmetric eigendecomposition.
+    
+    Args:
+        source_cov (np.ndarray): Source covariance(s), shape (..., d, d)
+        target_cov (np.ndarray): Target covariance(s), shape (..., d, d)
+    
+    Returns:
+        np.ndarray: Transformation matrix(es), shape (..., d, d)
+    """
+    source_cov_inv_sqrt = _symmetric_power(source_cov, -0.5)
+    target_cov_sqrt = _symmetric_power(target_cov, 0.5)
+    return source_cov_inv_sqrt @ target_cov_sqrt @ source_cov_inv_sqrt
+
+
+class CoralAdapter(AffineAdapter):
+    """
+    CORAL adapter that re-colors source features with the target covariance.
+    
+    The fitted map whitens centered source features with the source
+    covariance, re-colors them with the target covariance and shifts them to
+    the target mean.
+    """
+    
+    def __init__(self, reg_param=CORAL_REG_PARAM, dtype=np.float64):
+        """
+        Initialize the adapter.
+        
+        Args:
+            reg_param (float): Regularization added to both covariance diagonals
+            dtype: Floating point type for fitting (np.float32 or np.float64)
+        """
+        self.reg_param = reg_param
+        self.dtype = dtype
+    
+    def fit(self, source_features, target_features):
+        """
+        Fit the CORAL transformation.
+        
+        Args:
+            source_features (np.ndarray): Source domain features
+            target_features (np.ndarray): Target domain features
+        
+        Returns:
+            CoralAdapter: Fitted adapter
+        """
+        try:
+            # Means and covariance matrices with regularization
+            source_mean, source_cov = _regularized_covariance(source_features, self.reg_param, self.dtype)
+            target_mean, target_cov = _regularized_covariance(target_features, self.reg_param, self.dtype)
+            
+            transform = _coral_matrix(source_cov, target_cov)
+            
+            # (X - source_mean) @ transform + target_mean as one affine map
+            return self._set_affine(transform, target_mean - source_mean @ transform)
+        
+        except Exception as e:
+            logger.warning("CORAL transform failed: %s", e)
+            return self._set_identity(np.shape(source_features)[1])  # Leave features unchanged on failure
+    
+    def fit_moments(self, source_moments, target_moments):
+        """
+        Fit the CORAL transformation from accumulated feature statistics.
+        
+        Args:
+            source_moments (FeatureMoments): Source domain statistics
+            target_moments (FeatureMoments): Target domain statistics
+        
+        Returns:
+            CoralAdapter: Fitted adapter
+        """
+        try:
+            source_cov = source_moments.covariance(self.reg_param).astype(self.dtype)
+            target_cov = target_moments.covariance(self.reg_param).astype(self.dtype)
+            
+            transform = _coral_matrix(source_cov, target_cov)
+            
+            source_mean = source_moments.mean.astype(self.dtype)
+            target_mean = target_moments.mean.astype(self.dtype)
+            return self._set_affine(transform, target_mean - source_mean @ transform)
+        
+        except Exception as e:
+            logger.warning("CORAL transform failed: %s", e)
+            return self._set_identity(source_moments.n_features)  # Leave features unchanged on failure
+
+
+def fit_coral_batch(source_list, target_list, reg_param=CORAL_REG_PARAM, dtype=np.float64):
+    """
+    Fit CORAL adapters for many (source, target) pairs in one batched computation.
+    
+    All pairs must have the same number of features. The covariances are
+    stacked and decomposed with a single batched eigh call per domain.
+    
+    Args:
+        source_list (list): Source feature matrices
+        target_list (list): Target feature matrices, aligned with source_list
+        reg_param (float): Regularization added to the covariance diagonals
+        dtype: Floating point type for fitting (np.float32 or np.float64)
+    
+    Returns:
+        list: Fitted CoralAdapter objects, one per pair
+    """
+    if len(source_list) != len(target_list):
+        raise ValueError("source_list and target_list must have the same length")
+    
+    source_stats = [_regularized_covariance(X, reg_param, dtype) for X in source_list]
+    target_stats = [_regularized_covariance(X, reg_param, dtype) for X in target_list]
+    
+    source_means = np.stack([mean for mean, _ in source_stats])
+    target_means = np.stack([mean for mean, _ in target_stats])
+    transforms = _coral_matrix(
+        np.stack([cov for _, cov in source_stats]),
+        np.stack([cov for _, cov in target_stats])
+    )
+    offsets = target_means - np.einsum('bi,bij->bj', source_means, transforms)
+    
+    return [
+        CoralAdapter(reg_param=reg_param, dtype=dtype)._set_affine(transform, offset)
+        for transform, offset in zip(transforms, offsets)
+    ]
 
 
 def coral_transform(source_features, target_features, reg_param=CORAL_REG_PARAM):
@@ -19,32 +188,8 @@ def coral_transform(source_features, target_features, reg_param=CORAL_REG_PARAM)
     Returns:
         np.ndarray: Transformed source features
     """
-    try:
-        # Center the data
-        source_mean = np.mean(source_features, axis=0)
-        target_mean = np.mean(target_features, axis=0)
-        source_centered = source_features - source_mean
-        target_centered = target_features - target_mean
-        
-        # Calculate covariance matrices with regularization
-        source_cov = np.cov(source_centered, rowvar=False) + np.eye(source_centered.shape[1]) * reg_param
-        target_cov = np.cov(target_centered, rowvar=False) + np.eye(target_centered.shape[1]) * reg_param
-        
-        # Compute transformation matrix
-        source_cov_sqrt = scipy.linalg.sqrtm(source_cov)
-        source_cov_inv_sqrt = scipy.linalg.inv(source_cov_sqrt)
-        target_cov_sqrt = scipy.linalg.sqrtm(target_cov)
-        
-        # Ensure no complex numbers in the transformation
-        transform = np.real(np.dot(np.dot(source_cov_inv_sqrt, target_cov_sqrt), source_cov_inv_sqrt))
-        
-        # Apply transformation and add target mean
-        transformed = np.dot(source_centered, transform) + target_mean
-        return transformed
-    
-    except Exception as e:
-        print(f"CORAL transform failed: {e}")
-        return source_features  # Return original features on failure
+    adapter = CoralAdapter(reg_param=reg_param).fit(source_features, target_features)
+    return adapter.transform(source_features)
 
 
 def calculate_domain_discrepancy(source_features, target_features):
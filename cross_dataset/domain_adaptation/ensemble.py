@@ -2,73 +2,174 @@
 Ensemble domain adaptation method combining multiple adaptation techniques.
 """
 
+import logging
 import numpy as np
+import scipy.optimize
 from sklearn.preprocessing import StandardScaler
 
-from .coral import coral_transform, calculate_domain_discrepancy
-from .subspace import subspace_alignment
-from cross_dataset.config import ENSEMBLE_WEIGHTS
+from .base import AffineAdapter
+from .coral import CoralAdapter, calculate_domain_discrepancy
+from .metrics import domain_gap_metrics
+from .subspace import SubspaceAdapter
+from cross_dataset.config import ENSEMBLE_WEIGHTS, CORAL_REG_PARAM
 
+logger = logging.getLogger(__name__)
 
-def ensemble_domain_adaptation(source_features, target_features, weights=None):
+
+def _ensemble_n_components(source_features, target_features):
+    """Number of subspace components used inside the ensemble."""
+    n_comp = min(source_features.shape[1], target_features.shape[1], 
+                min(source_features.shape[0], target_features.shape[0]) - 1) // 2
+    return max(2, min(5, n_comp))  # At least 2, at most 5 components
+
+
+class EnsembleAdapter(AffineAdapter):
     """
-    Apply ensemble of domain adaptation methods for better performance.
-    
-    Args:
-        source_features (np.ndarray): Source domain features
-        target_features (np.ndarray): Target domain features
-        weights (list): Weights for subspace, CORAL, and scaling methods
+    Weighted ensemble of subspace alignment, CORAL and target standardization.
     
-    Returns:
-        np.ndarray: Transformed source features
+    All three components are affine, so the fitted ensemble is stored as a
+    single affine map. The component maps are kept in ``component_matrices_``
+    and ``component_offsets_`` so that other weights can be applied without
+    refitting (see set_weights).
     """
-    if weights is None:
-        weights = ENSEMBLE_WEIGHTS  # [0.4, 0.4, 0.2] by default
     
-    # Apply multiple adaptation methods
-    try:
-        # 1. Subspace alignment (with safer implementation)
+    def __init__(self, weights=None, reg_param=CORAL_REG_PARAM):
+        """
+        Initialize the adapter.
+        
+        Args:
+            weights (list): Weights for subspace, CORAL, and scaling methods
+            reg_param (float): CORAL regularization parameter
+        """
+        self.weights = weights
+        self.reg_param = reg_param
+    
+    def fit(self, source_features, target_features):
+        """
+        Fit all component adaptations and combine them.
+        
+        Args:
+            source_features (np.ndarray): Source domain features
+            target_features (np.ndarray): Target domain features
+        
+        Returns:
+            EnsembleAdapter: Fitted adapter
+        """
+        n_features = np.shape(source_features)[1]
+        
         try:
-            n_comp = min(source_features.shape[1], target_features.shape[1], 
-                        min(source_features.shape[0], target_features.shape[0]) - 1) // 2
-            n_comp = max(2, min(5, n_comp))  # At least 2, at most 5 components
-            adapted_subspace = subspace_alignment(source_features, target_features, n_comp)
+            # 1. Subspace alignment (with safer implementation)
+            try:
+                n_comp = _ensemble_n_components(source_features, target_features)
+                subspace = SubspaceAdapter(n_comp).fit(source_features, target_features)
+            except Exception as e:
+                logger.warning("Subspace alignment in ensemble failed: %s", e)
+                subspace = SubspaceAdapter()._set_identity(n_features)
+            
+            # 2. CORAL transformation
+            try:
+                coral = CoralAdapter(self.reg_param).fit(source_features, target_features)
+            except Exception as e:
+                logger.warning("CORAL in ensemble failed: %s", e)
+                coral = CoralAdapter()._set_identity(n_features)
+            
+            # 3. Simple standardization to match distributions
+            scaler = StandardScaler()
+            scaler.fit(target_features)
+            
+            self._set_components(subspace, coral, scaler.mean_, scaler.scale_)
         except Exception as e:
-            print(f"Subspace alignment in ensemble failed: {e}")
-            adapted_subspace = source_features
+            logger.warning("Ensemble adaptation failed: %s, using simple standardization", e)
+            # Fall back to simple standardization
+            scaler = StandardScaler()
+            scaler.fit(target_features)
+            return self._set_affine(np.diag(1.0 / scaler.scale_), -scaler.mean_ / scaler.scale_)
+        
+        return self.set_weights(self.weights)
+    
+    def fit_moments(self, source_moments, target_moments):
+        """
+        Fit all component adaptations from accumulated feature statistics.
+        
+        Args:
+            source_moments (FeatureMoments): Source domain statistics
+            target_moments (FeatureMoments): Target domain statistics
+        
+        Returns:
+            EnsembleAdapter: Fitted adapter
+        """
+        n_features = source_moments.n_features
+        target_mean = target_moments.mean
+        target_scale = target_moments.std()
         
-        # 2. CORAL transformation
         try:
-            adapted_coral = coral_transform(source_features, target_features)
+            try:
+                n_comp = _ensemble_n_components(source_moments, target_moments)
+                subspace = SubspaceAdapter(n_comp).fit_moments(source_moments, target_moments)
+            except Exception as e:
+                logger.warning("Subspace alignment in ensemble failed: %s", e)
+                subspace = SubspaceAdapter()._set_identity(n_features)
+            
+            try:
+                coral = CoralAdapter(self.reg_param).fit_moments(source_moments, target_moments)
+            except Exception as e:
+                logger.warning("CORAL in ensemble failed: %s", e)
+                coral = CoralAdapter()._set_identity(n_features)
+            
+            self._set_components(subspace, coral, target_mean, target_scale)
         except Exception as e:
-            print(f"CORAL in ensemble failed: {e}")
-            adapted_coral = source_features
+            logger.warning("Ensemble adaptation failed: %s, using simple standardization", e)
+            return self._set_affine(np.diag(1.0 / target_scale), -target_mean / target_scale)
         
-        # 3. Simple standardization to match distributions
-        scaler = StandardScaler()
-        scaler.fit(target_features)
-        adapted_scaled = scaler.transform(source_features)
+        return self.set_weights(self.weights)
+    
+    def _set_components(self, subspace, coral, target_mean, target_scale):
+        """Store the subspace, CORAL and standardization maps."""
+        self.component_matrices_ = np.stack([
+            subspace.matrix_, coral.matrix_, np.diag(1.0 / target_scale)])
+        self.component_offsets_ = np.stack([
+            subspace.offset_, coral.offset_, -target_mean / target_scale])
+    
+    def set_weights(self, weights):
+        """
+        Re-blend the fitted component maps with new weights.
+        
+        Args:
+            weights (list): Weights for subspace, CORAL, and scaling methods
+        
+        Returns:
+            EnsembleAdapter: Adapter with the updated combined map
+        """
+        if weights is None:
+            weights = ENSEMBLE_WEIGHTS  # [0.4, 0.4, 0.2] by default
         
         # Normalize weights
         weights = np.array(weights) / sum(weights)
+        self.weights_ = weights
         
-        # Combine adaptations
-        adapted_ensemble = (
-            weights[0] * adapted_subspace + 
-            weights[1] * adapted_coral + 
-            weights[2] * adapted_scaled
+        return self._set_affine(
+            np.tensordot(weights, self.component_matrices_, axes=1),
+            weights @ self.component_offsets_
         )
-        
-        return adapted_ensemble
-    except Exception as e:
-        print(f"Ensemble adaptation failed: {e}, using simple standardization")
-        # Fall back to simple standardization
-        scaler = StandardScaler()
-        scaler.fit(target_features)
-        return scaler.transform(source_features)
 
 
-def measure_domain_gap(source_features, target_features, transformed_features=None):
+def ensemble_domain_adaptation(source_features, target_features, weights=None):
+    """
+    Apply ensemble of domain adaptation methods for better performance.
+    
+    Args:
+        source_features (np.ndarray): Source domain features
+        target_features (np.ndarray): Target domain features
+        weights (list): Weights for subspace, CORAL, and scaling methods
+    
+    Returns:
+        np.ndarray: Transformed source features
+    """
+    adapter = EnsembleAdapter(weights=weights).fit(source_features, target_features)
+    return adapter.transform(source_features)
+
+
+def measure_domain_gap(source_features, target_features, transformed_features=None, detailed=False):
     """
     Measure the domain gap before and after adaptation.
     
@@ -76,6 +177,8 @@ def measure_domain_gap(source_features, target_features, transformed_features=No
         source_features (np.ndarray): Original source features
         target_features (np.ndarray): Target features
         transformed_features (np.ndarray): Transformed source features
+        detailed (bool): Whether to add MMD, CORAL and sliced Wasserstein
+            distances (see domain_gap_metrics) under 'metrics_before' and 'metrics_after'
     
     Returns:
         dict: Gap measurements
@@ -91,27 +194,65 @@ def measure_domain_gap(source_features, target_features, transformed_features=No
         gap_after = None
         gap_reduction = None
     
-    return {
+    gap_info = {
         'gap_before': gap_before,
         'gap_after': gap_after,
         'gap_reduction': gap_reduction,
         'gap_reduction_percent': gap_reduction * 100.0 if gap_reduction is not None else None
     }
+    
+    if detailed:
+        gap_info['metrics_before'] = domain_gap_metrics(source_features, target_features)
+        gap_info['metrics_after'] = (
+            domain_gap_metrics(transformed_features, target_features)
+            if transformed_features is not None else None
+        )
+    
+    return gap_info
 
 
-def optimize_adaptation_weights(source_features, target_features, weight_grid=None):
+def simplex_weight_grid(resolution=10):
+    """
+    Generate all weight triples on a regular grid over the probability simplex.
+    
+    Args:
+        resolution (int): Number of steps between 0 and 1 for each weight
+    
+    Returns:
+        np.ndarray: Weight triples of shape (n_candidates, 3), each summing to 1
+    """
+    steps = np.arange(resolution + 1)
+    first, second = np.meshgrid(steps, steps, indexing='ij')
+    valid = first + second <= resolution
+    first, second = first[valid], second[valid]
+    return np.column_stack([first, second, resolution - first - second]) / resolution
+
+
+def optimize_adaptation_weights(source_features, target_features, weight_grid=None,
+                                resolution=None, refine=False):
     """
     Find optimal weights for ensemble adaptation using grid search.
     
+    The subspace, CORAL and scaling adaptations are fitted once. Since every
+    component is affine, the adapted source mean is a linear blend of the
+    component means, so the gap reduction of all candidate weights is scored
+    in one matrix product.
+    
     Args:
         source_features (np.ndarray): Source domain features
         target_features (np.ndarray): Target domain features
         weight_grid (list): List of weight combinations to try
+        resolution (int): If set, search the full simplex grid with this resolution
+            (see simplex_weight_grid) instead of weight_grid
+        refine (bool): Whether to refine the best grid point with a continuous
+            optimizer constrained to the simplex
     
     Returns:
         tuple: (optimal_weights, gap_reduction)
     """
-    if weight_grid is None:
+    if resolution is not None:
+        weight_grid = simplex_weight_grid(resolution).tolist()
+    elif weight_grid is None:
         # Default weight grid for [subspace, coral, scaling]
         weight_grid = [
             [0.8, 0.1, 0.1],
@@ -126,20 +267,51 @@ def optimize_adaptation_weights(source_features, target_features, weight_grid=No
     best_reduction = 0.0
     best_weights = [0.33, 0.33, 0.34]  # Default equal weights
     
-    for weights in weight_grid:
-        # Apply adaptation with these weights
-        try:
-            adapted = ensemble_domain_adaptation(source_features, target_features, weights)
-            
-            # Measure gap reduction
-            gap_info = measure_domain_gap(source_features, target_features, adapted)
-            reduction = gap_info['gap_reduction']
-            
-            # Update if better
-            if reduction is not None and reduction > best_reduction:
-                best_reduction = reduction
-                best_weights = weights
-        except Exception:
-            continue
+    try:
+        adapter = EnsembleAdapter().fit(source_features, target_features)
+        if not hasattr(adapter, 'component_matrices_'):
+            return best_weights, best_reduction  # Ensemble fell back to plain scaling
+        
+        source_mean = np.mean(source_features, axis=0)
+        target_mean = np.mean(target_features, axis=0)
+        gap_before = np.linalg.norm(source_mean - target_mean)
+        if gap_before == 0:
+            return best_weights, best_reduction
+        
+        # Adapted source mean of each component, shape (3, n_features)
+        component_means = source_mean @ adapter.component_matrices_ + adapter.component_offsets_
+        
+        def gap_reduction(weights):
+            """Gap reduction for each row of normalized weights."""
+            gaps_after = np.linalg.norm(weights @ component_means - target_mean, axis=-1)
+            return 1.0 - gaps_after / gap_before
+        
+        # Score all candidates at once
+        candidates = np.asarray(weight_grid, dtype=float)
+        reductions = gap_reduction(candidates / candidates.sum(axis=1, keepdims=True))
+        reductions = np.where(np.isfinite(reductions), reductions, -np.inf)
+        
+        best_index = int(np.argmax(reductions))
+        if reductions[best_index] > best_reduction:
+            best_reduction = float(reductions[best_index])
+            best_weights = weight_grid[best_index]
+        
+        if refine:
+            start = np.asarray(best_weights, dtype=float)
+            result = scipy.optimize.minimize(
+                lambda w: -gap_reduction(w),
+                start / start.sum(),
+                method='SLSQP',
+                bounds=[(0.0, 1.0)] * 3,
+                constraints=[{'type': 'eq', 'fun': lambda w: w.sum() - 1.0}]
+            )
+            refined_weights = np.clip(result.x, 0.0, 1.0)
+            refined_weights = refined_weights / refined_weights.sum()
+            refined_reduction = float(gap_reduction(refined_weights))
+            if refined_reduction > best_reduction:
+                best_reduction = refined_reduction
+                best_weights = refined_weights.tolist()
+    except Exception as e:
+        logger.warning("Adaptation weight optimization failed: %s", e)
     
     return best_weights, best_reduction
\ No newline at end of file
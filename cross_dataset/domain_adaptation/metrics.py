@@ -0,0 +1,184 @@
+"""
+Domain gap metrics for comparing source and target feature distributions.
+"""
+
+import numpy as np
+from cross_dataset.config import DOMAIN_GAP_MAX_SAMPLES, MMD_RFF_FEATURES, SW_PROJECTIONS
+
+
+def _subsample(features, max_samples, rng):
+    """
+    Randomly subsample rows without replacement.
+    
+    Args:
+        features (np.ndarray): Feature matrix
+        max_samples (int): Maximum number of rows to keep (None keeps all)
+        rng (np.random.Generator): Random generator
+    
+    Returns:
+        np.ndarray: Feature matrix with at most max_samples rows
+    """
+    features = np.asarray(features, dtype=float)
+    if max_samples is None or len(features) <= max_samples:
+        return features
+    return features[rng.choice(len(features), max_samples, replace=False)]
+
+
+def _median_gamma(source_features, target_features, rng, max_points=500):
+    """
+    RBF bandwidth from the median heuristic on a pooled subsample.
+    
+    Args:
+        source_features (np.ndarray): Source domain features
+        target_features (np.ndarray): Target domain features
+        rng (np.random.Generator): Random generator
+        max_points (int): Maximum number of pooled points used for the pairwise distances
+    
+    Returns:
+        float: gamma such that k(x, y) = exp(-gamma * ||x - y||^2)
+    """
+    pooled = _subsample(np.vstack([source_features, target_features]), max_points, rng)
+    sq_norms = np.sum(pooled ** 2, axis=1)
+    sq_dists = sq_norms[:, np.newaxis] + sq_norms[np.newaxis, :] - 2 * pooled @ pooled.T
+    median = np.median(sq_dists[np.triu_indices(len(pooled), k=1)])
+    return 1.0 / median if median > 0 else 1.0
+
+
+def _rff_mean(features, weights, phases, chunk_size=4096):
+    """Mean random Fourier feature embedding, computed in row chunks."""
+    total = np.zeros(weights.shape[1])
+    for start in range(0, len(features), chunk_size):
+        total += np.cos(features[start:start + chunk_size] @ weights + phases).sum(axis=0)
+    return total * np.sqrt(2.0 / weights.shape[1]) / len(features)
+
+
+def mmd_rff(source_features, target_features, n_features=MMD_RFF_FEATURES, gamma=None,
+            max_samples=DOMAIN_GAP_MAX_SAMPLES, random_state=42):
+    """
+    Linear-time squared MMD with an RBF kernel approximated by random Fourier features.
+    
+    Args:
+        source_features (np.ndarray): Source domain features
+        target_features (np.ndarray): Target domain features
+        n_features (int): Number of random Fourier features
+        gamma (float): RBF kernel parameter (None uses the median heuristic)
+        max_samples (int): Maximum samples per domain (None uses all)
+        random_state (int): Random seed
+    
+    Returns:
+        float: Estimated squared maximum mean discrepancy
+    """
+    rng = np.random.default_rng(random_state)
+    source = _subsample(source_features, max_samples, rng)
+    target = _subsample(target_features, max_samples, rng)
+    
+    if gamma is None:
+        gamma = _median_gamma(source, target, rng)
+    
+    # Random features for exp(-gamma * ||x - y||^2)
+    weights = rng.normal(scale=np.sqrt(2 * gamma), size=(source.shape[1], n_features))
+    phases = rng.uniform(0, 2 * np.pi, size=n_features)
+    
+    diff = _rff_mean(source, weights, phases) - _rff_mean(target, weights, phases)
+    return float(diff @ diff)
+
+
+def coral_distance(source_features, target_features, max_samples=DOMAIN_GAP_MAX_SAMPLES, random_state=42):
+    """
+    CORAL distance: squared Frobenius distance between covariances, scaled by 1 / (4 d^2).
+    
+    Args:
+        source_features (np.ndarray): Source domain features
+        target_features (np.ndarray): Target domain features
+        max_samples (int): Maximum samples per domain (None uses all)
+        random_state (int): Random seed
+    
+    Returns:
+        float: CORAL distance
+    """
+    rng = np.random.default_rng(random_state)
+    source = _subsample(source_features, max_samples, rng)
+    target = _subsample(target_features, max_samples, rng)
+    
+    cov_diff = np.cov(source, rowvar=False) - np.cov(target, rowvar=False)
+    n_dims = source.shape[1]
+    return float(np.sum(cov_diff ** 2) / (4 * n_dims ** 2))
+
+
+def _column_quantiles(values, levels):
+    """
+    Linearly interpolated quantiles of every column (same as np.quantile with axis=0).
+    
+    Sorting once and interpolating is much faster than np.quantile for many levels.
+    
+    Args:
+        values (np.ndarray): Matrix of shape (n_samples, n_columns)
+        levels (np.ndarray): Quantile levels in [0, 1]
+    
+    Returns:
+        np.ndarray: Quantiles of shape (len(levels), n_columns)
+    """
+    values = np.sort(values, axis=0)
+    positions = levels * (len(values) - 1)
+    lower = np.floor(positions).astype(int)
+    upper = np.minimum(lower + 1, len(values) - 1)
+    frac = (positions - lower)[:, np.newaxis]
+    return values[lower] * (1 - frac) + values[upper] * frac
+
+
+def sliced_wasserstein(source_features, target_features, n_projections=SW_PROJECTIONS,
+                       max_samples=DOMAIN_GAP_MAX_SAMPLES, random_state=42):
+    """
+    Sliced 2-Wasserstein distance over random one-dimensional projections.
+    
+    All projections are handled at once; domains of different sizes are
+    compared through matching quantiles.
+    
+    Args:
+        source_features (np.ndarray): Source domain features
+        target_features (np.ndarray): Target domain features
+        n_projections (int): Number of random projection directions
+        max_samples (int): Maximum samples per domain (None uses all)
+        random_state (int): Random seed
+    
+    Returns:
+        float: Sliced Wasserstein distance
+    """
+    rng = np.random.default_rng(random_state)
+    source = _subsample(source_features, max_samples, rng)
+    target = _subsample(target_features, max_samples, rng)
+    
+    directions = rng.normal(size=(source.shape[1], n_projections))
+    directions /= np.linalg.norm(directions, axis=0, keepdims=True)
+    
+    n_levels = min(len(source), len(target))
+    levels = (np.arange(n_levels) + 0.5) / n_levels
+    source_quantiles = _column_quantiles(source @ directions, levels)
+    target_quantiles = _column_quantiles(target @ directions, levels)
+    
+    return float(np.sqrt(np.mean((source_quantiles - target_quantiles) ** 2)))
+
+
+def domain_gap_metrics(source_features, target_features, max_samples=DOMAIN_GAP_MAX_SAMPLES, random_state=42):
+    """
+    Compute all domain gap metrics on (subsampled) source and target features.
+    
+    Args:
+        source_features (np.ndarray): Source domain features
+        target_features (np.ndarray): Target domain features
+        max_samples (int): Maximum samples per domain (None uses all)
+        random_state (int): Random seed
+    
+    Returns:
+        dict: Mean distance, MMD, CORAL distance and sliced Wasserstein distance
+    """
+    rng = np.random.default_rng(random_state)
+    source = _subsample(source_features, max_samples, rng)
+    target = _subsample(target_features, max_samples, rng)
+    
+    return {
+        'mean_distance': float(np.linalg.norm(source.mean(axis=0) - target.mean(axis=0))),
+        'mmd': mmd_rff(source, target, max_samples=None, random_state=random_state),
+        'coral_distance': coral_distance(source, target, max_samples=None),
+        'sliced_wasserstein': sliced_wasserstein(source, target, max_samples=None, random_state=random_state)
+    }
@@ -0,0 +1,163 @@
+"""
+Streaming feature statistics for fitting domain adapters on large data.
+"""
+
+import numpy as np
+
+
+class FeatureMoments:
+    """
+    Single-pass accumulator for the mean and covariance of feature batches.
+    
+    Batches are folded in with the pairwise update of Chan et al., so the
+    memory used is O(d^2) in the number of features regardless of how many
+    samples are seen. Accumulators built on different workers or chunks can be
+    combined with merge. The top principal subspace is read directly from the
+    accumulated covariance, which gives the same components as a PCA fit on
+    all samples.
+    """
+    
+    def __init__(self, n_features=None, dtype=np.float64):
+        """
+        Initialize an empty accumulator.
+        
+        Args:
+            n_features (int): Number of features (inferred from the first batch if None)
+            dtype: Floating point type of the accumulated statistics
+        """
+        self.dtype = dtype
+        self.count = 0
+        self.mean = None
+        self.scatter = None  # Sum of outer products of centered samples
+        
+        if n_features is not None:
+            self._allocate(n_features)
+    
+    def _allocate(self, n_features):
+        """Create zeroed statistics for n_features features."""
+        self.mean = np.zeros(n_features, dtype=self.dtype)
+        self.scatter = np.zeros((n_features, n_features), dtype=self.dtype)
+    
+    @classmethod
+    def from_batches(cls, batches, dtype=np.float64):
+        """
+        Accumulate statistics over an iterable of feature batches.
+        
+        Args:
+            batches (iterable): Feature matrices of shape (n_samples, n_features)
+            dtype: Floating point type of the accumulated statistics
+        
+        Returns:
+            FeatureMoments: Accumulated statistics
+        """
+        moments = cls(dtype=dtype)
+        for batch in batches:
+            moments.update(batch)
+        return moments
+    
+    @property
+    def n_features(self):
+        """Number of features, or None before the first batch."""
+        return None if self.mean is None else len(self.mean)
+    
+    @property
+    def shape(self):
+        """Shape (n_samples, n_features) of the data summarized so far."""
+        return (self.count, self.n_features)
+    
+    def _combine(self, count, mean, scatter):
+        """Fold the statistics of another sample set into this one."""
+        if count == 0:
+            return self
+        if self.mean is None:
+            self._allocate(len(mean))
+        
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * (count / total)
+        self.scatter += scatter + np.outer(delta, delta) * (self.count * count / total)
+        self.count = total
+        return self
+    
+    def update(self, batch):
+        """
+        Add a batch of samples.
+        
+        Args:
+            batch (np.ndarray): Feature matrix of shape (n_samples, n_features)
+        
+        Returns:
+            FeatureMoments: This accumulator
+        """
+        batch = np.asarray(batch, dtype=self.dtype)
+        if batch.ndim == 1:
+            batch = batch[np.newaxis, :]
+        if len(batch) == 0:
+            return self
+        if self.mean is not None and batch.shape[1] != self.n_features:
+            raise ValueError(f"Expected {self.n_features} features, got {batch.shape[1]}")
+        
+        batch_mean = batch.mean(axis=0)
+        centered = batch - batch_mean
+        return self._combine(len(batch), batch_mean, centered.T @ centered)
+    
+    def merge(self, other):
+        """
+        Merge the statistics of another accumulator into this one.
+        
+        Args:
+            other (FeatureMoments): Accumulator over a disjoint set of samples
+        
+        Returns:
+            FeatureMoments: This accumulator
+        """
+        if other.count == 0:
+            return self
+        if self.mean is not None and other.n_features != self.n_features:
+            raise ValueError(f"Expected {self.n_features} features, got {other.n_features}")
+        return self._combine(other.count, other.mean, other.scatter)
+    
+    def covariance(self, reg_param=0.0, ddof=1):
+        """
+        Covariance matrix of the accumulated samples.
+        
+        Args:
+            reg_param (float): Regularization added to the diagonal
+            ddof (int): Delta degrees of freedom (1 matches np.cov)
+        
+        Returns:
+            np.ndarray: Covariance matrix (n_features, n_features)
+        """
+        if self.count <= ddof:
+            raise ValueError(f"Need more than {ddof} samples, got {self.count}")
+        
+        cov = self.scatter / (self.count - ddof)
+        cov[np.diag_indices_from(cov)] += reg_param
+        return cov
+    
+    def std(self):
+        """
+        Per-feature standard deviation, with constant features set to 1.
+        
+        Matches StandardScaler.scale_ on the same samples.
+        
+        Returns:
+            np.ndarray: Standard deviation of each feature
+        """
+        scale = np.sqrt(np.maximum(np.diag(self.scatter) / self.count, 0.0))
+        scale[scale == 0.0] = 1.0
+        return scale
+    
+    def principal_components(self, n_components):
+        """
+        Leading principal axes of the accumulated samples.
+        
+        Args:
+            n_components (int): Number of components to return
+        
+        Returns:
+            np.ndarray: Components of shape (n_components, n_features), ordered
+                by decreasing explained variance like PCA.components_
+        """
+        _, eigvecs = np.linalg.eigh(self.scatter)
+        return eigvecs[:, ::-1][:, :n_components].T
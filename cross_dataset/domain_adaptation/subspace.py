@@ -2,22 +2,102 @@
 Subspace alignment domain adaptation method.
 """
 
+import logging
+import hashlib
+from collections import OrderedDict
+
 import numpy as np
-from sklearn.decomposition import PCA
+from sklearn.utils.extmath import randomized_svd
 from cross_dataset.config import SUBSPACE_MIN_COMPONENTS
+from .base import AffineAdapter
 
+logger = logging.getLogger(__name__)
 
-def subspace_alignment(source_features, target_features, n_components=None):
+
+SVD_SOLVERS = ('auto', 'randomized', 'full')
+# With 'auto', feature counts from which the randomized solver is used
+RANDOMIZED_SVD_MIN_FEATURES = 500
+
+# Cache of fitted principal bases, most recently used last
+_BASIS_CACHE = OrderedDict()
+_BASIS_CACHE_SIZE = 16
+
+
+def _features_hash(features):
+    """Hash the contents, shape and dtype of a feature matrix."""
+    features = np.ascontiguousarray(features)
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(str((features.shape, features.dtype.str)).encode())
+    digest.update(features.tobytes())
+    return digest.hexdigest()
+
+
+def principal_basis(features, n_components, svd_solver='auto', random_state=42, use_cache=True):
     """
-    Apply subspace alignment to align source features with target domain.
+    Compute the mean and leading principal axes of a feature matrix.
+    
+    Results are cached per (feature matrix contents, n_components, solver), so
+    a target domain shared by several adaptations (e.g. arousal and valence,
+    or every weight trial of an ensemble) is decomposed only once.
     
     Args:
-        source_features (np.ndarray): Source domain features
-        target_features (np.ndarray): Target domain features
-        n_components (int): Number of components to use
+        features (np.ndarray): Feature matrix (n_samples, n_features)
+        n_components (int): Number of components
+        svd_solver (str): 'full' for an exact SVD, 'randomized' for a truncated randomized SVD,
+            or 'auto' for the exact SVD below RANDOMIZED_SVD_MIN_FEATURES features
+        random_state (int): Seed for the randomized solver
+        use_cache (bool): Whether to reuse cached bases
     
     Returns:
-        np.ndarray: Transformed source features
+        tuple: (mean, components) with components of shape (n_components, n_features)
+    """
+    if svd_solver not in SVD_SOLVERS:
+        raise ValueError(f"Unknown SVD solver: {svd_solver}")
+    
+    features = np.asarray(features, dtype=float)
+    if svd_solver == 'auto':
+        # The randomized solver only pays off on wide matrices, and it is approximate
+        # when the spectrum is flat
+        svd_solver = 'randomized' if features.shape[1] >= RANDOMIZED_SVD_MIN_FEATURES else 'full'
+    key = (_features_hash(features), n_components, svd_solver, random_state)
+    if use_cache and key in _BASIS_CACHE:
+        _BASIS_CACHE.move_to_end(key)
+        return _BASIS_CACHE[key]
+    
+    mean = features.mean(axis=0)
+    centered = features - mean
+    if svd_solver == 'randomized':
+        _, _, components = randomized_svd(centered, n_components, n_iter=7, random_state=random_state)
+    else:
+        _, _, components = np.linalg.svd(centered, full_matrices=False)
+        components = components[:n_components]
+    
+    if use_cache:
+        mean.setflags(write=False)
+        components.setflags(write=False)
+        _BASIS_CACHE[key] = (mean, components)
+        if len(_BASIS_CACHE) > _BASIS_CACHE_SIZE:
+            _BASIS_CACHE.popitem(last=False)
+    
+    return mean, components
+
+
+def clear_subspace_cache():
+    """Remove all cached principal bases."""
+    _BASIS_CACHE.clear()
+
+
+def _default_n_components(source_features, target_features, n_components=None):
+    """
+    Determine a valid number of subspace components.
+    
+    Args:
+        source_features (np.ndarray): Source domain features (or FeatureMoments)
+        target_features (np.ndarray): Target domain features (or FeatureMoments)
+        n_components (int): Requested number of components
+    
+    Returns:
+        int: Number of components to use
     """
     # Determine number of components if not specified
     if n_components is None:
@@ -30,31 +110,126 @@ def subspace_alignment(source_features, target_features, n_components=None):
                      min(source_features.shape[1], target_features.shape[1]), 
                      min(source_features.shape[0], target_features.shape[0]) - 1)
     
-    try:
-        # Learn source subspace
-        source_pca = PCA(n_components=n_components)
-        source_pca.fit(source_features)
-        Xs = source_pca.transform(source_features)
-        source_components = source_pca.components_
+    return n_components
+
+
+class SubspaceAdapter(AffineAdapter):
+    """
+    Subspace alignment adapter.
+    
+    Source features are projected onto the source principal subspace,
+    aligned with the target principal subspace and projected back into the
+    original feature space through the target components.
+    """
+    
+    def __init__(self, n_components=None, svd_solver='auto'):
+        """
+        Initialize the adapter.
         
-        # Learn target subspace
-        target_pca = PCA(n_components=n_components)
-        target_pca.fit(target_features)
-        target_components = target_pca.components_
+        Args:
+            n_components (int): Number of components to use (None picks a default)
+            svd_solver (str): 'auto', 'randomized' or 'full' (see principal_basis)
+        """
+        self.n_components = n_components
+        self.svd_solver = svd_solver
+    
+    def fit(self, source_features, target_features):
+        """
+        Fit the subspace alignment.
         
-        # Transform source components to target subspace
-        transform_matrix = np.dot(source_components, target_components.T)
+        Args:
+            source_features (np.ndarray): Source domain features
+            target_features (np.ndarray): Target domain features
         
-        # Apply transformation - align source features to target domain
-        Xs_aligned = np.dot(Xs, transform_matrix)
+        Returns:
+            SubspaceAdapter: Fitted adapter
+        """
+        n_components = _default_n_components(source_features, target_features, self.n_components)
         
-        # Project back to original feature space using target components
-        aligned_features = np.dot(Xs_aligned, target_components)
+        try:
+            # Learn source and target subspaces (cached per feature matrix)
+            source_mean, source_components = principal_basis(source_features, n_components, self.svd_solver)
+            _, target_components = principal_basis(target_features, n_components, self.svd_solver)
+            
+            # Transform source components to target subspace
+            transform_matrix = np.dot(source_components, target_components.T)
+            
+            # Project to source subspace, align, and project back with target components
+            matrix = source_components.T @ transform_matrix @ target_components
+            
+            self.n_components_ = n_components
+            return self._set_affine(matrix, -source_mean @ matrix)
+        except Exception as e:
+            logger.warning("Subspace alignment failed: %s", e)
+            return self._set_identity(np.shape(source_features)[1])  # Leave features unchanged on failure
+    
+    def fit_moments(self, source_moments, target_moments):
+        """
+        Fit the subspace alignment from accumulated feature statistics.
         
-        return aligned_features
-    except Exception as e:
-        print(f"Subspace alignment failed: {e}")
-        return source_features  # Return original features on failure
+        The principal subspaces come from the accumulated covariances, so the
+        result matches fit on the concatenated batches.
+        
+        Args:
+            source_moments (FeatureMoments): Source domain statistics
+            target_moments (FeatureMoments): Target domain statistics
+        
+        Returns:
+            SubspaceAdapter: Fitted adapter
+        """
+        n_components = _default_n_components(source_moments, target_moments, self.n_components)
+        
+        try:
+            source_components = source_moments.principal_components(n_components)
+            target_components = target_moments.principal_components(n_components)
+            
+            # Project to source subspace, align, and project back with target components
+            transform_matrix = np.dot(source_components, target_components.T)
+            matrix = source_components.T @ transform_matrix @ target_components
+            
+            self.n_components_ = n_components
+            return self._set_affine(matrix, -source_moments.mean @ matrix)
+        except Exception as e:
+            logger.warning("Subspace alignment failed: %s", e)
+            return self._set_identity(source_moments.n_features)  # Leave features unchanged on failure
+
+
+def subspace_alignment(source_features, target_features, n_components=None):
+    """
+    Apply subspace alignment to align source features with target domain.
+    
+    Args:
+        source_features (np.ndarray): Source domain features
+        target_features (np.ndarray): Target domain features
+        n_components (int): Number of components to use
+    
+    Returns:
+        np.ndarray: Transformed source features
+    """
+    adapter = SubspaceAdapter(n_components=n_components).fit(source_features, target_features)
+    return adapter.transform(source_features)
+
+
+def _subspace_errors(source_components, target_components):
+    """
+    Distance between the source and target principal subspaces for every prefix size.
+    
+    For orthonormal bases Ps and Pt with k rows, the Frobenius distance between
+    the projectors Ps.T @ Ps and Pt.T @ Pt equals sqrt(2k - 2 ||Ps @ Pt.T||_F^2),
+    so all k can be evaluated from one product of the largest bases.
+    
+    Args:
+        source_components (np.ndarray): Source principal axes (k_max, n_features)
+        target_components (np.ndarray): Target principal axes (k_max, n_features)
+    
+    Returns:
+        np.ndarray: Alignment error for k = 1..k_max
+    """
+    overlap = (source_components @ target_components.T) ** 2
+    # Sum of overlap[:k, :k] for every k
+    prefix_sums = np.cumsum(np.cumsum(overlap, axis=0), axis=1)
+    k = np.arange(1, len(overlap) + 1)
+    return np.sqrt(np.maximum(2 * k - 2 * np.diagonal(prefix_sums), 0.0))
 
 
 def calculate_subspace_error(source_features, target_features, n_components=None):
@@ -69,30 +244,18 @@ def calculate_subspace_error(source_features, target_features, n_components=None
     Returns:
         float: Subspace alignment error
     """
-    # Determine number of components
-    if n_components is None:
-        n_components = min(source_features.shape[1] // 2 + 1, 
-                         min(source_features.shape[0], target_features.shape[0]) - 1)
-        n_components = max(n_components, SUBSPACE_MIN_COMPONENTS)
+    # Determine number of components, at most the rank of the centered features
+    n_components = _default_n_components(source_features, target_features, n_components)
     
     try:
-        # Learn source subspace
-        source_pca = PCA(n_components=n_components)
-        source_pca.fit(source_features)
-        source_components = source_pca.components_
-        
-        # Learn target subspace
-        target_pca = PCA(n_components=n_components)
-        target_pca.fit(target_features)
-        target_components = target_pca.components_
-        
-        # Calculate Frobenius norm between subspaces
-        alignment_error = np.linalg.norm(np.dot(source_components, source_components.T) - 
-                                       np.dot(target_components, target_components.T), 'fro')
+        # Learn source and target subspaces
+        _, source_components = principal_basis(source_features, n_components)
+        _, target_components = principal_basis(target_features, n_components)
         
-        return alignment_error
+        # Calculate Frobenius norm between subspace projectors
+        return float(_subspace_errors(source_components, target_components)[-1])
     except Exception as e:
-        print(f"Error calculating subspace error: {e}")
+        logger.warning("Error calculating subspace error: %s", e)
         return float('inf')
 
 
@@ -100,6 +263,10 @@ def analyze_subspace_similarity(source_features, target_features, n_components_r
     """
     Analyze subspace similarity across different numbers of components.
     
+    One decomposition per domain with the largest number of components is
+    sliced to evaluate every component count. Counts above the rank of the
+    centered features (see _default_n_components) get an infinite error.
+    
     Args:
         source_features (np.ndarray): Source domain features
         target_features (np.ndarray): Target domain features
@@ -113,11 +280,21 @@ def analyze_subspace_similarity(source_features, target_features, n_components_r
                            min(source_features.shape[0], target_features.shape[0]) - 1)
         n_components_range = range(2, min(10, max_components))
     
-    results = {}
+    n_components_range = list(n_components_range)
+    results = {n: float('inf') for n in n_components_range}
     
-    for n in n_components_range:
-        error = calculate_subspace_error(source_features, target_features, n)
-        results[n] = error
+    try:
+        k_max = _default_n_components(source_features, target_features, max(n_components_range))
+        _, source_components = principal_basis(source_features, k_max)
+        _, target_components = principal_basis(target_features, k_max)
+        errors = _subspace_errors(source_components, target_components)
+        
+        for n in n_components_range:
+            if 1 <= n <= k_max:
+                results[n] = float(errors[n - 1])
+    except Exception as e:
+        logger.warning("Error calculating subspace error: %s", e)
+        results = {n: float('inf') for n in n_components_range}
     
     # Find optimal number of components
     optimal_n = min(results, key=results.get)
@@ -126,4 +303,4 @@ def analyze_subspace_similarity(source_features, target_features, n_components_r
         'errors': results,
         'optimal_n': optimal_n,
         'optimal_error': results[optimal_n]
-    }
\ No newline at end of file
+    }
@@ -2,9 +2,12 @@
 Feature extraction functions for physiological signals.
 """
 
+import logging
 import numpy as np
 from scipy import signal, stats  # Import stats module for skew and kurtosis
 
+logger = logging.getLogger(__name__)
+
 
 def extract_features(signal_data, sampling_rate=4):
     """
@@ -87,7 +90,7 @@ def extract_features(signal_data, sampling_rate=4):
                     features[key] = float(value[0]) if value.size > 0 else 0.0
         
     except Exception as e:
-        print(f"Error in feature extraction: {e}")
+        logger.warning("Error in feature extraction: %s", e, extra={'sample_every': 100})
         # Return basic features with default values
         features['mean'] = 0.0
         features['std'] = 0.0
@@ -211,7 +214,7 @@ def extract_frequency_features(signal_data, sampling_rate=4):
             features['lf_hf_ratio'] = 0.0
             
     except Exception as e:
-        print(f"Error in frequency feature extraction: {e}")
+        logger.warning("Error in frequency feature extraction: %s", e, extra={'sample_every': 100})
         features['low_freq_power'] = 0.0
         features['high_freq_power'] = 0.0
         features['lf_hf_ratio'] = 0.0
@@ -253,7 +256,7 @@ def extract_wavelet_features(signal_data, wavelet='db4', level=3):
             features[f'wavelet_detail{i+1}_energy'] = float(np.sum(detail**2) / len(detail))
         
     except Exception as e:
-        print(f"Error in wavelet feature extraction: {e}")
+        logger.warning("Error in wavelet feature extraction: %s", e, extra={'sample_every': 100})
     
     return features
 
@@ -2,9 +2,12 @@
 Feature mapping functions for cross-dataset emotion recognition.
 """
 
+import logging
 import pandas as pd
 import numpy as np
-from sklearn.feature_selection import mutual_info_classif
+from wesad_framework.features.mutual_info import mutual_info_scores
+
+logger = logging.getLogger(__name__)
 
 
 # Default emotion mapping for WESAD (refined for better alignment)
@@ -65,7 +68,8 @@ DEFAULT_FEATURE_MAPPING = {
 }
 
 
-def map_features(wesad_df, kemocon_df, feature_mapping=None, use_mutual_info=True, target='arousal', top_n=25):
+def map_features(wesad_df, kemocon_df, feature_mapping=None, use_mutual_info=True, target='arousal', top_n=25,
+                 n_jobs=None, mi_estimator='knn'):
     """
     Map features between WESAD and K-EmoCon datasets.
     
@@ -76,12 +80,14 @@ def map_features(wesad_df, kemocon_df, feature_mapping=None, use_mutual_info=Tru
         use_mutual_info (bool): Whether to use mutual information for feature selection
         target (str): Target variable for mutual information calculation
         top_n (int): Number of top features to select
+        n_jobs (int): Number of parallel jobs for mutual information
+        mi_estimator (str): Mutual information estimator ('knn' or 'binned')
     
     Returns:
         tuple: (wesad_features, kemocon_features) - Lists of selected feature names
     """
     if wesad_df is None or kemocon_df is None:
-        print("Both datasets must be provided")
+        logger.warning("Both datasets must be provided")
         return [], []
     
     # Use default mapping if not provided
@@ -111,36 +117,27 @@ def map_features(wesad_df, kemocon_df, feature_mapping=None, use_mutual_info=Tru
         qualified_features.append((wesad_name, kemocon_name))
     
     if use_mutual_info and target in wesad_df.columns and target in kemocon_df.columns:
-        # Compute mutual information for WESAD features
-        wesad_mi = {}
+        # Compute mutual information for all WESAD and K-EmoCon features at once
         # Create binary target for mutual info (above/below median)
         wesad_target = (wesad_df[target] > wesad_df[target].median()).astype(int)
+        kemocon_target = (kemocon_df[target] > kemocon_df[target].median()).astype(int)
         
-        for wesad_name, _ in qualified_features:
-            try:
-                mi = mutual_info_classif(
-                    wesad_df[wesad_name].values.reshape(-1, 1), 
-                    wesad_target,
-                    random_state=42
-                )[0]
-                wesad_mi[wesad_name] = mi
-            except Exception:
-                wesad_mi[wesad_name] = 0
+        wesad_names = [wesad_name for wesad_name, _ in qualified_features]
+        kemocon_names = [kemocon_name for _, kemocon_name in qualified_features]
         
-        # Compute mutual information for K-EmoCon features
+        wesad_mi = {}
         kemocon_mi = {}
-        kemocon_target = (kemocon_df[target] > kemocon_df[target].median()).astype(int)
-        
-        for _, kemocon_name in qualified_features:
-            try:
-                mi = mutual_info_classif(
-                    kemocon_df[kemocon_name].values.reshape(-1, 1), 
-                    kemocon_target,
-                    random_state=42
-                )[0]
-                kemocon_mi[kemocon_name] = mi
-            except Exception:
-                kemocon_mi[kemocon_name] = 0
+        if qualified_features:
+            wesad_scores = mutual_info_scores(
+                wesad_df[wesad_names].values, wesad_target.values,
+                random_state=42, n_jobs=n_jobs, estimator=mi_estimator
+            )
+            kemocon_scores = mutual_info_scores(
+                kemocon_df[kemocon_names].values, kemocon_target.values,
+                random_state=42, n_jobs=n_jobs, estimator=mi_estimator
+            )
+            wesad_mi = dict(zip(wesad_names, wesad_scores))
+            kemocon_mi = dict(zip(kemocon_names, kemocon_scores))
         
         # Combine scores and select top features
         feature_scores = []
@@ -156,9 +153,9 @@ def map_features(wesad_df, kemocon_df, feature_mapping=None, use_mutual_info=Tru
         selected_features = feature_scores[:top_n]
         
         # Print top features with scores
-        print(f"\nTop features by mutual information for {target}")
+        logger.debug("Top features by mutual information for %s", target)
         for wesad_name, kemocon_name, score in selected_features[:10]:
-            print(f"  {wesad_name}/{kemocon_name}: {score:.4f}")
+            logger.debug("%s/%s: %.4f", wesad_name, kemocon_name, score)
         
         # Extract feature names
         wesad_features = [f[0] for f in selected_features]
@@ -168,7 +165,7 @@ def map_features(wesad_df, kemocon_df, feature_mapping=None, use_mutual_info=Tru
         wesad_features = [f[0] for f in qualified_features]
         kemocon_features = [f[1] for f in qualified_features]
     
-    print(f"Selected {len(wesad_features)} common features between datasets")
+    logger.info("Selected %s common features between datasets", len(wesad_features))
     return wesad_features, kemocon_features
 
 
@@ -212,7 +209,7 @@ def convert_to_binary_targets(wesad_df, kemocon_df, target='arousal'):
         tuple: (wesad_y, kemocon_y) - Binary target variables
     """
     if target not in wesad_df.columns or target not in kemocon_df.columns:
-        print(f"Target variable '{target}' not found in both datasets")
+        logger.warning("Target variable '%s' not found in both datasets", target)
         return None, None
     
     # Convert to binary classification using median thresholds
@@ -223,7 +220,7 @@ def convert_to_binary_targets(wesad_df, kemocon_df, target='arousal'):
     kemocon_y = (kemocon_df[target] > kemocon_threshold).astype(int)
     
     # Report class distribution
-    print(f"WESAD {target} distribution: {np.bincount(wesad_y)}")
-    print(f"K-EmoCon {target} distribution: {np.bincount(kemocon_y)}")
+    logger.info("WESAD %s distribution: %s", target, np.bincount(wesad_y))
+    logger.info("K-EmoCon %s distribution: %s", target, np.bincount(kemocon_y))
     
     return wesad_y, kemocon_y
\ No newline at end of file
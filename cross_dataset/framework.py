@@ -2,15 +2,20 @@
 Main framework class for cross-dataset emotion recognition.
 """
 
+import logging
 import os
+import json
 import pickle
 import pandas as pd
 import numpy as np
 import joblib
+from sklearn.decomposition import PCA
 
 from .data.wesad_loader import process_wesad_data, get_available_subjects as get_wesad_subjects
 from .data.kemocon_loader import process_kemocon_data, get_available_participants
 from cross_dataset.features.extraction import extract_all_features
+from wesad_framework.utils.bundle import save_bundle
+from wesad_framework.utils.profiling import StageProfiler, data_shape
 from cross_dataset.features.mapping import (
     map_features, 
     create_mapped_dataframes, 
@@ -19,6 +24,7 @@ from cross_dataset.features.mapping import (
 )
 from cross_dataset.models.training import train_bidirectional_models
 from cross_dataset.models.evaluation import evaluate_bidirectional_models, print_classification_reports, evaluate_feature_importance
+from cross_dataset.models.compiled import CompiledEnsemble
 from cross_dataset.visualization.plots import (
     plot_confusion_matrices,
     plot_precision_recall_curves, 
@@ -26,7 +32,7 @@ from cross_dataset.visualization.plots import (
     plot_feature_importance,
     plot_domain_adaptation_effect
 )
-from cross_dataset.domain_adaptation.ensemble import measure_domain_gap
+from cross_dataset.domain_adaptation.ensemble import EnsembleAdapter, measure_domain_gap
 from cross_dataset.config import (
     DEFAULT_WESAD_SUBJECTS,
     DEFAULT_KEMOCON_PARTICIPANTS,
@@ -34,16 +40,19 @@ from cross_dataset.config import (
     SEGMENT_SIZE,
     RESULTS_DIR,
     SAVE_OPTIONS,
-    DEFAULT_SAVE_MODE
+    DEFAULT_SAVE_MODE,
+    SIMULATION_SAMPLES
 )
 
+logger = logging.getLogger(__name__)
+
 
 class CrossDatasetFramework:
     """
     Framework for cross-dataset emotion recognition between WESAD and K-EmoCon.
     """
     
-    def __init__(self, wesad_path=None, kemocon_path=None, results_dir=None, save_options=None):
+    def __init__(self, wesad_path=None, kemocon_path=None, results_dir=None, save_options=None, profiler=None):
         """
         Initialize the cross-dataset framework.
         
@@ -52,6 +61,7 @@ class CrossDatasetFramework:
             kemocon_path (str): Path to K-EmoCon dataset
             results_dir (str): Directory for saving results
             save_options (dict): Options controlling what to save
+            profiler (StageProfiler): Profiler recording the pipeline stages (disabled by default)
         """
         # Set paths from arguments or config
         if wesad_path:
@@ -64,6 +74,8 @@ class CrossDatasetFramework:
         else:
             self.results_dir = RESULTS_DIR
         
+        self.profiler = profiler or StageProfiler()
+        
         # Initialize dataset attributes
         self.wesad_data = None
         self.kemocon_data = None
@@ -80,17 +92,17 @@ class CrossDatasetFramework:
         if save_options:
             self.save_options.update(save_options)
         
-        print("Cross-dataset emotion recognition framework initialized")
+        logger.info("Cross-dataset emotion recognition framework initialized")
         if self.save_options['save_models']:
-            print("  Models will be saved")
+            logger.debug("Models will be saved")
         if self.save_options['save_features']:
-            print("  Feature information will be saved")
+            logger.debug("Feature information will be saved")
         if self.save_options['save_plots']:
-            print("  Plots will be generated and saved")
+            logger.debug("Plots will be generated and saved")
         if self.save_options['save_adaptation']:
-            print("  Adaptation data will be saved")
+            logger.debug("Adaptation data will be saved")
         if self.save_options['save_personal_models']:
-            print("  Individual models will be saved (including personal models)")
+            logger.debug("Individual models will be saved (including personal models)")
     
     def load_wesad_data(self, subject_ids=None):
         """
@@ -111,22 +123,25 @@ class CrossDatasetFramework:
         valid_subjects = [sid for sid in subject_ids if sid in available_subjects]
         
         if not valid_subjects:
-            print("No valid WESAD subjects found")
+            logger.warning("No valid WESAD subjects found")
             return None
         
         # Process WESAD data
-        self.wesad_data = process_wesad_data(
-            valid_subjects, 
-            extract_all_features, 
-            self.emotion_map, 
-            segment_size=SEGMENT_SIZE
-        )
+        with self.profiler.stage('extract', dataset='wesad', sources=len(valid_subjects)) as stage:
+            self.wesad_data = process_wesad_data(
+                valid_subjects, 
+                extract_all_features, 
+                self.emotion_map, 
+                segment_size=SEGMENT_SIZE
+            )
+            stage.update(data_shape(self.wesad_data))
         
         # Save processed data if enabled
         if self.save_options['save_features']:
-            data_file = os.path.join(self.results_dir, 'features', 'wesad_processed.csv')
-            self.wesad_data.to_csv(data_file, index=False)
-            print(f"Processed WESAD data saved to {data_file}")
+            with self.profiler.stage('save', dataset='wesad'):
+                data_file = os.path.join(self.results_dir, 'features', 'wesad_processed.csv')
+                self.wesad_data.to_csv(data_file, index=False)
+            logger.info("Processed WESAD data saved to %s", data_file)
         
         return self.wesad_data
     
@@ -149,36 +164,42 @@ class CrossDatasetFramework:
         valid_participants = [pid for pid in participant_ids if pid in available_participants]
         
         if not valid_participants:
-            print("No valid K-EmoCon participants found")
+            logger.warning("No valid K-EmoCon participants found")
             return None
         
         # Process K-EmoCon data
-        self.kemocon_data = process_kemocon_data(
-            valid_participants, 
-            extract_all_features, 
-            window_size=SEGMENT_SIZE
-        )
+        with self.profiler.stage('extract', dataset='kemocon', sources=len(valid_participants)) as stage:
+            self.kemocon_data = process_kemocon_data(
+                valid_participants, 
+                extract_all_features, 
+                window_size=SEGMENT_SIZE
+            )
+            stage.update(data_shape(self.kemocon_data))
         
         # Save processed data if enabled
         if self.save_options['save_features']:
-            data_file = os.path.join(self.results_dir, 'features', 'kemocon_processed.csv')
-            self.kemocon_data.to_csv(data_file, index=False)
-            print(f"Processed K-EmoCon data saved to {data_file}")
+            with self.profiler.stage('save', dataset='kemocon'):
+                data_file = os.path.join(self.results_dir, 'features', 'kemocon_processed.csv')
+                self.kemocon_data.to_csv(data_file, index=False)
+            logger.info("Processed K-EmoCon data saved to %s", data_file)
         
         return self.kemocon_data
     
-    def _save_model(self, model, name, scaler=None, metadata=None):
+    def _save_model(self, model, name, scaler=None, metadata=None, adapter=None, feature_names=None, threshold=None):
         """
-        Save a model and related artifacts.
+        Save a model and related artifacts as a model bundle.
         
         Args:
             model: Trained model
             name (str): Name for the saved model
             scaler: Fitted scaler (optional)
             metadata (dict): Additional metadata
+            adapter: Fitted domain adapter (optional)
+            feature_names (list): Target dataset features the model is applied to, in input order
+            threshold (float): Decision threshold on the high class probability
         
         Returns:
-            str: Path to saved model
+            str: Path to saved model bundle
         """
         if not self.save_options['save_models']:
             return None
@@ -187,36 +208,23 @@ class CrossDatasetFramework:
         models_dir = os.path.join(self.results_dir, 'models')
         os.makedirs(models_dir, exist_ok=True)
         
-        # Prepare full model package
-        model_package = {
-            'model': model,
-            'scaler': scaler,
-            'metadata': metadata or {}
-        }
-        
-        # Save with joblib for more efficient serialization
-        model_path = os.path.join(models_dir, f"{name}.joblib")
-        joblib.dump(model_package, model_path)
-        
-        # Save metadata separately as JSON for easy inspection
-        if metadata:
-            import json
-            
-            # Clean non-serializable types
-            clean_meta = {}
-            for key, value in metadata.items():
-                if isinstance(value, (np.ndarray, np.number)):
-                    clean_meta[key] = value.tolist() if hasattr(value, 'tolist') else float(value)
-                elif isinstance(value, dict):
-                    clean_meta[key] = {k: v for k, v in value.items() if not isinstance(v, (np.ndarray, np.number))}
-                else:
-                    clean_meta[key] = value
-            
-            meta_path = os.path.join(models_dir, f"{name}_metadata.json")
-            with open(meta_path, 'w') as f:
-                json.dump(clean_meta, f, indent=2)
-        
-        return model_path
+        # Array form of the ensemble for fast inference in the API
+        try:
+            arrays = {'compiled': CompiledEnsemble.from_voting(model).to_arrays()}
+        except TypeError:
+            arrays = None
+        
+        return save_bundle(
+            os.path.join(models_dir, name),
+            model,
+            feature_names=feature_names,
+            class_names=['low', 'high'],
+            scaler=scaler,
+            threshold=threshold,
+            metadata=metadata,
+            components={'adapter': adapter},
+            arrays=arrays
+        )
     
     def _save_adaptation_data(self, source_features, target_features, adapted_features, name):
         """
@@ -226,7 +234,7 @@ class CrossDatasetFramework:
             source_features (np.ndarray): Source domain features
             target_features (np.ndarray): Target domain features
             adapted_features (np.ndarray): Adapted source features
-            name (str): Name for the saved data
+            name (str): Name for the saved data ('{target}_{direction}')
         
         Returns:
             str: Path to saved data
@@ -238,8 +246,8 @@ class CrossDatasetFramework:
         adapt_dir = os.path.join(self.results_dir, 'adaptation')
         os.makedirs(adapt_dir, exist_ok=True)
         
-        # Measure domain gap reduction
-        gap_info = measure_domain_gap(source_features, target_features, adapted_features)
+        # Measure domain gap reduction, including distribution-level metrics
+        gap_info = measure_domain_gap(source_features, target_features, adapted_features, detailed=True)
         
         # Prepare data package
         adaptation_data = {
@@ -254,18 +262,19 @@ class CrossDatasetFramework:
         joblib.dump(adaptation_data, data_path)
         
         # Save gap info separately as CSV
-        gap_df = pd.DataFrame({
-            'metric': ['gap_before', 'gap_after', 'gap_reduction', 'gap_reduction_percent'],
-            'value': [
-                gap_info['gap_before'],
-                gap_info['gap_after'],
-                gap_info['gap_reduction'],
-                gap_info['gap_reduction_percent']
-            ]
-        })
+        metric_names = ['gap_before', 'gap_after', 'gap_reduction', 'gap_reduction_percent']
+        metric_values = [gap_info[metric] for metric in metric_names]
+        for metric, value in gap_info['metrics_before'].items():
+            metric_names.extend([f"{metric}_before", f"{metric}_after"])
+            metric_values.extend([value, gap_info['metrics_after'][metric]])
+        
+        gap_df = pd.DataFrame({'metric': metric_names, 'value': metric_values})
         gap_path = os.path.join(adapt_dir, f"{name}_gap.csv")
         gap_df.to_csv(gap_path, index=False)
         
+        # Save the domain gap visualization data served by the API
+        self._save_domain_gap_visualization(source_features, target_features, adapted_features, gap_info, name)
+        
         # Generate plot if enabled
         if self.save_options['save_plots']:
             from .visualization.plots import plot_domain_adaptation_effect
@@ -277,6 +286,142 @@ class CrossDatasetFramework:
         
         return data_path
     
+    def _save_adaptation_components(self, source_features, target_features, scaler, name,
+                                    adaptation_method=None):
+        """
+        Save the subspace, CORAL and scaling component maps for adaptation simulation.
+        
+        The components are fitted once on the scaled features and stored with a
+        subsample of both domains, so that any blend of the methods can later be
+        evaluated by mixing precomputed arrays (see the /simulate/adaptation
+        endpoint). A JSON summary of the gap measured with the trained
+        adaptation is saved next to it as {name}_components.json; {name}.json
+        is left to the gap data in the original feature space.
+        
+        Args:
+            source_features (np.ndarray): Source domain features
+            target_features (np.ndarray): Target domain features
+            scaler (object): Fitted scaler used by the model
+            name (str): Name for the saved data
+            adaptation_method (str): Adaptation method used for training
+        
+        Returns:
+            str: Path to saved components, or None if they could not be fitted
+        """
+        if not self.save_options['save_adaptation']:
+            return None
+        
+        adapt_dir = os.path.join(self.results_dir, 'adaptation')
+        os.makedirs(adapt_dir, exist_ok=True)
+        
+        source_scaled = scaler.transform(source_features)
+        target_scaled = scaler.transform(target_features)
+        
+        adapter = EnsembleAdapter().fit(source_scaled, target_scaled)
+        if not hasattr(adapter, 'component_matrices_'):
+            logger.warning("Could not fit adaptation components for %s", name)
+            return None
+        
+        source_mean = source_scaled.mean(axis=0)
+        target_mean = target_scaled.mean(axis=0)
+        # Adapted source mean of each component, for exact mean gaps of any blend
+        component_means = source_mean @ adapter.component_matrices_ + adapter.component_offsets_
+        
+        rng = np.random.default_rng(42)
+        source_idx = rng.choice(len(source_scaled), min(SIMULATION_SAMPLES, len(source_scaled)), replace=False)
+        target_idx = rng.choice(len(target_scaled), min(SIMULATION_SAMPLES, len(target_scaled)), replace=False)
+        
+        components_file = f"{name}_components.npz"
+        np.savez(
+            os.path.join(adapt_dir, components_file),
+            component_names=np.array(['subspace', 'coral', 'scaling']),
+            component_matrices=adapter.component_matrices_,
+            component_offsets=adapter.component_offsets_,
+            component_means=component_means,
+            source_mean=source_mean,
+            target_mean=target_mean,
+            source_sample=source_scaled[np.sort(source_idx)],
+            target_sample=target_scaled[np.sort(target_idx)]
+        )
+        
+        # Gap summary of the trained adaptation, in the scaled feature space
+        method_weights = {'subspace': [1.0, 0.0, 0.0], 'coral': [0.0, 1.0, 0.0]}
+        adapted_mean = np.asarray(method_weights.get(adaptation_method, adapter.weights_)) @ component_means
+        gap_before = float(np.linalg.norm(source_mean - target_mean))
+        gap_after = float(np.linalg.norm(adapted_mean - target_mean))
+        gap_reduction = 1.0 - gap_after / gap_before if gap_before > 0 else 0.0
+        
+        summary = {
+            'gap_before': gap_before,
+            'gap_after': gap_after,
+            'gap_reduction': gap_reduction,
+            'gap_reduction_percent': gap_reduction * 100.0,
+            'adaptation_method': adaptation_method,
+            'components_file': components_file
+        }
+        with open(os.path.join(adapt_dir, f"{name}_components.json"), 'w') as f:
+            json.dump(summary, f, indent=2)
+        
+        return os.path.join(adapt_dir, components_file)
+    
+    def _save_domain_gap_visualization(self, source_features, target_features, adapted_features,
+                                       gap_info, name, max_points=100):
+        """
+        Save PCA-projected samples and gap metrics as JSON for the domain gap view.
+        
+        The points are keyed by dataset ('wesad', 'kemocon') and 'adapted', as
+        in the shipped domain_gap_{target}.json files the client reads.
+        
+        Args:
+            source_features (np.ndarray): Source domain features
+            target_features (np.ndarray): Target domain features
+            adapted_features (np.ndarray): Adapted source features
+            gap_info (dict): Output of measure_domain_gap with detailed=True
+            name (str): Name for the saved data ('{target}_{direction}')
+            max_points (int): Maximum number of points saved per domain
+        
+        Returns:
+            str: Path to saved data
+        """
+        vis_dir = os.path.join(self.results_dir, 'visualizations')
+        os.makedirs(vis_dir, exist_ok=True)
+        
+        # Same rows for source and adapted points so they can be compared
+        rng = np.random.default_rng(42)
+        source_idx = np.sort(rng.choice(len(source_features), min(max_points, len(source_features)), replace=False))
+        target_idx = np.sort(rng.choice(len(target_features), min(max_points, len(target_features)), replace=False))
+        
+        pca = PCA(n_components=2)
+        pca.fit(np.vstack([source_features, target_features, adapted_features]))
+        
+        target, direction = name.split('_', 1)
+        source_dataset, target_dataset = direction.split('_to_')
+        vis_data = {
+            'target': target,
+            'direction': direction,
+            'data_points': {
+                source_dataset: pca.transform(source_features[source_idx]).tolist(),
+                target_dataset: pca.transform(target_features[target_idx]).tolist(),
+                'adapted': pca.transform(adapted_features[source_idx]).tolist()
+            },
+            'gap_measures': {
+                'before': float(gap_info['gap_before']),
+                'after': float(gap_info['gap_after']),
+                'reduction_pct': float(gap_info['gap_reduction_percent'])
+            },
+            'gap_metrics': {
+                'before': gap_info['metrics_before'],
+                'after': gap_info['metrics_after']
+            },
+            'pca_explained_variance': pca.explained_variance_ratio_.tolist()
+        }
+        
+        vis_path = os.path.join(vis_dir, f"domain_gap_{name}.json")
+        with open(vis_path, 'w') as f:
+            json.dump(vis_data, f, indent=2)
+        
+        return vis_path
+    
     def train_cross_dataset_models(self, target='arousal', adaptation_method=None):
         """
         Train cross-dataset models for a specific target.
@@ -289,213 +434,237 @@ class CrossDatasetFramework:
             dict: Trained models and evaluation results
         """
         if self.wesad_data is None or self.kemocon_data is None:
-            print("Both datasets must be loaded first")
+            logger.warning("Both datasets must be loaded first")
             return None
         
         # Use default adaptation method if none provided
         if adaptation_method is None:
             adaptation_method = DEFAULT_ADAPTATION_METHOD
         
-        print(f"\n===== Enhanced Cross-Dataset Training for {target.capitalize()} =====")
-        
-        # Get common features between datasets with mutual information filtering
-        wesad_features, kemocon_features = map_features(
-            self.wesad_data, self.kemocon_data, 
-            use_mutual_info=True, target=target
-        )
-        
-        if not wesad_features:
-            print("No common features found")
-            return None
-        
-        # Save feature mapping if enabled
-        if self.save_options['save_features']:
-            feature_dir = os.path.join(self.results_dir, 'features')
-            mapping_df = pd.DataFrame({
-                'wesad_feature': wesad_features,
-                'kemocon_feature': kemocon_features
-            })
-            mapping_df.to_csv(os.path.join(feature_dir, f"{target}_feature_mapping.csv"), index=False)
-        
-        # Create mapped dataframes with only the selected features
-        wesad_mapped, kemocon_mapped = create_mapped_dataframes(
-            self.wesad_data, self.kemocon_data,
-            wesad_features, kemocon_features
-        )
-        
-        # Convert targets to binary classification
-        wesad_y, kemocon_y = convert_to_binary_targets(wesad_mapped, kemocon_mapped, target)
-        
-        # Extract feature arrays
-        wesad_X = wesad_mapped[wesad_features].values
-        kemocon_X = kemocon_mapped[kemocon_features].values
+        logger.info("===== Enhanced Cross-Dataset Training for %s =====", target.capitalize())
         
-        # Train bidirectional models
-        models = train_bidirectional_models(
-            wesad_X, wesad_y, kemocon_X, kemocon_y, adaptation_method
-        )
+        with self.profiler.stage('select', target=target) as stage:
+            # Get common features between datasets with mutual information filtering
+            wesad_features, kemocon_features = map_features(
+                self.wesad_data, self.kemocon_data, 
+                use_mutual_info=True, target=target
+            )
+            
+            if not wesad_features:
+                logger.warning("No common features found")
+                return None
+            
+            # Save feature mapping if enabled
+            if self.save_options['save_features']:
+                feature_dir = os.path.join(self.results_dir, 'features')
+                mapping_df = pd.DataFrame({
+                    'wesad_feature': wesad_features,
+                    'kemocon_feature': kemocon_features
+                })
+                mapping_df.to_csv(os.path.join(feature_dir, f"{target}_feature_mapping.csv"), index=False)
+            
+            # Create mapped dataframes with only the selected features
+            wesad_mapped, kemocon_mapped = create_mapped_dataframes(
+                self.wesad_data, self.kemocon_data,
+                wesad_features, kemocon_features
+            )
+            
+            # Convert targets to binary classification
+            wesad_y, kemocon_y = convert_to_binary_targets(wesad_mapped, kemocon_mapped, target)
+            
+            # Extract feature arrays
+            wesad_X = wesad_mapped[wesad_features].values
+            kemocon_X = kemocon_mapped[kemocon_features].values
+            stage.update(wesad_rows=len(wesad_X), kemocon_rows=len(kemocon_X), columns=len(wesad_features))
+        
+        with self.profiler.stage('train', target=target, adaptation_method=adaptation_method):
+            # Train bidirectional models
+            models = train_bidirectional_models(
+                wesad_X, wesad_y, kemocon_X, kemocon_y, adaptation_method
+            )
         
         # Extract adapted features for saving/visualization
         if adaptation_method and adaptation_method != 'none' and self.save_options['save_adaptation']:
-            w2k_adapted = models['wesad_to_kemocon']['info'].get('adapted_features')
-            k2w_adapted = models['kemocon_to_wesad']['info'].get('adapted_features')
-            
-            if w2k_adapted is not None:
-                self._save_adaptation_data(
-                    wesad_X, kemocon_X, w2k_adapted,
-                    f"{target}_wesad_to_kemocon"
-                )
+            with self.profiler.stage('save', target=target, artifacts='adaptation'):
+                w2k_adapted = models['wesad_to_kemocon']['info'].get('adapted_features')
+                k2w_adapted = models['kemocon_to_wesad']['info'].get('adapted_features')
+                
+                if w2k_adapted is not None:
+                    self._save_adaptation_data(
+                        wesad_X, kemocon_X, w2k_adapted,
+                        f"{target}_wesad_to_kemocon"
+                    )
+                    self._save_adaptation_components(
+                        wesad_X, kemocon_X, models['wesad_to_kemocon']['scaler'],
+                        f"{target}_wesad_to_kemocon", adaptation_method
+                    )
+                
+                if k2w_adapted is not None:
+                    self._save_adaptation_data(
+                        kemocon_X, wesad_X, k2w_adapted,
+                        f"{target}_kemocon_to_wesad"
+                    )
+                    self._save_adaptation_components(
+                        kemocon_X, wesad_X, models['kemocon_to_wesad']['scaler'],
+                        f"{target}_kemocon_to_wesad", adaptation_method
+                    )
+        
+        with self.profiler.stage('evaluate', target=target):
+            # Evaluate models
+            evaluation = evaluate_bidirectional_models(
+                models, wesad_X, wesad_y, kemocon_X, kemocon_y
+            )
             
-            if k2w_adapted is not None:
-                self._save_adaptation_data(
-                    kemocon_X, wesad_X, k2w_adapted,
-                    f"{target}_kemocon_to_wesad"
-                )
+            # Print detailed classification reports
+            print_classification_reports(evaluation)
         
         # Save the models if enabled
         if self.save_options['save_models']:
-            # Always save base models
-            self._save_model(
-                models['wesad_to_kemocon']['model'],
-                f"{target}_wesad_to_kemocon_model",
-                scaler=models['wesad_to_kemocon']['scaler'],
-                metadata={
-                    'target': target,
-                    'adaptation_method': adaptation_method,
-                    'n_features': len(wesad_features),
-                    'features': wesad_features,
-                    'target_features': kemocon_features,
-                    'class_balance': models['wesad_to_kemocon']['info'].get('class_distribution')
-                }
-            )
+            with self.profiler.stage('save', target=target, artifacts='models'):
+                # Always save base models
+                self._save_model(
+                    models['wesad_to_kemocon']['model'],
+                    f"{target}_wesad_to_kemocon_model",
+                    scaler=models['wesad_to_kemocon']['scaler'],
+                    feature_names=kemocon_features,
+                    threshold=evaluation['wesad_to_kemocon']['threshold'],
+                    adapter=models['wesad_to_kemocon']['info'].get('adapter'),
+                    metadata={
+                        'target': target,
+                        'adaptation_method': adaptation_method,
+                        'n_features': len(wesad_features),
+                        'features': wesad_features,
+                        'target_features': kemocon_features,
+                        'class_balance': models['wesad_to_kemocon']['info'].get('class_distribution')
+                    }
+                )
+                
+                self._save_model(
+                    models['kemocon_to_wesad']['model'],
+                    f"{target}_kemocon_to_wesad_model",
+                    scaler=models['kemocon_to_wesad']['scaler'],
+                    feature_names=wesad_features,
+                    threshold=evaluation['kemocon_to_wesad']['threshold'],
+                    adapter=models['kemocon_to_wesad']['info'].get('adapter'),
+                    metadata={
+                        'target': target,
+                        'adaptation_method': adaptation_method,
+                        'n_features': len(kemocon_features),
+                        'features': kemocon_features,
+                        'target_features': wesad_features,
+                        'class_balance': models['kemocon_to_wesad']['info'].get('class_distribution')
+                    }
+                )
+                
+                # Save component models if full saving is enabled
+                if self.save_options['save_personal_models']:
+                    # Extract and save individual models from the ensemble
+                    if hasattr(models['wesad_to_kemocon']['model'], 'named_estimators_'):
+                        w2k_estimators = models['wesad_to_kemocon']['model'].named_estimators_
+                        for name, estimator in w2k_estimators.items():
+                            self._save_model(
+                                estimator,
+                                f"{target}_wesad_to_kemocon_{name}",
+                                scaler=models['wesad_to_kemocon']['scaler'],
+                                feature_names=kemocon_features
+                            )
+                    
+                    if hasattr(models['kemocon_to_wesad']['model'], 'named_estimators_'):
+                        k2w_estimators = models['kemocon_to_wesad']['model'].named_estimators_
+                        for name, estimator in k2w_estimators.items():
+                            self._save_model(
+                                estimator,
+                                f"{target}_kemocon_to_wesad_{name}",
+                                scaler=models['kemocon_to_wesad']['scaler'],
+                                feature_names=wesad_features
+                            )
+        
+        with self.profiler.stage('save', target=target, artifacts='results'):
+            # Save evaluation results
+            results_dir = os.path.join(self.results_dir, 'results', target)
+            os.makedirs(results_dir, exist_ok=True)
             
-            self._save_model(
-                models['kemocon_to_wesad']['model'],
-                f"{target}_kemocon_to_wesad_model",
-                scaler=models['kemocon_to_wesad']['scaler'],
-                metadata={
-                    'target': target,
-                    'adaptation_method': adaptation_method,
-                    'n_features': len(kemocon_features),
-                    'features': kemocon_features,
-                    'target_features': wesad_features,
-                    'class_balance': models['kemocon_to_wesad']['info'].get('class_distribution')
+            # Create summary metrics DataFrame
+            metrics = pd.DataFrame({
+                'wesad_to_kemocon': {
+                    'accuracy': evaluation['wesad_to_kemocon']['accuracy'],
+                    'f1_score': evaluation['wesad_to_kemocon']['f1_score'],
+                    'balanced_accuracy': evaluation['wesad_to_kemocon']['balanced_accuracy'],
+                    'roc_auc': evaluation['wesad_to_kemocon']['roc_auc'],
+                    'pr_auc': evaluation['wesad_to_kemocon']['pr_auc'],
+                    'threshold': evaluation['wesad_to_kemocon']['threshold']
+                },
+                'kemocon_to_wesad': {
+                    'accuracy': evaluation['kemocon_to_wesad']['accuracy'],
+                    'f1_score': evaluation['kemocon_to_wesad']['f1_score'],
+                    'balanced_accuracy': evaluation['kemocon_to_wesad']['balanced_accuracy'],
+                    'roc_auc': evaluation['kemocon_to_wesad']['roc_auc'],
+                    'pr_auc': evaluation['kemocon_to_wesad']['pr_auc'],
+                    'threshold': evaluation['kemocon_to_wesad']['threshold']
                 }
-            )
-            
-            # Save component models if full saving is enabled
-            if self.save_options['save_personal_models']:
-                # Extract and save individual models from the ensemble
-                if hasattr(models['wesad_to_kemocon']['model'], 'named_estimators_'):
-                    w2k_estimators = models['wesad_to_kemocon']['model'].named_estimators_
-                    for name, estimator in w2k_estimators.items():
-                        self._save_model(
-                            estimator,
-                            f"{target}_wesad_to_kemocon_{name}",
-                            scaler=models['wesad_to_kemocon']['scaler']
-                        )
-                
-                if hasattr(models['kemocon_to_wesad']['model'], 'named_estimators_'):
-                    k2w_estimators = models['kemocon_to_wesad']['model'].named_estimators_
-                    for name, estimator in k2w_estimators.items():
-                        self._save_model(
-                            estimator,
-                            f"{target}_kemocon_to_wesad_{name}",
-                            scaler=models['kemocon_to_wesad']['scaler']
-                        )
-        
-        # Evaluate models
-        evaluation = evaluate_bidirectional_models(
-            models, wesad_X, wesad_y, kemocon_X, kemocon_y
-        )
-        
-        # Print detailed classification reports
-        print_classification_reports(evaluation)
-        
-        # Save evaluation results
-        results_dir = os.path.join(self.results_dir, 'results', target)
-        os.makedirs(results_dir, exist_ok=True)
-        
-        # Create summary metrics DataFrame
-        metrics = pd.DataFrame({
-            'wesad_to_kemocon': {
-                'accuracy': evaluation['wesad_to_kemocon']['accuracy'],
-                'f1_score': evaluation['wesad_to_kemocon']['f1_score'],
-                'balanced_accuracy': evaluation['wesad_to_kemocon']['balanced_accuracy'],
-                'roc_auc': evaluation['wesad_to_kemocon']['roc_auc'],
-                'pr_auc': evaluation['wesad_to_kemocon']['pr_auc'],
-                'threshold': evaluation['wesad_to_kemocon']['threshold']
-            },
-            'kemocon_to_wesad': {
-                'accuracy': evaluation['kemocon_to_wesad']['accuracy'],
-                'f1_score': evaluation['kemocon_to_wesad']['f1_score'],
-                'balanced_accuracy': evaluation['kemocon_to_wesad']['balanced_accuracy'],
-                'roc_auc': evaluation['kemocon_to_wesad']['roc_auc'],
-                'pr_auc': evaluation['kemocon_to_wesad']['pr_auc'],
-                'threshold': evaluation['kemocon_to_wesad']['threshold']
-            }
-        }).T
-        
-        # Save summary metrics
-        metrics.to_csv(os.path.join(results_dir, 'metrics_summary.csv'))
-        
-        # Save detailed classification reports
-        w2k_report = pd.DataFrame(evaluation['wesad_to_kemocon']['classification_report']).T
-        k2w_report = pd.DataFrame(evaluation['kemocon_to_wesad']['classification_report']).T
-        
-        w2k_report.to_csv(os.path.join(results_dir, 'wesad_to_kemocon_classification.csv'))
-        k2w_report.to_csv(os.path.join(results_dir, 'kemocon_to_wesad_classification.csv'))
-        
-        # Save confusion matrices
-        w2k_cm = pd.DataFrame(
-            evaluation['wesad_to_kemocon']['confusion_matrix'],
-            columns=['Pred_Low', 'Pred_High'],
-            index=['True_Low', 'True_High']
-        )
-        k2w_cm = pd.DataFrame(
-            evaluation['kemocon_to_wesad']['confusion_matrix'],
-            columns=['Pred_Low', 'Pred_High'],
-            index=['True_Low', 'True_High']
-        )
-        
-        w2k_cm.to_csv(os.path.join(results_dir, 'wesad_to_kemocon_confusion.csv'))
-        k2w_cm.to_csv(os.path.join(results_dir, 'kemocon_to_wesad_confusion.csv'))
-        
-        # Generate and save visualizations if enabled
-        if self.save_options['save_plots']:
-            viz_dir = os.path.join(self.results_dir, 'visualizations', target)
-            os.makedirs(viz_dir, exist_ok=True)
+            }).T
             
-            # Save paths instead of just returning them
-            cm_path = plot_confusion_matrices(evaluation, target, output_dir=viz_dir)
-            pr_path = plot_precision_recall_curves(evaluation, target, output_dir=viz_dir)
+            # Save summary metrics
+            metrics.to_csv(os.path.join(results_dir, 'metrics_summary.csv'))
             
-            # Plot class distributions
-            w2k_info = models['wesad_to_kemocon']['info']
-            k2w_info = models['kemocon_to_wesad']['info']
+            # Save detailed classification reports
+            w2k_report = pd.DataFrame(evaluation['wesad_to_kemocon']['classification_report']).T
+            k2w_report = pd.DataFrame(evaluation['kemocon_to_wesad']['classification_report']).T
             
-            # Create balanced distributions for visualization
-            wesad_balanced_y = np.zeros(sum(w2k_info['class_distribution']), dtype=np.int64)
-            wesad_balanced_y[w2k_info['class_distribution'][0]:] = 1
-
-            kemocon_balanced_y = np.zeros(sum(k2w_info['class_distribution']), dtype=np.int64) 
-            kemocon_balanced_y[k2w_info['class_distribution'][0]:] = 1
+            w2k_report.to_csv(os.path.join(results_dir, 'wesad_to_kemocon_classification.csv'))
+            k2w_report.to_csv(os.path.join(results_dir, 'kemocon_to_wesad_classification.csv'))
             
-            dist_path = plot_class_distributions(
-                wesad_y, kemocon_y, 
-                wesad_balanced_y, kemocon_balanced_y, 
-                target, output_dir=viz_dir
+            # Save confusion matrices
+            w2k_cm = pd.DataFrame(
+                evaluation['wesad_to_kemocon']['confusion_matrix'],
+                columns=['Pred_Low', 'Pred_High'],
+                index=['True_Low', 'True_High']
+            )
+            k2w_cm = pd.DataFrame(
+                evaluation['kemocon_to_wesad']['confusion_matrix'],
+                columns=['Pred_Low', 'Pred_High'],
+                index=['True_Low', 'True_High']
             )
             
-            # Extract and plot feature importance
-            w2k_model = models['wesad_to_kemocon']['model']
-            importance_df = evaluate_feature_importance(w2k_model, wesad_features)
-            
-            # Save feature importance data
-            importance_df.to_csv(os.path.join(results_dir, 'feature_importance.csv'), index=False)
-            
-            # Plot feature importance
-            imp_path = plot_feature_importance(importance_df, target, output_dir=viz_dir)
+            w2k_cm.to_csv(os.path.join(results_dir, 'wesad_to_kemocon_confusion.csv'))
+            k2w_cm.to_csv(os.path.join(results_dir, 'kemocon_to_wesad_confusion.csv'))
+        
+        # Generate and save visualizations if enabled
+        if self.save_options['save_plots']:
+            with self.profiler.stage('plot', target=target):
+                viz_dir = os.path.join(self.results_dir, 'visualizations', target)
+                os.makedirs(viz_dir, exist_ok=True)
+                
+                # Save paths instead of just returning them
+                cm_path = plot_confusion_matrices(evaluation, target, output_dir=viz_dir)
+                pr_path = plot_precision_recall_curves(evaluation, target, output_dir=viz_dir)
+                
+                # Plot class distributions
+                w2k_info = models['wesad_to_kemocon']['info']
+                k2w_info = models['kemocon_to_wesad']['info']
+                
+                # Create balanced distributions for visualization
+                wesad_balanced_y = np.zeros(sum(w2k_info['class_distribution']), dtype=np.int64)
+                wesad_balanced_y[w2k_info['class_distribution'][0]:] = 1
+
+                kemocon_balanced_y = np.zeros(sum(k2w_info['class_distribution']), dtype=np.int64) 
+                kemocon_balanced_y[k2w_info['class_distribution'][0]:] = 1
+                
+                dist_path = plot_class_distributions(
+                    wesad_y, kemocon_y, 
+                    wesad_balanced_y, kemocon_balanced_y, 
+                    target, output_dir=viz_dir
+                )
+                
+                # Extract and plot feature importance
+                w2k_model = models['wesad_to_kemocon']['model']
+                importance_df = evaluate_feature_importance(w2k_model, wesad_features)
+                
+                # Save feature importance data
+                importance_df.to_csv(os.path.join(results_dir, 'feature_importance.csv'), index=False)
+                
+                # Plot feature importance
+                imp_path = plot_feature_importance(importance_df, target, output_dir=viz_dir)
         
         # Store models for later use
         if target == 'arousal':
@@ -11,6 +11,8 @@ import sys
 from datetime import datetime
 
 from cross_dataset.framework import CrossDatasetFramework
+from wesad_framework.utils.log import configure_logging, LOG_FORMAT_ENV, LOG_FORMATS
+from wesad_framework.utils.profiling import StageProfiler
 from .config import (
     WESAD_PATH, 
     KEMOCON_PATH, 
@@ -83,6 +85,34 @@ def parse_args():
         help='Output directory for results'
     )
     
+    # Logging
+    parser.add_argument(
+        '--log-level',
+        type=str,
+        default=None,
+        choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'],
+        help='Minimum log level (default: $NEUROFEEL_LOG_LEVEL or INFO)'
+    )
+    
+    parser.add_argument(
+        '--log-format',
+        type=str,
+        default=os.environ.get(LOG_FORMAT_ENV, 'text'),
+        choices=list(LOG_FORMATS),
+        help='Plain text console output or JSON records'
+    )
+    
+    # Profiling
+    parser.add_argument(
+        '--profile',
+        nargs='?',
+        const='trace',
+        default=None,
+        choices=['trace', 'cprofile'],
+        help=('Record wall/CPU time, peak memory and data sizes of each pipeline stage as a '
+              'Chrome trace (profile_trace.json); "--profile cprofile" also dumps cProfile stats per stage')
+    )
+    
     # Saving options
     save_group = parser.add_argument_group('Saving options')
     save_group.add_argument(
@@ -233,6 +263,7 @@ def main():
     """Main function."""
     # Parse command line arguments
     args = parse_args()
+    configure_logging(args.log_level, args.log_format)
     
     # Apply save mode and override with explicit flags
     args = apply_save_mode(args)
@@ -248,6 +279,13 @@ def main():
     # Save configuration
     save_config(args, results_dir)
     
+    # Stage profiling (disabled unless --profile is given)
+    profiler = StageProfiler(
+        enabled=args.profile is not None,
+        cprofile=args.profile == 'cprofile',
+        output_dir=results_dir
+    )
+    
     # Initialize framework with saving options
     framework = CrossDatasetFramework(
         wesad_path=args.wesad_path,
@@ -260,7 +298,8 @@ def main():
             'save_results': True,  # Always save results
             'save_adaptation': args.save_adaptation,
             'save_personal_models': args.save_personal_models
-        }
+        },
+        profiler=profiler
     )
     
     # Load datasets
@@ -289,6 +328,8 @@ def main():
         os.makedirs(demo_dir, exist_ok=True)
         save_demo_samples(framework, sample_size=20, save_dir=demo_dir)
     
+    profiler.save()
+    
     print(f"\nResults saved to {results_dir}")
 
 
@@ -5,9 +5,11 @@ Model training and evaluation modules.
 from .balancing import apply_class_balancing, check_class_imbalance, create_sample_weights
 from .training import train_cross_dataset_model, train_reverse_model, train_bidirectional_models
 from .evaluation import evaluate_model, evaluate_feature_importance, evaluate_bidirectional_models
+from .compiled import CompiledEnsemble, compile_model
 
 __all__ = [
     'apply_class_balancing', 'check_class_imbalance', 'create_sample_weights',
     'train_cross_dataset_model', 'train_reverse_model', 'train_bidirectional_models',
-    'evaluate_model', 'evaluate_feature_importance', 'evaluate_bidirectional_models'
+    'evaluate_model', 'evaluate_feature_importance', 'evaluate_bidirectional_models',
+    'CompiledEnsemble', 'compile_model'
 ]
\ No newline at end of file
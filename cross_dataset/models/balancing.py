@@ -2,6 +2,7 @@
 Class balancing techniques for handling imbalanced datasets.
 """
 
+import logging
 import numpy as np
 from sklearn.model_selection import train_test_split
 from sklearn.ensemble import RandomForestClassifier
@@ -16,6 +17,8 @@ from cross_dataset.config import (
     CV_TEST_SIZE
 )
 
+logger = logging.getLogger(__name__)
+
 
 def check_class_imbalance(y):
     """
@@ -84,7 +87,7 @@ def select_best_resampling_method(X, y, methods=None):
             y_pred = temp_model.predict(X_val)
             f1 = f1_score(y_val, y_pred, average='macro')  # Use macro F1 for imbalanced data
             
-            print(f"  {name} resampling F1: {f1:.4f}, distribution: {np.bincount(y_res)}")
+            logger.debug("%s resampling F1: %.4f, distribution: %s", name, f1, np.bincount(y_res))
             
             # Update if better
             if f1 > best_f1:
@@ -94,7 +97,7 @@ def select_best_resampling_method(X, y, methods=None):
                 best_X = X_res
                 best_y = y_res
         except Exception as e:
-            print(f"  {name} resampling failed: {e}")
+            logger.warning("%s resampling failed: %s", name, e)
     
     return best_name, best_method, best_f1, best_X, best_y
 
@@ -116,22 +119,22 @@ def apply_class_balancing(X, y, method=CLASS_BALANCE_METHOD):
     if not needs_balancing:
         return X, y
     
-    print(f"Applying class balancing (imbalance ratio: {ratio:.2f})...")
+    logger.info("Applying class balancing (imbalance ratio: %.2f)...", ratio)
     
     if method == 'auto':
         # Use CV to select best method
         name, resampler, f1, X_res, y_res = select_best_resampling_method(X, y)
         
         if name:
-            print(f"  Selected {name} resampling method (F1: {f1:.4f})")
+            logger.info("Selected %s resampling method (F1: %.4f)", name, f1)
             
             # Apply to full dataset for consistency
             try:
                 X_resampled, y_resampled = resampler.fit_resample(X, y)
-                print(f"  Class distribution after resampling: {np.bincount(y_resampled)}")
+                logger.info("Class distribution after resampling: %s", np.bincount(y_resampled))
                 return X_resampled, y_resampled
             except Exception as e:
-                print(f"  Failed to apply to full dataset: {e}, using best CV result")
+                logger.info("Failed to apply to full dataset: %s, using best CV result", e)
                 return X_res, y_res
     
     # Apply specific method
@@ -143,15 +146,15 @@ def apply_class_balancing(X, y, method=CLASS_BALANCE_METHOD):
         elif method == 'SMOTEENN':
             resampler = SMOTEENN(random_state=42)
         else:
-            print(f"Unknown resampling method: {method}, using SMOTE")
+            logger.warning("Unknown resampling method: %s, using SMOTE", method)
             resampler = SMOTE(random_state=42, sampling_strategy=SAMPLING_STRATEGY)
         
         X_resampled, y_resampled = resampler.fit_resample(X, y)
-        print(f"  Class distribution after {method} resampling: {np.bincount(y_resampled)}")
+        logger.info("Class distribution after %s resampling: %s", method, np.bincount(y_resampled))
         return X_resampled, y_resampled
     
     except Exception as e:
-        print(f"Resampling failed: {e}")
+        logger.warning("Resampling failed: %s", e)
         return X, y
 
 
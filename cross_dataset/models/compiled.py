@@ -0,0 +1,339 @@
+"""
+Compiled inference for the soft-voting RF + GB + SVC ensemble.
+
+sklearn's VotingClassifier.predict_proba calls every tree of the random
+forest and every stage of the gradient boosting model from Python. Here all
+trees of both models are flattened into one set of contiguous node arrays
+and evaluated together by a vectorized level-by-level traversal over the
+whole batch. The SVC is reduced to its support vectors, dual coefficients
+and Platt scaling parameters, and the voting weights are folded into the
+per-model leaf values, so predict_proba is a handful of array operations for
+any batch size.
+"""
+
+import logging
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier, VotingClassifier
+from sklearn.svm import SVC
+
+logger = logging.getLogger(__name__)
+
+
+# Probability clipping applied by libsvm to the Platt-scaled pairwise probabilities
+LIBSVM_MIN_PROB = 1e-7
+
+
+def _flatten_trees(trees, values, n_outputs):
+    """
+    Concatenate fitted trees into global node arrays.
+    
+    Leaves point to themselves, so extra traversal steps keep a sample on its leaf.
+    
+    Args:
+        trees (list): sklearn Tree objects
+        values (list): Leaf value array (n_nodes, n_outputs) of each tree
+        n_outputs (int): Width of the leaf values
+    
+    Returns:
+        dict: feature, threshold, children, value, roots and depth arrays
+    """
+    features, thresholds, children, node_values, roots = [], [], [], [], []
+    offset = 0
+    depth = 0
+    for tree, value in zip(trees, values):
+        node_ids = np.arange(tree.node_count)
+        is_leaf = tree.children_left == -1
+        
+        features.append(np.where(is_leaf, 0, tree.feature))
+        thresholds.append(np.where(is_leaf, np.inf, tree.threshold))
+        # Children of node i at 2 * i (left) and 2 * i + 1 (right), so one gather selects the next node
+        left = np.where(is_leaf, node_ids, tree.children_left) + offset
+        right = np.where(is_leaf, node_ids, tree.children_right) + offset
+        children.append(np.column_stack([left, right]).ravel())
+        node_values.append(value.reshape(tree.node_count, n_outputs))
+        roots.append(offset)
+        
+        offset += tree.node_count
+        depth = max(depth, tree.max_depth)
+    
+    return {
+        'feature': np.concatenate(features).astype(np.int32),
+        'threshold': np.concatenate(thresholds).astype(np.float64),
+        'children': np.concatenate(children).astype(np.int32),
+        'value': np.concatenate(node_values).astype(np.float64),
+        'roots': np.array(roots, dtype=np.int32),
+        'depth': np.array(depth)
+    }
+
+
+def _forest_values(forest, weight):
+    """Leaf class probabilities of each tree, scaled by weight / n_trees."""
+    values = []
+    for estimator in forest.estimators_:
+        value = estimator.tree_.value[:, 0, :]
+        totals = value.sum(axis=1, keepdims=True)
+        totals[totals == 0] = 1.0
+        values.append(value / totals * (weight / len(forest.estimators_)))
+    return values
+
+
+def _boosting_values(boosting, n_classes):
+    """Leaf values of each regression tree scaled by the learning rate, in its class column."""
+    trees, values = [], []
+    n_columns = boosting.estimators_.shape[1]
+    for stage in boosting.estimators_:
+        for k, estimator in enumerate(stage):
+            value = np.zeros((estimator.tree_.node_count, n_classes))
+            value[:, k if n_columns > 1 else 0] = estimator.tree_.value[:, 0, 0] * boosting.learning_rate
+            trees.append(estimator.tree_)
+            values.append(value)
+    return trees, values
+
+
+def _pairwise_coupling(first_proba, max_iter=100):
+    """
+    libsvm's multiclass_probability for two classes.
+    
+    libsvm runs its iterative pairwise coupling even for binary problems, which
+    moves the Platt-scaled probability slightly; this reproduces it exactly.
+    
+    Args:
+        first_proba (np.ndarray): Clipped pairwise probability of the first class
+        max_iter (int): Maximum number of iterations
+    
+    Returns:
+        np.ndarray: Probability of the second class
+    """
+    r01 = first_proba
+    r10 = 1 - r01
+    q = [[r10 ** 2, -r10 * r01], [-r10 * r01, r01 ** 2]]
+    p = [np.full_like(r01, 0.5), np.full_like(r01, 0.5)]
+    eps = 0.005 / 2
+    active = np.ones(r01.shape, dtype=bool)
+    
+    for _ in range(max_iter):
+        qp = [q[0][0] * p[0] + q[0][1] * p[1], q[1][0] * p[0] + q[1][1] * p[1]]
+        pqp = p[0] * qp[0] + p[1] * qp[1]
+        active &= np.maximum(np.abs(qp[0] - pqp), np.abs(qp[1] - pqp)) >= eps
+        if not active.any():
+            break
+        for t in (0, 1):
+            diff = np.where(active, (pqp - qp[t]) / q[t][t], 0.0)
+            p[t] = p[t] + diff
+            pqp = (pqp + diff * (diff * q[t][t] + 2 * qp[t])) / (1 + diff) ** 2
+            qp = [(qp[j] + diff * q[t][j]) / (1 + diff) for j in (0, 1)]
+            p = [p[j] / (1 + diff) for j in (0, 1)]
+    return p[1]
+
+
+def _kernel(X, support_vectors, kernel, gamma, coef0, degree):
+    """Kernel matrix between samples and support vectors."""
+    if kernel == 'linear':
+        return X @ support_vectors.T
+    if kernel == 'rbf':
+        sq_dists = (np.sum(X ** 2, axis=1)[:, np.newaxis] + np.sum(support_vectors ** 2, axis=1)[np.newaxis, :]
+                    - 2 * X @ support_vectors.T)
+        return np.exp(-gamma * np.maximum(sq_dists, 0))
+    if kernel == 'poly':
+        return (gamma * X @ support_vectors.T + coef0) ** degree
+    if kernel == 'sigmoid':
+        return np.tanh(gamma * X @ support_vectors.T + coef0)
+    raise ValueError(f"Unsupported SVC kernel: {kernel}")
+
+
+class CompiledEnsemble:
+    """
+    Array-based predict_proba for a soft-voting RF + GB + SVC ensemble on a binary target.
+    """
+    
+    SVC_KERNELS = ('linear', 'rbf', 'poly', 'sigmoid')
+    
+    def __init__(self, arrays):
+        """
+        Initialize from exported arrays.
+        
+        Args:
+            arrays (dict): Arrays produced by from_voting (see to_arrays)
+        """
+        self.arrays = dict(arrays)
+        self.classes_ = np.asarray(self.arrays['classes'])
+        self.kernel = str(self.arrays['svc_kernel'])
+        self._n_forest_trees = int(self.arrays['n_forest_trees'])
+        self._depth = int(self.arrays['depth'])
+    
+    @classmethod
+    def from_voting(cls, ensemble):
+        """
+        Compile a fitted VotingClassifier with soft voting.
+        
+        Args:
+            ensemble (VotingClassifier): Fitted ensemble of one RandomForestClassifier,
+                one GradientBoostingClassifier and one SVC(probability=True)
+        
+        Returns:
+            CompiledEnsemble: Compiled ensemble
+        """
+        if not isinstance(ensemble, VotingClassifier) or ensemble.voting != 'soft':
+            raise TypeError(f"Cannot compile {type(ensemble).__name__}: expected a soft VotingClassifier")
+        if len(ensemble.classes_) != 2:
+            raise TypeError("Only binary ensembles can be compiled")
+        
+        weights = np.ones(len(ensemble.estimators_)) if ensemble.weights is None else np.asarray(ensemble.weights, float)
+        weights = weights / weights.sum()
+        
+        by_type = {}
+        for estimator, weight in zip(ensemble.estimators_, weights):
+            for kind in (RandomForestClassifier, GradientBoostingClassifier, SVC):
+                if isinstance(estimator, kind) and kind not in by_type:
+                    by_type[kind] = (estimator, weight)
+                    break
+            else:
+                raise TypeError(f"Cannot compile ensemble member {type(estimator).__name__}")
+        if len(by_type) != 3:
+            raise TypeError("Expected one random forest, one gradient boosting model and one SVC")
+        
+        forest, forest_weight = by_type[RandomForestClassifier]
+        boosting, boosting_weight = by_type[GradientBoostingClassifier]
+        svc, svc_weight = by_type[SVC]
+        if svc.kernel not in cls.SVC_KERNELS or not getattr(svc, 'probability', False):
+            raise TypeError(f"Cannot compile SVC with kernel={svc.kernel!r}, probability={svc.probability}")
+        
+        n_classes = len(ensemble.classes_)
+        boosting_trees, boosting_values = _boosting_values(boosting, n_classes)
+        nodes = _flatten_trees(
+            [estimator.tree_ for estimator in forest.estimators_] + boosting_trees,
+            _forest_values(forest, forest_weight) + boosting_values,
+            n_classes
+        )
+        
+        # Constant raw score of the boosting init estimator (prior log-odds)
+        boosting_init = boosting._raw_predict_init(np.zeros((1, boosting.n_features_in_)))[0]
+        
+        arrays = {
+            'classes': np.asarray(ensemble.classes_),
+            'n_forest_trees': np.array(len(forest.estimators_)),
+            'boosting_init': boosting_init[:1].astype(np.float64),
+            'boosting_weight': np.array(boosting_weight),
+            'svc_support_vectors': np.asarray(svc.support_vectors_, dtype=np.float64),
+            'svc_dual_coef': np.asarray(svc.dual_coef_[0], dtype=np.float64),
+            'svc_intercept': np.array(svc.intercept_[0], dtype=np.float64),
+            'svc_prob_a': np.array(svc.probA_[0], dtype=np.float64),
+            'svc_prob_b': np.array(svc.probB_[0], dtype=np.float64),
+            'svc_kernel': np.array(svc.kernel),
+            'svc_gamma': np.array(svc._gamma, dtype=np.float64),
+            'svc_coef0': np.array(svc.coef0, dtype=np.float64),
+            'svc_degree': np.array(svc.degree),
+            'svc_weight': np.array(svc_weight)
+        }
+        arrays.update(nodes)
+        return cls(arrays)
+    
+    def to_arrays(self):
+        """
+        Named arrays describing the compiled ensemble, e.g. for a model bundle.
+        
+        Returns:
+            dict: Exported arrays
+        """
+        return dict(self.arrays)
+    
+    @classmethod
+    def from_arrays(cls, arrays):
+        """
+        Rebuild a compiled ensemble from the arrays written by to_arrays.
+        
+        Args:
+            arrays (dict): Named arrays
+        
+        Returns:
+            CompiledEnsemble: Compiled ensemble
+        """
+        return cls(arrays)
+    
+    def _leaf_values(self, X):
+        """Traverse all trees for a batch and return the leaf values (n_samples, n_trees, n_classes)."""
+        a = self.arrays
+        # Trees compare float32 features against float64 thresholds, like sklearn
+        X = np.asarray(X, dtype=np.float32)
+        flat_X = X.ravel()
+        row_offsets = (np.arange(len(X)) * X.shape[1])[:, np.newaxis]
+        nodes = np.broadcast_to(a['roots'], (len(X), len(a['roots']))).copy()
+        for _ in range(self._depth):
+            go_right = flat_X[row_offsets + a['feature'][nodes]] > a['threshold'][nodes]
+            nodes = a['children'][2 * nodes + go_right]
+        return a['value'][nodes]
+    
+    def _svc_positive_proba(self, X):
+        """Platt-scaled probability of the positive class from the SVC."""
+        a = self.arrays
+        kernel = _kernel(X, a['svc_support_vectors'], self.kernel,
+                         float(a['svc_gamma']), float(a['svc_coef0']), int(a['svc_degree']))
+        decision = kernel @ a['svc_dual_coef'] + a['svc_intercept']
+        # libsvm's decision value has the opposite sign and is scaled to P(first class)
+        first = 1.0 / (1.0 + np.exp(-decision * a['svc_prob_a'] + a['svc_prob_b']))
+        return _pairwise_coupling(np.clip(first, LIBSVM_MIN_PROB, 1 - LIBSVM_MIN_PROB))
+    
+    def predict_proba(self, X, chunk_size=4096):
+        """
+        Soft-voting class probabilities for a batch.
+        
+        Args:
+            X (np.ndarray): Features of shape (n_samples, n_features)
+            chunk_size (int): Number of rows traversed at once
+        
+        Returns:
+            np.ndarray: Probabilities of shape (n_samples, 2)
+        """
+        X = np.atleast_2d(np.asarray(X, dtype=np.float64))
+        a = self.arrays
+        positive = np.empty(len(X))
+        
+        for start in range(0, len(X), chunk_size):
+            chunk = X[start:start + chunk_size]
+            leaves = self._leaf_values(chunk)
+            
+            # Forest leaf values already hold weighted class probabilities
+            forest_positive = leaves[:, :self._n_forest_trees, 1].sum(axis=1)
+            raw = a['boosting_init'][0] + leaves[:, self._n_forest_trees:, 0].sum(axis=1)
+            boosting_positive = a['boosting_weight'] / (1.0 + np.exp(-raw))
+            svc_positive = a['svc_weight'] * self._svc_positive_proba(chunk)
+            
+            positive[start:start + chunk_size] = forest_positive + boosting_positive + svc_positive
+        
+        return np.column_stack([1 - positive, positive])
+    
+    def predict(self, X):
+        """Predicted class labels for a batch."""
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+
+def compile_model(model):
+    """
+    Compile a model for fast inference when possible.
+    
+    Args:
+        model: Fitted model
+    
+    Returns:
+        object: CompiledEnsemble for supported voting ensembles, otherwise the model itself
+    """
+    try:
+        return CompiledEnsemble.from_voting(model)
+    except TypeError as e:
+        logger.info("Using sklearn model for inference: %s", e)
+        return model
+
+
+def max_proba_difference(model, compiled, X):
+    """
+    Largest absolute difference between sklearn and compiled probabilities.
+    
+    Args:
+        model: Fitted sklearn model
+        compiled (CompiledEnsemble): Compiled version of the model
+        X (np.ndarray): Features to compare on
+    
+    Returns:
+        float: Maximum absolute probability difference
+    """
+    return float(np.abs(model.predict_proba(X) - compiled.predict_proba(X)).max())
@@ -2,6 +2,7 @@
 Model evaluation functions for cross-dataset emotion recognition.
 """
 
+import logging
 import numpy as np
 from sklearn.metrics import (
     accuracy_score, 
@@ -16,6 +17,8 @@ from sklearn.metrics import (
 
 from cross_dataset.config import DECISION_THRESHOLDS
 
+logger = logging.getLogger(__name__)
+
 
 def find_optimal_threshold(y_true, y_prob, metric='f1'):
     """
@@ -173,15 +176,15 @@ def evaluate_bidirectional_models(models_dict, wesad_X, wesad_y, kemocon_X, kemo
     k2w_results = evaluate_model(k2w_model, wesad_X, wesad_y, k2w_scaler)
     
     # Print results summary
-    print("\nWESAD → K-EmoCon Results:")
-    print(f"Accuracy: {w2k_results['accuracy']:.4f}, F1: {w2k_results['f1_score']:.4f}")
-    print(f"Balanced Accuracy: {w2k_results['balanced_accuracy']:.4f}, ROC-AUC: {w2k_results['roc_auc']:.4f}")
-    print(f"PR-AUC: {w2k_results['pr_auc']:.4f}, Threshold: {w2k_results['threshold']:.2f}")
-    
-    print("\nK-EmoCon → WESAD Results:")
-    print(f"Accuracy: {k2w_results['accuracy']:.4f}, F1: {k2w_results['f1_score']:.4f}")
-    print(f"Balanced Accuracy: {k2w_results['balanced_accuracy']:.4f}, ROC-AUC: {k2w_results['roc_auc']:.4f}")
-    print(f"PR-AUC: {k2w_results['pr_auc']:.4f}, Threshold: {k2w_results['threshold']:.2f}")
+    logger.info("WESAD → K-EmoCon Results:")
+    logger.info("Accuracy: %.4f, F1: %.4f", w2k_results['accuracy'], w2k_results['f1_score'])
+    logger.info("Balanced Accuracy: %.4f, ROC-AUC: %.4f", w2k_results['balanced_accuracy'], w2k_results['roc_auc'])
+    logger.info("PR-AUC: %.4f, Threshold: %.2f", w2k_results['pr_auc'], w2k_results['threshold'])
+    
+    logger.info("K-EmoCon → WESAD Results:")
+    logger.info("Accuracy: %.4f, F1: %.4f", k2w_results['accuracy'], k2w_results['f1_score'])
+    logger.info("Balanced Accuracy: %.4f, ROC-AUC: %.4f", k2w_results['balanced_accuracy'], k2w_results['roc_auc'])
+    logger.info("PR-AUC: %.4f, Threshold: %.2f", k2w_results['pr_auc'], k2w_results['threshold'])
     
     # Return combined results
     return {
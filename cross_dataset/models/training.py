@@ -2,13 +2,17 @@
 Model training functions for cross-dataset emotion recognition.
 """
 
+import logging
 import numpy as np
 from sklearn.preprocessing import StandardScaler, RobustScaler
 from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier, VotingClassifier
 from sklearn.svm import SVC
 
 from .balancing import apply_class_balancing, create_sample_weights
-from cross_dataset.domain_adaptation.ensemble import ensemble_domain_adaptation, measure_domain_gap
+from cross_dataset.domain_adaptation.coral import CoralAdapter
+from cross_dataset.domain_adaptation.subspace import SubspaceAdapter
+from cross_dataset.domain_adaptation.ensemble import EnsembleAdapter, measure_domain_gap
+from wesad_framework.utils.profiling import profile_stage, data_shape
 from cross_dataset.config import (
     RF_N_ESTIMATORS, 
     RF_MAX_DEPTH,
@@ -20,6 +24,16 @@ from cross_dataset.config import (
     ENSEMBLE_MODEL_WEIGHTS
 )
 
+logger = logging.getLogger(__name__)
+
+
+# Domain adapters available for training
+ADAPTERS = {
+    'ensemble': EnsembleAdapter,
+    'coral': CoralAdapter,
+    'subspace': SubspaceAdapter
+}
+
 
 def create_model_ensemble():
     """
@@ -77,39 +91,46 @@ def train_cross_dataset_model(wesad_X, wesad_y, kemocon_X, kemocon_y, adaptation
     Returns:
         tuple: (model, scaler, info)
     """
-    print("\nTraining WESAD → K-EmoCon model with balanced classes:")
+    logger.info("Training WESAD → K-EmoCon model with balanced classes:")
     
     # Balance classes if needed
-    wesad_X_balanced, wesad_y_balanced = apply_class_balancing(wesad_X, wesad_y)
+    with profile_stage('balance', direction='wesad_to_kemocon') as stage:
+        wesad_X_balanced, wesad_y_balanced = apply_class_balancing(wesad_X, wesad_y)
+        stage.update(data_shape(wesad_X_balanced))
     
     # Scale features with robust scaler for better handling of outliers
-    scaler = RobustScaler()
-    wesad_X_scaled = scaler.fit_transform(wesad_X_balanced)
-    kemocon_X_scaled = scaler.transform(kemocon_X)
+    with profile_stage('scale', direction='wesad_to_kemocon'):
+        scaler = RobustScaler()
+        wesad_X_scaled = scaler.fit_transform(wesad_X_balanced)
+        kemocon_X_scaled = scaler.transform(kemocon_X)
     
     # Initialize variables for adaptation
     wesad_adapted = None
+    adapter = None
     gap_info = None
     
     # Apply domain adaptation if specified
     if adaptation_method:
-        print(f"Applying {adaptation_method} domain adaptation...")
+        logger.info("Applying %s domain adaptation...", adaptation_method)
         
-        if adaptation_method == 'ensemble':
-            # Apply ensemble adaptation
-            wesad_adapted = ensemble_domain_adaptation(wesad_X_scaled, kemocon_X_scaled)
+        if adaptation_method in ADAPTERS:
+            # Fit adaptation (kept so it can be applied at inference time)
+            with profile_stage('adapt', direction='wesad_to_kemocon', method=adaptation_method) as stage:
+                adapter = ADAPTERS[adaptation_method]().fit(wesad_X_scaled, kemocon_X_scaled)
+                wesad_adapted = adapter.transform(wesad_X_scaled)
+                stage.update(data_shape(wesad_adapted))
             
             # Measure domain gap reduction
             gap_info = measure_domain_gap(wesad_X_scaled, kemocon_X_scaled, wesad_adapted)
             
-            print(f"Domain gap before adaptation: {gap_info['gap_before']:.4f}")
-            print(f"Domain gap after adaptation: {gap_info['gap_after']:.4f}")
-            print(f"Gap reduction: {gap_info['gap_reduction_percent']:.2f}%")
+            logger.info("Domain gap before adaptation: %.4f", gap_info['gap_before'])
+            logger.info("Domain gap after adaptation: %.4f", gap_info['gap_after'])
+            logger.info("Gap reduction: %.2f%%", gap_info['gap_reduction_percent'])
             
             # Use adapted features for training
             wesad_X_train = wesad_adapted
         else:
-            print(f"Unknown adaptation method: {adaptation_method}")
+            logger.warning("Unknown adaptation method: %s", adaptation_method)
             wesad_X_train = wesad_X_scaled
             wesad_adapted = wesad_X_scaled  # Set adapted to scaled if no adaptation
     else:
@@ -117,21 +138,24 @@ def train_cross_dataset_model(wesad_X, wesad_y, kemocon_X, kemocon_y, adaptation
         wesad_adapted = wesad_X_scaled  # Set adapted to scaled if no adaptation
     
     # Create and train ensemble model
-    ensemble = create_model_ensemble()
-    
-    # Create sample weights for GB
-    sample_weights = create_sample_weights(wesad_y_balanced)
-    
-    # Train ensemble
-    ensemble.fit(wesad_X_train, wesad_y_balanced)
-    
-    # Also train GB with sample weights
-    ensemble.named_estimators_['gb'].fit(
-        wesad_X_train, wesad_y_balanced, sample_weight=sample_weights)
+    with profile_stage('fit', direction='wesad_to_kemocon') as stage:
+        ensemble = create_model_ensemble()
+        
+        # Create sample weights for GB
+        sample_weights = create_sample_weights(wesad_y_balanced)
+        
+        # Train ensemble
+        ensemble.fit(wesad_X_train, wesad_y_balanced)
+        
+        # Also train GB with sample weights
+        ensemble.named_estimators_['gb'].fit(
+            wesad_X_train, wesad_y_balanced, sample_weight=sample_weights)
+        stage.update(data_shape(wesad_X_train))
     
     # Return trained model and additional info
     info = {
         'adaptation_method': adaptation_method,
+        'adapter': adapter,  # Fitted adapter (None without adaptation)
         'gap_reduction': gap_info['gap_reduction_percent'] if gap_info else None,
         'gap_before': gap_info['gap_before'] if gap_info else None,
         'gap_after': gap_info['gap_after'] if gap_info else None,
@@ -159,39 +183,46 @@ def train_reverse_model(kemocon_X, kemocon_y, wesad_X, wesad_y, adaptation_metho
     Returns:
         tuple: (model, scaler, info)
     """
-    print("\nTraining K-EmoCon → WESAD model with balanced classes:")
+    logger.info("Training K-EmoCon → WESAD model with balanced classes:")
     
     # Balance classes if needed
-    kemocon_X_balanced, kemocon_y_balanced = apply_class_balancing(kemocon_X, kemocon_y)
+    with profile_stage('balance', direction='kemocon_to_wesad') as stage:
+        kemocon_X_balanced, kemocon_y_balanced = apply_class_balancing(kemocon_X, kemocon_y)
+        stage.update(data_shape(kemocon_X_balanced))
     
     # Scale features with robust scaler
-    scaler = RobustScaler()
-    kemocon_X_scaled = scaler.fit_transform(kemocon_X_balanced)
-    wesad_X_scaled = scaler.transform(wesad_X)
+    with profile_stage('scale', direction='kemocon_to_wesad'):
+        scaler = RobustScaler()
+        kemocon_X_scaled = scaler.fit_transform(kemocon_X_balanced)
+        wesad_X_scaled = scaler.transform(wesad_X)
     
     # Initialize variables for adaptation
     kemocon_adapted = None
+    adapter = None
     gap_info = None
     
     # Apply domain adaptation if specified
     if adaptation_method:
-        print(f"Applying {adaptation_method} domain adaptation...")
+        logger.info("Applying %s domain adaptation...", adaptation_method)
         
-        if adaptation_method == 'ensemble':
-            # Apply ensemble adaptation
-            kemocon_adapted = ensemble_domain_adaptation(kemocon_X_scaled, wesad_X_scaled)
+        if adaptation_method in ADAPTERS:
+            # Fit adaptation (kept so it can be applied at inference time)
+            with profile_stage('adapt', direction='kemocon_to_wesad', method=adaptation_method) as stage:
+                adapter = ADAPTERS[adaptation_method]().fit(kemocon_X_scaled, wesad_X_scaled)
+                kemocon_adapted = adapter.transform(kemocon_X_scaled)
+                stage.update(data_shape(kemocon_adapted))
             
             # Measure domain gap reduction
             gap_info = measure_domain_gap(kemocon_X_scaled, wesad_X_scaled, kemocon_adapted)
             
-            print(f"Domain gap before adaptation: {gap_info['gap_before']:.4f}")
-            print(f"Domain gap after adaptation: {gap_info['gap_after']:.4f}")
-            print(f"Gap reduction: {gap_info['gap_reduction_percent']:.2f}%")
+            logger.info("Domain gap before adaptation: %.4f", gap_info['gap_before'])
+            logger.info("Domain gap after adaptation: %.4f", gap_info['gap_after'])
+            logger.info("Gap reduction: %.2f%%", gap_info['gap_reduction_percent'])
             
             # Use adapted features for training
             kemocon_X_train = kemocon_adapted
         else:
-            print(f"Unknown adaptation method: {adaptation_method}")
+            logger.warning("Unknown adaptation method: %s", adaptation_method)
             kemocon_X_train = kemocon_X_scaled
             kemocon_adapted = kemocon_X_scaled  # Set adapted to scaled if no adaptation
     else:
@@ -199,21 +230,24 @@ def train_reverse_model(kemocon_X, kemocon_y, wesad_X, wesad_y, adaptation_metho
         kemocon_adapted = kemocon_X_scaled  # Set adapted to scaled if no adaptation
     
     # Create and train ensemble model
-    ensemble = create_model_ensemble()
-    
-    # Create sample weights for GB
-    sample_weights = create_sample_weights(kemocon_y_balanced)
-    
-    # Train ensemble
-    ensemble.fit(kemocon_X_train, kemocon_y_balanced)
-    
-    # Also train GB with sample weights
-    ensemble.named_estimators_['gb'].fit(
-        kemocon_X_train, kemocon_y_balanced, sample_weight=sample_weights)
+    with profile_stage('fit', direction='kemocon_to_wesad') as stage:
+        ensemble = create_model_ensemble()
+        
+        # Create sample weights for GB
+        sample_weights = create_sample_weights(kemocon_y_balanced)
+        
+        # Train ensemble
+        ensemble.fit(kemocon_X_train, kemocon_y_balanced)
+        
+        # Also train GB with sample weights
+        ensemble.named_estimators_['gb'].fit(
+            kemocon_X_train, kemocon_y_balanced, sample_weight=sample_weights)
+        stage.update(data_shape(kemocon_X_train))
     
     # Return trained model and additional info
     info = {
         'adaptation_method': adaptation_method,
+        'adapter': adapter,  # Fitted adapter (None without adaptation)
         'gap_reduction': gap_info['gap_reduction_percent'] if gap_info else None,
         'gap_before': gap_info['gap_before'] if gap_info else None,
         'gap_after': gap_info['gap_after'] if gap_info else None,
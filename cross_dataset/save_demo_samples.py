@@ -4,6 +4,158 @@ import pickle
 import os
 import pandas as pd
 
+from cross_dataset.models.compiled import CompiledEnsemble
+from wesad_framework.utils.artifacts import save_table, load_table
+from wesad_framework.utils.bundle import save_bundle, load_bundle
+
+# Directory of the demo model bundles inside the demo directory
+DEMO_MODELS_DIR = 'demo_models'
+DEMO_TARGETS = ['arousal', 'valence']
+DEMO_DIRECTIONS = ['wesad_to_kemocon', 'kemocon_to_wesad']
+
+def save_demo_sample_set(file_path, samples, arousal_features, valence_features,
+                         arousal_threshold, valence_threshold):
+    """
+    Save demo samples of one dataset as a pickle-free .npz archive.
+    
+    Args:
+        file_path: Path to the .npz file
+        samples: DataFrame of samples with features and arousal/valence ratings
+        arousal_features: Features used by the arousal model
+        valence_features: Features used by the valence model
+        arousal_threshold: Rating threshold separating low and high arousal
+        valence_threshold: Rating threshold separating low and high valence
+    
+    Returns:
+        str: Path to the saved archive
+    """
+    return save_table(
+        file_path,
+        samples,
+        arrays={
+            'arousal_binary': (samples['arousal'] > arousal_threshold).astype(int).values,
+            'valence_binary': (samples['valence'] > valence_threshold).astype(int).values
+        },
+        metadata={
+            'arousal_features': list(arousal_features),
+            'valence_features': list(valence_features),
+            'arousal_threshold': float(arousal_threshold),
+            'valence_threshold': float(valence_threshold)
+        }
+    )
+
+def load_demo_sample_set(file_path):
+    """
+    Load demo samples saved by save_demo_sample_set.
+    
+    Args:
+        file_path: Path to the .npz file
+    
+    Returns:
+        dict: samples, feature lists, thresholds and binary labels
+    """
+    samples, arrays, metadata = load_table(file_path)
+    sample_set = {'samples': samples}
+    sample_set.update(metadata)
+    sample_set.update(arrays)
+    return sample_set
+
+def save_demo_model(models_dir, target, direction, model, scaler, threshold):
+    """
+    Save a demo model as a model bundle, with its compiled form when available.
+    
+    Args:
+        models_dir: Directory of the demo model bundles
+        target: 'arousal' or 'valence'
+        direction: 'wesad_to_kemocon' or 'kemocon_to_wesad'
+        model: Trained model
+        scaler: Fitted scaler
+        threshold: Decision threshold on the high class probability
+    
+    Returns:
+        str: Path to the saved bundle
+    """
+    try:
+        arrays = {'compiled': CompiledEnsemble.from_voting(model).to_arrays()}
+    except TypeError:
+        arrays = None
+    
+    return save_bundle(
+        os.path.join(models_dir, f"{target}_{direction}"),
+        model,
+        class_names=['low', 'high'],
+        scaler=scaler,
+        threshold=threshold,
+        metadata={'target': target, 'direction': direction},
+        arrays=arrays
+    )
+
+def load_demo_models(models_dir):
+    """
+    Load the demo model bundles.
+    
+    Args:
+        models_dir: Directory of the demo model bundles
+    
+    Returns:
+        dict: target -> direction -> model, scaler, threshold and compiled arrays (or None)
+    """
+    models = {}
+    for target in DEMO_TARGETS:
+        models[target] = {}
+        for direction in DEMO_DIRECTIONS:
+            bundle = load_bundle(os.path.join(models_dir, f"{target}_{direction}"))
+            models[target][direction] = {
+                'model': bundle.model,
+                'scaler': bundle.scaler,
+                'threshold': bundle.threshold,
+                'compiled': bundle.arrays.get('compiled')
+            }
+    return models
+
+def convert_demo_pickles(demo_dir):
+    """
+    Convert demo files pickled by earlier versions into the pickle-free formats.
+    
+    Only run this on trusted files: the pickles hold DataFrames and are
+    loaded with plain pickle.
+    
+    Args:
+        demo_dir: Directory with wesad_demo_samples.pkl, kemocon_demo_samples.pkl and demo_models.pkl
+    
+    Returns:
+        dict: Paths to converted files
+    """
+    converted = {}
+    
+    for dataset in ['wesad', 'kemocon']:
+        pickle_file = os.path.join(demo_dir, f'{dataset}_demo_samples.pkl')
+        if not os.path.exists(pickle_file):
+            continue
+        with open(pickle_file, 'rb') as f:
+            data = pickle.load(f)
+        converted[dataset] = save_demo_sample_set(
+            os.path.join(demo_dir, f'{dataset}_demo_samples.npz'),
+            data['samples'],
+            data['arousal_features'],
+            data['valence_features'],
+            data['arousal_threshold'],
+            data['valence_threshold']
+        )
+    
+    models_file = os.path.join(demo_dir, 'demo_models.pkl')
+    if os.path.exists(models_file):
+        with open(models_file, 'rb') as f:
+            models = pickle.load(f)
+        for target in DEMO_TARGETS:
+            for direction in DEMO_DIRECTIONS:
+                model_info = models[target][direction]
+                save_demo_model(os.path.join(demo_dir, DEMO_MODELS_DIR), target, direction,
+                                model_info['model'], model_info['scaler'], model_info['threshold'])
+        converted['models'] = os.path.join(demo_dir, DEMO_MODELS_DIR)
+    
+    return converted
+
 def save_demo_samples(framework, sample_size=20, save_dir='./demo_data'):
     """
     Save samples from WESAD and K-EmoCon datasets for later demonstration.
@@ -41,17 +193,15 @@ def save_demo_samples(framework, sample_size=20, save_dir='./demo_data'):
         wesad_samples = pd.concat([wesad_low_arousal, wesad_high_arousal])
         
         # Save dataset
-        wesad_demo_file = os.path.join(save_dir, 'wesad_demo_samples.pkl')
-        with open(wesad_demo_file, 'wb') as f:
-            pickle.dump({
-                'samples': wesad_samples,
-                'arousal_features': arousal_features,
-                'valence_features': valence_features,
-                'arousal_threshold': arousal_median,
-                'valence_threshold': valence_median,
-                'arousal_binary': (wesad_samples['arousal'] > arousal_median).astype(int).values,
-                'valence_binary': (wesad_samples['valence'] > valence_median).astype(int).values
-            }, f)
+        wesad_demo_file = os.path.join(save_dir, 'wesad_demo_samples.npz')
+        save_demo_sample_set(
+            wesad_demo_file,
+            wesad_samples,
+            arousal_features,
+            valence_features,
+            arousal_median,
+            valence_median
+        )
         
         saved_files['wesad'] = wesad_demo_file
         print(f"Saved {len(wesad_samples)} WESAD samples with {len(arousal_features)} arousal features "
@@ -77,17 +227,15 @@ def save_demo_samples(framework, sample_size=20, save_dir='./demo_data'):
         kemocon_samples = pd.concat([kemocon_low_arousal, kemocon_high_arousal])
         
         # Save dataset
-        kemocon_demo_file = os.path.join(save_dir, 'kemocon_demo_samples.pkl')
-        with open(kemocon_demo_file, 'wb') as f:
-            pickle.dump({
-                'samples': kemocon_samples,
-                'arousal_features': arousal_features,
-                'valence_features': valence_features,
-                'arousal_threshold': arousal_median,
-                'valence_threshold': valence_median,
-                'arousal_binary': (kemocon_samples['arousal'] > arousal_median).astype(int).values,
-                'valence_binary': (kemocon_samples['valence'] > valence_median).astype(int).values
-            }, f)
+        kemocon_demo_file = os.path.join(save_dir, 'kemocon_demo_samples.npz')
+        save_demo_sample_set(
+            kemocon_demo_file,
+            kemocon_samples,
+            arousal_features,
+            valence_features,
+            arousal_median,
+            valence_median
+        )
         
         saved_files['kemocon'] = kemocon_demo_file
         print(f"Saved {len(kemocon_samples)} K-EmoCon samples with {len(arousal_features)} arousal features "
@@ -95,57 +243,39 @@ def save_demo_samples(framework, sample_size=20, save_dir='./demo_data'):
     
     # Save models for prediction
     if hasattr(framework, 'arousal_models') and hasattr(framework, 'valence_models'):
-        models_file = os.path.join(save_dir, 'demo_models.pkl')
-        with open(models_file, 'wb') as f:
-            pickle.dump({
-                'arousal': {
-                    'wesad_to_kemocon': {
-                        'model': framework.arousal_models['models']['wesad_to_kemocon']['model'],
-                        'scaler': framework.arousal_models['models']['wesad_to_kemocon']['scaler'],
-                        'threshold': framework.arousal_models['evaluation']['wesad_to_kemocon']['threshold']
-                    },
-                    'kemocon_to_wesad': {
-                        'model': framework.arousal_models['models']['kemocon_to_wesad']['model'],
-                        'scaler': framework.arousal_models['models']['kemocon_to_wesad']['scaler'],
-                        'threshold': framework.arousal_models['evaluation']['kemocon_to_wesad']['threshold']
-                    }
-                },
-                'valence': {
-                    'wesad_to_kemocon': {
-                        'model': framework.valence_models['models']['wesad_to_kemocon']['model'],
-                        'scaler': framework.valence_models['models']['wesad_to_kemocon']['scaler'],
-                        'threshold': framework.valence_models['evaluation']['wesad_to_kemocon']['threshold']
-                    },
-                    'kemocon_to_wesad': {
-                        'model': framework.valence_models['models']['kemocon_to_wesad']['model'],
-                        'scaler': framework.valence_models['models']['kemocon_to_wesad']['scaler'],
-                        'threshold': framework.valence_models['evaluation']['kemocon_to_wesad']['threshold']
-                    }
-                }
-            }, f)
-        saved_files['models'] = models_file
+        models_dir = os.path.join(save_dir, DEMO_MODELS_DIR)
+        for target, target_models in [('arousal', framework.arousal_models), ('valence', framework.valence_models)]:
+            for direction in ['wesad_to_kemocon', 'kemocon_to_wesad']:
+                save_demo_model(
+                    models_dir,
+                    target,
+                    direction,
+                    target_models['models'][direction]['model'],
+                    target_models['models'][direction]['scaler'],
+                    target_models['evaluation'][direction]['threshold']
+                )
+        saved_files['models'] = models_dir
         print(f"Saved models and scalers for demo")
     
     # Create a helper demo script
     demo_script = """
-import pickle
-import numpy as np
-import pandas as pd
+import os
+
+# Requires the repository root on PYTHONPATH
+from cross_dataset.save_demo_samples import load_demo_sample_set, load_demo_models
+
+DEMO_DIR = os.path.dirname(os.path.abspath(__file__))
 
-def load_demo_data(wesad_file='wesad_demo_samples.pkl', 
-                  kemocon_file='kemocon_demo_samples.pkl',
-                  models_file='demo_models.pkl'):
+def load_demo_data(wesad_file=os.path.join(DEMO_DIR, 'wesad_demo_samples.npz'), 
+                  kemocon_file=os.path.join(DEMO_DIR, 'kemocon_demo_samples.npz'),
+                  models_dir=os.path.join(DEMO_DIR, 'demo_models')):
     \"\"\"Load demonstration data and models\"\"\"
-    # Load sample data
-    with open(wesad_file, 'rb') as f:
-        wesad_data = pickle.load(f)
+    # Load sample data (pickle-free archives)
+    wesad_data = load_demo_sample_set(wesad_file)
+    kemocon_data = load_demo_sample_set(kemocon_file)
     
-    with open(kemocon_file, 'rb') as f:
-        kemocon_data = pickle.load(f)
-    
-    # Load models and scalers
-    with open(models_file, 'rb') as f:
-        models = pickle.load(f)
+    # Load models and scalers from their bundles
+    models = load_demo_models(models_dir)
     
     return wesad_data, kemocon_data, models
 
@@ -214,7 +344,7 @@ if __name__ == "__main__":
     test_cross_dataset_models()
 """
     demo_script = demo_script.replace('\u2192', '->')
-
+    
     # Save demo script
     script_file = os.path.join(save_dir, 'run_demo.py')
     with open(script_file, 'w') as f:
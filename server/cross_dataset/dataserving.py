@@ -14,6 +14,23 @@ from pydantic import BaseModel
 import matplotlib.pyplot as plt
 import seaborn as sns
 from datetime import datetime
+import sys
+import logging
+import threading
+from functools import partial
+from scipy import signal as scipy_signal
+
+# Make the repository root importable for the shared cross_dataset package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from cross_dataset.config import ENSEMBLE_WEIGHTS, SEGMENT_SIZE
+from cross_dataset.domain_adaptation.metrics import domain_gap_metrics
+from cross_dataset.features.extraction import extract_all_features
+from cross_dataset.models.compiled import CompiledEnsemble, compile_model
+from wesad_framework.utils.bundle import load_bundle, is_bundle
+from wesad_framework.utils.artifacts import load_joblib
+from server.metrics import MetricsRoute, stage_timer
+
+logger = logging.getLogger(__name__)
 
 # Models for data validation
 class CrossDatasetPerformance(BaseModel):
@@ -41,8 +58,10 @@ class FeatureMapping(BaseModel):
     target: str  # "arousal" or "valence"
 
 class DomainAdaptationParams(BaseModel):
-    adaptation_method: str = "ensemble"  # "coral", "subspace", "ensemble", "none"
+    adaptation_method: str = "ensemble"  # "coral", "subspace", "scaling", "ensemble", "none"
     target: str = "arousal"  # "arousal" or "valence"
+    direction: str = "wesad_to_kemocon"  # "wesad_to_kemocon" or "kemocon_to_wesad"
+    weights: Optional[List[float]] = None  # Custom [subspace, coral, scaling] weights (overrides the method)
 
 class ClassDistribution(BaseModel):
     dataset: str  # "WESAD" or "K-EmoCon"
@@ -52,9 +71,10 @@ class ClassDistribution(BaseModel):
     distribution_ratio: float
 
 class SignalPredictionInput(BaseModel):
-    signals: Dict[str, List[float]]
+    signals: Dict[str, List[float]]  # e.g. {"ECG": [...]} for WESAD or {"HR": [...], "EDA": [...], "TEMP": [...]} for K-EmoCon
     dataset: str  # "WESAD" or "K-EmoCon"
     target: str = "both"  # "arousal", "valence", or "both"
+    sampling_rate: float = 4.0  # Sampling rate of the signals in Hz (resampled to 4 Hz if different)
 
 class DetailedEvaluation(BaseModel):
     direction: str
@@ -74,6 +94,8 @@ app = FastAPI(
     description="API for cross-dataset emotion recognition between WESAD and K-EmoCon",
     version="1.0.0"
 )
+# Time result serialization of every route (see server/metrics.py)
+app.router.route_class = MetricsRoute
 origins = [
     "https://neurofeel.vercel.app",  # Vercel frontend
     "http://localhost:3000",         # Local dev
@@ -110,7 +132,7 @@ def load_performance_data():
         else:
             raise FileNotFoundError(f"Performance data file not found: {PERFORMANCE_JSON}")
     except Exception as e:
-        print(f"Error loading performance data: {e}")
+        logger.error("Error loading performance data: %s", e)
         raise HTTPException(status_code=404, detail=f"Error loading performance data: {str(e)}")
 
 # Helper function to load adaptation data
@@ -124,9 +146,55 @@ def load_adaptation_data(target="arousal", direction="wesad_to_kemocon"):
         else:
             raise FileNotFoundError(f"Adaptation data file not found: {file_path}")
     except Exception as e:
-        print(f"Error loading adaptation data: {e}")
+        logger.error("Error loading adaptation data: %s", e)
         raise HTTPException(status_code=404, detail=f"Error loading adaptation data for {target}, {direction}: {str(e)}")
 
+# Component weights [subspace, coral, scaling] for each adaptation method
+ADAPTATION_METHOD_WEIGHTS = {
+    "subspace": [1.0, 0.0, 0.0],
+    "coral": [0.0, 1.0, 0.0],
+    "scaling": [0.0, 0.0, 1.0],
+    "ensemble": ENSEMBLE_WEIGHTS
+}
+
+# Precomputed adaptation components, loaded once per (target, direction)
+_adaptation_components = {}
+_adaptation_components_lock = threading.Lock()
+
+def adaptation_components_path(target, direction):
+    """Path of the components written by CrossDatasetFramework for a target and direction"""
+    return os.path.join(ADAPTATION_DIR, f"{target}_{direction}_components.npz")
+
+# Helper function to load precomputed adaptation components
+def load_adaptation_components(target="arousal", direction="wesad_to_kemocon"):
+    """Load the precomputed subspace/CORAL/scaling transforms and domain samples"""
+    key = (target, direction)
+    if key in _adaptation_components:
+        return _adaptation_components[key]
+    
+    with _adaptation_components_lock:
+        if key in _adaptation_components:
+            return _adaptation_components[key]
+        
+        try:
+            file_path = adaptation_components_path(target, direction)
+            if not os.path.exists(file_path):
+                raise FileNotFoundError(f"Adaptation components file not found: {file_path}; retrain the "
+                                        "cross-dataset models and copy their adaptation/*_components.npz here")
+            
+            with stage_timer('artifact_load'), np.load(file_path, allow_pickle=False) as data:
+                components = {name: data[name] for name in data.files}
+            
+            # The unadapted gap is the same for every request
+            components["metrics_before"] = domain_gap_metrics(
+                components["source_sample"], components["target_sample"], max_samples=None)
+            
+            _adaptation_components[key] = components
+            return components
+        except Exception as e:
+            logger.error("Error loading adaptation components: %s", e)
+            raise HTTPException(status_code=404, detail=f"Error loading adaptation components for {target}, {direction}: {str(e)}")
+
 # Helper function to load feature mapping
 def load_feature_mapping(target="arousal"):
     """Load feature mapping between WESAD and K-EmoCon"""
@@ -137,7 +205,7 @@ def load_feature_mapping(target="arousal"):
         else:
             raise FileNotFoundError(f"Feature mapping file not found: {file_path}")
     except Exception as e:
-        print(f"Error loading feature mapping: {e}")
+        logger.error("Error loading feature mapping: %s", e)
         raise HTTPException(status_code=404, detail=f"Error loading feature mapping for {target}: {str(e)}")
 
 # Helper function to load class distribution
@@ -151,7 +219,7 @@ def load_class_distribution():
         else:
             raise FileNotFoundError(f"Class distribution file not found: {file_path}")
     except Exception as e:
-        print(f"Error loading class distribution: {e}")
+        logger.error("Error loading class distribution: %s", e)
         raise HTTPException(status_code=404, detail=f"Error loading class distribution data: {str(e)}")
 
 # Helper function to load dataset statistics
@@ -164,7 +232,7 @@ def load_dataset_statistics():
         else:
             raise FileNotFoundError(f"Dataset statistics file not found: {DATASET_STATS_FILE}")
     except Exception as e:
-        print(f"Error loading dataset statistics: {e}")
+        logger.error("Error loading dataset statistics: %s", e)
         raise HTTPException(status_code=404, detail=f"Error loading dataset statistics: {str(e)}")
 
 # Helper function to load detailed evaluation
@@ -178,54 +246,230 @@ def load_detailed_evaluation(target="arousal", direction="wesad_to_kemocon"):
         else:
             raise FileNotFoundError(f"Evaluation file not found: {file_path}")
     except Exception as e:
-        print(f"Error loading detailed evaluation: {e}")
+        logger.error("Error loading detailed evaluation: %s", e)
         raise HTTPException(status_code=404, detail=f"Error loading evaluation data for {target}, {direction}: {str(e)}")
 
-# This section would need to be replaced with actual feature extraction and prediction code
-# that connects to your cross-dataset framework models
-
-# For now, we'll keep the stub functions that will be implemented later
-# They'll raise NotImplementedError to indicate they need to be connected to real models
+# Signals are processed at the sampling rate the models were trained with
+FEATURE_SAMPLING_RATE = 4
+
+# Models that predict on each dataset: the target domain of the direction
+DATASET_DIRECTIONS = {
+    "WESAD": "kemocon_to_wesad",
+    "K-EmoCon": "wesad_to_kemocon"
+}
+
+def load_model_package(target, direction):
+    """Load a model with its scaler, input feature order and threshold (None if not saved)"""
+    bundle_dir = os.path.join(MODELS_DIR, f"{target}_{direction}_model")
+    if is_bundle(bundle_dir):
+        bundle = load_bundle(bundle_dir)
+        if 'compiled' in bundle.arrays:
+            model = CompiledEnsemble.from_arrays(bundle.arrays['compiled'])
+        else:
+            model = compile_model(bundle.model)
+        return {
+            'model': model,
+            'scaler': bundle.scaler,
+            'feature_names': bundle.feature_names,
+            'threshold': bundle.threshold
+        }
+    
+    # Packages saved before model bundles were introduced
+    model_path = bundle_dir + ".joblib"
+    if not os.path.exists(model_path):
+        raise FileNotFoundError(f"Model file not found: {model_path}")
+    package = load_joblib(model_path, expected=dict)
+    return {
+        'model': compile_model(package['model']),
+        'scaler': package['scaler'],
+        'feature_names': list(package['metadata']['target_features']),
+        'threshold': None
+    }
 
-def extract_features_from_signals(signals, dataset="WESAD"):
-    """Extract features from raw physiological signals"""
-    # This would be implemented to actually extract features using your framework code
-    raise NotImplementedError("Feature extraction functionality needs to be implemented with actual models")
+# Compiled signal prediction pipelines, loaded once per direction
+_signal_pipelines = {}
+_signal_pipelines_lock = threading.Lock()
+
+def load_signal_pipeline(direction="wesad_to_kemocon"):
+    """
+    Load and compile the arousal/valence prediction pipeline for a direction.
+    
+    Column orders are resolved once here: every feature the two models need
+    gets a slot in a shared input vector, and each model keeps the indices of
+    its columns in that vector. Names from the other dataset are mapped to the
+    same slots through the saved feature mapping.
+    """
+    if direction in _signal_pipelines:
+        return _signal_pipelines[direction]
+    
+    with _signal_pipelines_lock:
+        if direction in _signal_pipelines:
+            return _signal_pipelines[direction]
+        
+        try:
+            slots = {}  # Feature name -> position in the shared input vector
+            aliases = {}  # Mapped feature name from the other dataset -> feature name
+            models = {}
+            
+            for target in ["arousal", "valence"]:
+                with stage_timer('artifact_load'):
+                    package = load_model_package(target, direction)
+                
+                # The model is applied to data from the target dataset of the direction
+                feature_names = package['feature_names']
+                for name in feature_names:
+                    slots.setdefault(name, len(slots))
+                
+                try:
+                    mapping = load_feature_mapping(target)
+                except HTTPException:
+                    mapping = []  # Only the model's own feature names are accepted
+                for row in mapping:
+                    wesad_name, kemocon_name = row['wesad_feature'], row['kemocon_feature']
+                    if wesad_name in feature_names:
+                        aliases[kemocon_name] = wesad_name
+                    elif kemocon_name in feature_names:
+                        aliases[wesad_name] = kemocon_name
+                
+                threshold = package['threshold']
+                if threshold is None:
+                    try:
+                        threshold = load_detailed_evaluation(target=target, direction=direction).get('threshold', 0.5)
+                    except HTTPException:
+                        threshold = 0.5
+                
+                models[target] = {
+                    'model': package['model'],
+                    'scaler': package['scaler'],
+                    'threshold': float(threshold),
+                    'feature_names': feature_names,
+                    'columns': np.array([slots[name] for name in feature_names])
+                }
+            
+            pipeline = {
+                'direction': direction,
+                'slots': slots,
+                'aliases': aliases,
+                'models': models
+            }
+            _signal_pipelines[direction] = pipeline
+            return pipeline
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.error("Error loading prediction pipeline: %s", e)
+            raise HTTPException(status_code=404, detail=f"Error loading prediction models for {direction}: {str(e)}")
+
+def validate_signals(signals, sampling_rate):
+    """Reject signals shorter than one training segment or with non-finite samples"""
+    min_length = int(np.ceil(SEGMENT_SIZE * sampling_rate))
+    for signal_type, values in signals.items():
+        if len(values) < min_length:
+            raise HTTPException(status_code=400, detail=f"Signal {signal_type} has {len(values)} samples; at least "
+                                f"{min_length} ({SEGMENT_SIZE} s at {sampling_rate:g} Hz) are required")
+        if not np.all(np.isfinite(values)):
+            raise HTTPException(status_code=400, detail=f"Signal {signal_type} contains non-finite values")
+
+def extract_features_from_signals(signals, dataset="WESAD", sampling_rate=FEATURE_SAMPLING_RATE):
+    """Extract features from raw physiological signals, leaving out non-finite features (e.g. of a flat signal)"""
+    features = {}
+    
+    for signal_type, values in signals.items():
+        values = np.asarray(values, dtype=float)
+        
+        # Downsample to the rate used for training (e.g. 700 Hz WESAD chest ECG)
+        if sampling_rate != FEATURE_SAMPLING_RATE and len(values) > 0:
+            values = scipy_signal.resample(values, max(1, int(len(values) * FEATURE_SAMPLING_RATE / sampling_rate)))
+        
+        signal_features = extract_all_features(values, sampling_rate=FEATURE_SAMPLING_RATE)
+        for name, value in signal_features.items():
+            if np.isfinite(value):
+                features[f"{signal_type.upper()}_{name}"] = float(value)
+    
+    return features
 
 def predict_emotion_dimensions(features, dataset="WESAD", target="both", direction=None):
     """Make a prediction for arousal and/or valence dimensions"""
-    # This would be implemented to actually use trained models to make predictions
-    raise NotImplementedError("Prediction functionality needs to be implemented with actual models")
+    if direction is None:
+        direction = DATASET_DIRECTIONS[dataset]
+    pipeline = load_signal_pipeline(direction)
+    
+    targets = ["arousal", "valence"] if target == "both" else [target]
+    
+    # Fill the shared input vector once for all targets (missing features default to 0)
+    slots = pipeline['slots']
+    x = np.zeros(len(slots))
+    filled = np.zeros(len(slots), dtype=bool)
+    for name, value in features.items():
+        name = name if name in slots else pipeline['aliases'].get(name)
+        # Non-finite values count as missing rather than reaching the scaler
+        if name is not None and np.isfinite(value):
+            x[slots[name]] = value
+            filled[slots[name]] = True
+    
+    result = {"direction": direction}
+    missing = set()
+    for t in targets:
+        model_info = pipeline['models'][t]
+        X = x[model_info['columns']].reshape(1, -1)
+        missing.update(name for name, ok in zip(model_info['feature_names'], filled[model_info['columns']]) if not ok)
+        
+        if model_info['scaler'] is not None:
+            with stage_timer('scaling'):
+                X = model_info['scaler'].transform(X)
+        
+        with stage_timer('inference'):
+            y_prob = float(model_info['model'].predict_proba(X)[0, 1])  # Probability of class 1 (high)
+        result[t] = {
+            "class": "high" if y_prob >= model_info['threshold'] else "low",
+            "probability": y_prob,
+            "confidence": max(y_prob, 1 - y_prob),
+            "threshold": model_info['threshold']
+        }
+    
+    result["missing_features"] = sorted(missing)
+    return result
+
+def warmup_direction(direction):
+    """Load the prediction pipeline of a direction and run an empty feature vector through it"""
+    predict_emotion_dimensions({}, direction=direction)
+
+def get_warmup_tasks():
+    """Get the artifacts to preload at startup, as a dict of name -> loader"""
+    tasks = {}
+    for direction in ["wesad_to_kemocon", "kemocon_to_wesad"]:
+        tasks[f"pipeline_{direction}"] = partial(warmup_direction, direction)
+        for target in ["arousal", "valence"]:
+            # Components only exist for models trained since they were introduced
+            if os.path.exists(adaptation_components_path(target, direction)):
+                tasks[f"adaptation_{target}_{direction}"] = partial(load_adaptation_components, target, direction)
+    return tasks
 
 # API Endpoints
 @app.get("/")
 async def root():
     return {"message": "Cross-Dataset Emotion Recognition API is running"}
-import logging
-
-logging.basicConfig(level=logging.INFO)
-
 @app.get("/overview", response_model=Dict[str, Any])
 async def get_overview():
     """Get overview of performance for all models"""
-    logging.info("Received request for overview endpoint.")
+    logger.debug("Received request for overview endpoint.")
     
     try:
         performance_data = load_performance_data()
-        logging.info("Loaded performance data successfully.")
+        logger.debug("Loaded performance data successfully.")
     except Exception as e:
-        logging.error(f"Error loading performance data: {e}")
+        logger.error("Error loading performance data: %s", e)
         raise HTTPException(status_code=500, detail="Error loading performance data")
     
     try:
         dataset_stats = load_dataset_statistics()
-        logging.info("Loaded dataset statistics successfully.")
+        logger.debug("Loaded dataset statistics successfully.")
     except Exception as e:
-        logging.error(f"Error loading dataset statistics: {e}")
+        logger.error("Error loading dataset statistics: %s", e)
         dataset_stats = {}
 
     # Extract performance metrics by target and direction
-    logging.info("Extracting performance metrics by target and direction.")
+    logger.debug("Extracting performance metrics by target and direction.")
     arousal_wesad_to_kemocon = next(
         (m for m in performance_data["models"] if m["direction"] == "wesad_to_kemocon" and m["target"] == "arousal"), {}
     )
@@ -240,11 +484,11 @@ async def get_overview():
     )
     
     # Calculate average metrics
-    logging.info("Calculating average metrics for performance data.")
+    logger.debug("Calculating average metrics for performance data.")
     avg_accuracy = np.mean([m.get("accuracy", 0) for m in performance_data["models"]])
     avg_f1 = np.mean([m.get("f1_score", 0) for m in performance_data["models"]])
     avg_auc = np.mean([m.get("roc_auc", 0) for m in performance_data["models"]])
-    logging.info(f"Calculated averages - Accuracy: {avg_accuracy}, F1: {avg_f1}, ROC AUC: {avg_auc}")
+    logger.debug("Calculated averages - Accuracy: %s, F1: %s, ROC AUC: %s", avg_accuracy, avg_f1, avg_auc)
 
     # Structure summary
     summary = {
@@ -274,7 +518,7 @@ async def get_overview():
         }
     }
     
-    logging.info("Returning overview summary.")
+    logger.debug("Returning overview summary.")
     return summary
 
 
@@ -366,12 +610,30 @@ async def get_dataset_statistics():
 @app.post("/predict", response_model=Dict[str, Any])
 async def predict_from_signals(data: SignalPredictionInput):
     """Make predictions from signal data"""
+    if data.dataset not in DATASET_DIRECTIONS:
+        raise HTTPException(status_code=400, detail="Invalid dataset: must be 'WESAD' or 'K-EmoCon'")
+    
+    target = data.target.lower()
+    if target not in ["arousal", "valence", "both"]:
+        raise HTTPException(status_code=400, detail=f"Invalid target: {data.target}")
+    
+    if not data.signals or data.sampling_rate <= 0:
+        raise HTTPException(status_code=400, detail="At least one signal and a positive sampling rate are required")
+    validate_signals(data.signals, data.sampling_rate)
+    
+    features = extract_features_from_signals(data.signals, dataset=data.dataset, sampling_rate=data.sampling_rate)
+    
     try:
-        # This endpoint should be connected to your actual models
-        # For now, indicate that implementation is needed
-        raise NotImplementedError("The prediction endpoint needs to be connected to your actual models")
-    except NotImplementedError as e:
-        raise HTTPException(status_code=501, detail=str(e))
+        prediction = predict_emotion_dimensions(features, dataset=data.dataset, target=target)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("Error making prediction: %s", e)
+        raise HTTPException(status_code=500, detail=f"Prediction error: {str(e)}")
+    
+    prediction["dataset"] = data.dataset
+    prediction["features"] = features
+    return prediction
 
 @app.get("/evaluation/{target}/{direction}", response_model=DetailedEvaluation)
 async def get_detailed_evaluation(
@@ -396,22 +658,78 @@ async def get_detailed_evaluation(
     
     return evaluation_data
 
+# Needs the adaptation/{target}_{direction}_components.npz files written by CrossDatasetFramework.
+# The shipped artifacts predate them, so this returns 404 until the models are retrained and
+# those files are copied into ADAPTATION_DIR.
 @app.post("/simulate/adaptation", response_model=Dict[str, Any])
 async def simulate_adaptation(params: DomainAdaptationParams):
     """Simulate domain adaptation with different methods"""
-    try:
-        # This endpoint should be connected to your actual adaptation methods
-        # For now, indicate that implementation is needed
-        raise NotImplementedError("The adaptation simulation endpoint needs to be connected to your actual domain adaptation methods")
-    except NotImplementedError as e:
-        raise HTTPException(status_code=501, detail=str(e))
+    if params.target not in ["arousal", "valence"]:
+        raise HTTPException(status_code=400, detail="Invalid target: must be 'arousal' or 'valence'")
+    
+    if params.direction not in ["wesad_to_kemocon", "kemocon_to_wesad"]:
+        raise HTTPException(status_code=400, detail="Invalid direction: must be 'wesad_to_kemocon' or 'kemocon_to_wesad'")
+    
+    # Resolve component weights
+    if params.weights is not None:
+        weights = np.asarray(params.weights, dtype=float)
+        if weights.shape != (3,) or np.any(weights < 0) or weights.sum() <= 0:
+            raise HTTPException(status_code=400, detail="Weights must be three non-negative numbers [subspace, coral, scaling] with a positive sum")
+        weights = weights / weights.sum()
+    elif params.adaptation_method in ADAPTATION_METHOD_WEIGHTS:
+        weights = np.asarray(ADAPTATION_METHOD_WEIGHTS[params.adaptation_method], dtype=float)
+        weights = weights / weights.sum()
+    elif params.adaptation_method == "none":
+        weights = None
+    else:
+        raise HTTPException(status_code=400, detail=f"Invalid adaptation method: {params.adaptation_method}")
+    
+    components = load_adaptation_components(target=params.target, direction=params.direction)
+    
+    # Blend the precomputed component maps; no refitting per request
+    source_sample = components["source_sample"]
+    if weights is None:
+        adapted_sample = source_sample
+        adapted_mean = components["source_mean"]
+    else:
+        matrix = np.tensordot(weights, components["component_matrices"], axes=1)
+        offset = weights @ components["component_offsets"]
+        adapted_sample = source_sample @ matrix + offset
+        adapted_mean = weights @ components["component_means"]
+    
+    target_mean = components["target_mean"]
+    gap_before = float(np.linalg.norm(components["source_mean"] - target_mean))
+    gap_after = float(np.linalg.norm(adapted_mean - target_mean))
+    gap_reduction = 1.0 - gap_after / gap_before if gap_before > 0 else 0.0
+    
+    return {
+        "target": params.target,
+        "direction": params.direction,
+        "adaptation_method": "custom" if params.weights is not None else params.adaptation_method,
+        "weights": dict(zip(["subspace", "coral", "scaling"], (weights if weights is not None else np.zeros(3)).tolist())),
+        "gap_before": gap_before,
+        "gap_after": gap_after,
+        "gap_reduction_pct": gap_reduction * 100.0,
+        "metrics_before": components["metrics_before"],
+        "metrics_after": domain_gap_metrics(adapted_sample, components["target_sample"], max_samples=None),
+        "n_samples": {"source": len(source_sample), "target": len(components["target_sample"])}
+    }
 
 @app.get("/visualize/domain_gap", response_model=Dict[str, Any])
-async def get_domain_gap_visualization(target: str = Query("arousal", description="Target dimension ('arousal' or 'valence')")):
+async def get_domain_gap_visualization(
+    target: str = Query("arousal", description="Target dimension ('arousal' or 'valence')"),
+    direction: Optional[str] = Query(None, description="Direction ('wesad_to_kemocon' or 'kemocon_to_wesad')")
+):
     """Get domain gap visualization data"""
     try:
         # This endpoint should load actual PCA-reduced features from your saved visualizations
         visualization_file = os.path.join(VISUALIZATION_DIR, f"domain_gap_{target}.json")
+        if direction is not None:
+            # Per-direction data written by CrossDatasetFramework, including MMD/CORAL/sliced Wasserstein
+            # gaps; same keys as the per-target file, which is used when it is missing
+            direction_file = os.path.join(VISUALIZATION_DIR, f"domain_gap_{target}_{direction}.json")
+            if os.path.exists(direction_file):
+                visualization_file = direction_file
         
         if os.path.exists(visualization_file):
             with open(visualization_file, 'r') as f:
@@ -419,7 +737,7 @@ async def get_domain_gap_visualization(target: str = Query("arousal", descriptio
         else:
             raise FileNotFoundError(f"Domain gap visualization data not found: {visualization_file}")
     except Exception as e:
-        print(f"Error loading domain gap visualization: {e}")
+        logger.error("Error loading domain gap visualization: %s", e)
         raise HTTPException(status_code=404, detail=f"Error loading domain gap visualization for {target}: {str(e)}")
 
 @app.get("/visualize/confusion_matrices", response_model=Dict[str, Any])
@@ -487,7 +805,7 @@ async def get_class_distribution_visualization():
         
         return result
     except Exception as e:
-        print(f"Error creating class distribution visualization: {e}")
+        logger.error("Error creating class distribution visualization: %s", e)
         raise HTTPException(status_code=500, detail=f"Error creating class distribution visualization: {str(e)}")
 
 @app.get("/visualize/feature_importance", response_model=Dict[str, Any])
@@ -528,7 +846,7 @@ async def get_feature_importance_visualization(
             "common_important_features": common_features
         }
     except Exception as e:
-        print(f"Error creating feature importance visualization: {e}")
+        logger.error("Error creating feature importance visualization: %s", e)
         raise HTTPException(status_code=500, detail=f"Error creating feature importance visualization for {target}: {str(e)}")
 
 @app.get("/report/{report_type}")
@@ -1,22 +1,30 @@
 import os
 import numpy as np
 import pandas as pd
-import pickle
 import json
+import threading
+from functools import partial
 from scipy import stats
 from typing import List, Dict, Any, Optional, Union
 from pydantic import BaseModel, Field
 from fastapi import FastAPI, HTTPException, Query, Path
 from fastapi.middleware.cors import CORSMiddleware
+import sys
+
+# Make the repository root importable for the shared cross_dataset package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from cross_dataset.models.compiled import CompiledEnsemble, compile_model
+from cross_dataset.save_demo_samples import DEMO_MODELS_DIR, load_demo_models, load_demo_sample_set
+from server.metrics import MetricsRoute, stage_timer
 
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
 DATA_DIR = os.path.join(BASE_DIR, "cross_dataset_api_data", "demo")
 
-DEMO_MODELS_PATH = os.path.join(DATA_DIR, "demo_models.pkl")
-WESAD_SAMPLES_PATH = os.path.join(DATA_DIR, "wesad_demo_samples.pkl")
-KEMOCON_SAMPLES_PATH = os.path.join(DATA_DIR, "kemocon_demo_samples.pkl")
+DEMO_MODELS_PATH = os.path.join(DATA_DIR, DEMO_MODELS_DIR)
+WESAD_SAMPLES_PATH = os.path.join(DATA_DIR, "wesad_demo_samples.npz")
+KEMOCON_SAMPLES_PATH = os.path.join(DATA_DIR, "kemocon_demo_samples.npz")
 
 # Define valid subjects/participants (keep these for validation)
 VALID_WESAD_SUBJECTS = [2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 13, 14, 15, 16, 17]
@@ -28,6 +36,8 @@ app = FastAPI(
     description="API for making predictions using cross-dataset models with demo samples",
     version="1.0.0"
 )
+# Time result serialization of every route (see server/metrics.py)
+app.router.route_class = MetricsRoute
 origins = [
     "https://neurofeel.vercel.app",  # Vercel frontend
     "http://localhost:3000",         # Local dev
@@ -61,6 +71,12 @@ class PredictionResponse(BaseModel):
     ground_truth: Dict[str, Any] = {}
     confidence: Dict[str, float] = {}
 
+class BatchPredictionRequest(BaseModel):
+    """Request for predictions on many samples from demo data"""
+    direction: str = Field(..., description="Model direction ('wesad_to_kemocon' or 'kemocon_to_wesad')")
+    sample_indices: List[int] = Field(..., description="Indices of the samples in demo data")
+    target_dimension: str = Field("both", description="Target dimension to predict ('arousal', 'valence', or 'both')")
+
 class AvailableSamplesResponse(BaseModel):
     """Response with available samples from the demo data"""
     wesad_samples: int
@@ -73,146 +89,178 @@ class AvailableSamplesResponse(BaseModel):
 demo_models = None
 wesad_samples = None
 kemocon_samples = None
+demo_matrices = None
+
+# Guards the globals above; reentrant because compile_demo_data calls load_demo_data
+_demo_lock = threading.RLock()
 
 def load_demo_data():
     """Load demo models and samples"""
     global demo_models, wesad_samples, kemocon_samples
     
-    # Only load if not already loaded
-    if demo_models is None:
-        try:
-            with open(DEMO_MODELS_PATH, 'rb') as f:
-                demo_models = pickle.load(f)
-        except Exception as e:
-            raise RuntimeError(f"Failed to load demo models: {e}")
-    
-    if wesad_samples is None:
-        try:
-            with open(WESAD_SAMPLES_PATH, 'rb') as f:
-                wesad_samples = pickle.load(f)
-        except Exception as e:
-            raise RuntimeError(f"Failed to load WESAD samples: {e}")
-    
-    if kemocon_samples is None:
-        try:
-            with open(KEMOCON_SAMPLES_PATH, 'rb') as f:
-                kemocon_samples = pickle.load(f)
-        except Exception as e:
-            raise RuntimeError(f"Failed to load K-EmoCon samples: {e}")
-    
-    return demo_models, wesad_samples, kemocon_samples
-
-def get_sample(direction, sample_index):
-    """Get a specific sample from the demo data"""
-    # Load data if not already loaded
-    demo_models, wesad_samples, kemocon_samples = load_demo_data()
-    
-    # Get the appropriate sample based on direction
-    if direction == 'wesad_to_kemocon':
-        # For WESAD→K-EmoCon, we need K-EmoCon samples
-        if sample_index >= len(kemocon_samples['samples']):
-            raise IndexError(f"Sample index {sample_index} out of range for K-EmoCon samples")
-        
-        sample = kemocon_samples['samples'].iloc[sample_index]
-        features = {}
+    with _demo_lock:
+        # Only load if not already loaded (model bundles and .npz archives, no plain pickle)
+        if demo_models is None:
+            try:
+                with stage_timer('artifact_load'):
+                    demo_models = load_demo_models(DEMO_MODELS_PATH)
+            except Exception as e:
+                raise RuntimeError(f"Failed to load demo models from {DEMO_MODELS_PATH}: {e}")
         
-        # Get features for the sample
-        for feature in kemocon_samples['arousal_features']:
-            if feature in sample:
-                features[feature] = sample[feature]
+        if wesad_samples is None:
+            try:
+                with stage_timer('artifact_load'):
+                    wesad_samples = load_demo_sample_set(WESAD_SAMPLES_PATH)
+            except Exception as e:
+                raise RuntimeError(f"Failed to load WESAD samples from {WESAD_SAMPLES_PATH}: {e}")
         
-        return {
-            'sample': sample,
-            'features': features,
-            'arousal_features': kemocon_samples['arousal_features'],
-            'valence_features': kemocon_samples['valence_features'],
-            'arousal_binary': kemocon_samples['arousal_binary'][sample_index],
-            'valence_binary': kemocon_samples['valence_binary'][sample_index],
-            'subject_id': sample['participant_id'] if 'participant_id' in sample else None
-        }
+        if kemocon_samples is None:
+            try:
+                with stage_timer('artifact_load'):
+                    kemocon_samples = load_demo_sample_set(KEMOCON_SAMPLES_PATH)
+            except Exception as e:
+                raise RuntimeError(f"Failed to load K-EmoCon samples from {KEMOCON_SAMPLES_PATH}: {e}")
         
-    elif direction == 'kemocon_to_wesad':
-        # For K-EmoCon→WESAD, we need WESAD samples
-        if sample_index >= len(wesad_samples['samples']):
-            raise IndexError(f"Sample index {sample_index} out of range for WESAD samples")
+        return demo_models, wesad_samples, kemocon_samples
+
+def compile_demo_data():
+    """
+    Convert the demo samples into dense arrays for fast prediction.
+    
+    For each direction the samples of its target dataset are stored as row
+    records, and for each target a float32 feature matrix is built with the
+    columns already in the model's feature order, and the model is compiled
+    into array form. A prediction is then a row index into that matrix
+    followed by predict_proba.
+    """
+    global demo_matrices
+    
+    with _demo_lock:
+        if demo_matrices is not None:
+            return demo_matrices
         
-        sample = wesad_samples['samples'].iloc[sample_index]
-        features = {}
+        demo_models, wesad_samples, kemocon_samples = load_demo_data()
         
-        # Get features for the sample
-        for feature in wesad_samples['arousal_features']:
-            if feature in sample:
-                features[feature] = sample[feature]
+        compiled = {}
+        # WESAD→K-EmoCon models predict K-EmoCon samples and vice versa
+        for direction, samples_data, id_column in [
+            ('wesad_to_kemocon', kemocon_samples, 'participant_id'),
+            ('kemocon_to_wesad', wesad_samples, 'subject_id')
+        ]:
+            samples = samples_data['samples']
+            
+            compiled_direction = {
+                'records': samples.to_dict('records'),
+                'subject_ids': samples[id_column].to_numpy() if id_column in samples.columns else None,
+                'arousal_features': samples_data['arousal_features'],
+                'valence_features': samples_data['valence_features'],
+                'arousal_binary': np.asarray(samples_data['arousal_binary']),
+                'valence_binary': np.asarray(samples_data['valence_binary'])
+            }
+            
+            for target in ['arousal', 'valence']:
+                feature_names = samples_data[f'{target}_features']
+                # Features missing from the samples default to 0
+                X = np.zeros((len(samples), len(feature_names)), dtype=np.float32)
+                available = [i for i, feature in enumerate(feature_names) if feature in samples.columns]
+                X[:, available] = samples[[feature_names[i] for i in available]].to_numpy(dtype=np.float32)
+                compiled_direction[f'{target}_matrix'] = X
+                model_data = demo_models[target][direction]
+                if model_data['compiled'] is not None:
+                    compiled_direction[f'{target}_model'] = CompiledEnsemble.from_arrays(model_data['compiled'])
+                else:
+                    compiled_direction[f'{target}_model'] = compile_model(model_data['model'])
+            
+            compiled[direction] = compiled_direction
         
-        return {
-            'sample': sample,
-            'features': features,
-            'arousal_features': wesad_samples['arousal_features'],
-            'valence_features': wesad_samples['valence_features'],
-            'arousal_binary': wesad_samples['arousal_binary'][sample_index],
-            'valence_binary': wesad_samples['valence_binary'][sample_index],
-            'subject_id': sample['subject_id'] if 'subject_id' in sample else None
-        }
-    
-    else:
+        demo_matrices = compiled
+        return demo_matrices
+
+def get_sample(direction, sample_index):
+    """Get a specific sample from the demo data"""
+    if direction not in ['wesad_to_kemocon', 'kemocon_to_wesad']:
         raise ValueError(f"Invalid direction: {direction}")
+    
+    compiled = compile_demo_data()[direction]
+    if sample_index < 0 or sample_index >= len(compiled['records']):
+        dataset_name = 'K-EmoCon' if direction == 'wesad_to_kemocon' else 'WESAD'
+        raise IndexError(f"Sample index {sample_index} out of range for {dataset_name} samples")
+    
+    sample = compiled['records'][sample_index]
+    features = {feature: sample[feature] for feature in compiled['arousal_features'] if feature in sample}
+    subject_ids = compiled['subject_ids']
+    
+    return {
+        'sample': sample,
+        'features': features,
+        'arousal_features': compiled['arousal_features'],
+        'valence_features': compiled['valence_features'],
+        'arousal_binary': compiled['arousal_binary'][sample_index],
+        'valence_binary': compiled['valence_binary'][sample_index],
+        'subject_id': subject_ids[sample_index] if subject_ids is not None else None
+    }
 
-def predict_with_model(features, direction, target):
-    """Make prediction using the demo models"""
-    # Load models if not already loaded
+def predict_samples(direction, sample_indices, target):
+    """
+    Predict a target for one or many demo samples with a single predict_proba call.
+    
+    Args:
+        direction (str): Model direction
+        sample_indices (array-like): Indices of the samples in the demo data
+        target (str): 'arousal' or 'valence'
+    
+    Returns:
+        tuple: (probabilities, predicted classes, feature names)
+    """
     demo_models, _, _ = load_demo_data()
+    compiled = compile_demo_data()[direction]
     
     # Get the appropriate model components
     model_data = demo_models[target][direction]
-    model = model_data['model']
+    model = compiled[f'{target}_model']
     scaler = model_data['scaler']
     threshold = model_data['threshold']
     
-    # Prepare features array
-    if target == 'arousal':
-        if direction == 'wesad_to_kemocon':
-            # Load demo data to get feature names
-            _, _, kemocon_samples = load_demo_data()
-            feature_names = kemocon_samples['arousal_features']
-        else:  # kemocon_to_wesad
-            _, wesad_samples, _ = load_demo_data()
-            feature_names = wesad_samples['arousal_features']
-    else:  # valence
-        if direction == 'wesad_to_kemocon':
-            _, _, kemocon_samples = load_demo_data()
-            feature_names = kemocon_samples['valence_features']
-        else:  # kemocon_to_wesad
-            _, wesad_samples, _ = load_demo_data()
-            feature_names = wesad_samples['valence_features']
-    
-    # Create feature vector
-    feature_vector = []
-    for feature in feature_names:
-        if feature in features:
-            feature_vector.append(features[feature])
-        else:
-            # Default to 0 if feature is missing
-            feature_vector.append(0.0)
-    
-    # Convert to numpy array
-    X = np.array(feature_vector).reshape(1, -1)
+    X = compiled[f'{target}_matrix'][sample_indices]
     
     # Apply scaling if available
     if scaler is not None:
-        X = scaler.transform(X)
+        with stage_timer('scaling'):
+            X = scaler.transform(X)
     
-    # Get prediction
-    y_prob = model.predict_proba(X)[0, 1]  # Probability of class 1 (high)
-    y_pred = 1 if y_prob >= threshold else 0
+    with stage_timer('inference'):
+        y_prob = model.predict_proba(X)[:, 1]  # Probability of class 1 (high)
+    y_pred = (y_prob >= threshold).astype(int)
     
-    # Format result
-    result = {
+    return y_prob, y_pred, compiled[f'{target}_features']
+
+def warmup_direction(direction):
+    """Compile the demo data and run one sample through both models of a direction"""
+    for target in ['arousal', 'valence']:
+        predict_samples(direction, [0], target)
+
+def get_warmup_tasks():
+    """Get the artifacts to preload at startup, as a dict of name -> loader"""
+    return {
+        f'demo_{direction}': partial(warmup_direction, direction)
+        for direction in ['wesad_to_kemocon', 'kemocon_to_wesad']
+    }
+
+def format_prediction(y_prob, y_pred):
+    """Format a single prediction result"""
+    return {
         "class": "high" if y_pred == 1 else "low",
         "probability": float(y_prob),
         "confidence": float(max(y_prob, 1 - y_prob)),
     }
-    
-    return result, feature_names
+
+def parse_target_dimension(target_dimension):
+    """Resolve the requested target dimension into a list of targets"""
+    if target_dimension.lower() == 'both':
+        return ['arousal', 'valence']
+    elif target_dimension.lower() in ['arousal', 'valence']:
+        return [target_dimension.lower()]
+    raise HTTPException(status_code=400, detail=f"Invalid target dimension: {target_dimension}")
 
 @app.get("/")
 async def root():
@@ -284,7 +332,7 @@ async def get_sample_details(
             result["emotion_label"] = emotion_names.get(int(sample['label']), f"Unknown ({sample['label']})")
         
         return result
-        
+    
     except IndexError:
         raise HTTPException(status_code=404, detail="Sample index out of range")
     except ValueError as e:
@@ -295,6 +343,16 @@ async def get_sample_details(
 @app.post("/predict", response_model=PredictionResponse)
 async def predict_using_demo_sample(request: PredictionRequest):
     """Make prediction using a demo sample"""
+    results = await predict_batch_using_demo_samples(BatchPredictionRequest(
+        direction=request.direction,
+        sample_indices=[request.sample_index],
+        target_dimension=request.target_dimension
+    ))
+    return results[0]
+
+@app.post("/predict/batch", response_model=List[PredictionResponse])
+async def predict_batch_using_demo_samples(request: BatchPredictionRequest):
+    """Make predictions for many demo samples and both targets at once"""
     try:
         # Validate direction
         if request.direction not in ['wesad_to_kemocon', 'kemocon_to_wesad']:
@@ -303,51 +361,53 @@ async def predict_using_demo_sample(request: PredictionRequest):
                 detail="Invalid direction. Must be 'wesad_to_kemocon' or 'kemocon_to_wesad'"
             )
         
-        # Get the sample
-        sample_data = get_sample(request.direction, request.sample_index)
+        targets = parse_target_dimension(request.target_dimension)
         
-        # Initialize result
-        result = {
-            "arousal": None,
-            "valence": None,
-            "features_used": {},
-            "direction": request.direction,
-            "sample_index": request.sample_index,
-            "subject_id": sample_data['subject_id'],
-            "ground_truth": {
-                "arousal": "high" if sample_data['arousal_binary'] == 1 else "low",
-                "valence": "high" if sample_data['valence_binary'] == 1 else "low"
-            },
-            "confidence": {}
-        }
+        compiled = compile_demo_data()[request.direction]
+        indices = np.asarray(request.sample_indices, dtype=int)
+        n_samples = len(compiled['records'])
+        if len(indices) == 0 or np.any((indices < 0) | (indices >= n_samples)):
+            raise IndexError("Sample index out of range")
         
-        # Determine which targets to predict
-        targets = []
-        if request.target_dimension.lower() == 'both':
-            targets = ['arousal', 'valence']
-        elif request.target_dimension.lower() in ['arousal', 'valence']:
-            targets = [request.target_dimension.lower()]
-        else:
-            raise HTTPException(status_code=400, detail=f"Invalid target dimension: {request.target_dimension}")
+        # One predict_proba call per target for all requested samples
+        predictions = {target: predict_samples(request.direction, indices, target) for target in targets}
         
-        # Make predictions for each target
-        for target in targets:
-            # Make prediction
-            prediction, feature_names = predict_with_model(sample_data['features'], request.direction, target)
+        results = []
+        for row, sample_index in enumerate(indices):
+            sample_data = get_sample(request.direction, int(sample_index))
             
-            # Add to result
-            result[target] = prediction
-            result["confidence"][target] = prediction["confidence"]
+            result = {
+                "arousal": None,
+                "valence": None,
+                "features_used": {},
+                "direction": request.direction,
+                "sample_index": int(sample_index),
+                "subject_id": sample_data['subject_id'],
+                "ground_truth": {
+                    "arousal": "high" if sample_data['arousal_binary'] == 1 else "low",
+                    "valence": "high" if sample_data['valence_binary'] == 1 else "low"
+                },
+                "confidence": {}
+            }
             
-            # Add features used
-            for feature in feature_names:
-                if feature in sample_data['features']:
-                    result["features_used"][feature] = float(sample_data['features'][feature])
-        
-        return result
+            for target, (y_prob, y_pred, feature_names) in predictions.items():
+                prediction = format_prediction(y_prob[row], y_pred[row])
+                result[target] = prediction
+                result["confidence"][target] = prediction["confidence"]
+                
+                # Add features used
+                for feature in feature_names:
+                    if feature in sample_data['features']:
+                        result["features_used"][feature] = float(sample_data['features'][feature])
+            
+            results.append(result)
         
+        return results
+    
     except IndexError:
         raise HTTPException(status_code=404, detail="Sample index out of range")
+    except HTTPException:
+        raise
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
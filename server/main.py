@@ -1,27 +1,106 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, Response
+from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 
 # Import WESAD apps
 from server.wesad.dataserving import app as wesad_dataserving_app
+from server.wesad.dataserving import get_warmup_tasks as wesad_dataserving_warmup_tasks
 from server.wesad.model import app as wesad_model_app
+from server.wesad.model import get_warmup_tasks as wesad_model_warmup_tasks
 
 
 # Import Cross Dataset apps
 from server.cross_dataset.dataserving import app as cross_dataserving_app
+from server.cross_dataset.dataserving import get_warmup_tasks as cross_dataserving_warmup_tasks
 from server.cross_dataset.model import app as cross_model_app
+from server.cross_dataset.model import get_warmup_tasks as cross_model_warmup_tasks
+
+from server.metrics import MetricsMiddleware, render_metrics, PROMETHEUS_CONTENT_TYPE
+from wesad_framework.utils.log import configure_logging
 
 
 import sys
 import os
+import logging
+import threading
+import time
 
 # Add server/ to the Python path
 sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
 
+# JSON records at $NEUROFEEL_LOG_LEVEL (INFO by default), written by a background thread
+configure_logging()
+logger = logging.getLogger(__name__)
+
+# Number of artifacts loaded in parallel at startup
+WARMUP_WORKERS = 8
+
+# Warmup tasks of each mounted app, keyed by mount path
+WARMUP_TASK_SOURCES = {
+    "/wesad/dataserving": wesad_dataserving_warmup_tasks,
+    "/wesad/model": wesad_model_warmup_tasks,
+    "/cross_dataset/dataserving": cross_dataserving_warmup_tasks,
+    "/cross_dataset/model": cross_model_warmup_tasks,
+}
+
+# Progress of the startup warmup, reported by /ready
+warmup_state = {
+    "ready": False,
+    "started_at": None,
+    "finished_at": None,
+    "total_seconds": None,
+    "artifacts": {}
+}
+
+def run_warmup_task(name, loader):
+    """Run one warmup task and record its load time"""
+    start = time.perf_counter()
+    try:
+        loader()
+        result = {"status": "loaded"}
+    except Exception as e:
+        # A missing artifact is reported but does not block the other apps
+        result = {"status": "failed", "error": str(getattr(e, "detail", e))}
+    result["seconds"] = round(time.perf_counter() - start, 4)
+    warmup_state["artifacts"][name] = result
+    logger.info("Warmup %s: %s in %.3fs", name, result["status"], result["seconds"],
+                extra={"artifact": name, "status": result["status"], "duration_ms": result["seconds"] * 1000})
+
+def warmup():
+    """Preload the models, scalers and samples of all mounted apps concurrently"""
+    start = time.perf_counter()
+    warmup_state["started_at"] = datetime.now().isoformat()
+    
+    tasks = {}
+    for prefix, get_tasks in WARMUP_TASK_SOURCES.items():
+        try:
+            for name, loader in get_tasks().items():
+                tasks[f"{prefix}/{name}"] = loader
+        except Exception as e:
+            warmup_state["artifacts"][prefix] = {"status": "failed", "error": str(e), "seconds": 0.0}
+    
+    with ThreadPoolExecutor(max_workers=WARMUP_WORKERS) as executor:
+        list(executor.map(lambda item: run_warmup_task(*item), tasks.items()))
+    
+    warmup_state["total_seconds"] = round(time.perf_counter() - start, 4)
+    warmup_state["finished_at"] = datetime.now().isoformat()
+    warmup_state["ready"] = True
+
+@asynccontextmanager
+async def lifespan(app):
+    # Load in the background so the server can answer /ready while warming up
+    threading.Thread(target=warmup, name="warmup", daemon=True).start()
+    yield
+
 # Create the main FastAPI app
 app = FastAPI(
     title="Combined NeuroFeel API",
     description="Combined API for WESAD and Cross-Dataset emotion recognition",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 # CORS Configuration
@@ -40,6 +119,21 @@ app.add_middleware(
     allow_headers=["*"],  # Allow all headers
 )
 
+# Request metrics of all mounted apps, labelled by route template (served on /metrics)
+app.add_middleware(MetricsMiddleware, prefixes=list(WARMUP_TASK_SOURCES))
+
+@app.get("/ready")
+async def ready():
+    """Readiness check: 503 until all artifacts have been preloaded"""
+    state = dict(warmup_state, artifacts=dict(warmup_state["artifacts"]))
+    state["failed"] = sorted(name for name, result in state["artifacts"].items() if result["status"] == "failed")
+    return JSONResponse(status_code=200 if state["ready"] else 503, content=state)
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Request counts, latencies, payload sizes and stage timings in Prometheus text format"""
+    return Response(content=render_metrics(), media_type=PROMETHEUS_CONTENT_TYPE)
+
 # Mount WESAD apps under /wesad
 app.mount("/wesad/dataserving", wesad_dataserving_app)
 app.mount("/wesad/model", wesad_model_app)
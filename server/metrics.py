@@ -0,0 +1,409 @@
+"""
+Request metrics for the NeuroFeel API in Prometheus text format.
+
+MetricsMiddleware wraps the combined app and records, per route template
+(e.g. /wesad/model/predict/{subject_id}), request counts by status, error
+counts, latency histograms, request/response payload sizes and the number
+of requests in flight per mounted app. Serving code marks its stages with
+stage_timer ('artifact_load', 'scaling', 'inference'); the time FastAPI
+spends validating and serializing an endpoint's result is recorded as the
+'serialization' stage by routes of type MetricsRoute. Stages are summed per
+request and recorded under the request's route; stages timed outside a
+request (e.g. the startup warmup) are recorded under the route 'background'.
+
+Metrics live in the memory of the process, so with several gunicorn workers
+each worker exposes its own counts on /metrics.
+"""
+
+import time
+import bisect
+import inspect
+import logging
+import functools
+import threading
+import contextvars
+from contextlib import contextmanager
+
+from fastapi.routing import APIRoute
+from starlette.routing import Mount
+
+
+# Histogram buckets for durations (seconds) and payload sizes (bytes)
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (100, 1000, 10000, 100000, 1000000, 10000000)
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Route label of requests that matched no route, and of stages timed outside requests
+UNMATCHED_ROUTE = 'unmatched'
+BACKGROUND_ROUTE = 'background'
+
+logger = logging.getLogger(__name__)
+
+
+def _format_value(value):
+    """Format a sample value or bucket bound."""
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value))
+
+
+def _format_labels(labels):
+    """Format a label set as {name="value",...}."""
+    if not labels:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+               for value in labels.values())
+    return '{' + ','.join(f'{name}="{value}"' for name, value in zip(labels, escaped)) + '}'
+
+
+class _Metric:
+    """
+    Base of the metric types: a value per label set, guarded by a lock.
+    """
+    
+    kind = None
+    
+    def __init__(self, name, documentation, labelnames=()):
+        """
+        Initialize a metric.
+        
+        Args:
+            name (str): Metric name
+            documentation (str): Help text
+            labelnames (list): Names of the labels of each sample
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+    
+    def _key(self, labels):
+        """Label values in labelnames order."""
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+    
+    def _samples(self):
+        """(suffix, labels, value) of each sample."""
+        with self._lock:
+            items = list(self._values.items())
+        return [('', dict(zip(self.labelnames, key)), value) for key, value in items]
+    
+    def render(self):
+        """Render the metric in Prometheus text format."""
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.kind}']
+        for suffix, labels, value in self._samples():
+            lines.append(f'{self.name}{suffix}{_format_labels(labels)} {_format_value(value)}')
+        return '\n'.join(lines)
+
+
+class Counter(_Metric):
+    """
+    Monotonically increasing count.
+    """
+    
+    kind = 'counter'
+    
+    def inc(self, amount=1, **labels):
+        """Increase the count of a label set."""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    """
+    Value that goes up and down.
+    """
+    
+    kind = 'gauge'
+    
+    def inc(self, amount=1, **labels):
+        """Increase the value of a label set."""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+    
+    def dec(self, amount=1, **labels):
+        """Decrease the value of a label set."""
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    """
+    Distribution of observed values in cumulative buckets.
+    """
+    
+    kind = 'histogram'
+    
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        """
+        Initialize a histogram.
+        
+        Args:
+            name (str): Metric name
+            documentation (str): Help text
+            labelnames (list): Names of the labels of each sample
+            buckets (tuple): Upper bounds of the buckets, in increasing order
+        """
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+    
+    def observe(self, value, **labels):
+        """Record an observation."""
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # Count per bucket (the last one is +Inf) and the sum of observations
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            state[0][index] += 1
+            state[1] += value
+    
+    def _samples(self):
+        with self._lock:
+            items = [(key, list(counts), total) for key, (counts, total) in self._values.items()]
+        
+        samples = []
+        for key, counts, total in items:
+            labels = dict(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                samples.append(('_bucket', dict(labels, le=_format_value(bound)), cumulative))
+            samples.append(('_sum', labels, total))
+            samples.append(('_count', labels, cumulative))
+        return samples
+
+
+class MetricsRegistry:
+    """
+    Collection of metrics rendered together on /metrics.
+    """
+    
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+    
+    def register(self, metric):
+        """Add a metric, or return the registered metric of the same name."""
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+    
+    def counter(self, name, documentation, labelnames=()):
+        return self.register(Counter(name, documentation, labelnames))
+    
+    def gauge(self, name, documentation, labelnames=()):
+        return self.register(Gauge(name, documentation, labelnames))
+    
+    def histogram(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+    
+    def render(self):
+        """Render all metrics in Prometheus text format."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return '\n'.join(metric.render() for metric in metrics) + '\n'
+
+
+REGISTRY = MetricsRegistry()
+
+HTTP_REQUESTS = REGISTRY.counter(
+    'neurofeel_http_requests_total', 'HTTP requests by route and status code', ['method', 'route', 'status'])
+HTTP_ERRORS = REGISTRY.counter(
+    'neurofeel_http_request_errors_total', 'HTTP requests that failed with a 5xx status or an unhandled exception',
+    ['method', 'route'])
+HTTP_LATENCY = REGISTRY.histogram(
+    'neurofeel_http_request_duration_seconds', 'Time from receiving a request to sending the last response byte',
+    ['method', 'route'])
+HTTP_IN_FLIGHT = REGISTRY.gauge(
+    'neurofeel_http_requests_in_flight', 'Requests being processed, by mounted app', ['app'])
+HTTP_REQUEST_SIZE = REGISTRY.histogram(
+    'neurofeel_http_request_size_bytes', 'Size of request bodies', ['method', 'route'], SIZE_BUCKETS)
+HTTP_RESPONSE_SIZE = REGISTRY.histogram(
+    'neurofeel_http_response_size_bytes', 'Size of response bodies', ['method', 'route'], SIZE_BUCKETS)
+STAGE_LATENCY = REGISTRY.histogram(
+    'neurofeel_stage_duration_seconds', 'Time spent in a serving stage per request', ['route', 'stage'])
+
+# Stage timings of the request being processed
+_request_state = contextvars.ContextVar('neurofeel_request_state', default=None)
+
+
+def record_stage(stage, seconds):
+    """
+    Add time spent in a stage to the current request, or record it directly outside requests.
+    
+    Args:
+        stage (str): Stage name
+        seconds (float): Time spent in the stage
+    """
+    state = _request_state.get()
+    if state is None:
+        STAGE_LATENCY.observe(seconds, route=BACKGROUND_ROUTE, stage=stage)
+    else:
+        state['stages'][stage] = state['stages'].get(stage, 0.0) + seconds
+
+
+@contextmanager
+def stage_timer(stage):
+    """
+    Time a block of serving code as a stage of the current request.
+    
+    Args:
+        stage (str): Stage name, e.g. 'artifact_load', 'scaling' or 'inference'
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_stage(stage, time.perf_counter() - start)
+
+
+def _mark_returned():
+    """Remember when the endpoint of the current request returned."""
+    state = _request_state.get()
+    if state is not None:
+        state['returned_at'] = time.perf_counter()
+
+
+def _timed_endpoint(endpoint):
+    """Wrap an endpoint so the time it returns is recorded, keeping its signature and sync/async kind."""
+    if inspect.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def wrapper(*args, **kwargs):
+            try:
+                return await endpoint(*args, **kwargs)
+            finally:
+                _mark_returned()
+    else:
+        @functools.wraps(endpoint)
+        def wrapper(*args, **kwargs):
+            try:
+                return endpoint(*args, **kwargs)
+            finally:
+                _mark_returned()
+    return wrapper
+
+
+class MetricsRoute(APIRoute):
+    """
+    APIRoute that records the time from the endpoint returning to the response
+    starting (result validation and JSON serialization) as the 'serialization' stage.
+    
+    Set it with app.router.route_class = MetricsRoute before declaring the routes.
+    """
+    
+    def __init__(self, path, endpoint, **kwargs):
+        super().__init__(path, _timed_endpoint(endpoint), **kwargs)
+
+
+def route_template(scope):
+    """
+    Route template of a handled request, including the mount prefix.
+    
+    Args:
+        scope (dict): ASGI scope after routing
+    
+    Returns:
+        str: Path template such as /wesad/model/predict/{subject_id}, or 'unmatched'
+    """
+    route = scope.get('route')
+    if route is None or isinstance(route, Mount) or not hasattr(route, 'path'):
+        return UNMATCHED_ROUTE
+    # Mounts extend root_path with their prefix; app_root_path is the server's own root path
+    root_path = scope.get('root_path', '')
+    app_root_path = scope.get('app_root_path', root_path)
+    return root_path[len(app_root_path):] + route.path
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording request metrics of an app and the apps mounted in it.
+    """
+    
+    def __init__(self, app, prefixes=()):
+        """
+        Initialize the middleware.
+        
+        Args:
+            app: ASGI app to wrap
+            prefixes (list): Mount paths, used to count in-flight requests per mounted app
+        """
+        self.app = app
+        self.prefixes = sorted(prefixes, key=len, reverse=True)
+    
+    def _app_label(self, path):
+        """Mount prefix of a request path, or '/' for routes of the combined app."""
+        for prefix in self.prefixes:
+            if path == prefix or path.startswith(prefix + '/'):
+                return prefix
+        return '/'
+    
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+        
+        state = {'stages': {}, 'returned_at': None}
+        response = {'status': 500, 'started_at': None, 'request_size': 0, 'response_size': 0}
+        
+        async def receive_wrapper():
+            message = await receive()
+            if message['type'] == 'http.request':
+                response['request_size'] += len(message.get('body', b''))
+            return message
+        
+        async def send_wrapper(message):
+            if message['type'] == 'http.response.start':
+                response['status'] = message['status']
+                response['started_at'] = time.perf_counter()
+            elif message['type'] == 'http.response.body':
+                response['response_size'] += len(message.get('body', b''))
+            await send(message)
+        
+        app_label = self._app_label(scope['path'])
+        token = _request_state.set(state)
+        HTTP_IN_FLIGHT.inc(app=app_label)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive_wrapper, send_wrapper)
+        except Exception:
+            response['status'] = 500
+            raise
+        finally:
+            duration = time.perf_counter() - start
+            HTTP_IN_FLIGHT.dec(app=app_label)
+            _request_state.reset(token)
+            self._record(scope, state, response, duration)
+    
+    def _record(self, scope, state, response, duration):
+        """Record the metrics of a finished request."""
+        method = scope['method']
+        route = route_template(scope)
+        status = response['status']
+        
+        HTTP_REQUESTS.inc(method=method, route=route, status=status)
+        if status >= 500:
+            HTTP_ERRORS.inc(method=method, route=route)
+        HTTP_LATENCY.observe(duration, method=method, route=route)
+        HTTP_REQUEST_SIZE.observe(response['request_size'], method=method, route=route)
+        HTTP_RESPONSE_SIZE.observe(response['response_size'], method=method, route=route)
+        
+        stages = state['stages']
+        if state['returned_at'] is not None and response['started_at'] is not None:
+            stages['serialization'] = max(response['started_at'] - state['returned_at'], 0.0)
+        for stage, seconds in stages.items():
+            STAGE_LATENCY.observe(seconds, route=route, stage=stage)
+        
+        if logger.isEnabledFor(logging.DEBUG):
+            fields = {f'{stage}_ms': round(seconds * 1000, 3) for stage, seconds in stages.items()}
+            logger.debug("%s %s %s", method, route, status, extra=dict(
+                fields, method=method, route=route, status=status, duration_ms=round(duration * 1000, 3)))
+
+
+def render_metrics():
+    """Render all registered metrics in Prometheus text format."""
+    return REGISTRY.render()
@@ -9,33 +9,45 @@ import json
 import io
 import zipfile
 import tempfile
-import pickle
+import sys
+import logging
+import threading
+from functools import partial
 from typing import List, Dict, Any, Optional
 from pydantic import BaseModel
 import matplotlib.pyplot as plt
 import seaborn as sns
 from datetime import datetime
 
+# Make the repository root importable for the shared model bundle format
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from wesad_framework.utils.bundle import load_bundle, is_bundle
+from wesad_framework.utils.artifacts import load_pickle
+from wesad_framework.utils.columnar import open_test_store, TEST_STORE_NAME
+from server.metrics import MetricsRoute, stage_timer
+
+logger = logging.getLogger(__name__)
+
 # Models for data validation
 class ModelPerformance(BaseModel):
     model_type: str
     accuracy: float
     f1_score: float
     subject_id: Optional[int] = None
-    
+
 class EmotionRecognition(BaseModel):
     emotion: str
     correct: int
     total: int
     accuracy: float
-    
+
 class SubjectPerformance(BaseModel):
     subject_id: int
     base_accuracy: float
     personal_accuracy: float
     ensemble_accuracy: float
     adaptive_accuracy: float
-    
+
 class ConfusionMatrix(BaseModel):
     model_type: str
     subject_id: int
@@ -88,6 +100,8 @@ app = FastAPI(
     description="API for serving WESAD emotion recognition research data",
     version="1.0.0"
 )
+# Time result serialization of every route (see server/metrics.py)
+app.router.route_class = MetricsRoute
 origins = [
     "https://neurofeel.vercel.app",  # Vercel frontend
     "http://localhost:3000",         # Local dev
@@ -123,6 +137,7 @@ BENCHMARKS_FILE = os.path.join(BASE_DIR, "benchmarks", "benchmarks.json")
 DATASET_STATS_FILE = os.path.join(BASE_DIR, "dataset", "statistics.json")
 VISUALIZATION_DIR = os.path.join(BASE_DIR, "visualizations")
 TEST_DATA_DIR = os.path.join(BASE_DIR, "test_data")
+TEST_STORE_DIR = os.path.join(TEST_DATA_DIR, TEST_STORE_NAME)
 
 # Define emotion class names
 CLASS_NAMES = ['Baseline', 'Stress', 'Amusement', 'Meditation']
@@ -165,10 +180,10 @@ def load_model_data():
             if all_data:
                 return pd.DataFrame(all_data)
             else:
-                print("No model data files found")
+                logger.warning("No model data files found")
                 return pd.DataFrame()
     except Exception as e:
-        print(f"Error loading data: {e}")
+        logger.error("Error loading data: %s", e)
         return pd.DataFrame()
 
 # Helper function to parse confusion matrices
@@ -214,7 +229,7 @@ def load_overview_data():
         else:
             return None
     except Exception as e:
-        print(f"Error loading overview data: {e}")
+        logger.error("Error loading overview data: %s", e)
         return None
 
 # Helper function to load emotion data
@@ -227,7 +242,7 @@ def load_emotion_data():
         else:
             return None
     except Exception as e:
-        print(f"Error loading emotion data: {e}")
+        logger.error("Error loading emotion data: %s", e)
         return None
 
 # Helper function to load subject data
@@ -241,7 +256,7 @@ def load_subject_data(subject_id):
         else:
             return None
     except Exception as e:
-        print(f"Error loading subject data: {e}")
+        logger.error("Error loading subject data: %s", e)
         return None
 
 # Helper function to load feature importance data
@@ -254,7 +269,7 @@ def load_feature_importance():
         else:
             return None
     except Exception as e:
-        print(f"Error loading feature importance data: {e}")
+        logger.error("Error loading feature importance data: %s", e)
         return None
 
 # Helper function to load subject-specific feature importance
@@ -268,7 +283,7 @@ def load_subject_feature_importance(subject_id):
         else:
             return None
     except Exception as e:
-        print(f"Error loading subject feature importance data: {e}")
+        logger.error("Error loading subject feature importance data: %s", e)
         return None
 
 # Helper function to load benchmark data
@@ -281,7 +296,7 @@ def load_benchmark_data():
         else:
             return None
     except Exception as e:
-        print(f"Error loading benchmark data: {e}")
+        logger.error("Error loading benchmark data: %s", e)
         return None
 
 # Helper function to load dataset statistics
@@ -294,61 +309,113 @@ def load_dataset_statistics():
         else:
             return None
     except Exception as e:
-        print(f"Error loading dataset statistics: {e}")
+        logger.error("Error loading dataset statistics: %s", e)
         return None
 
-# Helper function to load test data for a subject
-def load_test_data(subject_id):
-    test_data_path = os.path.join(TEST_DATA_DIR, f"SS{subject_id}_test.pkl")
-    print(f"Looking for test data at: {test_data_path}")
-    print(f"File exists: {os.path.exists(test_data_path)}")
-    
+# Loaded models and test data are kept for the lifetime of the process
+_artifacts = {}
+_artifact_locks = {}
+_artifact_locks_guard = threading.Lock()
+
+def _load_cached(key, loader):
+    """Load an artifact once, even when several threads request it at the same time"""
+    if key in _artifacts:
+        return _artifacts[key]
+    with _artifact_locks_guard:
+        lock = _artifact_locks.setdefault(key, threading.Lock())
+    with lock:
+        if key not in _artifacts:
+            with stage_timer('artifact_load'):
+                _artifacts[key] = loader()
+    return _artifacts[key]
+
+def _read_pickle(file_path):
+    """Read a pickled artifact, resolving only allow-listed types"""
+    return load_pickle(file_path)
+
+def _load_pickle_cached(file_path):
+    """Unpickle a file once"""
+    return _load_cached(file_path, partial(_read_pickle, file_path))
+
+def _load_bundle_cached(bundle_dir):
+    """Load a model bundle once"""
+    return _load_cached(bundle_dir, partial(load_bundle, bundle_dir))
+
+def load_test_store():
+    """Open the memory-mapped test data store of all subjects"""
     try:
-        if os.path.exists(test_data_path):
-            print(f"Attempting to open file...")
-            with open(test_data_path, 'rb') as f:
-                print(f"File opened, attempting to load pickle...")
-                data = pickle.load(f)
-                print(f"Pickle loaded. Keys: {data.keys() if isinstance(data, dict) else 'Not a dict'}")
-                return data
-        else:
-            return None
+        return _load_cached(TEST_STORE_DIR, partial(open_test_store, TEST_STORE_DIR))
     except Exception as e:
-        print(f"Error loading test data: {str(e)}")
+        logger.error("Error opening test data store: %s", e)
+        return None
+
+# Helper function to load test data for a subject
+def load_test_data(subject_id):
+    """Get test data for a subject as views into the memory-mapped store"""
+    store = load_test_store()
+    if store is None or subject_id not in store:
+        logger.warning("Test data not found for subject %s", subject_id, extra={'sample_every': 100})
         return None
+    return store.subject(subject_id)
 
 # Helper function to load model
 def load_model(model_type, subject_id=None):
     """Load model from model directory"""
     if model_type == 'base':
-        model_path = os.path.join(MODELS_DIR, "base_model.pkl")
+        model_name = "base_model"
     elif model_type == 'personal' and subject_id is not None:
-        model_path = os.path.join(MODELS_DIR, f"personal_SS{subject_id}.pkl")
-        print(f"Looking for model file: {model_path}")
-        print(f"File exists: {os.path.exists(model_path)}")
+        model_name = f"personal_SS{subject_id}"
     elif model_type == 'ensemble' and subject_id is not None:
-        model_path = os.path.join(MODELS_DIR, f"ensemble_SS{subject_id}.pkl")
+        model_name = f"ensemble_SS{subject_id}"
     elif model_type == 'adaptive' and subject_id is not None:
-        model_path = os.path.join(MODELS_DIR, f"adaptive_SS{subject_id}.pkl")
+        model_name = f"adaptive_SS{subject_id}"
     else:
         return None
     
+    bundle_dir = os.path.join(MODELS_DIR, model_name)
+    model_path = bundle_dir + ".pkl"
     try:
-        if os.path.exists(model_path):
-            with open(model_path, 'rb') as f:
-                model_data = pickle.load(f)
-                
+        if is_bundle(bundle_dir):
+            bundle = _load_bundle_cached(bundle_dir)
+            return bundle.model, bundle.scaler
+        elif os.path.exists(model_path):
+            model_data = _load_pickle_cached(model_path)
+            
             # Extract model if it's wrapped in a dictionary
             if isinstance(model_data, dict) and 'model' in model_data:
                 return model_data['model'], model_data.get('scaler')
             else:
                 return model_data, None
         else:
+            logger.warning("Model file not found: %s", model_path, extra={'sample_every': 100})
             return None, None
     except Exception as e:
-        print(f"Error loading model: {e}")
+        logger.error("Error loading model: %s", e)
         return None, None
 
+def warmup_subject(subject_id):
+    """Load a subject's test data and models and run one sample through each model"""
+    test_data = load_test_data(subject_id)
+    if test_data is None:
+        raise FileNotFoundError(f"No test data found for subject {subject_id}")
+    
+    X_sample = test_data['X_test'][:1]
+    for model_type in ['base', 'personal']:
+        model, scaler = load_model(model_type, subject_id)
+        if model is None:
+            raise FileNotFoundError(f"{model_type} model not found for subject {subject_id}")
+        model.predict_proba(scaler.transform(X_sample) if scaler is not None else X_sample)
+
+def get_warmup_tasks():
+    """Get the artifacts to preload at startup, as a dict of name -> loader"""
+    tasks = {}
+    store = load_test_store()
+    if store is None:
+        raise FileNotFoundError(f"Test data store not found: {TEST_STORE_DIR}")
+    for subject_id in store.subject_ids:
+        tasks[f'subject_SS{subject_id}'] = partial(warmup_subject, subject_id)
+    return tasks
+
 # Helper function to extract features from signal data
 def extract_features_from_signals(ecg_data, emg_data, resp_data):
     """Extract features from raw physiological signals"""
@@ -397,11 +464,13 @@ def predict_with_model(model, scaler, features):
     
     # Apply scaling if scaler is provided
     if scaler is not None:
-        feature_array = scaler.transform(feature_array)
+        with stage_timer('scaling'):
+            feature_array = scaler.transform(feature_array)
     
     # Make prediction
     if hasattr(model, 'predict_proba'):
-        probabilities = model.predict_proba(feature_array)[0]
+        with stage_timer('inference'):
+            probabilities = model.predict_proba(feature_array)[0]
         predicted_class = int(np.argmax(probabilities))
         
         # Convert to dictionary
@@ -415,7 +484,8 @@ def predict_with_model(model, scaler, features):
         }
     else:
         # If the model doesn't have predict_proba, use predict
-        predicted_class = int(model.predict(feature_array)[0])
+        with stage_timer('inference'):
+            predicted_class = int(model.predict(feature_array)[0])
         return {
             'predicted_emotion': CLASS_NAMES[predicted_class],
             'probabilities': {CLASS_NAMES[predicted_class]: 1.0}
@@ -1044,13 +1114,13 @@ async def get_feature_importance(subject_id: Optional[int] = None, top_n: Option
         # Validate feature data
         if 'name' not in feature or 'score' not in feature:
             continue
-            
+        
         try:
             # Convert score to float and validate
             score = float(feature['score'])
             if not np.isfinite(score):  # Check for NaN, inf
                 continue
-                
+            
             feature_item = {
                 "feature_name": feature['name'],
                 "importance_score": score,
@@ -1303,7 +1373,7 @@ async def predict_emotion_from_signals(data: SignalPredictionInput):
             try:
                 predictions[model_type] = predict_with_model(model, scaler, features)
             except Exception as e:
-                print(f"Error making prediction with {model_type} model: {e}")
+                logger.warning("Error making prediction with %s model: %s", model_type, e)
                 predictions[model_type] = {
                     "error": str(e),
                     "predicted_emotion": None,
@@ -1458,19 +1528,21 @@ async def simulate_adaptive_threshold(params: AdaptiveThresholdSimulation):
             raise HTTPException(status_code=404, detail="Test data doesn't contain required fields")
         
         # Make predictions with both models
-        if base_scaler is not None:
-            X_test_base = base_scaler.transform(X_test)
-        else:
-            X_test_base = X_test
+        with stage_timer('scaling'):
+            if base_scaler is not None:
+                X_test_base = base_scaler.transform(X_test)
+            else:
+                X_test_base = X_test
             
-        if personal_scaler is not None:
-            X_test_personal = personal_scaler.transform(X_test)
-        else:
-            X_test_personal = X_test
+            if personal_scaler is not None:
+                X_test_personal = personal_scaler.transform(X_test)
+            else:
+                X_test_personal = X_test
         
         # Generate probabilities
-        base_proba = base_model.predict_proba(X_test_base)
-        personal_proba = personal_model.predict_proba(X_test_personal)
+        with stage_timer('inference'):
+            base_proba = base_model.predict_proba(X_test_base)
+            personal_proba = personal_model.predict_proba(X_test_personal)
         
         # Simulate adaptive model with different thresholds
         threshold_values = np.arange(0.5, 1.0, 0.05)
@@ -1511,14 +1583,8 @@ async def simulate_adaptive_threshold(params: AdaptiveThresholdSimulation):
         
         # Find where in the sweep our requested threshold falls
         idx = np.abs(threshold_values - params.threshold).argmin()
-        # Add after loading test data:
-        print(f"Test data loaded for subject {params.subject_id}")
-
-        # Add after trying to load models:
-        print(f"Base model path: {os.path.join(MODELS_DIR, 'base_model.pkl')}")
-        print(f"Base model exists: {os.path.exists(os.path.join(MODELS_DIR, 'base_model.pkl'))}")
-        print(f"Personal model path: {os.path.join(MODELS_DIR, f'personal_SS{params.subject_id}.pkl')}")
-        print(f"Personal model exists: {os.path.exists(os.path.join(MODELS_DIR, f'personal_SS{params.subject_id}.pkl'))}")
+        logger.debug("Simulated adaptive thresholds for subject SS%s", params.subject_id,
+                     extra={'subject_id': params.subject_id, 'n_samples': len(X_test)})
         
         return {
             "threshold": float(params.threshold),
@@ -1631,7 +1697,7 @@ async def get_model_explanation(model_type: str, subject_id: int):
         status_code=501,
         detail="Model explanation needs to be generated by running the model explanation script"
     )
-    
+
 # Add this to your Pydantic models at the top of the file
 class EnsembleWeightSimulation(BaseModel):
     base_weight: float = 0.5
@@ -1662,19 +1728,21 @@ async def simulate_ensemble_weight(params: EnsembleWeightSimulation):
             raise HTTPException(status_code=404, detail="Test data doesn't contain required fields")
         
         # Make predictions with both models
-        if base_scaler is not None:
-            X_test_base = base_scaler.transform(X_test)
-        else:
-            X_test_base = X_test
+        with stage_timer('scaling'):
+            if base_scaler is not None:
+                X_test_base = base_scaler.transform(X_test)
+            else:
+                X_test_base = X_test
             
-        if personal_scaler is not None:
-            X_test_personal = personal_scaler.transform(X_test)
-        else:
-            X_test_personal = X_test
+            if personal_scaler is not None:
+                X_test_personal = personal_scaler.transform(X_test)
+            else:
+                X_test_personal = X_test
         
         # Generate probabilities from both models
-        base_proba = base_model.predict_proba(X_test_base)
-        personal_proba = personal_model.predict_proba(X_test_personal)
+        with stage_timer('inference'):
+            base_proba = base_model.predict_proba(X_test_base)
+            personal_proba = personal_model.predict_proba(X_test_personal)
         
         # Simulate ensemble model with different weights
         weight_values = np.arange(0, 1.1, 0.1)
@@ -1,6 +1,9 @@
 from fastapi import FastAPI
 from dataserving import app as dataserving_app
 from model import app as model_app
+from wesad_framework.utils.log import configure_logging
+
+configure_logging()
 
 app = FastAPI(
     title="Combined WESAD API",
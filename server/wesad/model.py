@@ -3,19 +3,34 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
-import pickle
 import numpy as np
 import os
 import json
+import sys
+import logging
+import threading
+from functools import partial
 from typing import List, Dict, Optional, Union
 import pandas as pd
 
+# Make the repository root importable for the shared model bundle format
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from wesad_framework.utils.bundle import load_bundle, is_bundle
+from wesad_framework.utils.artifacts import load_pickle
+from wesad_framework.models.runtime import MLPRuntime, StackedMLPRuntime
+from wesad_framework.utils.columnar import open_test_store, TEST_STORE_NAME
+from server.metrics import REGISTRY, MetricsRoute, stage_timer
+
+logger = logging.getLogger(__name__)
+
 # Create FastAPI app
 app = FastAPI(
     title="WESAD Emotion Recognition Demo API",
     description="API for demonstrating WESAD emotion recognition models",
     version="1.0.0"
 )
+# Time result serialization of every route (see server/metrics.py)
+app.router.route_class = MetricsRoute
 origins = [
     "https://neurofeel.vercel.app",  # Vercel frontend
     "http://localhost:3000",         # Local dev
@@ -35,8 +50,13 @@ BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DATA_DIR = os.path.join(BASE_DIR, "wesad_api_data")
 
 TEST_DATA_DIR = os.path.join(DATA_DIR, "test_data")
+TEST_STORE_DIR = os.path.join(TEST_DATA_DIR, TEST_STORE_NAME)
 MODELS_DIR = os.path.join(DATA_DIR, "models")
 SCALERS_DIR = os.path.join(DATA_DIR, "scalers")
+# Samples for which the adaptive model used the base or the personal model
+ADAPTIVE_SELECTIONS = REGISTRY.counter(
+    'neurofeel_adaptive_selections_total', 'Samples predicted by the adaptive model, by the model it selected', ['model'])
+
 # Define emotion classes
 EMOTION_CLASSES = ['Baseline', 'Stress', 'Amusement', 'Meditation']
 
@@ -65,104 +85,168 @@ class EvaluationResult(BaseModel):
     f1_score: Dict[str, float]
     confusion_matrix: Dict[str, List[List[int]]]
 
+# Loaded artifacts are kept for the lifetime of the process
+_artifacts = {}
+_artifact_locks = {}
+_artifact_locks_guard = threading.Lock()
+
+def _load_cached(key, loader):
+    """Load an artifact once, even when several threads request it at the same time"""
+    if key in _artifacts:
+        return _artifacts[key]
+    with _artifact_locks_guard:
+        lock = _artifact_locks.setdefault(key, threading.Lock())
+    with lock:
+        if key not in _artifacts:
+            with stage_timer('artifact_load'):
+                _artifacts[key] = loader()
+    return _artifacts[key]
+
+def _read_pickle(file_path):
+    """Read a pickled artifact, resolving only allow-listed types"""
+    return load_pickle(file_path)
+
+def _read_model(name):
+    """Read a model from its bundle, or from a legacy pickle if there is no bundle"""
+    bundle_dir = os.path.join(MODELS_DIR, name)
+    if not is_bundle(bundle_dir):
+        return _read_pickle(bundle_dir + '.pkl')
+    
+    bundle = load_bundle(bundle_dir)
+    model_dict = {'model': bundle.model}
+    if bundle.ensemble_weight is not None:
+        model_dict['ensemble_weight'] = bundle.ensemble_weight
+    if 'runtime' in bundle.arrays:
+        model_dict['runtime'] = bundle.arrays['runtime']
+    return model_dict
+
 # Helper functions
-def load_test_data(subject_id):
-    """Load test data for a specific subject"""
+def load_test_store():
+    """Open the memory-mapped test data store of all subjects"""
     try:
-        file_path = os.path.join(TEST_DATA_DIR, f'SS{subject_id}_test.pkl')
-        with open(file_path, 'rb') as f:
-            return pickle.load(f)
+        return _load_cached(('test_store',), partial(open_test_store, TEST_STORE_DIR))
     except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to open test data store: {str(e)}")
+
+def get_subject_ids():
+    """Get the IDs of all subjects with test data"""
+    return load_test_store().subject_ids
+
+def load_test_data(subject_id):
+    """Get test data for a specific subject (views into the memory-mapped store)"""
+    try:
+        return load_test_store().subject(subject_id)
+    except KeyError as e:
         raise HTTPException(status_code=404, detail=f"Test data for subject SS{subject_id} not found: {str(e)}")
 
 def load_feature_scaler():
     """Load the feature scaler"""
     try:
         file_path = os.path.join(SCALERS_DIR, 'feature_scaler.pkl')
-        with open(file_path, 'rb') as f:
-            return pickle.load(f)
+        return _load_cached(('scaler',), partial(_read_pickle, file_path))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to load feature scaler: {str(e)}")
 
 def load_base_model():
     """Load the base model"""
     try:
-        file_path = os.path.join(MODELS_DIR, 'base_model.pkl')
-        with open(file_path, 'rb') as f:
-            model_dict = pickle.load(f)
-            if isinstance(model_dict, dict) and 'model' in model_dict:
-                return model_dict['model']
-            return model_dict
+        model_dict = _load_cached(('base_model',), partial(_read_model, 'base_model'))
+        if isinstance(model_dict, dict) and 'model' in model_dict:
+            return model_dict['model']
+        return model_dict
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to load base model: {str(e)}")
 
 def load_personal_model(subject_id):
     """Load personal model for a specific subject"""
     try:
-        file_path = os.path.join(MODELS_DIR, f'personal_SS{subject_id}.pkl')
-        with open(file_path, 'rb') as f:
-            model_dict = pickle.load(f)
-            if isinstance(model_dict, dict) and 'model' in model_dict:
-                return model_dict['model'], model_dict.get('ensemble_weight', 0.5)
-            return model_dict, 0.5
+        model_dict = _load_cached(('personal_model', subject_id), partial(_read_model, f'personal_SS{subject_id}'))
+        if isinstance(model_dict, dict) and 'model' in model_dict:
+            return model_dict['model'], model_dict.get('ensemble_weight', 0.5)
+        return model_dict, 0.5
     except Exception as e:
         raise HTTPException(status_code=404, detail=f"Personal model for subject SS{subject_id} not found: {str(e)}")
 
-def predict_with_ensemble(X, base_model, personal_model, ensemble_weight=0.5):
-    """Make predictions using the ensemble model"""
-    base_proba = base_model.predict_proba(X)
-    personal_proba = personal_model.predict_proba(X)
+def _model_runtime(model_dict):
+    """NumPy runtime of a loaded model, exported from the model if the bundle has none"""
+    if isinstance(model_dict, dict) and 'runtime' in model_dict:
+        return MLPRuntime.from_arrays(model_dict['runtime'])
+    model = model_dict['model'] if isinstance(model_dict, dict) and 'model' in model_dict else model_dict
+    return MLPRuntime.from_sklearn(model, load_feature_scaler())
+
+def load_subject_runtime(subject_id):
+    """Stacked base + personal NumPy runtime of a subject, or None if the models are not MLPs"""
+    def build():
+        try:
+            base_runtime = _model_runtime(_load_cached(('base_model',), partial(_read_model, 'base_model')))
+            personal_runtime = _model_runtime(
+                _load_cached(('personal_model', subject_id), partial(_read_model, f'personal_SS{subject_id}')))
+        except TypeError as e:
+            logger.info("Using sklearn models for subject SS%s: %s", subject_id, e)
+            return None
+        return StackedMLPRuntime(base_runtime, personal_runtime)
+    
+    return _load_cached(('runtime', subject_id), build)
+
+def select_adaptive_proba(base_proba, personal_proba, threshold=0.65):
+    """
+    Pick the base or personal probabilities for each sample based on confidence thresholds.
+    
+    The base model is used when it is confident (at least threshold) and more confident
+    than the personal model, or when neither model reaches the threshold and the base
+    model is the more confident one. Otherwise the personal model is used.
+    """
+    base_conf = np.max(base_proba, axis=1)
+    personal_conf = np.max(personal_proba, axis=1)
+    
+    use_base = (base_conf > personal_conf) & ((base_conf >= threshold) | (personal_conf < threshold))
+    
+    ADAPTIVE_SELECTIONS.inc(int(use_base.sum()), model='base')
+    ADAPTIVE_SELECTIONS.inc(int((~use_base).sum()), model='personal')
+    
+    return np.where(use_base[:, np.newaxis], base_proba, personal_proba)
+
+def predict_subject_proba(subject_id, X):
+    """
+    Probabilities of the base, personal, ensemble and adaptive models for raw features.
+    
+    Uses the subject's stacked NumPy runtime (one forward pass, scaler folded in)
+    and falls back to the sklearn models with the feature scaler.
+    """
+    base_model = load_base_model()
+    personal_model, ensemble_weight = load_personal_model(subject_id)
+    runtime = load_subject_runtime(subject_id)
+    
+    if runtime is not None:
+        # The scaler is folded into the runtime's first layer
+        with stage_timer('inference'):
+            base_proba, personal_proba = runtime.predict_proba(X)
+    else:
+        scaler = load_feature_scaler()
+        with stage_timer('scaling'):
+            X_scaled = scaler.transform(X)
+        with stage_timer('inference'):
+            base_proba = base_model.predict_proba(X_scaled)
+            personal_proba = personal_model.predict_proba(X_scaled)
     
-    # Combine predictions with ensemble weight
     ensemble_proba = base_proba * ensemble_weight + personal_proba * (1 - ensemble_weight)
-    return ensemble_proba
+    adaptive_proba = select_adaptive_proba(base_proba, personal_proba)
+    return base_proba, personal_proba, ensemble_proba, adaptive_proba
 
-def predict_with_adaptive(X, base_model, personal_model, threshold=0.65):
-    """Make predictions using adaptive model selection based on confidence thresholds"""
-    try:
-        # Get probability predictions from both models
-        base_proba = base_model.predict_proba(X)
-        personal_proba = personal_model.predict_proba(X)
-        
-        # Get confidence scores (max probability for each sample)
-        base_conf = np.max(base_proba, axis=1)
-        personal_conf = np.max(personal_proba, axis=1)
-        
-        # Initialize result array with same shape as probabilities
-        result_proba = np.zeros_like(base_proba)
-        
-        # Track which model was used for each sample
-        base_selected = 0
-        personal_selected = 0
-        
-        # Select model based on confidence threshold
-        for i in range(len(X)):
-            # If base model has high confidence AND is more confident than personal
-            if base_conf[i] >= threshold and base_conf[i] > personal_conf[i]:
-                result_proba[i] = base_proba[i]
-                base_selected += 1
-            # If personal model has high confidence
-            elif personal_conf[i] >= threshold:
-                result_proba[i] = personal_proba[i]
-                personal_selected += 1
-            # If neither model is confident enough, use the more confident one
-            else:
-                if base_conf[i] > personal_conf[i]:
-                    result_proba[i] = base_proba[i]
-                    base_selected += 1
-                else:
-                    result_proba[i] = personal_proba[i]
-                    personal_selected += 1
-        
-        # For debugging
-        print(f"Adaptive selection used: base model {base_selected} times, personal model {personal_selected} times")
-        
-        return result_proba
-        
-    except Exception as e:
-        print(f"Error in adaptive prediction: {str(e)}")
-        # Fall back to personal model if there's an error
-        return personal_model.predict_proba(X)
+def warmup_subject(subject_id):
+    """Load a subject's artifacts, compile its runtime and run one sample through it"""
+    predict_subject_proba(subject_id, load_test_data(subject_id)['X_test'][:1])
+
+def get_warmup_tasks():
+    """Get the artifacts to preload at startup, as a dict of name -> loader"""
+    tasks = {
+        'test_store': load_test_store,
+        'feature_scaler': load_feature_scaler,
+        'base_model': load_base_model
+    }
+    for subject_id in get_subject_ids():
+        tasks[f'subject_SS{subject_id}'] = partial(warmup_subject, subject_id)
+    return tasks
 
 def format_prediction_result(probabilities):
     """Format prediction result"""
@@ -183,16 +267,11 @@ async def root():
 async def get_available_subjects():
     """Get list of available subjects with test data"""
     try:
-        test_files = [f for f in os.listdir(TEST_DATA_DIR) if f.endswith('_test.pkl')]
         subjects = []
         
-        for test_file in test_files:
-            # Extract subject ID
-            subject_id = int(test_file.split('SS')[1].split('_')[0])
-            
+        for subject_id in get_subject_ids():
             # Load test data to get sample count and class distribution
-            with open(os.path.join(TEST_DATA_DIR, test_file), 'rb') as f:
-                test_data = pickle.load(f)
+            test_data = load_test_data(subject_id)
             
             y_test = test_data['y_test']
             class_counts = {EMOTION_CLASSES[i]: int(np.sum(y_test == i)) for i in range(len(EMOTION_CLASSES))}
@@ -225,26 +304,14 @@ async def predict_for_subject(
             detail=f"Invalid sample index. Must be between 0 and {len(X_test)-1}"
         )
     
-    # Load feature scaler
-    scaler = load_feature_scaler()
-    
-    # Apply feature scaling
-    X_test_scaled = scaler.transform(X_test)
-    
-    # Get single sample
-    X_sample = X_test_scaled[sample_index:sample_index+1]
+    # Get single sample (scaling is part of the prediction runtime)
+    X_sample = X_test[sample_index:sample_index+1]
     y_true = int(y_test[sample_index])
     
     try:
-        # Load models
-        base_model = load_base_model()
-        personal_model, ensemble_weight = load_personal_model(subject_id)
-        
-        # Make predictions
-        base_proba = base_model.predict_proba(X_sample)[0]
-        personal_proba = personal_model.predict_proba(X_sample)[0]
-        ensemble_proba = predict_with_ensemble(X_sample, base_model, personal_model, ensemble_weight)[0]
-        adaptive_proba = predict_with_adaptive(X_sample, base_model, personal_model)[0]
+        # Make predictions with all models at once
+        base_proba, personal_proba, ensemble_proba, adaptive_proba = (
+            proba[0] for proba in predict_subject_proba(subject_id, X_sample))
         
         # Format results
         result = {
@@ -262,12 +329,9 @@ async def predict_for_subject(
             }
         }
         return result
-        
+    
     except Exception as e:
-        # Log the detailed error for debugging
-        import traceback
-        print(f"Error in prediction: {str(e)}")
-        print(traceback.format_exc())
+        logger.exception("Error in prediction for subject SS%s, sample %s", subject_id, sample_index)
         raise HTTPException(status_code=500, detail=f"Prediction error: {str(e)}")
 
 @app.get("/evaluate/{subject_id}", response_model=EvaluationResult)
@@ -278,26 +342,11 @@ async def evaluate_subject(subject_id: int):
     X_test = test_data['X_test']
     y_test = test_data['y_test']
     
-    # Load feature scaler
-    scaler = load_feature_scaler()
-    
-    # Apply feature scaling
-    X_test_scaled = scaler.transform(X_test)
-    
-    # Load models
-    base_model = load_base_model()
-    personal_model, ensemble_weight = load_personal_model(subject_id)
-    
-    # Make predictions
-    base_pred = base_model.predict(X_test_scaled)
-    personal_pred = personal_model.predict(X_test_scaled)
-    
-    # Ensemble predictions
-    ensemble_proba = predict_with_ensemble(X_test_scaled, base_model, personal_model, ensemble_weight)
+    # Make predictions with all models at once
+    base_proba, personal_proba, ensemble_proba, adaptive_proba = predict_subject_proba(subject_id, X_test)
+    base_pred = np.argmax(base_proba, axis=1)
+    personal_pred = np.argmax(personal_proba, axis=1)
     ensemble_pred = np.argmax(ensemble_proba, axis=1)
-    
-    # Adaptive predictions
-    adaptive_proba = predict_with_adaptive(X_test_scaled, base_model, personal_model)
     adaptive_pred = np.argmax(adaptive_proba, axis=1)
     
     # Calculate accuracy
@@ -373,8 +422,7 @@ async def get_sample_features(subject_id: int, sample_index: int):
 async def get_overall_performance():
     """Get overall performance across all subjects"""
     # Get all subjects
-    test_files = [f for f in os.listdir(TEST_DATA_DIR) if f.endswith('_test.pkl')]
-    subjects = [int(f.split('SS')[1].split('_')[0]) for f in test_files]
+    subjects = get_subject_ids()
     
     all_results = {
         "base_accuracy": [],
@@ -395,26 +443,11 @@ async def get_overall_performance():
             X_test = test_data['X_test']
             y_test = test_data['y_test']
             
-            # Load feature scaler
-            scaler = load_feature_scaler()
-            
-            # Apply feature scaling
-            X_test_scaled = scaler.transform(X_test)
-            
-            # Load models
-            base_model = load_base_model()
-            personal_model, ensemble_weight = load_personal_model(subject_id)
-            
-            # Make predictions
-            base_pred = base_model.predict(X_test_scaled)
-            personal_pred = personal_model.predict(X_test_scaled)
-            
-            # Ensemble predictions
-            ensemble_proba = predict_with_ensemble(X_test_scaled, base_model, personal_model, ensemble_weight)
+            # Make predictions with all models at once
+            base_proba, personal_proba, ensemble_proba, adaptive_proba = predict_subject_proba(subject_id, X_test)
+            base_pred = np.argmax(base_proba, axis=1)
+            personal_pred = np.argmax(personal_proba, axis=1)
             ensemble_pred = np.argmax(ensemble_proba, axis=1)
-            
-            # Adaptive predictions
-            adaptive_proba = predict_with_adaptive(X_test_scaled, base_model, personal_model)
             adaptive_pred = np.argmax(adaptive_proba, axis=1)
             
             # Calculate accuracy
@@ -439,9 +472,9 @@ async def get_overall_performance():
             all_results["personal_f1"].append(float(personal_f1))
             all_results["ensemble_f1"].append(float(ensemble_f1))
             all_results["adaptive_f1"].append(float(adaptive_f1))
-            
+        
         except Exception as e:
-            print(f"Error evaluating subject {subject_id}: {e}")
+            logger.warning("Error evaluating subject %s: %s", subject_id, e)
     
     # Calculate averages
     mean_results = {
@@ -0,0 +1,49 @@
+"""Tests of the allow-listed artifact loaders."""
+
+import pickle
+
+import joblib
+import numpy as np
+import pytest
+from sklearn.linear_model import LogisticRegression
+
+from wesad_framework.utils.artifacts import UnsafeArtifactError, load_joblib, load_pickle
+
+
+def global_call_payload(module, name, argument):
+    """Protocol 4 pickle that calls module.name(argument) through STACK_GLOBAL and REDUCE."""
+    return (pickle.PROTO + bytes([4])
+            + pickle.SHORT_BINUNICODE + bytes([len(module)]) + module.encode()
+            + pickle.SHORT_BINUNICODE + bytes([len(name)]) + name.encode()
+            + pickle.STACK_GLOBAL
+            + pickle.SHORT_BINUNICODE + bytes([len(argument)]) + argument.encode()
+            + pickle.TUPLE1 + pickle.REDUCE + pickle.STOP)
+
+
+@pytest.mark.parametrize('module, name', [
+    ('sklearn.externals.array_api_compat.numpy', 'f2py.subprocess.Popen'),
+    ('sklearn', 'os._wrap_close'),
+    ('wesad_framework.utils.artifacts', 'threading.Thread'),
+    ('wesad_framework.utils.artifacts', 'os.system'),
+    ('os', 'system')
+])
+@pytest.mark.parametrize('loader', [load_pickle, load_joblib])
+def test_rejects_globals_outside_allow_list(tmp_path, module, name, loader):
+    marker = tmp_path / 'marker'
+    path = tmp_path / 'payload.pkl'
+    path.write_bytes(global_call_payload(module, name, f"touch {marker}"))
+
+    with pytest.raises(UnsafeArtifactError):
+        loader(str(path))
+    assert not marker.exists()
+
+
+def test_loads_estimators(tmp_path):
+    model = LogisticRegression().fit(np.random.default_rng(0).normal(size=(20, 3)), [0, 1] * 10)
+    with open(tmp_path / 'model.pkl', 'wb') as f:
+        pickle.dump({'model': model}, f)
+    joblib.dump({'model': model}, tmp_path / 'model.joblib')
+
+    for package in [load_pickle(str(tmp_path / 'model.pkl'), expected=dict),
+                    load_joblib(str(tmp_path / 'model.joblib'), expected=dict)]:
+        np.testing.assert_array_equal(package['model'].coef_, model.coef_)
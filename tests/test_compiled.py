@@ -0,0 +1,54 @@
+"""Equivalence of the compiled voting ensemble with sklearn."""
+
+import numpy as np
+import pytest
+from sklearn.ensemble import GradientBoostingClassifier, RandomForestClassifier, VotingClassifier
+from sklearn.svm import SVC
+
+from cross_dataset.config import ENSEMBLE_MODEL_WEIGHTS
+from cross_dataset.models.compiled import CompiledEnsemble, max_proba_difference
+
+
+def make_data(n_samples, n_features=6, seed=0):
+    """Binary problem with a non-linear decision boundary."""
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n_samples, n_features))
+    y = (X[:, 0] + 0.5 * X[:, 1] ** 2 - X[:, 2] * X[:, 3] + rng.normal(size=n_samples) > 0.5).astype(int)
+    return X, y
+
+
+def fit_ensemble(weights):
+    """Small RF + GB + SVC soft-voting ensemble, configured like create_model_ensemble."""
+    X, y = make_data(200)
+    return VotingClassifier(
+        estimators=[
+            ('rf', RandomForestClassifier(n_estimators=20, max_depth=5, random_state=42, class_weight='balanced')),
+            ('gb', GradientBoostingClassifier(n_estimators=20, max_depth=3, learning_rate=0.1, random_state=42)),
+            ('svm', SVC(kernel='rbf', probability=True, random_state=42, class_weight='balanced'))
+        ],
+        voting='soft',
+        weights=weights
+    ).fit(X, y)
+
+
+@pytest.mark.parametrize('weights', [ENSEMBLE_MODEL_WEIGHTS, None])
+def test_matches_sklearn_predict_proba(weights):
+    model = fit_ensemble(weights)
+    compiled = CompiledEnsemble.from_voting(model)
+    X, _ = make_data(300, seed=1)
+
+    assert max_proba_difference(model, compiled, X) < 1e-9
+    np.testing.assert_array_equal(compiled.predict(X), model.predict(X))
+
+
+def test_array_round_trip(tmp_path):
+    model = fit_ensemble(ENSEMBLE_MODEL_WEIGHTS)
+    compiled = CompiledEnsemble.from_voting(model)
+    np.savez(tmp_path / 'compiled.npz', **compiled.to_arrays())
+
+    with np.load(tmp_path / 'compiled.npz', allow_pickle=False) as archive:
+        restored = CompiledEnsemble.from_arrays({name: archive[name] for name in archive.files})
+
+    X, _ = make_data(100, seed=2)
+    np.testing.assert_array_equal(restored.predict_proba(X), compiled.predict_proba(X))
+    assert max_proba_difference(model, restored, X) < 1e-9
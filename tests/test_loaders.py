@@ -0,0 +1,55 @@
+"""Tests of the temporal train/test splits."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from wesad_framework.data.loaders import rolling_origin_splits, temporal_split_indices
+
+
+def make_features(seed=0):
+    """Shuffled segments of three subjects and four labels with distinct timestamps."""
+    rng = np.random.default_rng(seed)
+    frames = []
+    for subject_id in [5, 2, 9]:
+        for label in [1, 2, 3, 4]:
+            n = int(rng.integers(10, 30))
+            frames.append(pd.DataFrame({
+                'subject_id': subject_id,
+                'label': label,
+                'timestamp': np.sort(rng.choice(10000, n, replace=False)),
+                'feature': rng.normal(size=n)
+            }))
+    return pd.concat(frames).sample(frac=1, random_state=seed).reset_index(drop=True)
+
+
+def test_rolling_origin_folds_are_contiguous_and_train_precedes_validation():
+    df = make_features()
+    folds = list(rolling_origin_splits(df, n_folds=3, min_train_ratio=0.4))
+    assert len(folds) == 3
+
+    previous_train = {}
+    for train_idx, val_idx in folds:
+        assert len(np.intersect1d(train_idx, val_idx)) == 0
+        for key, group in df.groupby(['subject_id', 'label']):
+            times = np.sort(group['timestamp'].to_numpy())
+            train_times = df['timestamp'].to_numpy()[np.intersect1d(train_idx, group.index)]
+            val_times = df['timestamp'].to_numpy()[np.intersect1d(val_idx, group.index)]
+            assert len(val_times) > 0
+
+            # Training is a prefix of the group in time, validation the block right after it
+            n_train = len(train_times)
+            np.testing.assert_array_equal(np.sort(train_times), times[:n_train])
+            np.testing.assert_array_equal(np.sort(val_times), times[n_train:n_train + len(val_times)])
+            assert train_times.max() < val_times.min()
+
+            # The training window expands from fold to fold
+            assert n_train > previous_train.get(key, 0)
+            previous_train[key] = n_train
+
+
+def test_temporal_split_rejects_missing_labels():
+    df = make_features()
+    df.loc[3, 'label'] = np.nan
+    with pytest.raises(ValueError, match='subject_id or label'):
+        temporal_split_indices(df)
@@ -0,0 +1,39 @@
+"""Tests of the mutual information estimators."""
+
+import numpy as np
+import pytest
+
+from wesad_framework.features.mutual_info import MI_ESTIMATORS, binned_mutual_info, mutual_info_scores
+
+
+def test_tied_values_carry_no_information():
+    # Rows grouped by label, so splitting ties by row order would track the label
+    y = np.repeat([0, 1, 2, 3], 100)
+    constant = np.zeros((400, 1))
+    discrete = np.tile([0.0, 1.0], 200)[:, np.newaxis]
+
+    assert binned_mutual_info(constant, y)[0] < 1e-9
+    assert binned_mutual_info(discrete, y)[0] < 1e-9
+
+
+def test_informative_feature_scores_above_noise():
+    rng = np.random.default_rng(0)
+    y = np.repeat([0, 1, 2, 3], 100)
+    X = np.column_stack([y + rng.normal(0, 0.3, 400), rng.normal(size=400)])
+
+    scores = binned_mutual_info(X, y)
+    assert scores[0] > 1.0
+    assert scores[1] < 0.2
+
+
+@pytest.mark.parametrize('estimator', MI_ESTIMATORS)
+def test_non_finite_columns_score_zero(estimator):
+    rng = np.random.default_rng(0)
+    y = np.repeat([0, 1], 100)
+    X = np.column_stack([y + rng.normal(0, 0.3, 200), rng.normal(size=200), rng.normal(size=200)])
+    X[5, 1] = np.inf
+    X[7, 2] = -np.inf
+
+    scores = mutual_info_scores(X, y, estimator=estimator, use_cache=False)
+    assert scores[0] > 0.2
+    np.testing.assert_array_equal(scores[1:], 0.0)
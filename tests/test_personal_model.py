@@ -0,0 +1,118 @@
+"""Tests of calibration selection and personal model creation."""
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.neural_network import MLPClassifier
+from sklearn.preprocessing import StandardScaler
+
+from wesad_framework.executor import PersonalizationExecutor
+from wesad_framework.models.personal_model import (
+    fine_tune_heads_batch, fine_tune_personal_model, select_calibration_batch, select_calibration_diverse
+)
+
+FEATURES = ['f0', 'f1', 'f2', 'f3', 'f4']
+
+
+def make_subjects(n_subjects=3, seed=0):
+    """Train and test features of a few subjects with four separable labels."""
+    rng = np.random.default_rng(seed)
+    train, test = {}, {}
+    for subject_id in range(2, 2 + n_subjects):
+        frames = []
+        for label in [1, 2, 3, 4]:
+            n = int(rng.integers(15, 40))
+            X = rng.normal(loc=label, size=(n, len(FEATURES))) + rng.normal(size=len(FEATURES))
+            frame = pd.DataFrame(X, columns=FEATURES)
+            frame['subject_id'] = subject_id
+            frame['label'] = label
+            frames.append(frame)
+        data = pd.concat(frames, ignore_index=True)
+        train[subject_id] = data.iloc[::2].reset_index(drop=True)
+        test[subject_id] = data.iloc[1::2].reset_index(drop=True)
+    return train, test
+
+
+def fit_base_model(train, n_classes=4):
+    """Scaler and small neural network fitted on all subjects' training data."""
+    combined = pd.concat(train.values(), ignore_index=True)
+    combined = combined[combined['label'] <= n_classes]
+    scaler = StandardScaler().fit(combined[FEATURES].values)
+    base_model = MLPClassifier(hidden_layer_sizes=(16, 8), max_iter=1000, random_state=0)
+    base_model.fit(scaler.transform(combined[FEATURES].values), combined['label'].values - 1)
+    return base_model, scaler
+
+
+@pytest.mark.parametrize('method', ['farthest', 'kmeans++'])
+def test_select_calibration_batch_matches_per_subject_selection(method):
+    train, _ = make_subjects()
+    train[9] = train[2].iloc[:0]
+    scaler = StandardScaler().fit(pd.concat(train.values())[FEATURES].values)
+
+    batch = select_calibration_batch(train, FEATURES, scaler, examples_per_class=4, method=method)
+
+    assert 9 not in batch
+    for subject_id in [2, 3, 4]:
+        expected = select_calibration_diverse(train[subject_id], FEATURES, scaler, 4, method=method)
+        pd.testing.assert_frame_equal(batch[subject_id], expected)
+
+
+def test_executor_batch_calibration_matches_per_subject_run():
+    train, test = make_subjects()
+    base_model, scaler = fit_base_model(train)
+    options = dict(num_calibration=3, calibration_method='farthest')
+
+    per_subject = PersonalizationExecutor(base_model, FEATURES, scaler, **options).run(
+        list(test), train, test)
+    batched = PersonalizationExecutor(base_model, FEATURES, scaler, batch_calibration=True,
+                                      **options).run(list(test), train, test)
+
+    for expected, output in zip(per_subject, batched):
+        assert output['subject_id'] == expected['subject_id']
+        pd.testing.assert_frame_equal(output['calibration_data'], expected['calibration_data'])
+        np.testing.assert_allclose(output['personal_model'].coefs_[-1],
+                                   expected['personal_model'].coefs_[-1])
+
+
+@pytest.mark.parametrize('n_classes', [4, 2])
+@pytest.mark.parametrize('tol', [1e-4, 1e-2])
+def test_fine_tune_heads_batch_matches_per_subject_partial_fit(n_classes, tol):
+    train, _ = make_subjects()
+    base_model, scaler = fit_base_model(train, n_classes)
+    rng = np.random.default_rng(1)
+
+    # Calibration sets of different sizes; the last one needs several partial_fit batches
+    calibration_sets = []
+    for n in [8, 13, 21, 250]:
+        y = np.arange(n) % n_classes
+        X = scaler.transform(rng.normal(loc=y[:, np.newaxis] + 1, size=(n, len(FEATURES))))
+        calibration_sets.append((X, y))
+
+    # The larger tolerance stops subjects after different numbers of epochs
+    personal_models, fine_tune_times = fine_tune_heads_batch(base_model, calibration_sets, tol=tol)
+
+    assert len(fine_tune_times) == len(calibration_sets)
+    for (X, y), personal_model in zip(calibration_sets, personal_models):
+        expected, _ = fine_tune_personal_model(base_model, X, y, tol=tol, freeze_hidden=True)
+        for layer in range(len(base_model.coefs_) - 1):
+            np.testing.assert_array_equal(personal_model.coefs_[layer], base_model.coefs_[layer])
+            np.testing.assert_array_equal(expected.coefs_[layer], base_model.coefs_[layer])
+        np.testing.assert_allclose(personal_model.coefs_[-1], expected.coefs_[-1], rtol=1e-7, atol=1e-10)
+        np.testing.assert_allclose(personal_model.intercepts_[-1], expected.intercepts_[-1], rtol=1e-7, atol=1e-10)
+        assert not np.allclose(personal_model.coefs_[-1], base_model.coefs_[-1])
+
+
+def test_executor_batch_fine_tune_trains_output_layers_together():
+    train, test = make_subjects()
+    base_model, scaler = fit_base_model(train)
+
+    outputs = PersonalizationExecutor(base_model, FEATURES, scaler, batch_fine_tune=True,
+                                      num_calibration=3).run(list(test), train, test)
+
+    for output in outputs:
+        calibration_data = output['calibration_data']
+        expected, _ = fine_tune_personal_model(
+            base_model, scaler.transform(calibration_data[FEATURES].values),
+            calibration_data['label'].values - 1, freeze_hidden=True)
+        np.testing.assert_allclose(output['personal_model'].coefs_[-1], expected.coefs_[-1], rtol=1e-7, atol=1e-10)
+        assert output['fine_tune_time'] > 0
@@ -0,0 +1,51 @@
+"""Tests of subspace alignment against an exact SVD."""
+
+import numpy as np
+from sklearn.decomposition import PCA
+
+from cross_dataset.domain_adaptation.subspace import (
+    SubspaceAdapter, analyze_subspace_similarity, calculate_subspace_error, principal_basis
+)
+
+
+def exact_alignment(source, target, n_components):
+    """Reference subspace alignment with exact PCA bases."""
+    source_components = PCA(n_components, svd_solver='full').fit(source).components_
+    target_components = PCA(n_components, svd_solver='full').fit(target).components_
+    matrix = source_components.T @ source_components @ target_components.T @ target_components
+    return (source - source.mean(axis=0)) @ matrix
+
+
+def test_default_solver_matches_exact_svd():
+    # Flat spectrum, where a randomized SVD drifts from the exact one
+    rng = np.random.default_rng(0)
+    source = rng.normal(size=(300, 20))
+    target = rng.normal(size=(200, 20)) * 1.5 + 0.3
+
+    adapted = SubspaceAdapter(n_components=5).fit(source, target).transform(source)
+    np.testing.assert_allclose(adapted, exact_alignment(source, target, 5), atol=1e-8)
+
+
+def test_randomized_solver_spans_exact_subspace_on_wide_features():
+    # Low-rank signal plus noise: the leading subspace is well separated
+    rng = np.random.default_rng(0)
+    features = rng.normal(size=(400, 5)) @ rng.normal(size=(5, 600)) * 10 + rng.normal(size=(400, 600))
+
+    _, randomized = principal_basis(features, 5, use_cache=False)
+    _, exact = principal_basis(features, 5, svd_solver='full', use_cache=False)
+    np.testing.assert_allclose(randomized.T @ randomized, exact.T @ exact, atol=1e-6)
+
+
+def test_component_counts_above_rank_are_clamped():
+    # 6 samples give centered features of rank 5 in 10 dimensions
+    rng = np.random.default_rng(0)
+    source = rng.normal(size=(6, 10))
+    target = rng.normal(size=(8, 10))
+
+    assert np.isfinite(calculate_subspace_error(source, target, n_components=8))
+
+    analysis = analyze_subspace_similarity(source, target, n_components_range=range(2, 9))
+    for n in range(2, 6):
+        assert analysis['errors'][n] == calculate_subspace_error(source, target, n_components=n)
+    assert all(np.isinf(analysis['errors'][n]) for n in range(6, 9))
+    assert analysis['optimal_n'] <= 5
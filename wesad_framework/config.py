@@ -16,7 +16,9 @@ SEGMENT_OVERLAP = 4200  # Overlap between segments in samples
 BASE_MODEL_TYPE = 'neural_network'  # 'random_forest', 'svm', or 'neural_network'
 NUM_FEATURES = 20  # Number of features to select
 NUM_CALIBRATION = 5  # Number of calibration examples per class
+CALIBRATION_METHOD = 'minibatch'  # 'minibatch', 'kmeans++', 'farthest', or 'kmeans'
 USE_TRANSFER_LEARNING = True  # Whether to use transfer learning
+N_JOBS = 1  # Worker processes for per-subject personalization (-1 for all CPUs)
 
 # Evaluation parameters
 TEST_RATIO = 0.3  # Proportion of data to use for testing
@@ -2,11 +2,14 @@
 Data loading utilities for the WESAD dataset.
 """
 
+import logging
 import os
 import pickle
 import pandas as pd
 import numpy as np
 
+logger = logging.getLogger(__name__)
+
 
 def get_dataset_path():
     """
@@ -72,6 +75,96 @@ def load_all_subjects():
     return all_subjects_data
 
 
+def _temporal_group_order(all_features_df):
+    """
+    Order rows by (subject, label, timestamp) and rank them within each group.
+    
+    Subjects and labels keep their order of first appearance, so the result
+    matches iterating over ``unique()`` values and sorting each slice by time.
+    
+    Args:
+        all_features_df (pd.DataFrame): DataFrame with features for all subjects
+    
+    Returns:
+        tuple: (order, group_rank, group_size) where order holds row positions
+            in sorted order and the other arrays are aligned with it
+    """
+    missing = all_features_df[['subject_id', 'label']].isna().any(axis=1)
+    if missing.any():
+        raise ValueError(f"{int(missing.sum())} segments have no subject_id or label; "
+                         "drop them before splitting")
+    
+    subject_codes, _ = pd.factorize(all_features_df['subject_id'])
+    group_codes, _ = pd.factorize(pd.MultiIndex.from_arrays(
+        [all_features_df['subject_id'], all_features_df['label']]))
+    timestamps = all_features_df['timestamp'].to_numpy()
+    
+    # One stable sort; np.lexsort uses the last key as the primary key
+    order = np.lexsort((timestamps, group_codes, subject_codes))
+    sorted_groups = group_codes[order]
+    
+    # Rank of each row within its (subject, label) group
+    positions = np.arange(len(order))
+    is_group_start = np.ones(len(order), dtype=bool)
+    is_group_start[1:] = sorted_groups[1:] != sorted_groups[:-1]
+    group_start = np.maximum.accumulate(np.where(is_group_start, positions, 0))
+    group_rank = positions - group_start
+    group_size = np.bincount(group_codes)[sorted_groups]
+    
+    return order, group_rank, group_size
+
+
+def temporal_split_indices(all_features_df, test_ratio=0.3):
+    """
+    Compute temporal train/test row positions in a single pass.
+    
+    Within each (subject, label) group the earliest ``1 - test_ratio`` of the
+    segments go to training and the rest to testing.
+    
+    Args:
+        all_features_df (pd.DataFrame): DataFrame with features for all subjects
+        test_ratio (float): Proportion of data to use for testing
+    
+    Returns:
+        tuple: (train_idx, test_idx) integer arrays of row positions, grouped
+            by subject and label and sorted by timestamp
+    """
+    order, group_rank, group_size = _temporal_group_order(all_features_df)
+    split_idx = (group_size * (1 - test_ratio)).astype(int)
+    is_test = group_rank >= split_idx
+    
+    return order[~is_test], order[is_test]
+
+
+def rolling_origin_splits(all_features_df, n_folds=3, min_train_ratio=0.4):
+    """
+    Generate rolling-origin (expanding window) temporal folds.
+    
+    Each (subject, label) group is cut at ``n_folds + 1`` origins between
+    ``min_train_ratio`` and 1. Fold k trains on everything before origin k and
+    validates on the segments between origin k and origin k + 1, so every
+    fold validates on later segments than it trains on.
+    
+    Args:
+        all_features_df (pd.DataFrame): DataFrame with features for all subjects
+        n_folds (int): Number of folds to generate
+        min_train_ratio (float): Proportion of each group used for training in the first fold
+    
+    Yields:
+        tuple: (train_idx, val_idx) integer arrays of row positions, grouped
+            by subject and label and sorted by timestamp
+    """
+    order, group_rank, group_size = _temporal_group_order(all_features_df)
+    origins = np.linspace(min_train_ratio, 1.0, n_folds + 1)
+    
+    for fold in range(n_folds):
+        train_end = (group_size * origins[fold]).astype(int)
+        val_end = (group_size * origins[fold + 1]).astype(int)
+        is_train = group_rank < train_end
+        is_val = (group_rank >= train_end) & (group_rank < val_end)
+        yield order[is_train], order[is_val]
+
+
 def prepare_train_test_data(all_features_df, test_ratio=0.3):
     """
     Prepare training and testing data with temporal splitting.
@@ -83,55 +176,30 @@ def prepare_train_test_data(all_features_df, test_ratio=0.3):
     Returns:
         tuple: (train_data_dict, test_data_dict, combined_train, combined_test)
     """
-    print("Preparing train/test data...")
+    logger.info("Preparing train/test data...")
     
-    # Initialize dictionaries for train and test data
-    train_data = {}
-    test_data = {}
+    train_idx, test_idx = temporal_split_indices(all_features_df, test_ratio)
     
-    # Process each subject separately
-    for subject_id in all_features_df['subject_id'].unique():
-        # Get data for this subject
-        subject_data = all_features_df[all_features_df['subject_id'] == subject_id]
-        
-        # For each emotion label, split temporally
-        subject_train = []
-        subject_test = []
-        
-        for label in subject_data['label'].unique():
-            # Get data for this label
-            label_data = subject_data[subject_data['label'] == label]
-            
-            # Sort by timestamp
-            label_data = label_data.sort_values('timestamp')
-            
-            # Calculate split index (test_ratio of data goes to test set)
-            split_idx = int(len(label_data) * (1 - test_ratio))
-            
-            # Split data
-            label_train = label_data.iloc[:split_idx]
-            label_test = label_data.iloc[split_idx:]
-            
-            # Add to subject's train and test sets
-            subject_train.append(label_train)
-            subject_test.append(label_test)
-        
-        # Combine all labels
-        if len(subject_train) > 0:
-            train_data[subject_id] = pd.concat(subject_train)
-        else:
-            train_data[subject_id] = pd.DataFrame()
-        
-        if len(subject_test) > 0:
-            test_data[subject_id] = pd.concat(subject_test)
-        else:
-            test_data[subject_id] = pd.DataFrame()
+    # Take each split from the full DataFrame once
+    combined_train = all_features_df.iloc[train_idx]
+    combined_test = all_features_df.iloc[test_idx]
+    
+    # Rows are grouped by subject in order of first appearance, so each
+    # subject is a contiguous slice
+    subject_ids = pd.unique(all_features_df['subject_id'])
+    train_subjects = pd.Index(subject_ids).get_indexer(combined_train['subject_id'])
+    test_subjects = pd.Index(subject_ids).get_indexer(combined_test['subject_id'])
+    codes = np.arange(len(subject_ids))
+    train_bounds = np.searchsorted(train_subjects, np.append(codes, len(codes)))
+    test_bounds = np.searchsorted(test_subjects, np.append(codes, len(codes)))
     
-    # Combine all subjects
-    combined_train = pd.concat([df for df in train_data.values() if len(df) > 0])
-    combined_test = pd.concat([df for df in test_data.values() if len(df) > 0])
+    train_data = {}
+    test_data = {}
+    for code, subject_id in enumerate(subject_ids):
+        train_data[subject_id] = combined_train.iloc[train_bounds[code]:train_bounds[code + 1]]
+        test_data[subject_id] = combined_test.iloc[test_bounds[code]:test_bounds[code + 1]]
     
-    print(f"Train set: {len(combined_train)} samples")
-    print(f"Test set: {len(combined_test)} samples")
+    logger.info("Train set: %s samples", len(combined_train))
+    logger.info("Test set: %s samples", len(combined_test))
     
-    return train_data, test_data, combined_train, combined_test
\ No newline at end of file
+    return train_data, test_data, combined_train, combined_test
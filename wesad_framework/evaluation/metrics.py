@@ -2,6 +2,7 @@
 Evaluation metrics for emotion recognition models.
 """
 
+import logging
 import numpy as np
 import pandas as pd
 from sklearn.metrics import (
@@ -9,6 +10,8 @@ from sklearn.metrics import (
     accuracy_score, f1_score, precision_score, recall_score
 )
 
+logger = logging.getLogger(__name__)
+
 def calculate_metrics(y_true, y_pred, prefix=''):
     """
     Calculate various classification metrics.
@@ -98,10 +101,10 @@ def evaluate_all_models(subject_id, X_test_scaled, y_test,
     }
     
     # Print summary
-    print(f"  Base model accuracy: {base_metrics['base_accuracy']:.4f}, F1: {base_metrics['base_f1_score']:.4f}")
-    print(f"  Personal model accuracy: {personal_metrics['personal_accuracy']:.4f}, F1: {personal_metrics['personal_f1_score']:.4f}")
-    print(f"  Ensemble model accuracy: {ensemble_metrics['ensemble_accuracy']:.4f}, F1: {ensemble_metrics['ensemble_f1_score']:.4f}")
-    print(f"  Adaptive model accuracy: {adaptive_metrics['adaptive_accuracy']:.4f}, F1: {adaptive_metrics['adaptive_f1_score']:.4f}")
+    logger.info("Base model accuracy: %.4f, F1: %.4f", base_metrics['base_accuracy'], base_metrics['base_f1_score'])
+    logger.info("Personal model accuracy: %.4f, F1: %.4f", personal_metrics['personal_accuracy'], personal_metrics['personal_f1_score'])
+    logger.info("Ensemble model accuracy: %.4f, F1: %.4f", ensemble_metrics['ensemble_accuracy'], ensemble_metrics['ensemble_f1_score'])
+    logger.info("Adaptive model accuracy: %.4f, F1: %.4f", adaptive_metrics['adaptive_accuracy'], adaptive_metrics['adaptive_f1_score'])
     
     return results
 
@@ -155,13 +158,13 @@ def calculate_overall_results(results_list):
     }
     
     # Print summary
-    print("\nOverall Results:")
-    print(f"Mean base model accuracy: {mean_base_acc:.4f}, F1: {mean_base_f1:.4f}")
-    print(f"Mean personal model accuracy: {mean_personal_acc:.4f}, F1: {mean_personal_f1:.4f}")
-    print(f"Mean ensemble model accuracy: {mean_ensemble_acc:.4f}, F1: {mean_ensemble_f1:.4f}")
-    print(f"Mean adaptive model accuracy: {mean_adaptive_acc:.4f}, F1: {mean_adaptive_f1:.4f}")
-    print(f"Personal model improvement: {personal_improvement:.4f}")
-    print(f"Ensemble model improvement: {ensemble_improvement:.4f}")
-    print(f"Adaptive model improvement: {adaptive_improvement:.4f}")
+    logger.info("Overall Results:")
+    logger.info("Mean base model accuracy: %.4f, F1: %.4f", mean_base_acc, mean_base_f1)
+    logger.info("Mean personal model accuracy: %.4f, F1: %.4f", mean_personal_acc, mean_personal_f1)
+    logger.info("Mean ensemble model accuracy: %.4f, F1: %.4f", mean_ensemble_acc, mean_ensemble_f1)
+    logger.info("Mean adaptive model accuracy: %.4f, F1: %.4f", mean_adaptive_acc, mean_adaptive_f1)
+    logger.info("Personal model improvement: %.4f", personal_improvement)
+    logger.info("Ensemble model improvement: %.4f", ensemble_improvement)
+    logger.info("Adaptive model improvement: %.4f", adaptive_improvement)
     
     return overall_results
\ No newline at end of file
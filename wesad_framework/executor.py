@@ -0,0 +1,305 @@
+"""
+Parallel per-subject personalization for the WESAD framework.
+
+Once the base model is trained, every subject is personalized independently:
+calibration selection, personal model fine-tuning, ensemble weight learning,
+prediction and evaluation. This module fans that work out to worker
+processes. The base model, scaler and feature list are shipped to each worker
+once (through the pool initializer) instead of with every task, and results
+are returned in submission order so runs stay reproducible.
+
+With batch_calibration the calibration examples of all subjects are selected
+up front in the parent process with one select_calibration_batch call, and
+each task only receives its subject's precomputed set. batch_fine_tune goes
+one step further and also fine-tunes the output layers of all personal
+neural networks together with fine_tune_heads_batch.
+"""
+
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from wesad_framework.models.personal_model import (
+    create_personal_model, fine_tune_heads_batch, select_calibration_batch, supports_fine_tuning
+)
+from wesad_framework.models.ensemble import learn_ensemble_weights, predict_with_ensemble
+from wesad_framework.models.adaptive import predict_with_adaptive_selection
+from wesad_framework.evaluation.metrics import evaluate_all_models
+from wesad_framework.utils.log import configure_logging, logging_settings
+
+logger = logging.getLogger(__name__)
+
+
+# Shared state for worker processes, populated once by _init_worker
+_WORKER_STATE = {}
+
+
+def _init_worker(base_model, feature_scaler, feature_names, options, log_settings=None):
+    """
+    Store the shared personalization inputs in the worker process.
+
+    Args:
+        base_model (object): Trained base model
+        feature_scaler (sklearn.preprocessing.StandardScaler): Fitted feature scaler
+        feature_names (list): List of feature names to use
+        options (dict): Personalization options passed to personalize_subject
+        log_settings (dict): Logging configuration of the parent process
+    """
+    # The parent's log listener thread does not exist in the worker
+    if log_settings:
+        configure_logging(**log_settings)
+    _WORKER_STATE['base_model'] = base_model
+    _WORKER_STATE['feature_scaler'] = feature_scaler
+    _WORKER_STATE['feature_names'] = feature_names
+    _WORKER_STATE['options'] = options
+
+
+def _personalize_in_worker(subject_id, subject_train, subject_test, **precomputed):
+    """Run personalize_subject with the state shipped to this worker."""
+    return personalize_subject(
+        subject_id,
+        subject_train,
+        subject_test,
+        _WORKER_STATE['base_model'],
+        _WORKER_STATE['feature_names'],
+        _WORKER_STATE['feature_scaler'],
+        **_WORKER_STATE['options'],
+        **precomputed
+    )
+
+
+def personalize_subject(subject_id, subject_train, subject_test, base_model, feature_names,
+                        feature_scaler, base_model_type='neural_network', num_calibration=5,
+                        use_transfer_learning=True, adaptive_threshold=0.65,
+                        calibration_method='minibatch', calibration_data=None,
+                        personal_model=None, fine_tune_time=None):
+    """
+    Personalize and evaluate the models for a single subject.
+
+    This function performs no plotting or file output so that it can run in a
+    worker process; the caller is responsible for saving and visualizing the
+    returned results.
+
+    Args:
+        subject_id (int): Subject ID
+        subject_train (pd.DataFrame): Training data for the subject
+        subject_test (pd.DataFrame): Test data for the subject
+        base_model (object): Trained base model
+        feature_names (list): List of feature names to use
+        feature_scaler (sklearn.preprocessing.StandardScaler): Fitted feature scaler
+        base_model_type (str): Type of model to use
+        num_calibration (int): Number of calibration examples per class
+        use_transfer_learning (bool): Whether to use transfer learning
+        adaptive_threshold (float): Confidence threshold for adaptive selection
+        calibration_method (str): Calibration selection method (see select_calibration_diverse)
+        calibration_data (pd.DataFrame): Precomputed calibration examples, or None
+            to select them here
+        personal_model (object): Personal model already fine-tuned on calibration_data,
+            or None to train it here
+        fine_tune_time (float): Time in seconds spent training personal_model
+
+    Returns:
+        dict: Personal model, calibration data, feature ranking, ensemble
+            weight, fine-tuning time and evaluation results, or None if the
+            subject has no training data
+    """
+    logger.info("Evaluating subject S%s...", subject_id)
+    logger.debug("Test samples: %s", len(subject_test))
+
+    if subject_train is None or len(subject_train) == 0:
+        logger.warning("No training data for personalization, using base model only.")
+        return None
+
+    # Extract features and labels
+    X_test = subject_test[feature_names].values
+    y_test = subject_test['label'].values - 1  # Convert to 0-indexed
+    X_test_scaled = feature_scaler.transform(X_test)
+
+    # Create personal model with transfer learning
+    personal_model, calibration_data, feature_ranking, fine_tune_time = create_personal_model(
+        subject_train,
+        base_model,
+        feature_names,
+        feature_scaler,
+        base_model_type,
+        num_calibration=num_calibration,
+        use_transfer_learning=use_transfer_learning,
+        calibration_method=calibration_method,
+        calibration_data=calibration_data,
+        personal_model=personal_model,
+        fine_tune_time=fine_tune_time
+    )
+
+    # Learn ensemble weights
+    ensemble_weight = learn_ensemble_weights(
+        subject_id,
+        subject_train,
+        base_model,
+        personal_model,
+        feature_names,
+        feature_scaler
+    )
+
+    # Make predictions with ensemble and adaptive models
+    ensemble_pred = predict_with_ensemble(
+        subject_id, X_test_scaled, base_model, personal_model, ensemble_weight)
+    adaptive_pred = predict_with_adaptive_selection(
+        X_test_scaled, base_model, personal_model, threshold=adaptive_threshold)
+
+    # Evaluate all models
+    results = evaluate_all_models(
+        subject_id,
+        X_test_scaled,
+        y_test,
+        base_model,
+        personal_model,
+        ensemble_pred,
+        adaptive_pred
+    )
+    results['calibration_samples'] = len(calibration_data)
+    results['fine_tune_time'] = fine_tune_time
+
+    return {
+        'subject_id': subject_id,
+        'personal_model': personal_model,
+        'calibration_data': calibration_data,
+        'feature_ranking': feature_ranking,
+        'ensemble_weight': ensemble_weight,
+        'fine_tune_time': fine_tune_time,
+        'results': results
+    }
+
+
+class PersonalizationExecutor:
+    """
+    Run per-subject personalization serially or across worker processes.
+
+    With n_jobs=1 everything runs in the calling process. Otherwise a process
+    pool is started whose workers receive the base model, scaler and feature
+    names once at start-up, and only the subject's train/test slices are sent
+    with each task.
+
+    With batch_calibration=True the calibration examples of every subject are
+    selected in the calling process with a single select_calibration_batch
+    call (one stacked computation for the 'farthest' method) and passed to
+    the tasks. With batch_fine_tune=True the calibration sets are batched the
+    same way and the personal neural networks are fine-tuned together by
+    fine_tune_heads_batch, which trains only their output layers.
+    """
+
+    def __init__(self, base_model, feature_names, feature_scaler, n_jobs=1,
+                 batch_calibration=False, batch_fine_tune=False, **options):
+        """
+        Initialize the executor.
+
+        Args:
+            base_model (object): Trained base model
+            feature_names (list): List of feature names to use
+            feature_scaler (sklearn.preprocessing.StandardScaler): Fitted feature scaler
+            n_jobs (int): Number of worker processes (-1 uses all CPUs)
+            batch_calibration (bool): Whether to select all subjects' calibration
+                examples up front with select_calibration_batch
+            batch_fine_tune (bool): Whether to also fine-tune the output layers of
+                all personal models up front with fine_tune_heads_batch
+            **options: Keyword arguments forwarded to personalize_subject
+        """
+        self.base_model = base_model
+        self.feature_names = feature_names
+        self.feature_scaler = feature_scaler
+        self.batch_calibration = batch_calibration
+        self.batch_fine_tune = batch_fine_tune
+        self.options = options
+
+        if n_jobs is None or n_jobs == 0:
+            n_jobs = 1
+        elif n_jobs < 0:
+            n_jobs = max(1, (os.cpu_count() or 1) + 1 + n_jobs)
+        self.n_jobs = n_jobs
+
+    def run(self, subject_ids, train_data_dict, test_data_dict):
+        """
+        Personalize all given subjects.
+
+        Args:
+            subject_ids (list): Subject IDs to personalize, in output order
+            train_data_dict (dict): Mapping from subject ID to training data
+            test_data_dict (dict): Mapping from subject ID to test data
+
+        Returns:
+            list: personalize_subject outputs in the order of subject_ids
+        """
+        tasks = [
+            (subject_id, train_data_dict.get(subject_id), test_data_dict[subject_id])
+            for subject_id in subject_ids
+        ]
+        precomputed = self._precompute(tasks)
+
+        n_workers = min(self.n_jobs, len(tasks))
+        if n_workers <= 1:
+            return [
+                personalize_subject(
+                    subject_id, subject_train, subject_test,
+                    self.base_model, self.feature_names, self.feature_scaler,
+                    **self.options, **precomputed[subject_id]
+                )
+                for subject_id, subject_train, subject_test in tasks
+            ]
+
+        logger.info("Personalizing %s subjects with %s workers...", len(tasks), n_workers)
+        with ProcessPoolExecutor(
+            max_workers=n_workers,
+            initializer=_init_worker,
+            initargs=(self.base_model, self.feature_scaler, self.feature_names, self.options,
+                      logging_settings())
+        ) as pool:
+            futures = [pool.submit(_personalize_in_worker, *task, **precomputed[task[0]])
+                       for task in tasks]
+            # Collect in submission order for deterministic output
+            return [future.result() for future in futures]
+
+    def _precompute(self, tasks):
+        """
+        Run the cross-subject batch steps enabled for this executor.
+
+        Args:
+            tasks (list): (subject_id, subject_train, subject_test) tuples
+
+        Returns:
+            dict: Mapping from subject ID to extra personalize_subject keyword arguments
+        """
+        precomputed = {subject_id: {} for subject_id, _, _ in tasks}
+        if not (self.batch_calibration or self.batch_fine_tune):
+            return precomputed
+
+        train_data = {subject_id: subject_train for subject_id, subject_train, _ in tasks}
+        calibration_sets = select_calibration_batch(
+            train_data,
+            self.feature_names,
+            self.feature_scaler,
+            self.options.get('num_calibration', 5),
+            method=self.options.get('calibration_method', 'minibatch')
+        )
+        logger.info("Selected calibration examples for %s subjects in one batch", len(calibration_sets))
+
+        for subject_id, calibration_data in calibration_sets.items():
+            precomputed[subject_id]['calibration_data'] = calibration_data
+
+        if self.batch_fine_tune and supports_fine_tuning(
+                self.base_model,
+                self.options.get('base_model_type', 'neural_network'),
+                self.options.get('use_transfer_learning', True)):
+            subject_order = list(calibration_sets)
+            personal_models, fine_tune_times = fine_tune_heads_batch(
+                self.base_model,
+                [
+                    (self.feature_scaler.transform(calibration_sets[subject_id][self.feature_names].values),
+                     calibration_sets[subject_id]['label'].values - 1)
+                    for subject_id in subject_order
+                ]
+            )
+            logger.info("Fine-tuned %s personal models in one batch", len(personal_models))
+
+            for subject_id, personal_model, fine_tune_time in zip(subject_order, personal_models, fine_tune_times):
+                precomputed[subject_id]['personal_model'] = personal_model
+                precomputed[subject_id]['fine_tune_time'] = fine_tune_time
+        return precomputed
@@ -2,12 +2,15 @@
 Feature selection utilities.
 """
 
+import logging
 import numpy as np
 import pandas as pd
-from sklearn.feature_selection import mutual_info_classif
+from wesad_framework.features.mutual_info import mutual_info_scores
 
+logger = logging.getLogger(__name__)
 
-def select_best_features(all_features_df, scaler, n_features=20):
+
+def select_best_features(all_features_df, scaler, n_features=20, n_jobs=None, estimator='knn'):
     """
     Select best features using mutual information.
     
@@ -15,11 +18,13 @@ def select_best_features(all_features_df, scaler, n_features=20):
         all_features_df (pd.DataFrame): DataFrame with all features
         scaler (sklearn.preprocessing.StandardScaler): Already fitted scaler
         n_features (int): Number of features to select
+        n_jobs (int): Number of parallel jobs for mutual information
+        estimator (str): Mutual information estimator ('knn' or 'binned')
     
     Returns:
         list: List of selected feature names
     """
-    print("Selecting best features...")
+    logger.info("Selecting best features...")
     
     # Get feature names (exclude metadata and label)
     metadata_cols = ['subject_id', 'segment_id', 'timestamp', 'label']
@@ -33,7 +38,7 @@ def select_best_features(all_features_df, scaler, n_features=20):
     X_scaled = scaler.transform(X)
     
     # Calculate mutual information for feature selection
-    mi_scores = mutual_info_classif(X_scaled, y, random_state=42)
+    mi_scores = mutual_info_scores(X_scaled, y, random_state=42, n_jobs=n_jobs, estimator=estimator)
     
     # Create feature ranking
     feature_ranking = [(feature, score) for feature, score in zip(feature_cols, mi_scores)]
@@ -42,41 +47,43 @@ def select_best_features(all_features_df, scaler, n_features=20):
     # Select top features
     selected_features = [feature for feature, _ in feature_ranking[:n_features]]
     
-    print(f"Selected {len(selected_features)} best features:")
+    logger.info("Selected %s best features:", len(selected_features))
     for i, (feature, score) in enumerate(feature_ranking[:n_features]):
-        print(f"  {i+1}. {feature}: MI = {score:.4f}")
+        logger.debug("%s. %s: MI = %.4f", i+1, feature, score)
     
     return selected_features
 
 
-def identify_subject_important_features(subject_data, global_features):
+def identify_subject_important_features(subject_data, global_features, n_jobs=None, estimator='knn'):
     """
     Identify most discriminative features for a specific subject.
     
     Args:
         subject_data (pd.DataFrame): DataFrame with subject features
         global_features (list): List of global feature names
+        n_jobs (int): Number of parallel jobs for mutual information
+        estimator (str): Mutual information estimator ('knn' or 'binned')
     
     Returns:
         list: List of feature rankings for this subject
     """
     subject_id = subject_data['subject_id'].iloc[0]
-    print(f"  Identifying important features for S{subject_id}...")
+    logger.debug("Identifying important features for S%s...", subject_id)
     
     # Extract features and labels
     X = subject_data[global_features].values
     y = subject_data['label'].values
     
     # Calculate mutual information for this subject
-    mi_scores = mutual_info_classif(X, y, random_state=42)
+    mi_scores = mutual_info_scores(X, y, random_state=42, n_jobs=n_jobs, estimator=estimator)
     
     # Create feature ranking
     feature_ranking = [(feature, score) for feature, score in zip(global_features, mi_scores)]
     feature_ranking.sort(key=lambda x: x[1], reverse=True)
     
-    print(f"  Top 5 important features for S{subject_id}:")
+    logger.debug("Top 5 important features for S%s:", subject_id)
     for i, (feature, score) in enumerate(feature_ranking[:5]):
-        print(f"    {i+1}. {feature}: MI = {score:.4f}")
+        logger.debug("%s. %s: MI = %.4f", i+1, feature, score)
     
     # Return feature rankings
     return feature_ranking
\ No newline at end of file
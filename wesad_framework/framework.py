@@ -2,8 +2,8 @@
 Enhanced Personalization Framework for Emotion Recognition.
 """
 
+import logging
 import os
-import pickle
 import numpy as np
 import pandas as pd
 from sklearn.preprocessing import StandardScaler
@@ -13,12 +13,15 @@ from .data.loaders import get_available_subjects, load_all_subjects, prepare_tra
 from .data.feature_extraction import extract_features
 from wesad_framework.features.selection import select_best_features, identify_subject_important_features
 from wesad_framework.models.base_model import train_base_model
-from wesad_framework.models.personal_model import create_personal_model
-from wesad_framework.models.ensemble import learn_ensemble_weights, predict_with_ensemble
-from wesad_framework.models.adaptive import predict_with_adaptive_selection
-from wesad_framework.evaluation.metrics import evaluate_all_models, calculate_overall_results
+from wesad_framework.evaluation.metrics import calculate_overall_results
 from wesad_framework.evaluation.visualization import plot_confusion_matrices, plot_overall_results, plot_feature_importance
-from wesad_framework.utils.helpers import save_model, save_scaler, save_features, save_results_table
+from wesad_framework.utils.helpers import save_model, save_scaler, save_features, save_results_table, EMOTION_CLASSES
+from wesad_framework.utils.columnar import save_test_store, TEST_STORE_NAME
+from wesad_framework.utils.log import log_duration
+from wesad_framework.utils.profiling import StageProfiler, data_shape
+from wesad_framework.executor import PersonalizationExecutor
+
+logger = logging.getLogger(__name__)
 
 
 class EnhancedPersonalizationFramework:
@@ -34,7 +37,7 @@ class EnhancedPersonalizationFramework:
     6. Adaptive model selection based on confidence
     """
     
-    def __init__(self, base_model_type='neural_network', output_dir=None, save_options=None):
+    def __init__(self, base_model_type='neural_network', output_dir=None, save_options=None, profiler=None):
         """
         Initialize the framework.
         
@@ -42,9 +45,11 @@ class EnhancedPersonalizationFramework:
             base_model_type (str): Type of base model to use
             output_dir (str): Directory for output files
             save_options (dict): Options controlling what to save
+            profiler (StageProfiler): Profiler recording the pipeline stages (disabled by default)
         """
         self.base_model_type = base_model_type
         self.output_dir = output_dir or '.'
+        self.profiler = profiler or StageProfiler()
         
         # Set default save options
         self.save_options = {
@@ -73,55 +78,52 @@ class EnhancedPersonalizationFramework:
         self.subject_features = {}
         self.ensemble_weights = {}
         
-        print(f"Initialized framework with {base_model_type} base model")
+        logger.info("Initialized framework with %s base model", base_model_type)
     
-    def save_test_data(self, subject_id, X_test, y_test, feature_names):
-        """Save test data for a subject for later demonstration"""
+    def save_test_data(self, subject_data, feature_names):
+        """
+        Save the test data of all subjects for later demonstration.
+        
+        Args:
+            subject_data (dict): Subject ID -> (X_test, y_test) with raw features and 0-indexed labels
+            feature_names (list): Feature name of each column
+        """
         test_data_dir = os.path.join(self.output_dir, 'test_data')
         os.makedirs(test_data_dir, exist_ok=True)
         
-        # Create test data package
-        test_data = {
-            'X_test': X_test,  # Raw features before scaling
-            'y_test': y_test,  # Labels (0-indexed)
-            'subject_id': subject_id,
-            'feature_names': feature_names,
-            'class_names': ['Baseline', 'Stress', 'Amusement', 'Meditation']
-        }
-        
-        # Save to file
-        test_file = os.path.join(test_data_dir, f'S{subject_id}_test.pkl')
-        with open(test_file, 'wb') as f:
-            pickle.dump(test_data, f)
+        # One columnar store for all subjects, read with memory mapping by the API
+        save_test_store(os.path.join(test_data_dir, TEST_STORE_NAME), subject_data, feature_names, EMOTION_CLASSES)
         
         # Save a JSON version with a subset of samples for easier inspection
         import json
         import random
         
-        # Select a random subset of samples (up to 10)
-        n_samples = min(10, len(X_test))
-        sample_indices = random.sample(range(len(X_test)), n_samples)
-        
-        # Format samples as JSON-serializable dictionary
-        samples = []
-        for idx in sample_indices:
-            sample = {
-                'features': {feature_names[i]: float(X_test[idx, i]) for i in range(len(feature_names))},
-                'label': int(y_test[idx]) + 1,  # Convert back to 1-indexed
-                'emotion': ['Baseline', 'Stress', 'Amusement', 'Meditation'][int(y_test[idx])]
-            }
-            samples.append(sample)
-        
-        # Save JSON version
-        json_file = os.path.join(test_data_dir, f'S{subject_id}_test_samples.json')
-        with open(json_file, 'w') as f:
-            json.dump(samples, f, indent=2)
-        
-        print(f"  Saved {len(X_test)} test samples for S{subject_id}")
+        for subject_id, (X_test, y_test) in subject_data.items():
+            # Select a random subset of samples (up to 10)
+            n_samples = min(10, len(X_test))
+            sample_indices = random.sample(range(len(X_test)), n_samples)
+            
+            # Format samples as JSON-serializable dictionary
+            samples = []
+            for idx in sample_indices:
+                sample = {
+                    'features': {feature_names[i]: float(X_test[idx, i]) for i in range(len(feature_names))},
+                    'label': int(y_test[idx]) + 1,  # Convert back to 1-indexed
+                    'emotion': EMOTION_CLASSES[int(y_test[idx])]
+                }
+                samples.append(sample)
+            
+            # Save JSON version
+            json_file = os.path.join(test_data_dir, f'S{subject_id}_test_samples.json')
+            with open(json_file, 'w') as f:
+                json.dump(samples, f, indent=2)
+            
+            logger.debug("Saved %s test samples for S%s", len(X_test), subject_id)
     
     
     
-    def run(self, n_features=20, num_calibration=5, use_transfer_learning=True):
+    def run(self, n_features=20, num_calibration=5, use_transfer_learning=True, n_jobs=1,
+            calibration_method='minibatch', batch_calibration=False, batch_fine_tune=False):
         """
         Run the complete personalization framework.
         
@@ -129,114 +131,143 @@ class EnhancedPersonalizationFramework:
             n_features (int): Number of features to select
             num_calibration (int): Number of calibration examples per class
             use_transfer_learning (bool): Whether to use transfer learning
+            n_jobs (int): Number of worker processes for per-subject personalization
+            calibration_method (str): Calibration selection method (see select_calibration_diverse)
+            batch_calibration (bool): Whether to select all subjects' calibration examples in one batch
+            batch_fine_tune (bool): Whether to fine-tune the output layers of all personal models in one batch
         
         Returns:
             dict: Overall results
         """
-        print("Enhanced Personalized Emotion Recognition Framework")
-        print("--------------------------------------------------")
+        logger.info("Enhanced Personalized Emotion Recognition Framework")
+        logger.info("--------------------------------------------------")
         
         # Load all subject data
-        available_subjects = get_available_subjects()
-        print(f"Available subjects: {available_subjects}")
-        
-        all_subjects_data = load_all_subjects()
+        with self.profiler.stage('load') as stage:
+            available_subjects = get_available_subjects()
+            logger.info("Available subjects: %s", available_subjects)
+            
+            all_subjects_data = load_all_subjects()
+            stage['subjects'] = len(all_subjects_data)
         
         # Extract features for all subjects
-        all_features_df = pd.DataFrame()
-        
-        for subject_id, subject_data in all_subjects_data.items():
-            print(f"Extracting features for subject S{subject_id}...")
-            features_df = extract_features(subject_data)
-            all_features_df = pd.concat([all_features_df, features_df])
-        
-        print(f"\nTotal dataset size: {len(all_features_df)} segments")
-        print(f"Class distribution:")
+        with self.profiler.stage('extract') as stage:
+            all_features_df = pd.DataFrame()
+            
+            for subject_id, subject_data in all_subjects_data.items():
+                with log_duration(logger, f"Extracted features for subject S{subject_id}", subject_id=subject_id) as fields:
+                    features_df = extract_features(subject_data)
+                    fields['segments'] = len(features_df)
+                all_features_df = pd.concat([all_features_df, features_df])
+            stage.update(data_shape(all_features_df))
+        
+        logger.info("Total dataset size: %s segments", len(all_features_df))
+        logger.info("Class distribution:")
         for label, count in all_features_df['label'].value_counts().sort_index().items():
             label_name = ['Baseline', 'Stress', 'Amusement', 'Meditation'][label-1]
-            print(f"  {label_name}: {count} segments")
+            logger.info("%s: %s segments", label_name, count)
         
         # Select best features
-        print("\nSelecting features...")
+        logger.info("Selecting features...")
         # First get all feature names (exclude metadata and label)
         metadata_cols = ['subject_id', 'segment_id', 'timestamp', 'label']
         all_feature_cols = [col for col in all_features_df.columns if col not in metadata_cols]
         
         # Fit the scaler on all features
-        X_all = all_features_df[all_feature_cols].values
-        self.global_scaler.fit(X_all)
+        with self.profiler.stage('scale') as stage:
+            X_all = all_features_df[all_feature_cols].values
+            self.global_scaler.fit(X_all)
+            stage.update(data_shape(X_all))
         
         # Now select the best features
-        self.selected_features = select_best_features(
-            all_features_df, self.global_scaler, n_features=n_features)
-        self.feature_names = self.selected_features
+        with self.profiler.stage('select', n_features=n_features):
+            self.selected_features = select_best_features(
+                all_features_df, self.global_scaler, n_features=n_features)
+            self.feature_names = self.selected_features
         
         # Prepare train/test data
-        train_data_dict, test_data_dict, combined_train, combined_test = prepare_train_test_data(
-            all_features_df, test_ratio=0.3)
+        with self.profiler.stage('split') as stage:
+            train_data_dict, test_data_dict, combined_train, combined_test = prepare_train_test_data(
+                all_features_df, test_ratio=0.3)
+            stage.update(train_rows=len(combined_train), test_rows=len(combined_test))
         
         # Train base model
-        self.base_model, self.feature_scaler = train_base_model(
-            combined_train, self.feature_names, self.base_model_type, self.global_scaler)
-        
-        # Save base model if enabled
-        if self.save_options['save_models']:
-            save_model(
-                self.base_model, 
-                'base', 
-                output_dir=self.output_dir,
-                metadata={
-                    'features': self.feature_names,
-                    'model_type': self.base_model_type,
-                    'num_samples': len(combined_train)
-                }
-            )
-        
-        # Save the scaler if enabled
-        if self.save_options['save_scalers']:
-            save_scaler(self.feature_scaler, 'feature_scaler', output_dir=self.output_dir)
-        
-        # Evaluate personalization for each subject
-        results_list = []
-        
-        for subject_id in test_data_dict.keys():
-            if len(test_data_dict[subject_id]) == 0:
-                print(f"\nSkipping subject S{subject_id} (no test data)")
-                continue
-            
-            print(f"\nEvaluating subject S{subject_id}...")
-            
-            # Get test data
-            subject_test = test_data_dict[subject_id]
-            print(f"  Test samples: {len(subject_test)}")
-            
-            # Extract features and labels
-            X_test = subject_test[self.feature_names].values
-            y_test = subject_test['label'].values - 1  # Convert to 0-indexed
+        with self.profiler.stage('fit', model='base', model_type=self.base_model_type) as stage:
+            self.base_model, self.feature_scaler = train_base_model(
+                combined_train, self.feature_names, self.base_model_type, self.global_scaler)
+            stage.update(rows=len(combined_train), columns=len(self.feature_names))
+        
+        with self.profiler.stage('save', artifacts='base'):
+            # Save base model if enabled
+            if self.save_options['save_models']:
+                save_model(
+                    self.base_model, 
+                    'base', 
+                    output_dir=self.output_dir,
+                    metadata={
+                        'features': self.feature_names,
+                        'model_type': self.base_model_type,
+                        'num_samples': len(combined_train)
+                    },
+                    scaler=self.feature_scaler
+                )
             
-            if self.save_options.get('save_test_data', False):
-                self.save_test_data(subject_id, X_test, y_test, self.feature_names)
+            # Save the scaler if enabled
+            if self.save_options['save_scalers']:
+                save_scaler(self.feature_scaler, 'feature_scaler', output_dir=self.output_dir)
             
-            # Standardize features
-            X_test_scaled = self.feature_scaler.transform(X_test)
+            # Evaluate personalization for each subject
+            subject_ids = []
+            subject_test_data = {}
+            for subject_id in test_data_dict.keys():
+                if len(test_data_dict[subject_id]) == 0:
+                    logger.warning("Skipping subject S%s (no test data)", subject_id)
+                    continue
+                subject_ids.append(subject_id)
+                
+                if self.save_options.get('save_test_data', False):
+                    subject_test = test_data_dict[subject_id]
+                    X_test = subject_test[self.feature_names].values
+                    y_test = subject_test['label'].values - 1  # Convert to 0-indexed
+                    subject_test_data[subject_id] = (X_test, y_test)
             
-            # Create personalized model
-            if subject_id in train_data_dict and len(train_data_dict[subject_id]) > 0:
-                # Create personal model with transfer learning
-                personal_model, calibration_data, feature_ranking = create_personal_model(
-                    train_data_dict[subject_id], 
-                    self.base_model,
-                    self.feature_names,
-                    self.feature_scaler,  # Use the feature-specific scaler
-                    self.base_model_type,
-                    num_calibration=num_calibration, 
-                    use_transfer_learning=use_transfer_learning
-                )
+            if subject_test_data:
+                self.save_test_data(subject_test_data, self.feature_names)
+        
+        # Personalize subjects (in parallel if n_jobs > 1)
+        with self.profiler.stage('personalize', subjects=len(subject_ids), n_jobs=n_jobs):
+            executor = PersonalizationExecutor(
+                self.base_model,
+                self.feature_names,
+                self.feature_scaler,  # Use the feature-specific scaler
+                n_jobs=n_jobs,
+                batch_calibration=batch_calibration,
+                batch_fine_tune=batch_fine_tune,
+                base_model_type=self.base_model_type,
+                num_calibration=num_calibration,
+                use_transfer_learning=use_transfer_learning,
+                adaptive_threshold=0.65,
+                calibration_method=calibration_method
+            )
+            subject_outputs = executor.run(subject_ids, train_data_dict, test_data_dict)
+        
+        # Store and save per-subject outputs
+        results_list = []
+        with self.profiler.stage('save', artifacts='personal'):
+            for output in subject_outputs:
+                if output is None:
+                    continue
+                
+                subject_id = output['subject_id']
+                personal_model = output['personal_model']
+                calibration_data = output['calibration_data']
+                feature_ranking = output['feature_ranking']
                 
                 # Store personal model and calibration data
                 self.personal_models[subject_id] = personal_model
                 self.calibration_examples[subject_id] = calibration_data
                 self.subject_features[subject_id] = feature_ranking
+                self.ensemble_weights[subject_id] = output['ensemble_weight']
                 
                 # Save personal model if enabled
                 if self.save_options['save_models'] and self.save_options['save_personal_models']:
@@ -250,7 +281,9 @@ class EnhancedPersonalizationFramework:
                             'calibration_samples': len(calibration_data),
                             'training_samples': len(train_data_dict[subject_id]),
                             'transfer_learning': use_transfer_learning
-                        }
+                        },
+                        scaler=self.feature_scaler,
+                        ensemble_weight=output['ensemble_weight']
                     )
                 
                 # Save feature rankings if enabled
@@ -261,80 +294,46 @@ class EnhancedPersonalizationFramework:
                         output_dir=self.output_dir
                     )
                 
-                # Learn ensemble weights
-                self.ensemble_weights[subject_id] = learn_ensemble_weights(
-                    subject_id, 
-                    train_data_dict[subject_id], 
-                    self.base_model, 
-                    personal_model,
-                    self.feature_names,
-                    self.feature_scaler  # Use the feature-specific scaler
-                )
-                
-                # Make predictions with ensemble model
-                ensemble_pred = predict_with_ensemble(
-                    subject_id, 
-                    X_test_scaled, 
-                    self.base_model, 
-                    personal_model,
-                    self.ensemble_weights[subject_id]
-                )
-                
-                # Make predictions with adaptive model
-                adaptive_pred = predict_with_adaptive_selection(
-                    X_test_scaled, 
-                    self.base_model, 
-                    personal_model,
-                    threshold=0.65
-                )
-                
-                # Evaluate all models
-                results = evaluate_all_models(
-                    subject_id, 
-                    X_test_scaled, 
-                    y_test, 
-                    self.base_model, 
-                    personal_model, 
-                    ensemble_pred, 
-                    adaptive_pred
-                )
-                
-                # Visualize confusion matrices
-                confusions = {
-                    'base': results['confusions']['base'],
-                    'personal': results['confusions']['personal'],
-                    'ensemble': results['confusions']['ensemble'],
-                    'adaptive': results['confusions']['adaptive']
-                }
-                
-                accuracies = {
-                    'base': results['base_model_accuracy'],
-                    'personal': results['personal_model_accuracy'],
-                    'ensemble': results['ensemble_model_accuracy'],
-                    'adaptive': results['adaptive_model_accuracy']
-                }
-                
-                # Generate visualizations if enabled
-                if self.save_options['save_plots']:
-                    plot_confusion_matrices(subject_id, confusions, accuracies, output_dir=self.output_dir)
-                    plot_feature_importance(subject_id, feature_ranking, output_dir=self.output_dir)
-                
                 # Add results to list
-                results_list.append(results)
-            else:
-                print("  No training data for personalization, using base model only.")
+                results_list.append(output['results'])
+        
+        # Generate visualizations if enabled (deferred until all subjects are done)
+        if self.save_options['save_plots']:
+            with self.profiler.stage('plot', subjects=len(results_list)):
+                for results in results_list:
+                    subject_id = results['subject_id']
+                    
+                    confusions = {
+                        'base': results['confusions']['base'],
+                        'personal': results['confusions']['personal'],
+                        'ensemble': results['confusions']['ensemble'],
+                        'adaptive': results['confusions']['adaptive']
+                    }
+                    
+                    accuracies = {
+                        'base': results['base_model_accuracy'],
+                        'personal': results['personal_model_accuracy'],
+                        'ensemble': results['ensemble_model_accuracy'],
+                        'adaptive': results['adaptive_model_accuracy']
+                    }
+                    
+                    plot_confusion_matrices(subject_id, confusions, accuracies, output_dir=self.output_dir)
+                    plot_feature_importance(subject_id, self.subject_features[subject_id], output_dir=self.output_dir)
         
         # Calculate overall results
-        overall_results = calculate_overall_results(results_list)
+        with self.profiler.stage('evaluate', subjects=len(results_list)):
+            overall_results = calculate_overall_results(results_list)
         
         # Visualize overall results if enabled
         if 'results_df' in overall_results and len(overall_results['results_df']) > 1:
             if self.save_options['save_plots']:
-                plot_overall_results(overall_results['results_df'], output_dir=self.output_dir)
+                with self.profiler.stage('plot', plot='overall'):
+                    plot_overall_results(overall_results['results_df'], output_dir=self.output_dir)
             
             # Save results table in multiple formats (always save results)
-            save_results_table(overall_results['results_df'], output_dir=self.output_dir)
+            with self.profiler.stage('save', artifacts='results'):
+                save_results_table(overall_results['results_df'], output_dir=self.output_dir)
         
-        print("\nEnhanced personalization framework evaluation complete.")
+        logger.info("Enhanced personalization framework evaluation complete.")
         
         return overall_results
\ No newline at end of file
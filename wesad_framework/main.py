@@ -11,6 +11,9 @@ import sys
 from datetime import datetime
 
 from wesad_framework.framework import EnhancedPersonalizationFramework
+from wesad_framework.models.personal_model import CALIBRATION_METHODS
+from wesad_framework.utils.log import configure_logging, LOG_FORMAT_ENV, LOG_FORMATS
+from wesad_framework.utils.profiling import StageProfiler
 from . import config
 
 
@@ -41,12 +44,39 @@ def parse_args():
         help='Number of calibration examples per class'
     )
     
+    parser.add_argument(
+        '--calibration_method', 
+        type=str, 
+        default=config.CALIBRATION_METHOD,
+        choices=list(CALIBRATION_METHODS),
+        help='How calibration examples are selected from each class'
+    )
+    
+    parser.add_argument(
+        '--batch_calibration', 
+        action='store_true',
+        help='Select the calibration examples of all subjects in one batch before personalization'
+    )
+    
+    parser.add_argument(
+        '--batch_fine_tune', 
+        action='store_true',
+        help='Fine-tune the output layers of all personal models together in one batch'
+    )
+    
     parser.add_argument(
         '--no_transfer', 
         action='store_true',
         help='Disable transfer learning'
     )
     
+    parser.add_argument(
+        '--n_jobs', 
+        type=int, 
+        default=config.N_JOBS,
+        help='Number of worker processes for per-subject personalization (-1 for all CPUs)'
+    )
+    
     parser.add_argument(
         '--output_dir', 
         type=str, 
@@ -54,6 +84,34 @@ def parse_args():
         help='Output directory for results'
     )
     
+    # Logging
+    parser.add_argument(
+        '--log_level',
+        type=str,
+        default=None,
+        choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'],
+        help='Minimum log level (default: $NEUROFEEL_LOG_LEVEL or INFO)'
+    )
+    
+    parser.add_argument(
+        '--log_format',
+        type=str,
+        default=os.environ.get(LOG_FORMAT_ENV, 'text'),
+        choices=list(LOG_FORMATS),
+        help='Plain text console output or JSON records'
+    )
+    
+    # Profiling
+    parser.add_argument(
+        '--profile',
+        nargs='?',
+        const='trace',
+        default=None,
+        choices=['trace', 'cprofile'],
+        help=('Record wall/CPU time, peak memory and data sizes of each pipeline stage as a '
+              'Chrome trace (profile_trace.json); "--profile cprofile" also dumps cProfile stats per stage')
+    )
+    
     # Saving options
     save_group = parser.add_argument_group('Saving options')
     save_group.add_argument(
@@ -90,6 +148,7 @@ def main():
     """Main function to run the framework."""
     # Parse arguments
     args = parse_args()
+    configure_logging(args.log_level, args.log_format)
     
     # Process save mode settings
     if args.save_mode == 'none':
@@ -161,6 +220,13 @@ def main():
     with open(os.path.join(output_dir, 'environment_info.json'), 'w') as f:
         json.dump(env_info, f, indent=2)
     
+    # Stage profiling (disabled unless --profile is given)
+    profiler = StageProfiler(
+        enabled=args.profile is not None,
+        cprofile=args.profile == 'cprofile',
+        output_dir=output_dir
+    )
+    
     # Initialize framework
     framework = EnhancedPersonalizationFramework(
         base_model_type=args.model_type,
@@ -172,15 +238,21 @@ def main():
             'save_scalers': args.save_scalers,
             'save_personal_models': getattr(args, 'save_personal_models', False),
             'save_test_data': getattr(args, 'save_test_data', False)  # Add this option
-        }
+        },
+        profiler=profiler
     )
     
     # Run framework
     results = framework.run(
         n_features=args.num_features,
         num_calibration=args.num_calibration,
-        use_transfer_learning=not args.no_transfer
+        use_transfer_learning=not args.no_transfer,
+        n_jobs=args.n_jobs,
+        calibration_method=args.calibration_method,
+        batch_calibration=args.batch_calibration,
+        batch_fine_tune=args.batch_fine_tune
     )
+    profiler.save()
     
     # Save detailed configuration
     config_dict = {
@@ -189,6 +261,10 @@ def main():
         'num_features': args.num_features,
         'num_calibration': args.num_calibration,
         'use_transfer_learning': not args.no_transfer,
+        'n_jobs': args.n_jobs,
+        'calibration_method': args.calibration_method,
+        'batch_calibration': args.batch_calibration,
+        'batch_fine_tune': args.batch_fine_tune,
         'timestamp': timestamp,
         
         # Additional config parameters from config.py
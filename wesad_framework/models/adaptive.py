@@ -2,8 +2,11 @@
 Adaptive model implementation for emotion recognition.
 """
 
+import logging
 import numpy as np
 
+logger = logging.getLogger(__name__)
+
 
 def predict_with_adaptive_selection(X_test_scaled, base_model, personal_model, threshold=0.65):
     """
@@ -38,6 +41,6 @@ def predict_with_adaptive_selection(X_test_scaled, base_model, personal_model, t
     # Count how many times each model was used
     base_count = np.sum(final_pred == base_pred)
     personal_count = len(final_pred) - base_count
-    print(f"  Adaptive selection used: base model {base_count} times, personal model {personal_count} times")
+    logger.debug("Adaptive selection used: base model %s times, personal model %s times", base_count, personal_count)
     
     return final_pred
\ No newline at end of file
@@ -2,12 +2,15 @@
 Base model implementation for emotion recognition.
 """
 
+import logging
 from sklearn.discriminant_analysis import StandardScaler
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.neural_network import MLPClassifier
 from sklearn.svm import SVC
 from sklearn.base import clone
 
+logger = logging.getLogger(__name__)
+
 
 def get_model_types():
     """
@@ -76,7 +79,7 @@ def train_base_model(train_data, feature_names, model_type, scaler):
     Returns:
         object: Trained model
     """
-    print("Training base model...")
+    logger.info("Training base model...")
     
     # Extract features and labels using only the selected feature names
     X_train = train_data[feature_names].values
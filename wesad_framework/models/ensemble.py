@@ -2,10 +2,13 @@
 Ensemble model implementation for emotion recognition.
 """
 
+import logging
 import numpy as np
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import accuracy_score
 
+logger = logging.getLogger(__name__)
+
 
 def learn_ensemble_weights(subject_id, subject_train_data, base_model, personal_model, 
                            feature_names, scaler, val_ratio=0.2):
@@ -65,7 +68,7 @@ def learn_ensemble_weights(subject_id, subject_train_data, base_model, personal_
             best_acc = acc
             best_weight = weight
     
-    print(f"  Optimal ensemble weight: {best_weight:.2f} (base: {best_weight:.2f}, personal: {1-best_weight:.2f})")
+    logger.info("Optimal ensemble weight: %.2f (base: %.2f, personal: %.2f)", best_weight, best_weight, 1-best_weight)
     return best_weight
 
 
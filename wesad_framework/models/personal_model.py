@@ -2,37 +2,40 @@
 Personal model implementation for emotion recognition.
 """
 
+import logging
+import copy
+import time
 import numpy as np
 import pandas as pd
 from sklearn.base import clone
-from sklearn.cluster import KMeans
+from sklearn.cluster import KMeans, MiniBatchKMeans, kmeans_plusplus
 
 from wesad_framework.models.base_model import get_model_types, get_transfer_model_types
 from wesad_framework.features.selection import identify_subject_important_features
 
+logger = logging.getLogger(__name__)
 
-def select_calibration_diverse(subject_data, feature_names, scaler, examples_per_class=5):
+
+CALIBRATION_METHODS = ('minibatch', 'kmeans++', 'farthest', 'kmeans')
+
+
+def _plan_calibration(subject_data, examples_per_class):
     """
-    Select diverse calibration examples using clustering.
+    Decide how many calibration examples to take from each class.
     
     Args:
         subject_data (pd.DataFrame): DataFrame with subject features
-        feature_names (list): List of feature names to use
-        scaler (sklearn.preprocessing.StandardScaler): Fitted scaler
         examples_per_class (int): Number of examples to select per class
     
     Returns:
-        pd.DataFrame: DataFrame with selected calibration examples
+        list: List of (label_data, examples_needed) tuples, one per class
     """
-    print("  Using diversity-aware calibration selection...")
-    calibration_data_list = []  # Empty list to collect selected data
-    
     # Ensure we have at least 2 examples per class (minimum needed)
     min_examples = max(2, examples_per_class)
     
     # Increase examples for less represented classes
     class_distribution = subject_data['label'].value_counts()
-    total_examples = 0
+    plan = []
     
     for label in subject_data['label'].unique():
         # Get data for this label
@@ -48,32 +51,135 @@ def select_calibration_diverse(subject_data, feature_names, scaler, examples_per
         else:
             examples_needed = min(min_examples, len(label_data))
         
+        plan.append((label_data, examples_needed))
+    
+    return plan
+
+
+def _closest_to_centers(X, clusters, centers):
+    """
+    Find the sample closest to each cluster center within its cluster.
+    
+    Args:
+        X (np.array): Samples
+        clusters (np.array): Cluster assignment of each sample
+        centers (np.array): Cluster centers
+    
+    Returns:
+        np.array: Indices of the selected samples (empty clusters are skipped)
+    """
+    # Squared distances of every sample to every center in one computation
+    distances = ((X ** 2).sum(axis=1)[:, np.newaxis]
+                 - 2 * X @ centers.T
+                 + (centers ** 2).sum(axis=1)[np.newaxis, :])
+    in_cluster = clusters[:, np.newaxis] == np.arange(len(centers))
+    distances = np.where(in_cluster, distances, np.inf)
+    
+    closest = np.argmin(distances, axis=0)
+    return closest[in_cluster.any(axis=0)]
+
+
+def farthest_point_batch(X_groups, n_select):
+    """
+    Farthest-point (k-center) selection for many groups in one stacked computation.
+    
+    Each group starts from the sample closest to its mean and then repeatedly
+    adds the sample farthest from everything selected so far. Groups are
+    padded to the same size so every step is a single vectorized update.
+    Padding and samples with non-finite features are never selected.
+    
+    Args:
+        X_groups (list): List of 2D arrays, one per group
+        n_select (list): Number of samples to select from each group
+    
+    Returns:
+        list: Arrays of selected indices, one per group
+    """
+    n_groups = len(X_groups)
+    sizes = np.array([len(X) for X in X_groups])
+    n_max = sizes.max()
+    
+    # Stack groups, padding with zero rows; the mask marks the real, finite samples
+    stacked = np.zeros((n_groups, n_max, X_groups[0].shape[1]))
+    valid = np.zeros((n_groups, n_max), dtype=bool)
+    for i, X in enumerate(X_groups):
+        X = np.asarray(X, dtype=float)
+        finite = np.isfinite(X).all(axis=1)
+        stacked[i, :len(X)] = np.where(finite[:, np.newaxis], X, 0.0)
+        valid[i, :len(X)] = finite
+    n_select = np.minimum(np.asarray(n_select), valid.sum(axis=1))
+    group_idx = np.arange(n_groups)
+    
+    # Start from the sample closest to the group mean
+    counts = np.maximum(valid.sum(axis=1), 1)[:, np.newaxis, np.newaxis]
+    means = (stacked * valid[:, :, np.newaxis]).sum(axis=1, keepdims=True) / counts
+    min_dist = np.where(valid, ((stacked - means) ** 2).sum(axis=2), np.inf)
+    current = np.argmin(min_dist, axis=1)
+    
+    selected = np.zeros((n_groups, n_select.max()), dtype=int)
+    for step in range(n_select.max()):
+        selected[:, step] = current
+        
+        # Distance from every sample to the newly selected one
+        new_dist = ((stacked - stacked[group_idx, current][:, np.newaxis, :]) ** 2).sum(axis=2)
+        if step == 0:
+            min_dist = np.where(valid, new_dist, -np.inf)
+        else:
+            min_dist = np.where(valid, np.minimum(min_dist, new_dist), -np.inf)
+        current = np.argmax(min_dist, axis=1)
+    
+    return [selected[i, :n_select[i]] for i in range(n_groups)]
+
+
+def _select_diverse_indices(X_scaled, n_select, method, random_state):
+    """Select n_select diverse samples from X_scaled with the given method."""
+    if method == 'minibatch':
+        kmeans = MiniBatchKMeans(n_clusters=n_select, random_state=random_state, n_init=1)
+        clusters = kmeans.fit_predict(X_scaled)
+        return _closest_to_centers(X_scaled, clusters, kmeans.cluster_centers_)
+    elif method == 'kmeans++':
+        # k-means++ seeding alone already returns well-spread data points
+        _, indices = kmeans_plusplus(X_scaled, n_select, random_state=random_state)
+        return indices
+    elif method == 'farthest':
+        return farthest_point_batch([X_scaled], [n_select])[0]
+    elif method == 'kmeans':
+        kmeans = KMeans(n_clusters=n_select, random_state=random_state, n_init=10)
+        clusters = kmeans.fit_predict(X_scaled)
+        return _closest_to_centers(X_scaled, clusters, kmeans.cluster_centers_)
+    else:
+        raise ValueError(f"Unknown calibration method: {method}")
+
+
+def select_calibration_diverse(subject_data, feature_names, scaler, examples_per_class=5,
+                               method='minibatch', random_state=42):
+    """
+    Select diverse calibration examples using clustering.
+    
+    Args:
+        subject_data (pd.DataFrame): DataFrame with subject features
+        feature_names (list): List of feature names to use
+        scaler (sklearn.preprocessing.StandardScaler): Fitted scaler
+        examples_per_class (int): Number of examples to select per class
+        method (str): Selection method ('minibatch', 'kmeans++', 'farthest', or 'kmeans')
+        random_state (int): Seed for the clustering methods
+    
+    Returns:
+        pd.DataFrame: DataFrame with selected calibration examples
+    """
+    logger.debug("Using diversity-aware calibration selection...")
+    calibration_data_list = []  # Empty list to collect selected data
+    total_examples = 0
+    
+    for label_data, examples_needed in _plan_calibration(subject_data, examples_per_class):
         total_examples += examples_needed
         
         if len(label_data) <= examples_needed:
             # Use all examples if fewer than requested
             selected = label_data
         else:
-            # Use k-means clustering to find diverse examples
-            X = label_data[feature_names].values
-            X_scaled = scaler.transform(X)  # Using already fitted scaler
-            
-            # Apply clustering
-            n_clusters = min(examples_needed, len(label_data))
-            kmeans = KMeans(n_clusters=n_clusters, random_state=42, n_init=10)
-            clusters = kmeans.fit_predict(X_scaled)
-            
-            # Select the example closest to each cluster center
-            selected_indices = []
-            for cluster_id in range(n_clusters):
-                cluster_samples = np.where(clusters == cluster_id)[0]
-                if len(cluster_samples) > 0:
-                    # Find closest to cluster center
-                    distances = np.sum((X_scaled[cluster_samples] - 
-                                    kmeans.cluster_centers_[cluster_id])**2, axis=1)
-                    closest_idx = cluster_samples[np.argmin(distances)]
-                    selected_indices.append(closest_idx)
-            
+            X_scaled = scaler.transform(label_data[feature_names].values)  # Using already fitted scaler
+            selected_indices = _select_diverse_indices(X_scaled, examples_needed, method, random_state)
             selected = label_data.iloc[selected_indices]
         
         # Add to calibration data list
@@ -85,12 +191,285 @@ def select_calibration_diverse(subject_data, feature_names, scaler, examples_per
     else:
         calibration_data = pd.DataFrame()
     
-    print(f"  Selected {len(calibration_data)} diverse calibration examples ({total_examples} planned)")
+    logger.debug("Selected %s diverse calibration examples (%s planned)", len(calibration_data), total_examples)
     return calibration_data
 
 
+def select_calibration_batch(train_data_dict, feature_names, scaler, examples_per_class=5,
+                             method='farthest', random_state=42):
+    """
+    Select calibration examples for many subjects in one call.
+    
+    With the 'farthest' method the selection for every (subject, class) group
+    runs as one stacked computation; other methods are applied group by group.
+    
+    Args:
+        train_data_dict (dict): Mapping from subject ID to training data
+        feature_names (list): List of feature names to use
+        scaler (sklearn.preprocessing.StandardScaler): Fitted scaler
+        examples_per_class (int): Number of examples to select per class
+        method (str): Selection method ('minibatch', 'kmeans++', 'farthest', or 'kmeans')
+        random_state (int): Seed for the clustering methods
+    
+    Returns:
+        dict: Mapping from subject ID to calibration DataFrame; subjects without
+            training data are left out
+    """
+    # Collect every (subject, class) group that needs a selection
+    groups = []
+    for subject_id, subject_data in train_data_dict.items():
+        if subject_data is None or len(subject_data) == 0:
+            continue
+        for label_data, examples_needed in _plan_calibration(subject_data, examples_per_class):
+            groups.append((subject_id, label_data, examples_needed))
+    
+    to_select = [i for i, (_, label_data, needed) in enumerate(groups) if len(label_data) > needed]
+    X_groups = [scaler.transform(groups[i][1][feature_names].values) for i in to_select]
+    
+    if method == 'farthest' and to_select:
+        indices = farthest_point_batch(X_groups, [groups[i][2] for i in to_select])
+    else:
+        indices = [_select_diverse_indices(X, groups[i][2], method, random_state)
+                   for i, X in zip(to_select, X_groups)]
+    selected_indices = dict(zip(to_select, indices))
+    
+    # Reassemble per-subject calibration sets in group order
+    calibration_lists = {}
+    for i, (subject_id, label_data, _) in enumerate(groups):
+        selected = label_data.iloc[selected_indices[i]] if i in selected_indices else label_data
+        calibration_lists.setdefault(subject_id, []).append(selected)
+    
+    return {
+        subject_id: pd.concat(selected_list, ignore_index=True)
+        for subject_id, selected_list in calibration_lists.items()
+    }
+
+
+def fine_tune_personal_model(base_model, X_cal_scaled, y_cal, max_epochs=50, tol=1e-4, n_iter_no_change=5,
+                             freeze_hidden=False):
+    """
+    Fine-tune a copy of a trained neural network on calibration data.
+    
+    The copy starts from the base model's weights and runs a bounded number of
+    partial_fit epochs, stopping early once the training loss stops improving.
+    
+    Args:
+        base_model (MLPClassifier): Trained base model
+        X_cal_scaled (np.array): Scaled calibration features
+        y_cal (np.array): Calibration labels (0-indexed)
+        max_epochs (int): Maximum number of fine-tuning epochs
+        tol (float): Minimum loss improvement counted as progress
+        n_iter_no_change (int): Epochs without progress before stopping
+        freeze_hidden (bool): Whether to keep the hidden layers at the base weights
+            and only train the output layer
+    
+    Returns:
+        tuple: (personal_model, fine_tune_time) with the time in seconds
+    """
+    start = time.perf_counter()
+    
+    # Copy keeps the base architecture, classes and weights
+    personal_model = copy.deepcopy(base_model)
+    hidden_params = personal_model.coefs_[:-1] + personal_model.intercepts_[:-1]
+    frozen_params = [param.copy() for param in hidden_params] if freeze_hidden else []
+    
+    best_loss = np.inf
+    epochs_no_change = 0
+    for _ in range(max_epochs):
+        personal_model.partial_fit(X_cal_scaled, y_cal)
+        
+        # partial_fit updates the weight arrays in place, so undo the hidden layer steps
+        for param, frozen in zip(hidden_params, frozen_params):
+            param[...] = frozen
+        
+        if personal_model.loss_ > best_loss - tol:
+            epochs_no_change += 1
+        else:
+            epochs_no_change = 0
+        best_loss = min(best_loss, personal_model.loss_)
+        
+        if epochs_no_change >= n_iter_no_change:
+            break
+    
+    return personal_model, time.perf_counter() - start
+
+
+def _hidden_activations(base_model, X):
+    """Forward X through all hidden layers of a trained MLPClassifier."""
+    activations = {
+        'identity': lambda z: z,
+        'logistic': lambda z: 1.0 / (1.0 + np.exp(-z)),
+        'tanh': np.tanh,
+        'relu': lambda z: np.maximum(z, 0)
+    }
+    activation = activations[base_model.activation]
+    
+    hidden = X
+    for coef, intercept in zip(base_model.coefs_[:-1], base_model.intercepts_[:-1]):
+        hidden = activation(hidden @ coef + intercept)
+    
+    return hidden
+
+
+def fine_tune_heads_batch(base_model, calibration_sets, max_epochs=50, tol=1e-4, n_iter_no_change=5):
+    """
+    Fine-tune the output layer of a neural network for many subjects in one stacked batch.
+    
+    Equivalent to calling fine_tune_personal_model with freeze_hidden=True for
+    every subject. The hidden layers are shared and frozen, so the hidden
+    representation of every calibration sample is computed once, and all
+    output layers are trained together on padded, stacked arrays with the
+    same Adam updates, loss and early stopping as partial_fit. Each head
+    continues from the base model's output layer and optimizer state. Subjects
+    with more samples than one partial_fit batch are fine-tuned on their own.
+    
+    Args:
+        base_model (MLPClassifier): Trained base model (adam solver)
+        calibration_sets (list): List of (X_cal_scaled, y_cal) tuples, one per subject
+        max_epochs (int): Maximum number of fine-tuning epochs
+        tol (float): Minimum loss improvement counted as progress
+        n_iter_no_change (int): Epochs without progress before stopping
+    
+    Returns:
+        tuple: (personal_models, fine_tune_times) lists aligned with calibration_sets;
+            each batched time is the subject's share of the batch time by sample count
+    """
+    if base_model.solver != 'adam':
+        raise ValueError(f"Batched fine-tuning requires the adam solver, got {base_model.solver}")
+    
+    start = time.perf_counter()
+    
+    personal_models = [None] * len(calibration_sets)
+    fine_tune_times = [0.0] * len(calibration_sets)
+    
+    # partial_fit splits larger sets into several minibatches per epoch
+    batch_limit = 200 if base_model.batch_size == 'auto' else base_model.batch_size
+    sizes = np.array([len(X) for X, _ in calibration_sets])
+    for i in np.flatnonzero(sizes > batch_limit):
+        personal_models[i], fine_tune_times[i] = fine_tune_personal_model(
+            base_model, *calibration_sets[i], max_epochs=max_epochs, tol=tol,
+            n_iter_no_change=n_iter_no_change, freeze_hidden=True)
+    
+    batched = np.flatnonzero(sizes <= batch_limit)
+    if len(batched) == 0:
+        return personal_models, fine_tune_times
+    
+    n_subjects = len(batched)
+    n_samples = sizes[batched]
+    n_max = n_samples.max()
+    classes = base_model.classes_
+    binary = base_model.out_activation_ == 'logistic'
+    n_hidden, n_outputs = base_model.coefs_[-1].shape
+    
+    # Stack hidden activations and targets, padding subjects to n_max samples
+    hidden = np.zeros((n_subjects, n_max, n_hidden))
+    targets = np.zeros((n_subjects, n_max, n_outputs))
+    mask = np.zeros((n_subjects, n_max, 1))
+    for row, i in enumerate(batched):
+        X_cal, y_cal = calibration_sets[i]
+        n = len(X_cal)
+        hidden[row, :n] = _hidden_activations(base_model, X_cal)
+        class_idx = np.searchsorted(classes, y_cal)
+        if binary:
+            targets[row, :n, 0] = class_idx
+        else:
+            targets[row, np.arange(n), class_idx] = 1.0
+        mask[row, :n] = 1.0
+    
+    # Every head starts from the base output layer and its Adam moments
+    out_layer = len(base_model.coefs_) - 1
+    weights = np.repeat(base_model.coefs_[-1][np.newaxis], n_subjects, axis=0)
+    biases = np.repeat(base_model.intercepts_[-1][np.newaxis], n_subjects, axis=0)
+    params = [weights, biases]
+    optimizer = getattr(base_model, '_optimizer', None)
+    if optimizer is not None:
+        step = optimizer.t
+        first_moments = [np.repeat(optimizer.ms[k][np.newaxis], n_subjects, axis=0)
+                         for k in (out_layer, 2 * out_layer + 1)]
+        second_moments = [np.repeat(optimizer.vs[k][np.newaxis], n_subjects, axis=0)
+                          for k in (out_layer, 2 * out_layer + 1)]
+    else:
+        step = 0
+        first_moments = [np.zeros_like(p) for p in params]
+        second_moments = [np.zeros_like(p) for p in params]
+    
+    alpha = base_model.alpha
+    beta_1, beta_2 = base_model.beta_1, base_model.beta_2
+    hidden_penalty = sum((coef ** 2).sum() for coef in base_model.coefs_[:-1])
+    eps = np.finfo(float).eps
+    
+    active = np.ones(n_subjects, dtype=bool)
+    best_loss = np.full(n_subjects, np.inf)
+    epochs_no_change = np.zeros(n_subjects, dtype=int)
+    for _ in range(max_epochs):
+        logits = np.einsum('snh,sho->sno', hidden, weights) + biases[:, np.newaxis, :]
+        if binary:
+            proba = 1.0 / (1.0 + np.exp(-logits))
+        else:
+            logits -= logits.max(axis=2, keepdims=True)
+            proba = np.exp(logits)
+            proba /= proba.sum(axis=2, keepdims=True)
+        
+        # Cross-entropy plus the L2 penalty on all layers, as reported in loss_
+        clipped = np.clip(proba, eps, 1 - eps)
+        log_likelihood = targets * np.log(clipped)
+        if binary:
+            log_likelihood += (1 - targets) * np.log(1 - clipped)
+        penalty = hidden_penalty + (weights ** 2).sum(axis=(1, 2))
+        loss = (-(log_likelihood * mask).sum(axis=(1, 2)) + 0.5 * alpha * penalty) / n_samples
+        
+        delta = (proba - targets) * mask
+        grad_weights = (np.einsum('snh,sno->sho', hidden, delta) + alpha * weights) / n_samples[:, np.newaxis, np.newaxis]
+        grad_biases = delta.sum(axis=1) / n_samples[:, np.newaxis]
+        
+        # Adam step for the heads that are still training
+        step += 1
+        lr = base_model.learning_rate_init * np.sqrt(1 - beta_2 ** step) / (1 - beta_1 ** step)
+        for param, grad, m, v in zip(params, [grad_weights, grad_biases], first_moments, second_moments):
+            m[active] = beta_1 * m[active] + (1 - beta_1) * grad[active]
+            v[active] = beta_2 * v[active] + (1 - beta_2) * grad[active] ** 2
+            param[active] -= lr * m[active] / (np.sqrt(v[active]) + base_model.epsilon)
+        
+        epochs_no_change = np.where(loss > best_loss - tol, epochs_no_change + 1, 0)
+        best_loss = np.minimum(best_loss, loss)
+        active &= epochs_no_change < n_iter_no_change
+        if not active.any():
+            break
+    
+    # Build one personal model per subject from the shared body and its own head
+    for row, i in enumerate(batched):
+        personal_model = copy.deepcopy(base_model)
+        personal_model.coefs_[-1] = weights[row].copy()
+        personal_model.intercepts_[-1] = biases[row].copy()
+        personal_models[i] = personal_model
+    
+    elapsed = time.perf_counter() - start - sum(fine_tune_times)
+    for i, share in zip(batched, n_samples / n_samples.sum()):
+        fine_tune_times[i] = elapsed * share
+    
+    return personal_models, fine_tune_times
+
+
+def supports_fine_tuning(base_model, model_type, use_transfer_learning=True):
+    """
+    Check whether personal models are fine-tuned from the base model weights.
+    
+    Args:
+        base_model (object): Trained base model
+        model_type (str): Type of model to use
+        use_transfer_learning (bool): Whether to use transfer learning
+    
+    Returns:
+        bool: True if the base model is a trained transfer learning model
+    """
+    return (use_transfer_learning and model_type in get_transfer_model_types()
+            and hasattr(base_model, 'coefs_'))
+
+
 def create_personal_model(subject_train_data, base_model, feature_names, scaler, 
-                          model_type='neural_network', num_calibration=5, use_transfer_learning=True):
+                          model_type='neural_network', num_calibration=5, use_transfer_learning=True,
+                          fine_tune_epochs=50, calibration_method='minibatch', calibration_data=None,
+                          personal_model=None, fine_tune_time=None):
     """
     Create a personalized model for a subject using transfer learning.
     
@@ -102,24 +481,33 @@ def create_personal_model(subject_train_data, base_model, feature_names, scaler,
         model_type (str): Type of model to use
         num_calibration (int): Number of calibration examples per class
         use_transfer_learning (bool): Whether to use transfer learning
+        fine_tune_epochs (int): Maximum number of transfer learning epochs
+        calibration_method (str): Calibration selection method (see select_calibration_diverse)
+        calibration_data (pd.DataFrame): Precomputed calibration examples, e.g. from
+            select_calibration_batch; selected here with calibration_method if None
+        personal_model (object): Model already fine-tuned on calibration_data, e.g. by
+            fine_tune_heads_batch; trained here if None
+        fine_tune_time (float): Time in seconds spent training personal_model
     
     Returns:
-        tuple: (personal_model, calibration_data, feature_ranking)
+        tuple: (personal_model, calibration_data, feature_ranking, fine_tune_time)
+            with the fine-tuning time in seconds
     """
     if len(subject_train_data) == 0:
-        print("  No training data available for this subject.")
-        return None, None, None
+        logger.warning("No training data available for this subject.")
+        return None, None, None, None
     
     subject_id = subject_train_data['subject_id'].iloc[0]
-    print(f"Creating personal model for subject S{subject_id} with transfer learning...")
+    logger.info("Creating personal model for subject S%s with transfer learning...", subject_id)
     
     # Identify important features (but keep using all features)
     feature_ranking = identify_subject_important_features(
         subject_train_data, feature_names)
     
-    # Select calibration examples with diversity
-    calibration_data = select_calibration_diverse(
-        subject_train_data, feature_names, scaler, num_calibration)
+    # Select calibration examples with diversity unless they were selected upfront
+    if calibration_data is None:
+        calibration_data = select_calibration_diverse(
+            subject_train_data, feature_names, scaler, num_calibration, method=calibration_method)
     
     # Extract features and labels (using all original features)
     X_cal = calibration_data[feature_names].values
@@ -128,40 +516,21 @@ def create_personal_model(subject_train_data, base_model, feature_names, scaler,
     # Standardize features
     X_cal_scaled = scaler.transform(X_cal)
     
-    # Get model types
-    model_types = get_model_types()
-    transfer_model_types = get_transfer_model_types()
-    
-    if use_transfer_learning:
-        # Use transfer learning-specific model (no early stopping)
-        if model_type in transfer_model_types:
-            # Create a fresh model
-            personal_model = clone(transfer_model_types[model_type])
-            
-            # Initialize with weights from base model
-            if model_type == 'neural_network':
-                # For neural networks, we need to fit first with a sample
-                # to initialize the model architecture
-                personal_model.fit(X_cal_scaled[:2], y_cal[:2])
-                
-                # Now copy weights from base model
-                if hasattr(base_model, 'coefs_') and hasattr(personal_model, 'coefs_'):
-                    for i in range(len(base_model.coefs_)):
-                        personal_model.coefs_[i] = base_model.coefs_[i].copy()
-                
-                if hasattr(base_model, 'intercepts_') and hasattr(personal_model, 'intercepts_'):
-                    for i in range(len(base_model.intercepts_)):
-                        personal_model.intercepts_[i] = base_model.intercepts_[i].copy()
-            
-            # Now fine-tune
-            personal_model.fit(X_cal_scaled, y_cal)
-        else:
-            # Use a new model (fallback if transfer model not available)
-            personal_model = clone(model_types[model_type])
-            personal_model.fit(X_cal_scaled, y_cal)
+    if personal_model is not None:
+        # Fine-tuned up front together with other subjects
+        fine_tune_time = fine_tune_time or 0.0
+    elif supports_fine_tuning(base_model, model_type, use_transfer_learning):
+        # Continue training from the base model weights
+        personal_model, fine_tune_time = fine_tune_personal_model(
+            base_model, X_cal_scaled, y_cal, max_epochs=fine_tune_epochs)
     else:
-        # Use a new model (without transfer)
-        personal_model = clone(model_types[model_type])
+        # Use a new model (without transfer, or if transfer model not available)
+        start = time.perf_counter()
+        personal_model = clone(get_model_types()[model_type])
         personal_model.fit(X_cal_scaled, y_cal)
+        fine_tune_time = time.perf_counter() - start
+    
+    logger.info("Personal model trained in %.3fs on %s calibration samples", fine_tune_time, len(X_cal),
+                extra={'subject_id': subject_id, 'duration_ms': round(fine_tune_time * 1000, 3)})
     
-    return personal_model, calibration_data, feature_ranking
\ No newline at end of file
+    return personal_model, calibration_data, feature_ranking, fine_tune_time
@@ -0,0 +1,229 @@
+"""
+Pure NumPy inference runtime for the WESAD MLP models.
+
+An exported network is a list of float32 weight matrices and bias vectors
+with the StandardScaler folded into the first layer, so predicting is a few
+matrix multiplies on raw features without sklearn's input validation. The
+base and personal networks of a subject can be stacked into one network that
+returns both models' probabilities from a single forward pass.
+"""
+
+import numpy as np
+
+
+HIDDEN_ACTIVATIONS = {
+    'identity': lambda z: z,
+    'logistic': lambda z: 1.0 / (1.0 + np.exp(-z)),
+    'tanh': np.tanh,
+    'relu': lambda z: np.maximum(z, 0)
+}
+
+
+def _softmax(z):
+    """Row-wise softmax."""
+    z = np.exp(z - z.max(axis=1, keepdims=True))
+    return z / z.sum(axis=1, keepdims=True)
+
+
+def _output_proba(z, out_activation):
+    """Class probabilities from the output layer, matching MLPClassifier.predict_proba."""
+    if out_activation == 'softmax':
+        return _softmax(z)
+    # Binary networks have a single logistic output unit for the positive class
+    positive = 1.0 / (1.0 + np.exp(-z[:, 0]))
+    return np.column_stack([1 - positive, positive])
+
+
+class MLPRuntime:
+    """
+    Forward pass of an exported MLPClassifier.
+    """
+    
+    def __init__(self, weights, biases, activation='relu', out_activation='softmax', classes=None):
+        """
+        Initialize the runtime from exported layers.
+        
+        Args:
+            weights (list): Weight matrix of each layer, (n_in, n_out)
+            biases (list): Bias vector of each layer
+            activation (str): Hidden layer activation
+            out_activation (str): 'softmax' or 'logistic'
+            classes (np.ndarray): Class labels in predict_proba column order
+        """
+        self.weights = list(weights)
+        self.biases = list(biases)
+        self.activation = activation
+        self.out_activation = out_activation
+        self.classes = classes
+        self._hidden = HIDDEN_ACTIVATIONS[activation]
+    
+    @classmethod
+    def from_sklearn(cls, model, scaler=None, dtype=np.float32):
+        """
+        Export a trained MLPClassifier, folding an optional StandardScaler into the first layer.
+        
+        With z = (x - mean) / scale, z @ W + b equals x @ (W / scale) + (b - (mean / scale) @ W),
+        so the runtime takes raw features.
+        
+        Args:
+            model (MLPClassifier): Trained network
+            scaler (StandardScaler): Fitted scaler applied before the network (optional)
+            dtype: Floating point type of the exported layers
+        
+        Returns:
+            MLPRuntime: Runtime with the same outputs as scaler + model
+        """
+        if not hasattr(model, 'coefs_') or model.out_activation_ not in ('softmax', 'logistic'):
+            raise TypeError(f"Cannot export {type(model).__name__}: expected a trained MLPClassifier")
+        
+        weights = [np.asarray(coef, dtype=np.float64) for coef in model.coefs_]
+        biases = [np.asarray(intercept, dtype=np.float64) for intercept in model.intercepts_]
+        
+        if scaler is not None:
+            mean = scaler.mean_ if getattr(scaler, 'with_mean', True) and scaler.mean_ is not None else 0.0
+            scale = scaler.scale_ if getattr(scaler, 'with_std', True) and scaler.scale_ is not None else 1.0
+            mean = np.broadcast_to(mean, weights[0].shape[:1])
+            scale = np.broadcast_to(scale, weights[0].shape[:1])
+            biases[0] = biases[0] - (mean / scale) @ weights[0]
+            weights[0] = weights[0] / scale[:, np.newaxis]
+        
+        return cls(
+            [w.astype(dtype) for w in weights],
+            [b.astype(dtype) for b in biases],
+            activation=model.activation,
+            out_activation=model.out_activation_,
+            classes=np.asarray(model.classes_)
+        )
+    
+    def to_arrays(self):
+        """
+        Flatten the runtime into named arrays, e.g. for np.savez or a model bundle.
+        
+        Returns:
+            dict: Arrays named weight_{i}, bias_{i}, classes and config
+        """
+        arrays = {f'weight_{i}': w for i, w in enumerate(self.weights)}
+        arrays.update({f'bias_{i}': b for i, b in enumerate(self.biases)})
+        arrays['classes'] = self.classes
+        arrays['config'] = np.array([self.activation, self.out_activation])
+        return arrays
+    
+    @classmethod
+    def from_arrays(cls, arrays):
+        """
+        Rebuild a runtime from the arrays written by to_arrays.
+        
+        Args:
+            arrays (dict): Named arrays (an open np.load file works too)
+        
+        Returns:
+            MLPRuntime: Runtime
+        """
+        n_layers = sum(1 for name in arrays.keys() if name.startswith('weight_'))
+        activation, out_activation = (str(value) for value in arrays['config'])
+        return cls(
+            [arrays[f'weight_{i}'] for i in range(n_layers)],
+            [arrays[f'bias_{i}'] for i in range(n_layers)],
+            activation=activation,
+            out_activation=out_activation,
+            classes=arrays['classes']
+        )
+    
+    def _logits(self, X):
+        """Output layer pre-activations for a batch."""
+        hidden = X
+        for weight, bias in zip(self.weights[:-1], self.biases[:-1]):
+            hidden = self._hidden(hidden @ weight + bias)
+        return hidden @ self.weights[-1] + self.biases[-1]
+    
+    def predict_proba(self, X):
+        """
+        Class probabilities for one row or a batch of raw features.
+        
+        Args:
+            X (np.ndarray): Features of shape (n_features,) or (n_samples, n_features)
+        
+        Returns:
+            np.ndarray: Probabilities of shape (n_samples, n_classes)
+        """
+        X = np.atleast_2d(np.asarray(X, dtype=self.weights[0].dtype))
+        return _output_proba(self._logits(X), self.out_activation)
+    
+    def predict(self, X):
+        """Predicted class labels for one row or a batch of raw features."""
+        return self.classes[np.argmax(self.predict_proba(X), axis=1)]
+
+
+class StackedMLPRuntime:
+    """
+    Base and personal networks evaluated together in one forward pass.
+    
+    The first layers are concatenated (both networks read the same raw
+    features) and the deeper layers are placed block-diagonally, so each
+    matrix multiply computes both networks at once. Networks of different
+    depth or activation are evaluated one after the other instead.
+    """
+    
+    def __init__(self, base_runtime, personal_runtime):
+        """
+        Stack two exported networks.
+        
+        Args:
+            base_runtime (MLPRuntime): Base model runtime
+            personal_runtime (MLPRuntime): Personal model runtime
+        """
+        self.base = base_runtime
+        self.personal = personal_runtime
+        self.stacked = None
+        
+        if (len(base_runtime.weights) == len(personal_runtime.weights)
+                and base_runtime.activation == personal_runtime.activation
+                and base_runtime.out_activation == personal_runtime.out_activation):
+            self.stacked = self._stack(base_runtime, personal_runtime)
+            self._split = base_runtime.weights[-1].shape[1]
+    
+    @staticmethod
+    def _stack(base, personal):
+        """Build the combined runtime."""
+        weights = [np.hstack([base.weights[0], personal.weights[0]])]
+        for base_weight, personal_weight in zip(base.weights[1:], personal.weights[1:]):
+            weight = np.zeros((base_weight.shape[0] + personal_weight.shape[0],
+                               base_weight.shape[1] + personal_weight.shape[1]), dtype=base_weight.dtype)
+            weight[:base_weight.shape[0], :base_weight.shape[1]] = base_weight
+            weight[base_weight.shape[0]:, base_weight.shape[1]:] = personal_weight
+            weights.append(weight)
+        biases = [np.concatenate([b, p]) for b, p in zip(base.biases, personal.biases)]
+        return MLPRuntime(weights, biases, activation=base.activation, out_activation=base.out_activation)
+    
+    def predict_proba(self, X):
+        """
+        Probabilities of both networks for one row or a batch of raw features.
+        
+        Args:
+            X (np.ndarray): Features of shape (n_features,) or (n_samples, n_features)
+        
+        Returns:
+            tuple: (base probabilities, personal probabilities)
+        """
+        if self.stacked is None:
+            return self.base.predict_proba(X), self.personal.predict_proba(X)
+        
+        X = np.atleast_2d(np.asarray(X, dtype=self.stacked.weights[0].dtype))
+        logits = self.stacked._logits(X)
+        out_activation = self.stacked.out_activation
+        return (_output_proba(logits[:, :self._split], out_activation),
+                _output_proba(logits[:, self._split:], out_activation))
+    
+    def ensemble_proba(self, X, ensemble_weight=0.5):
+        """
+        Weighted average of the base and personal probabilities.
+        
+        Args:
+            X (np.ndarray): Raw features
+            ensemble_weight (float): Weight of the base model
+        
+        Returns:
+            np.ndarray: Ensemble probabilities
+        """
+        base_proba, personal_proba = self.predict_proba(X)
+        return base_proba * ensemble_weight + personal_proba * (1 - ensemble_weight)
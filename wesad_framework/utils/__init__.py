@@ -2,4 +2,23 @@ from wesad_framework.utils.helpers import (
     save_model, load_model,
     save_scaler, load_scaler,
     save_features, save_results_table
-)
\ No newline at end of file
+)
+from wesad_framework.utils.bundle import (
+    ModelBundle, save_bundle, load_bundle,
+    read_manifest, is_bundle
+)
+from wesad_framework.utils.columnar import (
+    ColumnarTestData, save_test_store, open_test_store,
+    convert_test_pickles, is_test_store
+)
+from wesad_framework.utils.artifacts import (
+    UnsafeArtifactError, load_pickle, load_joblib,
+    save_table, load_table
+)
+from wesad_framework.utils.log import (
+    configure_logging, logging_settings, log_duration,
+    JsonFormatter, SamplingFilter
+)
+from wesad_framework.utils.profiling import (
+    StageProfiler, profile_stage, data_shape
+)
@@ -0,0 +1,238 @@
+"""
+Restricted loading of serving artifacts.
+
+pickle and joblib files can run arbitrary code while loading: any global
+the file names is imported and called. The loaders here only resolve
+globals from an allow-list: NumPy array reconstruction, a few builtins, and
+classes (not functions) defined in scikit-learn and this project. Dotted
+names are refused, since the unpickler would follow them through module
+attributes to anything the module imports. Anything else stops the load
+with UnsafeArtifactError before it is called.
+
+Tabular data such as the demo samples is stored without pickle as an .npz
+archive holding the columns, extra named arrays and JSON metadata.
+"""
+
+import os
+import json
+import pickle
+import inspect
+import numpy as np
+import pandas as pd
+from joblib import numpy_pickle
+
+
+# Individually allowed globals: (module, name)
+SAFE_GLOBALS = {
+    ('builtins', 'set'),
+    ('builtins', 'frozenset'),
+    ('builtins', 'slice'),
+    ('builtins', 'complex'),
+    ('builtins', 'bytearray'),
+    ('builtins', 'object'),
+    ('copyreg', '_reconstructor'),
+    ('_codecs', 'encode'),
+    ('collections', 'OrderedDict'),
+    ('collections', 'defaultdict'),
+    ('numpy', 'dtype'),
+    ('numpy', 'ndarray'),
+    ('numpy.core.multiarray', '_reconstruct'),
+    ('numpy._core.multiarray', '_reconstruct'),
+    ('numpy.core.multiarray', 'scalar'),
+    ('numpy._core.multiarray', 'scalar'),
+    ('numpy.core.numeric', '_frombuffer'),
+    ('numpy._core.numeric', '_frombuffer'),
+    ('numpy.random._pickle', '__bit_generator_ctor'),
+    ('numpy.random._pickle', '__randomstate_ctor'),
+    ('numpy.random._pickle', '__generator_ctor'),
+    ('numpy.random._mt19937', 'MT19937'),
+    ('numpy.random._pcg64', 'PCG64'),
+    ('numpy.random._philox', 'Philox'),
+    ('numpy.random._sfc64', 'SFC64'),
+    ('numpy.random.mtrand', 'RandomState'),
+    ('joblib.numpy_pickle', 'NumpyArrayWrapper')
+}
+
+# Modules recorded under a different name by some scikit-learn builds
+LEGACY_MODULES = {
+    '_loss': 'sklearn._loss._loss'
+}
+
+# Packages whose classes may be instantiated (estimators, losses, trees, adapters)
+SAFE_CLASS_PACKAGES = ('sklearn', 'imblearn', 'cross_dataset', 'wesad_framework')
+
+TABLE_METADATA_KEY = '__metadata__'
+TABLE_BLOCK_PREFIX = 'block:'
+
+
+class UnsafeArtifactError(pickle.UnpicklingError):
+    """Raised when an artifact references a global outside the allow-list."""
+
+
+def resolve_global(module, name, find_class):
+    """
+    Resolve a pickled global if it is allow-listed.
+    
+    Args:
+        module (str): Module of the global
+        name (str): Name of the global
+        find_class (callable): Resolver of the underlying unpickler
+    
+    Returns:
+        object: The resolved global
+    """
+    module = LEGACY_MODULES.get(module, module)
+    if '.' in name:
+        # Protocol 4 names are attribute paths (e.g. 'f2py.subprocess.Popen')
+        raise UnsafeArtifactError(f"Refusing to load {module}.{name}: dotted global names are not allowed")
+    if (module, name) in SAFE_GLOBALS:
+        return find_class(module, name)
+    
+    # NumPy scalar and dtype classes, e.g. numpy.float64
+    if module in ('numpy', 'numpy.dtypes'):
+        obj = find_class(module, name)
+        if isinstance(obj, type) and issubclass(obj, (np.generic, np.dtype)):
+            return obj
+    
+    if module.split('.')[0] in SAFE_CLASS_PACKAGES:
+        obj = find_class(module, name)
+        # The class must be defined in an allowed package, not just imported into one
+        if isinstance(obj, type) and str(getattr(obj, '__module__', '')).split('.')[0] in SAFE_CLASS_PACKAGES:
+            return obj
+    
+    raise UnsafeArtifactError(f"Refusing to load {module}.{name}: not an allowed artifact type")
+
+
+class RestrictedUnpickler(pickle.Unpickler):
+    """Unpickler that only resolves allow-listed globals."""
+    
+    def find_class(self, module, name):
+        return resolve_global(module, name, super().find_class)
+
+
+class _RestrictedNumpyUnpickler(numpy_pickle.NumpyUnpickler):
+    """joblib's unpickler (arrays stored as raw buffers) with the same allow-list."""
+    
+    def find_class(self, module, name):
+        return resolve_global(module, name, super().find_class)
+
+
+# NumpyUnpickler takes ensure_native_byte_order from joblib 1.5
+_NATIVE_BYTE_ORDER_ARG = 'ensure_native_byte_order' in inspect.signature(numpy_pickle.NumpyUnpickler).parameters
+
+
+def _check_type(obj, expected, path):
+    """Fail if a loaded object is not of an expected type."""
+    if expected is not None and not isinstance(obj, expected):
+        raise UnsafeArtifactError(f"Unexpected artifact type {type(obj).__name__} in {path}")
+    return obj
+
+
+def load_pickle(path, expected=None):
+    """
+    Load a pickle file through the allow-list.
+    
+    Args:
+        path (str): Path to the pickle file
+        expected (type or tuple): Allowed types of the loaded object (None allows any)
+    
+    Returns:
+        object: Loaded object
+    """
+    with open(path, 'rb') as f:
+        return _check_type(RestrictedUnpickler(f).load(), expected, path)
+
+
+def load_joblib(path, mmap_mode=None, expected=None):
+    """
+    Load a joblib file through the allow-list.
+    
+    Args:
+        path (str): Path to the joblib file
+        mmap_mode (str): Memory-map mode for uncompressed arrays
+        expected (type or tuple): Allowed types of the loaded object (None allows any)
+    
+    Returns:
+        object: Loaded object
+    """
+    # Same steps as joblib.load, with the restricted unpickler
+    with open(path, 'rb') as f:
+        with numpy_pickle._validate_fileobject_and_memmap(f, path, mmap_mode) as (fobj, mmap_mode):
+            if isinstance(fobj, str):
+                # Files of joblib < 0.10 are read with plain pickle
+                raise UnsafeArtifactError(f"Unsupported legacy joblib format in {path}")
+            kwargs = {'mmap_mode': mmap_mode}
+            if _NATIVE_BYTE_ORDER_ARG:
+                kwargs['ensure_native_byte_order'] = mmap_mode is None
+            obj = _RestrictedNumpyUnpickler(path, fobj, **kwargs).load()
+    return _check_type(obj, expected, path)
+
+
+def save_table(path, frame, arrays=None, metadata=None):
+    """
+    Save a DataFrame with extra arrays and metadata as a pickle-free .npz archive.
+    
+    Columns of the same dtype are stored together as one 2D block, so loading
+    reads a few arrays instead of one per column.
+    
+    Args:
+        path (str): Path to the .npz file
+        frame (pd.DataFrame): Table with numeric, boolean or string columns
+        arrays (dict): Additional named arrays
+        metadata (dict): JSON-serializable metadata
+    
+    Returns:
+        str: Path to the saved archive
+    """
+    blocks = {}  # dtype -> (column names, column arrays)
+    for column in frame.columns:
+        values = frame[column].to_numpy()
+        if values.dtype == object:
+            if not all(isinstance(value, str) for value in values):
+                raise TypeError(f"Column {column!r} holds Python objects and cannot be stored without pickle")
+            values = values.astype(str)
+        names, columns = blocks.setdefault(values.dtype.kind + str(values.dtype.itemsize), ([], []))
+        names.append(str(column))
+        columns.append(values)
+    
+    contents = {name: np.asarray(array) for name, array in (arrays or {}).items()}
+    block_columns = []
+    for i, (names, columns) in enumerate(blocks.values()):
+        contents[f"{TABLE_BLOCK_PREFIX}{i}"] = np.column_stack(columns)
+        block_columns.append(names)
+    
+    contents[TABLE_METADATA_KEY] = np.array(json.dumps({
+        'columns': [str(column) for column in frame.columns],
+        'blocks': block_columns,
+        'metadata': metadata or {}
+    }))
+    
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    np.savez(path, **contents)
+    return path
+
+
+def load_table(path):
+    """
+    Load an archive written by save_table.
+    
+    Args:
+        path (str): Path to the .npz file
+    
+    Returns:
+        tuple: (DataFrame, dict of extra arrays, metadata dict)
+    """
+    with np.load(path, allow_pickle=False) as archive:
+        if TABLE_METADATA_KEY not in archive.files:
+            raise ValueError(f"Not a table archive: {path}")
+        header = json.loads(str(archive[TABLE_METADATA_KEY]))
+        
+        blocks = [pd.DataFrame(archive[f"{TABLE_BLOCK_PREFIX}{i}"], columns=names)
+                  for i, names in enumerate(header['blocks'])]
+        arrays = {
+            name: archive[name] for name in archive.files
+            if name != TABLE_METADATA_KEY and not name.startswith(TABLE_BLOCK_PREFIX)
+        }
+    
+    frame = pd.concat(blocks, axis=1)[header['columns']] if blocks else pd.DataFrame()
+    return frame, arrays, header['metadata']
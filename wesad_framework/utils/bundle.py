@@ -0,0 +1,275 @@
+"""
+Versioned model bundles shared by the WESAD and cross-dataset frameworks.
+
+A bundle is a directory with a manifest.json, one uncompressed joblib file
+per estimator (model, scaler, adapter, ...) and optional groups of plain .npy
+arrays, such as an exported inference runtime. joblib stores the NumPy arrays
+of an estimator as raw buffers, so loading with mmap_mode='c' maps the weights
+from the page cache instead of copying them, and server workers on the same
+host share a single copy. The mapping is copy-on-write because some compiled
+estimators (libsvm) require writable buffers even though they never write.
+Estimators are loaded through the allow-listed unpickler of artifacts.py.
+The manifest holds everything needed to use the model without unpickling
+it: input feature order, class names, ensemble weight, decision threshold,
+library versions and a content hash of the payload files.
+"""
+
+import logging
+import os
+import sys
+import json
+import shutil
+import hashlib
+import datetime
+import numpy as np
+import joblib
+import sklearn
+
+from wesad_framework.utils.artifacts import load_joblib
+
+logger = logging.getLogger(__name__)
+
+
+BUNDLE_FORMAT = 'neurofeel-model-bundle'
+BUNDLE_VERSION = 1
+MANIFEST_FILE = 'manifest.json'
+
+
+def _json_safe(value):
+    """Convert NumPy types, tuples and other objects into JSON-serializable values."""
+    if isinstance(value, dict):
+        return {str(k): _json_safe(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_json_safe(v) for v in value]
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    return str(value)
+
+
+def library_versions():
+    """
+    Versions of the libraries a bundle depends on.
+    
+    Returns:
+        dict: Version strings of Python, NumPy, scikit-learn and joblib
+    """
+    return {
+        'python': sys.version.split()[0],
+        'numpy': np.__version__,
+        'scikit-learn': sklearn.__version__,
+        'joblib': joblib.__version__
+    }
+
+
+def _payload_files(files, array_files):
+    """All payload files of a bundle, keyed by a unique name."""
+    payload = dict(files)
+    for group, group_files in array_files.items():
+        payload.update({f"{group}/{name}": path for name, path in group_files.items()})
+    return payload
+
+
+def _content_hash(bundle_dir, files):
+    """SHA-256 over the payload files, in name order."""
+    digest = hashlib.sha256()
+    for name in sorted(files):
+        digest.update(name.encode())
+        with open(os.path.join(bundle_dir, files[name]), 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+def is_bundle(path):
+    """
+    Check whether a path is a model bundle directory.
+    
+    Args:
+        path (str): Path to check
+    
+    Returns:
+        bool: True if the path contains a bundle manifest
+    """
+    return os.path.isfile(os.path.join(path, MANIFEST_FILE))
+
+
+def save_bundle(bundle_dir, model, feature_names=None, class_names=None, scaler=None,
+                ensemble_weight=None, threshold=None, metadata=None, components=None, arrays=None):
+    """
+    Save a model and its preprocessing as a versioned bundle.
+    
+    The bundle is written next to its final location and moved into place at
+    the end, so readers never see a half-written bundle.
+    
+    Args:
+        bundle_dir (str): Directory of the bundle
+        model: Trained model
+        feature_names (list): Input feature order expected at prediction time
+        class_names (list): Name of each class, in predict_proba column order
+        scaler: Fitted scaler applied before the model (optional)
+        ensemble_weight (float): Weight of the base model when ensembling (optional)
+        threshold (float): Decision threshold on the positive class probability (optional)
+        metadata (dict): Additional metadata
+        components (dict): Other fitted objects to store, e.g. {'adapter': adapter}
+        arrays (dict): Groups of named arrays stored as .npy files, e.g. {'runtime': {'weight_0': ...}}
+    
+    Returns:
+        str: Path to the saved bundle
+    """
+    bundle_dir = os.path.normpath(bundle_dir)
+    tmp_dir = bundle_dir + '.tmp'
+    if os.path.exists(tmp_dir):
+        shutil.rmtree(tmp_dir)
+    os.makedirs(tmp_dir)
+    
+    estimators = {'model': model, 'scaler': scaler}
+    estimators.update(components or {})
+    
+    # Uncompressed joblib files keep arrays as raw buffers that can be memory-mapped
+    files = {}
+    for name, estimator in estimators.items():
+        if estimator is None:
+            continue
+        files[name] = f"{name}.joblib"
+        joblib.dump(estimator, os.path.join(tmp_dir, files[name]))
+    
+    array_files = {}
+    for group, group_arrays in (arrays or {}).items():
+        os.makedirs(os.path.join(tmp_dir, group))
+        array_files[group] = {}
+        for name, array in group_arrays.items():
+            array_files[group][name] = os.path.join(group, f"{name}.npy")
+            np.save(os.path.join(tmp_dir, array_files[group][name]), np.asarray(array), allow_pickle=False)
+    
+    manifest = {
+        'format': BUNDLE_FORMAT,
+        'format_version': BUNDLE_VERSION,
+        'created_at': datetime.datetime.now().isoformat(),
+        'model_class': f"{type(model).__module__}.{type(model).__name__}",
+        'feature_names': list(feature_names) if feature_names is not None else None,
+        'class_names': list(class_names) if class_names is not None else None,
+        'ensemble_weight': None if ensemble_weight is None else float(ensemble_weight),
+        'threshold': None if threshold is None else float(threshold),
+        'versions': library_versions(),
+        'files': files,
+        'arrays': array_files,
+        'content_hash': _content_hash(tmp_dir, _payload_files(files, array_files)),
+        'metadata': _json_safe(metadata or {})
+    }
+    with open(os.path.join(tmp_dir, MANIFEST_FILE), 'w') as f:
+        json.dump(manifest, f, indent=2)
+    
+    if os.path.exists(bundle_dir):
+        shutil.rmtree(bundle_dir)
+    os.replace(tmp_dir, bundle_dir)
+    
+    return bundle_dir
+
+
+def read_manifest(bundle_dir):
+    """
+    Read and validate the manifest of a bundle.
+    
+    Args:
+        bundle_dir (str): Directory of the bundle
+    
+    Returns:
+        dict: Bundle manifest
+    """
+    with open(os.path.join(bundle_dir, MANIFEST_FILE), 'r') as f:
+        manifest = json.load(f)
+    
+    if manifest.get('format') != BUNDLE_FORMAT:
+        raise ValueError(f"Not a model bundle: {bundle_dir}")
+    if manifest.get('format_version', 0) > BUNDLE_VERSION:
+        raise ValueError(f"Bundle format version {manifest['format_version']} is newer than "
+                         f"the supported version {BUNDLE_VERSION}: {bundle_dir}")
+    return manifest
+
+
+class ModelBundle:
+    """
+    A loaded model bundle: the manifest plus the estimators it references.
+    """
+    
+    def __init__(self, path, manifest, estimators, arrays=None):
+        """
+        Initialize a loaded bundle.
+        
+        Args:
+            path (str): Directory of the bundle
+            manifest (dict): Bundle manifest
+            estimators (dict): Loaded estimators by name
+            arrays (dict): Loaded array groups
+        """
+        self.path = path
+        self.manifest = manifest
+        self.estimators = estimators
+        self.arrays = arrays or {}
+    
+    @property
+    def model(self):
+        return self.estimators['model']
+    
+    @property
+    def scaler(self):
+        return self.estimators.get('scaler')
+    
+    @property
+    def feature_names(self):
+        return self.manifest['feature_names']
+    
+    @property
+    def class_names(self):
+        return self.manifest['class_names']
+    
+    @property
+    def ensemble_weight(self):
+        return self.manifest['ensemble_weight']
+    
+    @property
+    def threshold(self):
+        return self.manifest['threshold']
+    
+    @property
+    def metadata(self):
+        return self.manifest['metadata']
+
+
+def load_bundle(bundle_dir, mmap_mode='c', verify=False):
+    """
+    Load a model bundle.
+    
+    Args:
+        bundle_dir (str): Directory of the bundle
+        mmap_mode (str): joblib memory-map mode for the array payloads (None reads them into memory)
+        verify (bool): Whether to check the payload files against the content hash
+    
+    Returns:
+        ModelBundle: Loaded bundle
+    """
+    manifest = read_manifest(bundle_dir)
+    
+    array_files = manifest.get('arrays', {})
+    if verify and _content_hash(bundle_dir, _payload_files(manifest['files'], array_files)) != manifest['content_hash']:
+        raise ValueError(f"Content hash mismatch, bundle is corrupted: {bundle_dir}")
+    
+    saved_sklearn = manifest['versions'].get('scikit-learn')
+    if saved_sklearn != sklearn.__version__:
+        logger.warning("Bundle %s was saved with scikit-learn %s, running %s",
+                       bundle_dir, saved_sklearn, sklearn.__version__)
+    
+    estimators = {
+        name: load_joblib(os.path.join(bundle_dir, filename), mmap_mode=mmap_mode)
+        for name, filename in manifest['files'].items()
+    }
+    arrays = {
+        group: {name: np.load(os.path.join(bundle_dir, path), mmap_mode=mmap_mode, allow_pickle=False)
+                for name, path in group_files.items()}
+        for group, group_files in array_files.items()
+    }
+    return ModelBundle(bundle_dir, manifest, estimators, arrays)
@@ -0,0 +1,251 @@
+"""
+Columnar store for the held-out test data of all subjects.
+
+The test samples of every subject are stacked into one float32 feature
+matrix with a matching label array. An offsets array marks where each
+subject's rows start and end, and a JSON header holds the feature names,
+class names and subject IDs. Opening the store with mmap_mode='r' maps the
+arrays instead of reading them, so a subject's data is a slice of the matrix
+and reading one sample only touches that row.
+"""
+
+import os
+import json
+import shutil
+import datetime
+import numpy as np
+
+from wesad_framework.utils.artifacts import load_pickle
+
+
+STORE_FORMAT = 'neurofeel-test-store'
+STORE_VERSION = 1
+HEADER_FILE = 'header.json'
+TEST_STORE_NAME = 'test_store'
+
+
+def subject_number(subject_id):
+    """
+    Numeric ID of a subject given as 2, 'S2' or 'SS2'.
+    
+    Args:
+        subject_id (int or str): Subject ID
+    
+    Returns:
+        int: Subject number
+    """
+    return int(str(subject_id).lstrip('S'))
+
+
+def is_test_store(path):
+    """
+    Check whether a path is a test data store directory.
+    
+    Args:
+        path (str): Path to check
+    
+    Returns:
+        bool: True if the path contains a store header
+    """
+    return os.path.isfile(os.path.join(path, HEADER_FILE))
+
+
+def save_test_store(store_dir, subject_data, feature_names, class_names=None):
+    """
+    Write the test data of all subjects as a single columnar store.
+    
+    Like model bundles, the store is written next to its final location and
+    moved into place at the end.
+    
+    Args:
+        store_dir (str): Directory of the store
+        subject_data (dict): Subject ID -> (X_test, y_test), features in feature_names order
+        feature_names (list): Feature name of each column
+        class_names (list): Name of each (0-indexed) label
+    
+    Returns:
+        str: Path to the saved store
+    """
+    store_dir = os.path.normpath(store_dir)
+    tmp_dir = store_dir + '.tmp'
+    if os.path.exists(tmp_dir):
+        shutil.rmtree(tmp_dir)
+    os.makedirs(tmp_dir)
+    
+    subject_ids = sorted(subject_data, key=subject_number)
+    lengths = [len(subject_data[subject_id][1]) for subject_id in subject_ids]
+    offsets = np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64)
+    
+    # Write the matrix through a memory map to avoid building a second copy in memory
+    features = np.lib.format.open_memmap(os.path.join(tmp_dir, 'features.npy'), mode='w+',
+                                         dtype=np.float32, shape=(int(offsets[-1]), len(feature_names)))
+    labels = np.empty(int(offsets[-1]), dtype=np.int8)
+    for i, subject_id in enumerate(subject_ids):
+        X_test, y_test = subject_data[subject_id]
+        features[offsets[i]:offsets[i + 1]] = np.asarray(X_test, dtype=np.float32)
+        labels[offsets[i]:offsets[i + 1]] = np.asarray(y_test)
+    features.flush()
+    del features
+    
+    np.save(os.path.join(tmp_dir, 'labels.npy'), labels)
+    np.save(os.path.join(tmp_dir, 'offsets.npy'), offsets)
+    np.save(os.path.join(tmp_dir, 'subject_ids.npy'),
+            np.array([subject_number(subject_id) for subject_id in subject_ids], dtype=np.int32))
+    
+    header = {
+        'format': STORE_FORMAT,
+        'format_version': STORE_VERSION,
+        'created_at': datetime.datetime.now().isoformat(),
+        'n_samples': int(offsets[-1]),
+        'feature_names': list(feature_names),
+        'class_names': list(class_names) if class_names is not None else None,
+        'subject_ids': [subject_number(subject_id) for subject_id in subject_ids]
+    }
+    with open(os.path.join(tmp_dir, HEADER_FILE), 'w') as f:
+        json.dump(header, f, indent=2)
+    
+    if os.path.exists(store_dir):
+        shutil.rmtree(store_dir)
+    os.replace(tmp_dir, store_dir)
+    
+    return store_dir
+
+
+class ColumnarTestData:
+    """
+    An opened test data store.
+    """
+    
+    def __init__(self, path, header, features, labels, offsets, subject_ids):
+        """
+        Initialize an opened store.
+        
+        Args:
+            path (str): Directory of the store
+            header (dict): Store header
+            features (np.ndarray): Feature matrix of all subjects (n_samples, n_features)
+            labels (np.ndarray): 0-indexed label of each row
+            offsets (np.ndarray): Row offset of each subject, plus the total number of rows
+            subject_ids (np.ndarray): Subject number of each block of rows
+        """
+        self.path = path
+        self.header = header
+        self.features = features
+        self.labels = labels
+        self.offsets = offsets
+        self.feature_names = header['feature_names']
+        self.class_names = header['class_names']
+        self._positions = {int(subject_id): i for i, subject_id in enumerate(subject_ids)}
+    
+    @property
+    def subject_ids(self):
+        return sorted(self._positions)
+    
+    def __contains__(self, subject_id):
+        return subject_number(subject_id) in self._positions
+    
+    def _bounds(self, subject_id):
+        """Start and end row of a subject."""
+        try:
+            position = self._positions[subject_number(subject_id)]
+        except KeyError:
+            raise KeyError(f"No test data for subject {subject_id}")
+        return int(self.offsets[position]), int(self.offsets[position + 1])
+    
+    def num_samples(self, subject_id):
+        """Number of test samples of a subject."""
+        start, end = self._bounds(subject_id)
+        return end - start
+    
+    def subject(self, subject_id):
+        """
+        Test data of a subject, as views into the store.
+        
+        Args:
+            subject_id (int or str): Subject ID
+        
+        Returns:
+            dict: X_test, y_test, subject_id, feature_names and class_names
+        """
+        start, end = self._bounds(subject_id)
+        return {
+            'X_test': self.features[start:end],
+            'y_test': self.labels[start:end],
+            'subject_id': f"S{subject_number(subject_id)}",
+            'feature_names': self.feature_names,
+            'class_names': self.class_names
+        }
+    
+    def row(self, subject_id, sample_index):
+        """
+        A single test sample of a subject.
+        
+        Args:
+            subject_id (int or str): Subject ID
+            sample_index (int): Index of the sample within the subject
+        
+        Returns:
+            tuple: (features, label)
+        """
+        start, end = self._bounds(subject_id)
+        if sample_index < 0 or sample_index >= end - start:
+            raise IndexError(f"Sample index {sample_index} out of range for subject {subject_id}")
+        return self.features[start + sample_index], int(self.labels[start + sample_index])
+
+
+def open_test_store(store_dir, mmap_mode='r'):
+    """
+    Open a test data store.
+    
+    Args:
+        store_dir (str): Directory of the store
+        mmap_mode (str): np.load memory-map mode (None reads the arrays into memory)
+    
+    Returns:
+        ColumnarTestData: Opened store
+    """
+    with open(os.path.join(store_dir, HEADER_FILE), 'r') as f:
+        header = json.load(f)
+    
+    if header.get('format') != STORE_FORMAT:
+        raise ValueError(f"Not a test data store: {store_dir}")
+    if header.get('format_version', 0) > STORE_VERSION:
+        raise ValueError(f"Test store format version {header['format_version']} is newer than "
+                         f"the supported version {STORE_VERSION}: {store_dir}")
+    
+    arrays = {
+        name: np.load(os.path.join(store_dir, f"{name}.npy"), mmap_mode=mmap_mode, allow_pickle=False)
+        for name in ['features', 'labels', 'offsets', 'subject_ids']
+    }
+    return ColumnarTestData(store_dir, header, **arrays)
+
+
+def convert_test_pickles(test_data_dir, store_dir=None):
+    """
+    Convert per-subject test data pickles (S{id}_test.pkl) into a test data store.
+    
+    Args:
+        test_data_dir (str): Directory with the pickled test data
+        store_dir (str): Directory of the store (defaults to test_data_dir/test_store)
+    
+    Returns:
+        str: Path to the saved store
+    """
+    subject_data = {}
+    feature_names, class_names = None, None
+    for filename in sorted(os.listdir(test_data_dir)):
+        if not filename.endswith('_test.pkl'):
+            continue
+        test_data = load_pickle(os.path.join(test_data_dir, filename), expected=dict)
+        
+        if feature_names is None:
+            feature_names, class_names = test_data['feature_names'], test_data.get('class_names')
+        elif list(test_data['feature_names']) != list(feature_names):
+            raise ValueError(f"{filename} has a different feature order than the other subjects")
+        subject_data[filename[:-len('_test.pkl')]] = (test_data['X_test'], test_data['y_test'])
+    
+    if not subject_data:
+        raise FileNotFoundError(f"No test data pickles found in {test_data_dir}")
+    
+    return save_test_store(store_dir or os.path.join(test_data_dir, TEST_STORE_NAME),
+                           subject_data, feature_names, class_names)
@@ -4,16 +4,22 @@ Helper functions for the WESAD framework.
 
 import os
 import pickle
-import json
 import datetime
-import numpy as np
 import pandas as pd
-from sklearn.base import BaseEstimator
+from sklearn.neural_network import MLPClassifier
 
+from wesad_framework.utils.bundle import save_bundle, load_bundle, is_bundle
+from wesad_framework.utils.artifacts import load_pickle
+from wesad_framework.models.runtime import MLPRuntime
 
-def save_model(model, model_name, subject_id=None, output_dir='.', metadata=None):
+
+# Class names in predict_proba column order
+EMOTION_CLASSES = ['Baseline', 'Stress', 'Amusement', 'Meditation']
+
+
+def save_model(model, model_name, subject_id=None, output_dir='.', metadata=None, scaler=None, ensemble_weight=None):
     """
-    Save a trained model with metadata.
+    Save a trained model with metadata as a model bundle.
     
     Args:
         model: Trained model to save
@@ -21,9 +27,11 @@ def save_model(model, model_name, subject_id=None, output_dir='.', metadata=None
         subject_id (int, optional): Subject ID for personal models
         output_dir (str): Directory to save the model
         metadata (dict, optional): Additional metadata to save with the model
+        scaler (optional): Fitted scaler applied before the model
+        ensemble_weight (float, optional): Weight of the base model when ensembling
     
     Returns:
-        str: Path to saved model
+        str: Path to saved model bundle
     """
     # Create models directory if it doesn't exist
     models_dir = os.path.join(output_dir, 'models')
@@ -46,56 +54,46 @@ def save_model(model, model_name, subject_id=None, output_dir='.', metadata=None
         except:
             metadata['parameters'] = str(model)
     
-    # Create a model package with model and metadata
-    model_package = {
-        'model': model,
-        'metadata': metadata
-    }
-    
-    # Create filename
+    # Create bundle name
     if subject_id is not None:
-        filename = f"{model_name}_S{subject_id}.pkl"
+        bundle_name = f"{model_name}_S{subject_id}"
     else:
-        filename = f"{model_name}_model.pkl"
-    
-    filepath = os.path.join(models_dir, filename)
-    
-    # Save model package
-    with open(filepath, 'wb') as f:
-        pickle.dump(model_package, f)
-    
-    # Save metadata separately as JSON for easy access
-    meta_filepath = os.path.join(models_dir, os.path.splitext(filename)[0] + '_meta.json')
-    
-    # Convert numpy and other non-serializable types to strings in metadata
-    clean_metadata = {}
-    for key, value in metadata.items():
-        if isinstance(value, dict):
-            clean_metadata[key] = {k: str(v) for k, v in value.items()}
-        elif isinstance(value, (np.ndarray, np.number)):
-            clean_metadata[key] = str(value)
-        else:
-            clean_metadata[key] = value
-    
-    with open(meta_filepath, 'w') as f:
-        json.dump(clean_metadata, f, indent=2)
-    
-    return filepath
+        bundle_name = f"{model_name}_model"
+    
+    # Neural networks also get a float32 NumPy runtime with the scaler folded in
+    arrays = {}
+    if isinstance(model, MLPClassifier):
+        arrays['runtime'] = MLPRuntime.from_sklearn(model, scaler).to_arrays()
+    
+    return save_bundle(
+        os.path.join(models_dir, bundle_name),
+        model,
+        feature_names=metadata.get('features'),
+        class_names=EMOTION_CLASSES,
+        scaler=scaler,
+        ensemble_weight=ensemble_weight,
+        metadata=metadata,
+        arrays=arrays
+    )
 
 
 def load_model(filepath):
     """
     Load a saved model with metadata.
     
+    Accepts model bundles as well as models pickled by earlier versions.
+    
     Args:
-        filepath (str): Path to saved model
+        filepath (str): Path to saved model bundle or pickle
     
     Returns:
         tuple: (model, metadata)
     """
-    with open(filepath, 'rb') as f:
-        model_package = pickle.load(f)
+    if is_bundle(filepath):
+        bundle = load_bundle(filepath)
+        return bundle.model, bundle.metadata
     
+    model_package = load_pickle(filepath, expected=dict)
     return model_package['model'], model_package['metadata']
 
 
@@ -136,10 +134,7 @@ def load_scaler(filepath):
     Returns:
         object: Loaded scaler
     """
-    with open(filepath, 'rb') as f:
-        scaler = pickle.load(f)
-    
-    return scaler
+    return load_pickle(filepath)
 
 
 def save_features(feature_ranking, subject_id=None, output_dir='.'):
@@ -0,0 +1,199 @@
+"""
+Logging setup shared by the research pipelines and the API servers.
+
+Modules log through logging.getLogger(__name__). configure_logging installs
+a single handler on the root logger that only puts records on a queue; a
+background listener thread formats them (JSON lines or plain text) and
+writes them out, so a log call on a request path does no stream I/O.
+
+Structured fields are passed with extra={...} and become keys of the JSON
+record. Records of high-frequency events can carry extra={'sample_every': n}
+to only emit one in every n occurrences of the same message. log_duration
+adds a duration_ms field to a record for a timed block.
+"""
+
+import os
+import sys
+import copy
+import json
+import time
+import queue
+import atexit
+import logging
+import datetime
+import threading
+import logging.handlers
+from contextlib import contextmanager
+
+
+LOG_LEVEL_ENV = 'NEUROFEEL_LOG_LEVEL'
+LOG_FORMAT_ENV = 'NEUROFEEL_LOG_FORMAT'
+LOG_FORMATS = ('json', 'text')
+
+# Attributes every LogRecord has; anything else on a record came from extra={...}
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord('', logging.INFO, '', 0, '', None, None))) | {'message', 'asctime'}
+
+# Listener of the installed queue handler and the settings it was configured with
+_listener = None
+_listener_lock = threading.Lock()
+_settings = {}
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Format a record as one JSON object per line.
+    """
+    
+    def format(self, record):
+        entry = {
+            'time': datetime.datetime.fromtimestamp(record.created, datetime.timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage()
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+        
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry['exception'] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Pass one in every n records of a message logged with extra={'sample_every': n}.
+    
+    Occurrences are counted per logger and message template, so sampled calls
+    should pass their values as arguments (logger.info("... %s", value)).
+    Emitted records get an occurrences field with the count so far.
+    """
+    
+    def __init__(self):
+        super().__init__()
+        self._counts = {}
+        self._lock = threading.Lock()
+    
+    def filter(self, record):
+        every = getattr(record, 'sample_every', None)
+        if not every or every <= 1:
+            return True
+        
+        key = (record.name, record.msg)
+        with self._lock:
+            count = self._counts.get(key, 0) + 1
+            self._counts[key] = count
+        if (count - 1) % every:
+            return False
+        record.occurrences = count
+        return True
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """
+    Queue handler that leaves formatting to the listener.
+    
+    The default handler formats every record on the calling thread; this one
+    only merges the message arguments and renders tracebacks, which cannot
+    be passed to another thread.
+    """
+    
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def _stop_listener():
+    """Flush the queued records and stop the listener thread."""
+    global _listener
+    with _listener_lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+
+
+def configure_logging(level=None, log_format=None, stream=None):
+    """
+    Route all logging through a queue to a single output stream.
+    
+    Calling it again replaces the previous configuration.
+    
+    Args:
+        level (str or int): Minimum level (defaults to $NEUROFEEL_LOG_LEVEL or INFO)
+        log_format (str): 'json' or 'text' (defaults to $NEUROFEEL_LOG_FORMAT or json)
+        stream: Output stream (defaults to stdout)
+    
+    Returns:
+        logging.Logger: The configured root logger
+    """
+    global _listener
+    
+    level = level or os.environ.get(LOG_LEVEL_ENV, 'INFO')
+    if isinstance(level, str):
+        level = level.upper()
+    log_format = (log_format or os.environ.get(LOG_FORMAT_ENV, 'json')).lower()
+    if log_format not in LOG_FORMATS:
+        raise ValueError(f"Unknown log format {log_format!r}, expected one of {LOG_FORMATS}")
+    
+    _stop_listener()
+    
+    output = logging.StreamHandler(stream or sys.stdout)
+    output.setFormatter(JsonFormatter() if log_format == 'json' else logging.Formatter('%(message)s'))
+    
+    records = queue.SimpleQueue()
+    handler = _QueueHandler(records)
+    handler.addFilter(SamplingFilter())
+    
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(level)
+    
+    with _listener_lock:
+        _listener = logging.handlers.QueueListener(records, output)
+        _listener.start()
+    _settings.update(level=level, log_format=log_format)
+    return root
+
+
+def logging_settings():
+    """
+    Level and format of the current configuration, e.g. to configure worker processes the same way.
+    
+    Returns:
+        dict: Keyword arguments for configure_logging (empty if not configured)
+    """
+    return dict(_settings)
+
+
+atexit.register(_stop_listener)
+
+
+@contextmanager
+def log_duration(logger, message, level=logging.INFO, **fields):
+    """
+    Log a message with the duration of a block as a duration_ms field.
+    
+    The yielded dict holds the record's fields; the block can add to it.
+    
+    Args:
+        logger (logging.Logger): Logger to use
+        message (str): Message logged when the block ends
+        level (int): Log level
+        **fields: Additional structured fields
+    """
+    start = time.perf_counter()
+    try:
+        yield fields
+    finally:
+        if logger.isEnabledFor(level):
+            fields['duration_ms'] = round((time.perf_counter() - start) * 1000, 3)
+            logger.log(level, message, extra=fields)
@@ -0,0 +1,219 @@
+"""
+Opt-in stage profiling for the training pipelines.
+
+A StageProfiler times named pipeline stages (load, extract, select, scale,
+balance, adapt, fit, evaluate, plot, save) with wall and CPU time, the peak
+resident set size and the row/column counts of the data a stage produced.
+The stages are written as a Chrome trace (chrome://tracing or Perfetto) and
+can optionally be profiled with cProfile, one stats file per top-level stage.
+
+Code called from inside a stage, such as the model training functions, marks
+its own sub-stages with profile_stage, which does nothing unless a profiler
+is active. A disabled profiler costs one branch per stage.
+"""
+
+import os
+import json
+import time
+import pstats
+import logging
+import cProfile
+import threading
+import contextvars
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+logger = logging.getLogger(__name__)
+
+TRACE_FILE = 'profile_trace.json'
+CPROFILE_DIR = 'profile'
+
+# Profiler of the stage running in the current context
+_active_profiler = contextvars.ContextVar('active_profiler', default=None)
+
+
+def peak_rss_mb():
+    """Peak resident set size of the process in MB (None where unavailable)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    return round(peak / (1024 * 1024 if os.uname().sysname == 'Darwin' else 1024), 1)
+
+
+def data_shape(data):
+    """
+    Row and column counts of a DataFrame, array or dict of them.
+    
+    Args:
+        data: DataFrame, array, list or dict of DataFrames/arrays
+    
+    Returns:
+        dict: rows and (if two-dimensional) columns
+    """
+    if data is None:
+        return {}
+    if isinstance(data, dict):
+        shapes = [data_shape(value) for value in data.values()]
+        info = {'rows': sum(shape.get('rows', 0) for shape in shapes)}
+        columns = {shape['columns'] for shape in shapes if 'columns' in shape}
+        if len(columns) == 1:
+            info['columns'] = columns.pop()
+        return info
+    
+    shape = getattr(data, 'shape', None)
+    if shape is None:
+        return {'rows': len(data)}
+    info = {'rows': int(shape[0]) if len(shape) else 1}
+    if len(shape) > 1:
+        info['columns'] = int(shape[1])
+    return info
+
+
+class StageProfiler:
+    """
+    Collect timings of pipeline stages and write them as a Chrome trace.
+    """
+    
+    def __init__(self, enabled=False, cprofile=False, output_dir=None):
+        """
+        Initialize the profiler.
+        
+        Args:
+            enabled (bool): Whether stages are recorded at all
+            cprofile (bool): Also run cProfile on each top-level stage
+            output_dir (str): Directory for the trace and cProfile stats
+        """
+        self.enabled = enabled
+        self.cprofile = enabled and cprofile
+        self.output_dir = output_dir or '.'
+        self.events = []
+        self._origin = time.perf_counter()
+        self._depth = 0
+        self._top_level_stages = 0
+        self._lock = threading.Lock()
+    
+    @contextmanager
+    def stage(self, name, **args):
+        """
+        Record a stage.
+        
+        The yielded dict is added to the trace event's args; the block can put
+        the row/column counts of its output there, e.g. with data_shape.
+        
+        Args:
+            name (str): Stage name
+            **args: Additional fields recorded with the stage
+        """
+        if not self.enabled:
+            yield args
+            return
+        
+        token = _active_profiler.set(self)
+        profiler = None
+        with self._lock:
+            top_level = self._depth == 0
+            self._depth += 1
+            index = self._top_level_stages
+            self._top_level_stages += top_level
+        if top_level and self.cprofile:
+            profiler = cProfile.Profile()
+            profiler.enable()
+        
+        start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield args
+        finally:
+            wall = time.perf_counter() - start
+            cpu = time.process_time() - cpu_start
+            if profiler is not None:
+                profiler.disable()
+            _active_profiler.reset(token)
+            with self._lock:
+                self._depth -= 1
+            
+            args.update(cpu_ms=round(cpu * 1000, 3), peak_rss_mb=peak_rss_mb())
+            if profiler is not None:
+                args['cprofile'] = self._dump_stats(profiler, index, name)
+            self.events.append({
+                'name': name,
+                'cat': 'stage',
+                'ph': 'X',
+                'ts': round((start - self._origin) * 1e6, 1),
+                'dur': round(wall * 1e6, 1),
+                'pid': os.getpid(),
+                'tid': threading.get_ident(),
+                'args': args
+            })
+            logger.debug("Stage %s finished", name, extra=dict(args, stage=name, duration_ms=round(wall * 1000, 3)))
+    
+    def _dump_stats(self, profiler, index, name):
+        """Write the cProfile stats of a stage and return the file path."""
+        stats_dir = os.path.join(self.output_dir, CPROFILE_DIR)
+        os.makedirs(stats_dir, exist_ok=True)
+        path = os.path.join(stats_dir, f"{index:02d}_{name}.prof")
+        pstats.Stats(profiler).dump_stats(path)
+        return path
+    
+    def summary(self):
+        """
+        Total wall and CPU time per stage name.
+        
+        Returns:
+            dict: Stage name -> {'calls', 'wall_ms', 'cpu_ms'}, in order of first occurrence
+        """
+        totals = {}
+        for event in sorted(self.events, key=lambda event: event['ts']):
+            total = totals.setdefault(event['name'], {'calls': 0, 'wall_ms': 0.0, 'cpu_ms': 0.0})
+            total['calls'] += 1
+            total['wall_ms'] += event['dur'] / 1000
+            total['cpu_ms'] += event['args']['cpu_ms']
+        return totals
+    
+    def save(self, path=None):
+        """
+        Write the recorded stages as a Chrome trace and log a summary.
+        
+        Args:
+            path (str): Trace file (defaults to output_dir/profile_trace.json)
+        
+        Returns:
+            str: Path to the trace, or None if the profiler is disabled
+        """
+        if not self.enabled:
+            return None
+        
+        path = path or os.path.join(self.output_dir, TRACE_FILE)
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        events = sorted(self.events, key=lambda event: event['ts'])
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f, indent=1, default=str)
+        
+        for name, total in self.summary().items():
+            logger.info("%-12s %4d call(s) %10.1f ms wall %10.1f ms CPU", name, total['calls'],
+                        total['wall_ms'], total['cpu_ms'])
+        logger.info("Profile trace saved to %s", path)
+        return path
+
+
+@contextmanager
+def profile_stage(name, **args):
+    """
+    Record a stage with the profiler of the enclosing stage, if there is one.
+    
+    Args:
+        name (str): Stage name
+        **args: Additional fields recorded with the stage
+    """
+    profiler = _active_profiler.get()
+    if profiler is None:
+        yield args
+        return
+    with profiler.stage(name, **args) as info:
+        yield info